@@ -12,6 +12,10 @@ Este paquete contiene todos los componentes necesarios para el algoritmo genéti
 # Constantes globales
 LONGITUD_MINIMA_DESPERDICIO_UTILIZABLE = 0.5  # Metros. Desperdicios menores se consideran pérdida.
 
+# Aritmética entera: en este modo todas las longitudes se expresan en milímetros enteros
+ESCALA_MILIMETROS = 1000  # Milímetros por metro
+LONGITUD_MINIMA_DESPERDICIO_UTILIZABLE_MM = round(LONGITUD_MINIMA_DESPERDICIO_UTILIZABLE * ESCALA_MILIMETROS)
+
 # Configuración por defecto para los operadores genéticos
 CONFIG_OPERADORES_DEFAULT = {
     'tamaño_poblacion': 50,
@@ -40,7 +44,8 @@ CONFIG_CICLO_EVOLUTIVO_DEFAULT = {
     # Elitismo y reemplazo
     'elitismo': True,
     'tamaño_elite': 2,
-    'estrategia_reemplazo': 'elitismo',
+    'estrategia_reemplazo': 'elitismo',  # 'elitismo' (generacional), 'reemplazo_peor' o 'reemplazo_torneo'
+    'hijos_por_paso': 2,  # Hijos generados por paso en los reemplazos de estado estacionario
     
     # Logging y monitoreo
     'logging_habilitado': True,
@@ -49,7 +54,20 @@ CONFIG_CICLO_EVOLUTIVO_DEFAULT = {
     
     # Optimizaciones
     'paralelizar_evaluacion': False,
-    'cache_fitness': False
+    'num_trabajadores': None,  # Procesos para la evaluación paralela (None = todos los núcleos)
+    'tamaño_lote_paralelo': 8,  # Cromosomas o parejas por tarea enviada a cada proceso
+    'evolucion_asincrona': False,  # Con evaluación paralela: hijos insertados al llegar, sin barrera por generación
+    'cache_fitness': False,
+    'tamaño_cache_fitness': 10000,  # Máximo de firmas de cromosoma en la caché LRU de fitness
+    'aritmetica_entera': False,  # Longitudes cuantizadas a milímetros enteros en la entrada
+    'ruta_checkpoint': None,  # Archivo de checkpoint para reanudar la ejecución (checkpoint.py)
+    'intervalo_checkpoint': 10,  # Generaciones entre checkpoints
+    'parada_por_cota_inferior': False,  # Detener al alcanzar la cota de Gilmore–Gomory (lower_bound.py)
+    
+    # Modelo de islas (islands.py)
+    'num_islas': 1,  # Subpoblaciones en procesos separados (1 = población única)
+    'intervalo_migracion': 5,  # Generaciones entre migraciones
+    'num_migrantes': 2  # Mejores individuos que cada isla envía a la siguiente
 }
 
 # Configuración por defecto para el algoritmo genético completo
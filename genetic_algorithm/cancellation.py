@@ -0,0 +1,243 @@
+"""
+Cancelación cooperativa y límites de recursos de una ejecución.
+
+Un TokenCancelacion se consulta entre generaciones del AG, entre individuos de
+la población inicial y entre subproblemas de la cartilla. Se considera
+cancelado cuando se llama a cancelar(), cuando existe su archivo de señal
+(para cancelar desde otro proceso) o cuando el árbol de procesos de la
+ejecución supera el tiempo de CPU o la memoria máximos configurados.
+
+El árbol lo encabeza el proceso que creó el token e incluye a todos sus
+descendientes vivos (diámetros en paralelo, islas, evaluación paralela,
+solvers del portafolio), y se mide igual desde cualquiera de ellos: el
+presupuesto es de la ejecución completa, no de cada proceso. Por eso cada
+ejecución con límites debe crear su token en un proceso propio. Los procesos
+se leen de /proc como mucho una vez cada INTERVALO_MEDICION_RECURSOS_SEGUNDOS;
+sin /proc solo se mide el proceso que consulta el token.
+
+Los bucles del AG terminan al detectar la cancelación y retornan el mejor
+cromosoma encontrado; donde no hay un resultado parcial que retornar (la
+población inicial) se lanza CancelacionSolicitada.
+"""
+
+import os
+import time
+from typing import Dict, List, Optional, Tuple
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+
+MOTIVO_CANCELADO = 'cancelado'
+MOTIVO_LIMITE_CPU = 'limite_tiempo_cpu'
+MOTIVO_LIMITE_MEMORIA = 'limite_memoria'
+
+
+class CancelacionSolicitada(Exception):
+    """La ejecución se canceló o superó un límite de recursos."""
+
+    def __init__(self, motivo: str):
+        super().__init__(f"Ejecución detenida: {motivo}")
+        self.motivo = motivo
+
+
+# Posiciones en /proc/<pid>/stat contadas desde el campo de estado, que sigue al
+# nombre del comando entre paréntesis
+_CAMPO_PPID = 1
+_CAMPOS_TIEMPO_CPU = (11, 12, 13, 14)  # utime, stime, cutime, cstime
+_CAMPO_RSS = 21
+
+# Antigüedad máxima de una medición de /proc antes de volver a recorrerlo
+INTERVALO_MEDICION_RECURSOS_SEGUNDOS = 0.1
+
+MedicionRecursos = Tuple[float, Optional[float]]  # (tiempo de CPU en s, memoria residente en MB)
+
+_mediciones_recientes: Dict[int, Tuple[float, Optional[MedicionRecursos]]] = {}
+
+
+def _procesos_del_arbol(pid_raiz: int) -> Optional[List[List[str]]]:
+    """Campos de /proc/<pid>/stat de pid_raiz y sus descendientes vivos (None sin /proc o si pid_raiz terminó)."""
+    try:
+        entradas = os.listdir('/proc')
+    except OSError:
+        return None
+
+    campos_por_pid = {}
+    hijos_por_pid = {}
+    for entrada in entradas:
+        if not entrada.isdigit():
+            continue
+        try:
+            with open(f'/proc/{entrada}/stat') as archivo:
+                contenido = archivo.read()
+            campos = contenido[contenido.rindex(')') + 2:].split()
+            ppid = int(campos[_CAMPO_PPID])
+        except (OSError, ValueError, IndexError):
+            continue  # El proceso terminó durante el recorrido
+        campos_por_pid[int(entrada)] = campos
+        hijos_por_pid.setdefault(ppid, []).append(int(entrada))
+
+    if pid_raiz not in campos_por_pid:
+        return None
+    procesos = []
+    pendientes = [pid_raiz]
+    while pendientes:
+        pid = pendientes.pop()
+        procesos.append(campos_por_pid[pid])
+        pendientes.extend(hijos_por_pid.get(pid, []))
+    return procesos
+
+
+def _medir_arbol_de_procesos(pid_raiz: int) -> Optional[MedicionRecursos]:
+    """
+    Tiempo de CPU y memoria residente de pid_raiz y sus descendientes vivos.
+
+    El tiempo incluye el de los hijos que cada proceso ya esperó. Las páginas
+    compartidas entre procesos (copias por fork) se cuentan en cada uno, de modo
+    que la memoria es una cota superior del consumo real. Una medición de hace
+    menos de INTERVALO_MEDICION_RECURSOS_SEGUNDOS se reutiliza.
+
+    Returns:
+        Optional[MedicionRecursos]: (segundos de CPU, MB residentes), o None sin /proc.
+    """
+    ahora = time.monotonic()
+    reciente = _mediciones_recientes.get(pid_raiz)
+    if reciente is not None and ahora - reciente[0] < INTERVALO_MEDICION_RECURSOS_SEGUNDOS:
+        return reciente[1]
+
+    medicion = None
+    procesos = _procesos_del_arbol(pid_raiz)
+    if procesos is not None:
+        ticks = 0
+        paginas_residentes = 0
+        for campos in procesos:
+            try:
+                ticks += sum(int(campos[indice]) for indice in _CAMPOS_TIEMPO_CPU)
+                paginas_residentes += int(campos[_CAMPO_RSS])
+            except (ValueError, IndexError):
+                continue
+        medicion = (
+            ticks / os.sysconf('SC_CLK_TCK'),
+            paginas_residentes * os.sysconf('SC_PAGE_SIZE') / (1024 * 1024)
+        )
+    _mediciones_recientes[pid_raiz] = (ahora, medicion)
+    return medicion
+
+
+def _medir_proceso_actual() -> MedicionRecursos:
+    """Tiempo de CPU del proceso actual y de sus hijos terminados, y su memoria residente máxima."""
+    if resource is None:
+        return time.process_time(), None
+    propio = resource.getrusage(resource.RUSAGE_SELF)
+    hijos = resource.getrusage(resource.RUSAGE_CHILDREN)
+    tiempo_cpu = propio.ru_utime + propio.ru_stime + hijos.ru_utime + hijos.ru_stime
+    return tiempo_cpu, propio.ru_maxrss / 1024  # Kilobytes en Linux
+
+
+class TokenCancelacion:
+    """
+    Señal de cancelación con límites opcionales de tiempo de CPU y memoria.
+
+    El token es serializable: una copia enviada a otro proceso ve la cancelación
+    solo a través de ruta_senal. Los límites se miden sobre el árbol de procesos
+    del proceso que creó el token, desde cualquier proceso que lo consulte; el
+    tiempo de CPU se cuenta desde la creación del token.
+    """
+
+    def __init__(
+        self,
+        ruta_senal: Optional[str] = None,
+        limite_tiempo_cpu_segundos: Optional[float] = None,
+        limite_memoria_mb: Optional[float] = None
+    ):
+        """
+        Args:
+            ruta_senal: Archivo cuya existencia cancela la ejecución; su contenido,
+                si lo hay, es el motivo.
+            limite_tiempo_cpu_segundos: Tiempo de CPU máximo del árbol de procesos
+                (None = sin límite).
+            limite_memoria_mb: Memoria residente máxima en MB del árbol de procesos
+                (None = sin límite).
+        """
+        self.ruta_senal = ruta_senal
+        self.limite_tiempo_cpu_segundos = limite_tiempo_cpu_segundos
+        self.limite_memoria_mb = limite_memoria_mb
+        self.motivo: Optional[str] = None
+        self._pid_raiz = os.getpid()
+        self._pid_base: Optional[int] = None
+        self._tiempo_cpu_base = 0.0
+        if limite_tiempo_cpu_segundos is not None or limite_memoria_mb is not None:
+            self._medir_recursos()
+
+    def _medir_recursos(self) -> MedicionRecursos:
+        """
+        Mide el árbol de procesos del token o, sin /proc, solo el proceso actual.
+
+        El tiempo de CPU base se toma la primera vez que se mide cada origen: el
+        árbol al crear el token o, sin /proc, cada proceso en su primera consulta.
+        """
+        medicion = _medir_arbol_de_procesos(self._pid_raiz)
+        pid_medido = self._pid_raiz
+        if medicion is None:
+            medicion = _medir_proceso_actual()
+            pid_medido = os.getpid()
+        if pid_medido != self._pid_base:
+            self._pid_base = pid_medido
+            self._tiempo_cpu_base = medicion[0]
+        return medicion
+
+    def cancelar(self, motivo: str = MOTIVO_CANCELADO) -> None:
+        """Cancela la ejecución; con ruta_senal, también en los demás procesos."""
+        if self.motivo is None:
+            self.motivo = motivo
+        if self.ruta_senal:
+            with open(self.ruta_senal, 'w', encoding='utf-8') as archivo:
+                archivo.write(motivo)
+
+    @property
+    def cancelado(self) -> bool:
+        """Indica si la ejecución debe detenerse; registra el motivo la primera vez."""
+        if self.motivo is not None:
+            return True
+
+        if self.ruta_senal and os.path.exists(self.ruta_senal):
+            try:
+                with open(self.ruta_senal, encoding='utf-8') as archivo:
+                    motivo = archivo.read().strip()
+            except OSError:
+                motivo = ''
+            self.motivo = motivo or MOTIVO_CANCELADO
+            return True
+
+        if self.limite_tiempo_cpu_segundos is None and self.limite_memoria_mb is None:
+            return False
+
+        tiempo_cpu, memoria = self._medir_recursos()
+        if (self.limite_tiempo_cpu_segundos is not None
+                and tiempo_cpu - self._tiempo_cpu_base >= self.limite_tiempo_cpu_segundos):
+            self.motivo = MOTIVO_LIMITE_CPU
+            return True
+
+        if self.limite_memoria_mb is not None and memoria is not None and memoria >= self.limite_memoria_mb:
+            self.motivo = MOTIVO_LIMITE_MEMORIA
+            return True
+
+        return False
+
+    def verificar(self) -> None:
+        """
+        Detiene la ejecución si el token está cancelado.
+
+        Raises:
+            CancelacionSolicitada: Si la ejecución debe detenerse.
+        """
+        if self.cancelado:
+            raise CancelacionSolicitada(self.motivo)
+
+
+def verificar_cancelacion(token_cancelacion: Optional[TokenCancelacion]) -> None:
+    """Llama a token_cancelacion.verificar() si hay token."""
+    if token_cancelacion is not None:
+        token_cancelacion.verificar()
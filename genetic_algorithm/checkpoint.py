@@ -0,0 +1,112 @@
+"""
+Puntos de control (checkpoints) para reanudar ejecuciones largas.
+
+Un checkpoint es un diccionario serializado con pickle y comprimido con gzip.
+Se escribe en un archivo temporal que luego reemplaza al anterior, de modo que
+una interrupción durante la escritura nunca deja un checkpoint a medias.
+
+Cada checkpoint guarda una clave del problema (calcular_clave_problema); al
+cargarlo con una clave distinta se descarta, para no reanudar un problema
+diferente con el estado de otro.
+"""
+
+import gzip
+import hashlib
+import os
+import pickle
+import random
+from typing import Dict, Any, Optional
+import numpy as np
+
+
+VERSION_CHECKPOINT = 1
+
+
+def calcular_clave_problema(*partes: Any) -> str:
+    """
+    Calcula una clave que identifica los datos de un problema.
+
+    Args:
+        *partes: Datos del problema (DataFrames, listas, diccionarios o escalares).
+
+    Returns:
+        str: Resumen hexadecimal (BLAKE2b) de la representación de las partes.
+    """
+    resumen = hashlib.blake2b(digest_size=16)
+    for parte in partes:
+        if hasattr(parte, 'to_dict'):
+            parte = parte.to_dict('records')
+        resumen.update(repr(parte).encode('utf-8'))
+        resumen.update(b'\x00')
+    return resumen.hexdigest()
+
+
+def capturar_estado_aleatorio() -> Dict[str, Any]:
+    """Captura el estado de los generadores aleatorios de random y numpy."""
+    return {'random': random.getstate(), 'numpy': np.random.get_state()}
+
+
+def restaurar_estado_aleatorio(estado: Dict[str, Any]) -> None:
+    """Restaura el estado capturado con capturar_estado_aleatorio."""
+    random.setstate(estado['random'])
+    np.random.set_state(estado['numpy'])
+
+
+def guardar_checkpoint(ruta: str, clave: str, estado: Dict[str, Any]) -> None:
+    """
+    Guarda un checkpoint de forma atómica.
+
+    Args:
+        ruta: Ruta del archivo de checkpoint.
+        clave: Clave del problema (calcular_clave_problema).
+        estado: Estado a guardar; debe ser serializable con pickle.
+    """
+    directorio = os.path.dirname(ruta)
+    if directorio:
+        os.makedirs(directorio, exist_ok=True)
+
+    ruta_temporal = f"{ruta}.tmp"
+    with gzip.open(ruta_temporal, 'wb', compresslevel=6) as archivo:
+        pickle.dump(
+            {'version': VERSION_CHECKPOINT, 'clave': clave, 'estado': estado},
+            archivo,
+            protocol=pickle.HIGHEST_PROTOCOL
+        )
+    os.replace(ruta_temporal, ruta)
+
+
+def cargar_checkpoint(ruta: str, clave: str) -> Optional[Dict[str, Any]]:
+    """
+    Carga un checkpoint si existe y corresponde al mismo problema.
+
+    Args:
+        ruta: Ruta del archivo de checkpoint.
+        clave: Clave esperada del problema.
+
+    Returns:
+        Optional[Dict]: Estado guardado, o None si el archivo no existe, está
+            dañado o pertenece a otro problema o versión.
+    """
+    if not os.path.exists(ruta):
+        return None
+    try:
+        with gzip.open(ruta, 'rb') as archivo:
+            contenido = pickle.load(archivo)
+    except (OSError, EOFError, ValueError, pickle.UnpicklingError):
+        return None
+
+    if contenido.get('version') != VERSION_CHECKPOINT or contenido.get('clave') != clave:
+        return None
+    return contenido['estado']
+
+
+def eliminar_checkpoint(ruta: str) -> None:
+    """
+    Elimina un checkpoint una vez completada la ejecución.
+
+    Args:
+        ruta: Ruta del archivo de checkpoint.
+    """
+    for ruta_archivo in (ruta, f"{ruta}.tmp"):
+        if os.path.exists(ruta_archivo):
+            os.remove(ruta_archivo)
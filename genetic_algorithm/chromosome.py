@@ -5,9 +5,11 @@ Este módulo define las estructuras de datos básicas para representar solucione
 al problema de corte de acero en el algoritmo genético.
 """
 
-from typing import List, Dict, Any, Union, Optional
-from copy import deepcopy
-from . import LONGITUD_MINIMA_DESPERDICIO_UTILIZABLE
+from contextlib import contextmanager
+from typing import List, Dict, Any, Union, Optional, Tuple, Iterator
+from copy import copy
+from . import LONGITUD_MINIMA_DESPERDICIO_UTILIZABLE, LONGITUD_MINIMA_DESPERDICIO_UTILIZABLE_MM
+from .units import a_milimetros, milimetros_a_metros
 
 class Patron:
     """
@@ -15,24 +17,39 @@ class Patron:
     
     Un patrón define cómo se corta una barra de origen (estándar o desperdicio)
     en piezas específicas, registrando las piezas cortadas y el desperdicio resultante.
+    
+    Los patrones pueden estar compartidos entre varios cromosomas. Solo el
+    cromosoma indicado en `_propietario` puede modificarlo en el lugar; el resto
+    debe obtener una copia propia con Cromosoma.patron_mutable().
     """
     
+    # Marca de propiedad del cromosoma que puede modificar el patrón (None: compartido)
+    _propietario: Optional[object] = None
+    
+    # Unidad de las longitudes (por defecto metros, también en patrones de checkpoints previos)
+    en_milimetros: bool = False
+    
     def __init__(
         self, 
         origen_barra_longitud: float, 
         origen_barra_tipo: str,
-        piezas_cortadas: Optional[List[Dict[str, Any]]] = None
+        piezas_cortadas: Optional[List[Dict[str, Any]]] = None,
+        en_milimetros: bool = False
     ):
         """
         Inicializa un nuevo patrón de corte.
         
         Args:
-            origen_barra_longitud: Longitud de la barra de origen en metros.
+            origen_barra_longitud: Longitud de la barra de origen en metros, o en
+                milímetros enteros en el modo de aritmética entera.
             origen_barra_tipo: Tipo de barra ('estandar' o 'desperdicio').
             piezas_cortadas: Lista de diccionarios que representan las piezas cortadas.
                 Cada pieza tiene formato {'id_pedido': id, 'longitud_pieza': longitud, 'cantidad_pieza_en_patron': cantidad}
                 Si no se proporciona, se inicializa como una lista vacía.
+            en_milimetros: Si las longitudes del patrón están en milímetros enteros
+                (modo de aritmética entera). Por defecto, en metros.
         """
+        self.en_milimetros = en_milimetros
         self.origen_barra_longitud = origen_barra_longitud
         self.origen_barra_tipo = origen_barra_tipo
         self.piezas_cortadas = piezas_cortadas or []
@@ -52,8 +69,25 @@ class Patron:
             for pieza in self.piezas_cortadas
         )
         
-        self.desperdicio_patron_longitud = round(self.origen_barra_longitud - longitud_total_utilizada, 3)
-        self.es_desperdicio_utilizable = self.desperdicio_patron_longitud >= LONGITUD_MINIMA_DESPERDICIO_UTILIZABLE
+        self._asignar_desperdicio(self.origen_barra_longitud - longitud_total_utilizada)
+    
+    def _asignar_desperdicio(self, desperdicio: Union[int, float]) -> None:
+        """
+        Registra el desperdicio calculado y su clasificación como utilizable.
+        
+        En milímetros enteros el resultado es exacto y se compara con el umbral
+        en milímetros; en metros se redondea a 3 decimales para absorber el
+        error de punto flotante.
+        
+        Args:
+            desperdicio: Longitud de la barra origen menos la longitud utilizada.
+        """
+        if self.en_milimetros:
+            self.desperdicio_patron_longitud = int(desperdicio)
+            self.es_desperdicio_utilizable = desperdicio >= LONGITUD_MINIMA_DESPERDICIO_UTILIZABLE_MM
+        else:
+            self.desperdicio_patron_longitud = round(desperdicio, 3)
+            self.es_desperdicio_utilizable = self.desperdicio_patron_longitud >= LONGITUD_MINIMA_DESPERDICIO_UTILIZABLE
     
     def agregar_pieza(self, id_pedido: Any, longitud_pieza: float, cantidad: int = 1) -> bool:
         """
@@ -83,6 +117,36 @@ class Patron:
         self._calcular_desperdicio()
         return True
     
+    def copiar(self) -> 'Patron':
+        """
+        Crea una copia independiente del patrón, sin propietario.
+        
+        Se copian la lista de piezas y cada diccionario de pieza, ya que los
+        operadores de mutación modifican las cantidades en el lugar.
+        
+        Returns:
+            Patron: Nuevo patrón con las mismas piezas y el mismo desperdicio.
+        """
+        copia = copy(self)
+        copia.piezas_cortadas = [dict(pieza) for pieza in self.piezas_cortadas]
+        copia._propietario = None
+        return copia
+    
+    def obtener_conteos_piezas(self) -> List[Tuple[Tuple[Any, float], int]]:
+        """
+        Retorna las piezas del patrón como pares (clave, cantidad).
+
+        La clave es la tupla (id_pedido, longitud_pieza). Permite a los cálculos
+        agregados recorrer las piezas sin depender de la representación interna.
+
+        Returns:
+            List[Tuple]: Lista de pares ((id_pedido, longitud_pieza), cantidad).
+        """
+        return [
+            ((pieza['id_pedido'], pieza['longitud_pieza']), pieza['cantidad_pieza_en_patron'])
+            for pieza in self.piezas_cortadas
+        ]
+
     def obtener_longitud_utilizada(self) -> float:
         """
         Retorna la longitud total utilizada por todas las piezas en el patrón.
@@ -117,23 +181,144 @@ class Patron:
         return self.__str__()
 
 
+class ResumenCromosoma:
+    """
+    Agregados de un cromosoma que usa la función de fitness.
+    
+    Reúne el conteo de piezas por (id_pedido, longitud_pieza), el desperdicio
+    total, el número de barras estándar y la longitud de desperdicios
+    reutilizados. Se actualiza patrón a patrón, de modo que un operador que
+    modifica uno o dos patrones no obliga a recorrer todo el cromosoma.
+    
+    Las longitudes se acumulan en milímetros enteros: el resultado de las
+    actualizaciones incrementales es idéntico al de un recálculo completo.
+    """
+    
+    def __init__(self):
+        """Inicializa un resumen vacío."""
+        self.conteos_piezas: Dict[Tuple[Any, float], int] = {}
+        self.desperdicio_mm = 0
+        self.num_barras_estandar = 0
+        self.longitud_desperdicios_usados_mm = 0
+    
+    @classmethod
+    def desde_patrones(cls, patrones: List[Patron]) -> 'ResumenCromosoma':
+        """
+        Calcula el resumen completo de una lista de patrones.
+        
+        Args:
+            patrones: Patrones del cromosoma.
+        
+        Returns:
+            ResumenCromosoma: Resumen con la contribución de todos los patrones.
+        """
+        resumen = cls()
+        for patron in patrones:
+            resumen.agregar_patron(patron)
+        return resumen
+    
+    def agregar_patron(self, patron: Patron) -> None:
+        """Suma al resumen la contribución de un patrón."""
+        self._acumular(patron, 1)
+    
+    def retirar_patron(self, patron: Patron) -> None:
+        """Resta del resumen la contribución de un patrón."""
+        self._acumular(patron, -1)
+    
+    def _acumular(self, patron: Patron, signo: int) -> None:
+        """Suma (signo 1) o resta (signo -1) la contribución de un patrón."""
+        conteos = self.conteos_piezas
+        for clave, cantidad in patron.obtener_conteos_piezas():
+            total = conteos.get(clave, 0) + signo * cantidad
+            if total:
+                conteos[clave] = total
+            else:
+                conteos.pop(clave, None)
+        
+        self.desperdicio_mm += signo * a_milimetros(patron.desperdicio_patron_longitud, patron.en_milimetros)
+        if patron.origen_barra_tipo == 'estandar':
+            self.num_barras_estandar += signo
+        elif patron.origen_barra_tipo == 'desperdicio':
+            self.longitud_desperdicios_usados_mm += signo * a_milimetros(patron.origen_barra_longitud, patron.en_milimetros)
+    
+    def desperdicio_total_metros(self) -> float:
+        """Retorna el desperdicio total en metros."""
+        return milimetros_a_metros(self.desperdicio_mm)
+    
+    def longitud_desperdicios_usados_metros(self) -> float:
+        """Retorna la longitud total de desperdicios reutilizados en metros."""
+        return milimetros_a_metros(self.longitud_desperdicios_usados_mm)
+    
+    def copiar(self) -> 'ResumenCromosoma':
+        """Crea una copia independiente del resumen."""
+        copia = copy(self)
+        copia.conteos_piezas = dict(self.conteos_piezas)
+        return copia
+
+
 class Cromosoma:
     """
     Representa una solución completa al problema de corte de acero para un subproblema específico.
     
     Un cromosoma contiene una lista de patrones de corte que, en conjunto, deben satisfacer
     la demanda de piezas requeridas para un número de barra y grupo de ejecución específicos.
+    
+    Los patrones se comparten entre un cromosoma y sus clones (copia en escritura):
+    clonar solo copia la lista, y un patrón se duplica la primera vez que se
+    modifica a través de patron_mutable() o editar_patron().
+    
+    El cromosoma guarda en caché su ResumenCromosoma. Los métodos que editan
+    patrones (editar_patron, reemplazar_patron, insertar_patron, eliminar_patron,
+    agregar_patron) lo actualizan de forma incremental; cualquier otra
+    modificación de la lista `patrones` debe seguirse de invalidar_resumen().
     """
     
-    def __init__(self, patrones: Optional[List[Patron]] = None):
+    def __init__(self, patrones: Optional[List[Patron]] = None, resumen: Optional[ResumenCromosoma] = None):
         """
         Inicializa un nuevo cromosoma.
         
         Args:
             patrones: Lista de objetos Patron que conforman la solución.
                 Si no se proporciona, se inicializa como una lista vacía.
+            resumen: Resumen ya calculado para estos patrones, si se conoce. El
+                cromosoma pasa a ser su dueño.
         """
         self.patrones = patrones or []
+        self._resumen = resumen
+        self._token_propiedad = object()
+    
+    @property
+    def patrones(self) -> List[Patron]:
+        """Lista de patrones del cromosoma."""
+        return self._patrones
+    
+    @patrones.setter
+    def patrones(self, patrones: List[Patron]) -> None:
+        """Reemplaza la lista de patrones e invalida el resumen."""
+        self._patrones = patrones
+        self._resumen = None
+    
+    def obtener_resumen(self) -> ResumenCromosoma:
+        """
+        Retorna el resumen de piezas, desperdicio y barras del cromosoma.
+        
+        Se calcula completo la primera vez y luego se mantiene de forma incremental.
+        
+        Returns:
+            ResumenCromosoma: Resumen actual del cromosoma (no debe modificarse).
+        """
+        if self._resumen is None:
+            self._resumen = ResumenCromosoma.desde_patrones(self._patrones)
+        return self._resumen
+    
+    @property
+    def resumen_en_cache(self) -> Optional[ResumenCromosoma]:
+        """Resumen ya calculado, o None si aún no se ha calculado."""
+        return self._resumen
+    
+    def invalidar_resumen(self) -> None:
+        """Descarta el resumen en caché tras modificar los patrones directamente."""
+        self._resumen = None
     
     def agregar_patron(self, patron: Patron) -> None:
         """
@@ -142,7 +327,49 @@ class Cromosoma:
         Args:
             patron: Objeto Patron a agregar.
         """
-        self.patrones.append(patron)
+        self._patrones.append(patron)
+        if self._resumen is not None:
+            self._resumen.agregar_patron(patron)
+    
+    def insertar_patron(self, indice: int, patron: Patron) -> None:
+        """
+        Inserta un patrón en la posición indicada.
+        
+        Args:
+            indice: Posición donde insertar el patrón.
+            patron: Objeto Patron a insertar.
+        """
+        self._patrones.insert(indice, patron)
+        if self._resumen is not None:
+            self._resumen.agregar_patron(patron)
+    
+    def reemplazar_patron(self, indice: int, patron: Patron) -> None:
+        """
+        Reemplaza el patrón de la posición indicada.
+        
+        Args:
+            indice: Posición del patrón a reemplazar.
+            patron: Nuevo objeto Patron.
+        """
+        if self._resumen is not None:
+            self._resumen.retirar_patron(self._patrones[indice])
+            self._resumen.agregar_patron(patron)
+        self._patrones[indice] = patron
+    
+    def eliminar_patron(self, indice: int) -> Patron:
+        """
+        Elimina y retorna el patrón de la posición indicada.
+        
+        Args:
+            indice: Posición del patrón a eliminar.
+        
+        Returns:
+            Patron: El patrón eliminado.
+        """
+        patron = self._patrones.pop(indice)
+        if self._resumen is not None:
+            self._resumen.retirar_patron(patron)
+        return patron
     
     def calcular_desperdicio_total(self) -> float:
         """
@@ -197,14 +424,84 @@ class Cromosoma:
             if patron.origen_barra_tipo == 'desperdicio'
         )
     
+    def _patron_propio(self, indice: int) -> Patron:
+        """Retorna el patrón de la posición indicada, copiándolo si está compartido."""
+        patron = self._patrones[indice]
+        if patron._propietario is not self._token_propiedad:
+            patron = patron.copiar()
+            patron._propietario = self._token_propiedad
+            self._patrones[indice] = patron
+        return patron
+    
+    def patron_mutable(self, indice: int) -> Patron:
+        """
+        Retorna el patrón en la posición indicada listo para modificarse en el lugar.
+        
+        Si el patrón puede estar compartido con otro cromosoma, se reemplaza por
+        una copia propia antes de devolverlo; las siguientes llamadas sobre la
+        misma posición no vuelven a copiarlo. Invalida el resumen en caché; para
+        mantenerlo de forma incremental use editar_patron().
+        
+        Args:
+            indice: Posición del patrón en el cromosoma.
+        
+        Returns:
+            Patron: Patrón propiedad exclusiva de este cromosoma.
+        """
+        self._resumen = None
+        return self._patron_propio(indice)
+    
+    @contextmanager
+    def editar_patron(self, indice: int) -> Iterator[Patron]:
+        """
+        Permite modificar un patrón manteniendo actualizado el resumen.
+        
+        Al entrar se resta la contribución del patrón y al salir se suma la del
+        patrón modificado, cuyo desperdicio debe haberse recalculado. El costo es
+        proporcional a las piezas del patrón, no al tamaño del cromosoma.
+        
+        Args:
+            indice: Posición del patrón en el cromosoma.
+        
+        Yields:
+            Patron: Patrón propiedad exclusiva de este cromosoma.
+        """
+        patron = self._patron_propio(indice)
+        resumen = self._resumen
+        if resumen is not None:
+            resumen.retirar_patron(patron)
+        try:
+            yield patron
+        finally:
+            if resumen is not None and self._resumen is resumen:
+                resumen.agregar_patron(patron)
+    
+    def compartir_patrones(self) -> List[Patron]:
+        """
+        Retorna una copia de la lista de patrones para compartirlos con otro cromosoma.
+        
+        El cromosoma renuncia a la propiedad de todos sus patrones, de modo que
+        cualquier modificación posterior, en él o en quien los reciba, copie
+        primero el patrón afectado.
+        
+        Returns:
+            List[Patron]: Nueva lista con los mismos objetos Patron.
+        """
+        self._token_propiedad = object()
+        return list(self._patrones)
+    
     def clonar(self) -> 'Cromosoma':
         """
-        Crea una copia profunda del cromosoma.
+        Crea una copia del cromosoma que comparte los patrones (copia en escritura).
+        
+        El costo es proporcional al número de patrones y no al de piezas; cada
+        patrón se copia solo cuando alguno de los dos cromosomas lo modifica.
         
         Returns:
-            Cromosoma: Una nueva instancia que es copia del cromosoma actual.
+            Cromosoma: Una nueva instancia equivalente al cromosoma actual.
         """
-        return deepcopy(self)
+        resumen = self._resumen.copiar() if self._resumen is not None else None
+        return Cromosoma(self.compartir_patrones(), resumen)
     
     def __len__(self) -> int:
         """Retorna el número de patrones en el cromosoma."""
@@ -212,7 +509,7 @@ class Cromosoma:
     
     def __str__(self) -> str:
         """Representación en string del cromosoma."""
-        return f"Cromosoma con {len(self.patrones)} patrones, desperdicio total: {self.calcular_desperdicio_total():.2f}m"
+        return f"Cromosoma con {len(self.patrones)} patrones, desperdicio total: {self.obtener_resumen().desperdicio_total_metros():.2f}m"
     
     def __repr__(self) -> str:
         """Representación detallada del cromosoma."""
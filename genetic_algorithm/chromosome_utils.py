@@ -6,15 +6,19 @@ cromosomas y patrones de corte.
 """
 
 from typing import List, Dict, Any, Tuple, Union, Set
+import hashlib
+import numbers
 import pandas as pd
 from copy import deepcopy
 
 from .chromosome import Patron, Cromosoma
+from .units import en_unidades_de
 from . import LONGITUD_MINIMA_DESPERDICIO_UTILIZABLE
 
 
 def crear_patron_corte(origen_longitud: float, origen_tipo: str, 
-                       lista_piezas_a_cortar_en_patron: List[Dict[str, Any]]) -> Patron:
+                       lista_piezas_a_cortar_en_patron: List[Dict[str, Any]],
+                       en_milimetros: bool = False) -> Patron:
     """
     Crea un patrón de corte a partir de los parámetros especificados.
     
@@ -23,6 +27,7 @@ def crear_patron_corte(origen_longitud: float, origen_tipo: str,
         origen_tipo: Tipo de barra ('estandar' o 'desperdicio').
         lista_piezas_a_cortar_en_patron: Lista de piezas a incluir en el patrón.
             Cada pieza es un diccionario con 'id_pedido', 'longitud_pieza' y 'cantidad_pieza_en_patron'.
+        en_milimetros: Si las longitudes están en milímetros enteros.
     
     Returns:
         Patron: Un nuevo objeto Patron con las piezas especificadas.
@@ -46,7 +51,7 @@ def crear_patron_corte(origen_longitud: float, origen_tipo: str,
         )
     
     # Crear y retornar el nuevo patrón
-    return Patron(origen_longitud, origen_tipo, piezas_copia)
+    return Patron(origen_longitud, origen_tipo, piezas_copia, en_milimetros=en_milimetros)
 
 
 def validar_patron(patron: Patron, longitud_minima_desperdicio: float = LONGITUD_MINIMA_DESPERDICIO_UTILIZABLE) -> bool:
@@ -79,7 +84,8 @@ def validar_patron(patron: Patron, longitud_minima_desperdicio: float = LONGITUD
         return False
     
     # Verificar la clasificación correcta del desperdicio como utilizable
-    es_utilizable_esperado = desperdicio_esperado >= longitud_minima_desperdicio
+    # (el umbral se expresa en metros y se lleva a la unidad del patrón)
+    es_utilizable_esperado = desperdicio_esperado >= en_unidades_de(longitud_minima_desperdicio, patron.en_milimetros)
     if es_utilizable_esperado != patron.es_desperdicio_utilizable:
         return False
     
@@ -100,12 +106,7 @@ def calcular_sumario_piezas_en_cromosoma(cromosoma: Cromosoma) -> Dict[Tuple[Any
     sumario: Dict[Tuple[Any, float], int] = {}
     
     for patron in cromosoma.patrones:
-        for pieza in patron.piezas_cortadas:
-            id_pedido = pieza['id_pedido']
-            longitud = pieza['longitud_pieza']
-            cantidad = pieza['cantidad_pieza_en_patron']
-            
-            clave = (id_pedido, longitud)
+        for clave, cantidad in patron.obtener_conteos_piezas():
             if clave in sumario:
                 sumario[clave] += cantidad
             else:
@@ -114,6 +115,54 @@ def calcular_sumario_piezas_en_cromosoma(cromosoma: Cromosoma) -> Dict[Tuple[Any
     return sumario
 
 
+def _normalizar_valor_firma(valor: Any) -> str:
+    """
+    Representa un valor de forma estable para la firma canónica.
+    
+    Los escalares de NumPy y de Python con el mismo valor producen la misma
+    representación; los flotantes se redondean para absorber el error de redondeo.
+    """
+    if isinstance(valor, numbers.Integral) and not isinstance(valor, bool):
+        return str(int(valor))
+    if isinstance(valor, numbers.Real):
+        return repr(round(float(valor), 6))
+    return repr(str(valor))
+
+
+def calcular_firma_canonica(cromosoma: Cromosoma) -> str:
+    """
+    Calcula una firma del cromosoma que no depende del orden de sus patrones.
+    
+    Cada patrón se describe por su barra de origen y sus piezas agregadas y
+    ordenadas; las descripciones se ordenan antes de aplicar el hash. Dos
+    cromosomas con la misma firma tienen el mismo fitness.
+    
+    Args:
+        cromosoma: Cromosoma a firmar.
+    
+    Returns:
+        str: Resumen hexadecimal (BLAKE2b) de la forma canónica del cromosoma.
+    """
+    descripciones_patrones = []
+    for patron in cromosoma.patrones:
+        piezas: Dict[Tuple[str, str], int] = {}
+        for (id_pedido, longitud), cantidad in patron.obtener_conteos_piezas():
+            clave = (_normalizar_valor_firma(id_pedido), _normalizar_valor_firma(longitud))
+            piezas[clave] = piezas.get(clave, 0) + int(cantidad)
+        
+        piezas_str = ','.join(
+            f"{id_pedido}:{longitud}x{cantidad}"
+            for (id_pedido, longitud), cantidad in sorted(piezas.items())
+            if cantidad
+        )
+        descripciones_patrones.append(
+            f"{patron.origen_barra_tipo}|{_normalizar_valor_firma(patron.origen_barra_longitud)}|{piezas_str}"
+        )
+    
+    forma_canonica = ';'.join(sorted(descripciones_patrones))
+    return hashlib.blake2b(forma_canonica.encode('utf-8'), digest_size=16).hexdigest()
+
+
 def validar_cromosoma_completitud(cromosoma: Cromosoma, piezas_requeridas_df: pd.DataFrame) -> Tuple[bool, Dict[str, Any]]:
     """
     Verifica si un cromosoma satisface exactamente la demanda especificada.
@@ -238,7 +287,8 @@ def crear_cromosoma_desde_dict(datos_cromosoma: List[Dict[str, Any]], longitud_m
     
     Args:
         datos_cromosoma: Lista de diccionarios, cada uno representando un patrón.
-            Cada patrón debe tener 'origen_barra_longitud', 'origen_barra_tipo' y 'piezas_cortadas'.
+            Cada patrón debe tener 'origen_barra_longitud', 'origen_barra_tipo' y 'piezas_cortadas';
+            'en_milimetros' es opcional (por defecto, longitudes en metros).
         longitud_minima_desperdicio: Longitud mínima para considerar un desperdicio utilizable.
     
     Returns:
@@ -251,7 +301,10 @@ def crear_cromosoma_desde_dict(datos_cromosoma: List[Dict[str, Any]], longitud_m
         origen_tipo = datos_patron['origen_barra_tipo']
         piezas_cortadas = datos_patron['piezas_cortadas']
         
-        patron = Patron(origen_longitud, origen_tipo, piezas_cortadas)
+        patron = Patron(
+            origen_longitud, origen_tipo, piezas_cortadas,
+            en_milimetros=datos_patron.get('en_milimetros', False)
+        )
         patrones.append(patron)
     
     return Cromosoma(patrones)
@@ -277,7 +330,8 @@ def convertir_cromosoma_a_dict(cromosoma: Cromosoma) -> List[Dict[str, Any]]:
             'origen_barra_tipo': patron.origen_barra_tipo,
             'piezas_cortadas': deepcopy(patron.piezas_cortadas),
             'desperdicio_patron_longitud': patron.desperdicio_patron_longitud,
-            'es_desperdicio_utilizable': patron.es_desperdicio_utilizable
+            'es_desperdicio_utilizable': patron.es_desperdicio_utilizable,
+            'en_milimetros': patron.en_milimetros
         }
         result.append(patron_dict)
     
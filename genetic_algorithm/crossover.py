@@ -6,7 +6,6 @@ cromosomas padres y generar descendencia.
 """
 
 import random
-import copy
 from typing import List, Dict, Any, Optional, Tuple
 import pandas as pd
 
@@ -33,26 +32,30 @@ def cruce_un_punto(
     """
     # Si algún padre está vacío, retornar copias de los padres
     if len(padre1.patrones) == 0 or len(padre2.patrones) == 0:
-        return copy.deepcopy(padre1), copy.deepcopy(padre2)
+        return padre1.clonar(), padre2.clonar()
     
     # Determinar punto de cruce para cada padre
     punto_cruce_1 = random.randint(1, len(padre1.patrones))
     punto_cruce_2 = random.randint(1, len(padre2.patrones))
     
+    # Los hijos comparten los patrones de los padres (copia en escritura)
+    patrones_padre1 = padre1.compartir_patrones()
+    patrones_padre2 = padre2.compartir_patrones()
+    
     # Crear hijos combinando segmentos de los padres
     patrones_hijo1 = (
-        padre1.patrones[:punto_cruce_1] + 
-        padre2.patrones[punto_cruce_2:]
+        patrones_padre1[:punto_cruce_1] + 
+        patrones_padre2[punto_cruce_2:]
     )
     
     patrones_hijo2 = (
-        padre2.patrones[:punto_cruce_2] + 
-        padre1.patrones[punto_cruce_1:]
+        patrones_padre2[:punto_cruce_2] + 
+        patrones_padre1[punto_cruce_1:]
     )
     
     # Crear cromosomas hijos
-    hijo1 = Cromosoma(copy.deepcopy(patrones_hijo1))
-    hijo2 = Cromosoma(copy.deepcopy(patrones_hijo2))
+    hijo1 = Cromosoma(patrones_hijo1)
+    hijo2 = Cromosoma(patrones_hijo2)
     
     return hijo1, hijo2
 
@@ -75,7 +78,7 @@ def cruce_dos_puntos(
     """
     # Si algún padre está vacío, retornar copias de los padres
     if len(padre1.patrones) == 0 or len(padre2.patrones) == 0:
-        return copy.deepcopy(padre1), copy.deepcopy(padre2)
+        return padre1.clonar(), padre2.clonar()
     
     # Determinar puntos de cruce para cada padre
     len1, len2 = len(padre1.patrones), len(padre2.patrones)
@@ -94,22 +97,26 @@ def cruce_dos_puntos(
     else:
         punto1_2, punto2_2 = 0, 1
     
+    # Los hijos comparten los patrones de los padres (copia en escritura)
+    patrones_padre1 = padre1.compartir_patrones()
+    patrones_padre2 = padre2.compartir_patrones()
+    
     # Crear hijos intercambiando segmentos centrales
     patrones_hijo1 = (
-        padre1.patrones[:punto1_1] + 
-        padre2.patrones[punto1_2:punto2_2] + 
-        padre1.patrones[punto2_1:]
+        patrones_padre1[:punto1_1] + 
+        patrones_padre2[punto1_2:punto2_2] + 
+        patrones_padre1[punto2_1:]
     )
     
     patrones_hijo2 = (
-        padre2.patrones[:punto1_2] + 
-        padre1.patrones[punto1_1:punto2_1] + 
-        padre2.patrones[punto2_2:]
+        patrones_padre2[:punto1_2] + 
+        patrones_padre1[punto1_1:punto2_1] + 
+        patrones_padre2[punto2_2:]
     )
     
     # Crear cromosomas hijos
-    hijo1 = Cromosoma(copy.deepcopy(patrones_hijo1))
-    hijo2 = Cromosoma(copy.deepcopy(patrones_hijo2))
+    hijo1 = Cromosoma(patrones_hijo1)
+    hijo2 = Cromosoma(patrones_hijo2)
     
     return hijo1, hijo2
 
@@ -142,7 +149,8 @@ def cruce_basado_en_piezas(
     # Analizar qué piezas satisface cada patrón en cada padre
     def analizar_patrones(cromosoma):
         patrones_info = []
-        for i, patron in enumerate(cromosoma.patrones):
+        # Los patrones seleccionados se comparten con los hijos (copia en escritura)
+        for i, patron in enumerate(cromosoma.compartir_patrones()):
             piezas_en_patron = set()
             for pieza_info in patron.piezas_cortadas:
                 clave = (pieza_info['id_pedido'], pieza_info['longitud_pieza'])
@@ -181,7 +189,7 @@ def cruce_basado_en_piezas(
             
             if piezas_nuevas or len(patrones_seleccionados) < 2:
                 # Añadir el patrón
-                patrones_seleccionados.append(copy.deepcopy(info['patron']))
+                patrones_seleccionados.append(info['patron'])
                 piezas_cubiertas.update(info['piezas'])
                 
                 # Limitar el número de patrones para evitar cromosomas muy grandes
@@ -303,7 +311,7 @@ def cruzar(
     # Decidir si realizar el cruce basándose en la tasa de cruce
     if random.random() > tasa_cruce:
         # No realizar cruce, retornar copias de los padres
-        return copy.deepcopy(padre1_cromosoma), copy.deepcopy(padre2_cromosoma)
+        return padre1_cromosoma.clonar(), padre2_cromosoma.clonar()
     
     # Realizar el cruce según la estrategia especificada
     if estrategia_cruce == 'un_punto':
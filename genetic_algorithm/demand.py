@@ -0,0 +1,252 @@
+"""
+Módulo para la representación indexada de la demanda de piezas.
+
+Este módulo define una tabla compartida que asigna a cada tipo de pieza
+requerida, identificado por la clave (id_pedido, longitud), un índice entero
+denso.
+
+DemandaCompilada extiende la tabla con el vector de cantidades requeridas, de
+forma que la función de fitness puede evaluar faltantes y sobrantes con NumPy
+sin recorrer el DataFrame de piezas en cada evaluación.
+
+La tabla registra la unidad de las longitudes (en_milimetros), tomada del
+DataFrame marcado por el adaptador de entrada; los cálculos que la reciben no
+deducen la unidad del tipo de los valores.
+"""
+
+from typing import List, Dict, Any, Tuple, Iterable, Optional, Union
+import numpy as np
+import pandas as pd
+
+from .units import a_metros, longitudes_en_milimetros
+
+
+ClavePieza = Tuple[Any, float]
+
+
+class TablaDemanda:
+    """
+    Tabla compartida de tipos de pieza indexados por enteros.
+
+    Cada clave (id_pedido, longitud_pieza) recibe un índice denso en el orden
+    en que se registra. La tabla crece de forma dinámica si un operador produce
+    una pieza que no estaba registrada, de modo que cualquier patrón puede
+    codificarse sin pérdida de información.
+    """
+
+    def __init__(self, claves: Optional[Iterable[ClavePieza]] = None, en_milimetros: bool = False):
+        """
+        Inicializa la tabla de demanda.
+
+        Args:
+            claves: Claves (id_pedido, longitud_pieza) iniciales, en orden.
+            en_milimetros: Si las longitudes están en milímetros enteros.
+        """
+        self.en_milimetros = en_milimetros
+        self.claves: List[ClavePieza] = []
+        self.longitudes: List[float] = []
+        self._indices: Dict[ClavePieza, int] = {}
+
+        for clave in claves or []:
+            self.obtener_indice(clave[0], clave[1])
+
+    @classmethod
+    def desde_dataframe(cls, piezas_requeridas_df: pd.DataFrame) -> 'TablaDemanda':
+        """
+        Construye la tabla a partir del DataFrame de piezas requeridas.
+
+        Args:
+            piezas_requeridas_df: DataFrame con columnas 'id_pedido' y
+                'longitud_pieza_requerida'.
+
+        Returns:
+            TablaDemanda: Tabla con una entrada por tipo de pieza.
+        """
+        claves = zip(
+            piezas_requeridas_df['id_pedido'].tolist(),
+            piezas_requeridas_df['longitud_pieza_requerida'].tolist()
+        )
+        return cls(claves, en_milimetros=longitudes_en_milimetros(piezas_requeridas_df))
+
+    def obtener_indice(self, id_pedido: Any, longitud_pieza: float) -> int:
+        """
+        Retorna el índice de un tipo de pieza, registrándolo si es nuevo.
+
+        Args:
+            id_pedido: Identificador del pedido.
+            longitud_pieza: Longitud de la pieza.
+
+        Returns:
+            int: Índice denso de la pieza en la tabla.
+        """
+        clave = (id_pedido, longitud_pieza)
+        indice = self._indices.get(clave)
+        if indice is None:
+            indice = len(self.claves)
+            self._indices[clave] = indice
+            self.claves.append(clave)
+            self.longitudes.append(longitud_pieza)
+        return indice
+
+    def buscar_indice(self, id_pedido: Any, longitud_pieza: float) -> Optional[int]:
+        """
+        Busca el índice de un tipo de pieza sin registrarlo.
+
+        Args:
+            id_pedido: Identificador del pedido.
+            longitud_pieza: Longitud de la pieza.
+
+        Returns:
+            Optional[int]: Índice de la pieza o None si no está registrada.
+        """
+        return self._indices.get((id_pedido, longitud_pieza))
+
+    def obtener_clave(self, indice: int) -> ClavePieza:
+        """
+        Retorna la clave (id_pedido, longitud_pieza) asociada a un índice.
+
+        Args:
+            indice: Índice denso de la pieza.
+
+        Returns:
+            Tuple: Clave de la pieza.
+        """
+        return self.claves[indice]
+
+    def __len__(self) -> int:
+        """Retorna el número de tipos de pieza registrados."""
+        return len(self.claves)
+
+    def __contains__(self, clave: ClavePieza) -> bool:
+        """Indica si una clave (id_pedido, longitud_pieza) está registrada."""
+        return clave in self._indices
+
+
+class DemandaCompilada(TablaDemanda):
+    """
+    Demanda de piezas precompilada para la evaluación de fitness.
+
+    Se construye una vez por ejecución del AG a partir del DataFrame de piezas.
+    Los primeros `num_tipos_demandados` índices de la tabla corresponden a las
+    piezas requeridas; cualquier índice posterior, registrado dinámicamente,
+    representa una pieza que no forma parte de la demanda.
+    """
+
+    def __init__(self, claves: Iterable[ClavePieza], cantidades: Iterable[int], en_milimetros: bool = False):
+        """
+        Compila la demanda a partir de claves y cantidades alineadas.
+
+        Las claves repetidas acumulan su cantidad en un único índice.
+
+        Args:
+            claves: Claves (id_pedido, longitud_pieza) de las piezas requeridas.
+            cantidades: Cantidad requerida de cada clave.
+            en_milimetros: Si las longitudes están en milímetros enteros.
+        """
+        super().__init__(en_milimetros=en_milimetros)
+
+        cantidades_por_indice: List[int] = []
+        for (id_pedido, longitud), cantidad in zip(claves, cantidades):
+            indice = self.obtener_indice(id_pedido, longitud)
+            if indice == len(cantidades_por_indice):
+                cantidades_por_indice.append(int(cantidad))
+            else:
+                cantidades_por_indice[indice] += int(cantidad)
+
+        self.num_tipos_demandados = len(cantidades_por_indice)
+        self.cantidades_requeridas = np.array(cantidades_por_indice, dtype=np.int64)
+        self.longitudes_metros = np.array(
+            [a_metros(longitud, en_milimetros) for longitud in self.longitudes],
+            dtype=np.float64
+        )
+
+    @classmethod
+    def desde_dataframe(cls, piezas_requeridas_df: pd.DataFrame) -> 'DemandaCompilada':
+        """
+        Compila la demanda a partir del DataFrame de piezas requeridas.
+
+        Args:
+            piezas_requeridas_df: DataFrame con columnas 'id_pedido',
+                'longitud_pieza_requerida' y 'cantidad_requerida'.
+
+        Returns:
+            DemandaCompilada: Demanda indexada lista para evaluar fitness.
+        """
+        claves = zip(
+            piezas_requeridas_df['id_pedido'].tolist(),
+            piezas_requeridas_df['longitud_pieza_requerida'].tolist()
+        )
+        return cls(
+            claves,
+            piezas_requeridas_df['cantidad_requerida'].tolist(),
+            en_milimetros=longitudes_en_milimetros(piezas_requeridas_df)
+        )
+
+    def vectorizar_sumario(self, sumario_piezas: Dict[ClavePieza, int]) -> Tuple[np.ndarray, float]:
+        """
+        Convierte un sumario de piezas en un vector de conteos alineado con la demanda.
+
+        Args:
+            sumario_piezas: Diccionario (id_pedido, longitud_pieza) -> cantidad.
+
+        Returns:
+            Tuple[np.ndarray, float]: Conteos por índice demandado y longitud total,
+                en metros, de las piezas que no forman parte de la demanda.
+        """
+        conteos = np.zeros(self.num_tipos_demandados, dtype=np.int64)
+        longitud_no_demandada = 0.0
+
+        for clave, cantidad in sumario_piezas.items():
+            indice = self._indices.get(clave)
+            if indice is not None and indice < self.num_tipos_demandados:
+                conteos[indice] += cantidad
+            else:
+                longitud_no_demandada += cantidad * a_metros(clave[1], self.en_milimetros)
+
+        return conteos, longitud_no_demandada
+
+    def calcular_longitud_faltante(self, conteos: np.ndarray) -> Union[float, np.ndarray]:
+        """
+        Calcula la longitud, en metros, de las piezas requeridas que faltan.
+
+        Args:
+            conteos: Vector de conteos (o matriz con un individuo por fila).
+
+        Returns:
+            Longitud faltante total (un valor por fila si se pasa una matriz).
+        """
+        faltantes = np.maximum(self.cantidades_requeridas - conteos, 0)
+        return (faltantes * self.longitudes_metros[:self.num_tipos_demandados]).sum(axis=-1)
+
+    def calcular_longitud_sobrante(
+        self,
+        conteos: np.ndarray,
+        longitud_no_demandada: Union[float, np.ndarray] = 0.0
+    ) -> Union[float, np.ndarray]:
+        """
+        Calcula la longitud, en metros, de las piezas producidas en exceso.
+
+        Args:
+            conteos: Vector de conteos (o matriz con un individuo por fila).
+            longitud_no_demandada: Longitud de piezas que no forman parte de la demanda.
+
+        Returns:
+            Longitud sobrante total (un valor por fila si se pasa una matriz).
+        """
+        sobrantes = np.maximum(conteos - self.cantidades_requeridas, 0)
+        return (sobrantes * self.longitudes_metros[:self.num_tipos_demandados]).sum(axis=-1) + longitud_no_demandada
+
+
+def compilar_demanda(piezas_requeridas: Union[pd.DataFrame, DemandaCompilada]) -> DemandaCompilada:
+    """
+    Retorna la demanda compilada, construyéndola desde el DataFrame si es necesario.
+
+    Args:
+        piezas_requeridas: DataFrame de piezas requeridas o una demanda ya compilada.
+
+    Returns:
+        DemandaCompilada: Demanda lista para evaluar fitness.
+    """
+    if isinstance(piezas_requeridas, DemandaCompilada):
+        return piezas_requeridas
+    return DemandaCompilada.desde_dataframe(piezas_requeridas)
@@ -7,24 +7,54 @@ todos los operadores y gestiona el ciclo evolutivo completo.
 
 import time
 import random
+from concurrent.futures import wait, FIRST_COMPLETED
 from typing import List, Dict, Any, Optional, Tuple
 import pandas as pd
 
 from .chromosome import Cromosoma
+from .chromosome_utils import calcular_firma_canonica
+from .demand import DemandaCompilada, compilar_demanda
 from .population import inicializar_poblacion
-from .fitness import calcular_fitness
+from .fitness import calcular_fitness_poblacion, CacheFitness
+from .parallel import EvaluadorParalelo
 from .selection import seleccionar_padres, seleccionar_parejas_para_cruce
 from .crossover import cruzar
 from .mutation import mutar
-from .metrics import RegistroEvolucion, detectar_convergencia
+from .metrics import RegistroEvolucion, CallbackProgreso, detectar_convergencia
+from .lower_bound import calcular_cota_inferior, alcanza_cota_inferior
+from .cancellation import TokenCancelacion
+from .checkpoint import (
+    calcular_clave_problema,
+    capturar_estado_aleatorio,
+    restaurar_estado_aleatorio,
+    guardar_checkpoint,
+    cargar_checkpoint,
+    eliminar_checkpoint
+)
 from . import CONFIG_GA_DEFAULT
 
 
+# Estrategias de reemplazo que insertan cada hijo en cuanto se evalúa
+ESTRATEGIAS_ESTADO_ESTACIONARIO = ('reemplazo_peor', 'reemplazo_torneo')
+
+# Parámetros que no cambian el resultado y pueden variar entre la ejecución y su reanudación
+CLAVES_CONFIG_SIN_EFECTO_EN_CHECKPOINT = (
+    'ruta_checkpoint',
+    'intervalo_checkpoint',
+    'logging_habilitado',
+    'logging_frecuencia',
+    'tiempo_limite_segundos'
+)
+
+
 def ejecutar_algoritmo_genetico(
     piezas_requeridas_df: pd.DataFrame,
     barras_estandar_disponibles: List[Dict[str, Any]],
     desperdicios_reutilizables_previos: List[Dict[str, Any]],
-    config_ga: Optional[Dict[str, Any]] = None
+    config_ga: Optional[Dict[str, Any]] = None,
+    demanda: Optional[DemandaCompilada] = None,
+    callback_progreso: Optional[CallbackProgreso] = None,
+    token_cancelacion: Optional[TokenCancelacion] = None
 ) -> Tuple[Cromosoma, Dict[str, Any]]:
     """
     Ejecuta el algoritmo genético completo para optimizar el corte de acero.
@@ -34,6 +64,21 @@ def ejecutar_algoritmo_genetico(
         barras_estandar_disponibles: Lista de barras estándar disponibles.
         desperdicios_reutilizables_previos: Lista de desperdicios reutilizables.
         config_ga: Configuración del algoritmo genético.
+        demanda: Demanda ya compilada a partir de piezas_requeridas_df. Si no se
+            proporciona, se compila una vez al inicio de la ejecución.
+        callback_progreso: Receptor de un evento por generación con el mejor
+            fitness, el promedio, la diversidad, el tiempo y las evaluaciones por
+            segundo (ver RegistroEvolucion.registrar_generacion).
+        token_cancelacion: Token que se consulta entre generaciones. Si se cancela o
+            supera un límite de recursos, el AG se detiene y retorna el mejor
+            cromosoma encontrado; el resumen indica el 'motivo_cancelacion' y el
+            checkpoint, si lo hay, se conserva para reanudar.
+    
+    Si config_ga define 'ruta_checkpoint', cada 'intervalo_checkpoint' generaciones
+    se guardan la población, el fitness, el registro y el estado aleatorio, y una
+    ejecución posterior del mismo problema continúa desde la última generación
+    guardada. Sin evaluación paralela la reanudación reproduce exactamente la
+    ejecución sin interrumpir. La evolución asíncrona no guarda checkpoints.
     
     Returns:
         Tuple[Cromosoma, Dict]: Mejor cromosoma encontrado y estadísticas de evolución.
@@ -47,8 +92,11 @@ def ejecutar_algoritmo_genetico(
         config_completa.update(config_ga)
         config_ga = config_completa
     
+    if piezas_requeridas_df.empty:
+        raise ValueError("No hay piezas requeridas para optimizar")
+    
     # Inicializar registro de evolución
-    registro = RegistroEvolucion()
+    registro = RegistroEvolucion(callback_progreso)
     registro.iniciar_registro(config_ga)
     
     if config_ga.get('logging_habilitado', True):
@@ -56,152 +104,617 @@ def ejecutar_algoritmo_genetico(
         print(f"Configuración: {config_ga['tamaño_poblacion']} individuos, "
               f"{config_ga['max_generaciones']} generaciones máx.")
     
-    try:
-        # Paso 1: Inicializar población
-        poblacion = inicializar_poblacion(
-            tamaño_poblacion=config_ga['tamaño_poblacion'],
-            piezas_requeridas_df=piezas_requeridas_df,
-            barras_estandar_disponibles=barras_estandar_disponibles,
-            desperdicios_reutilizables_previos=desperdicios_reutilizables_previos,
-            estrategia_inicializacion=config_ga['estrategia_inicializacion'],
-            config_ga=config_ga
+    # Checkpoint: si existe uno del mismo problema, la ejecución se reanuda desde él
+    ruta_checkpoint = config_ga.get('ruta_checkpoint')
+    estado_checkpoint = None
+    if ruta_checkpoint:
+        clave_checkpoint = calcular_clave_problema(
+            piezas_requeridas_df,
+            barras_estandar_disponibles,
+            desperdicios_reutilizables_previos,
+            sorted(
+                (clave, valor) for clave, valor in config_ga.items()
+                if clave not in CLAVES_CONFIG_SIN_EFECTO_EN_CHECKPOINT
+            )
         )
+        estado_checkpoint = cargar_checkpoint(ruta_checkpoint, clave_checkpoint)
+        if estado_checkpoint is not None:
+            registro = estado_checkpoint['registro']
+            registro.callback_progreso = callback_progreso
+            registro.tiempo_inicio = time.time() - estado_checkpoint['tiempo_transcurrido']
+            if config_ga.get('logging_habilitado', True):
+                print(f"Reanudando desde el checkpoint de la generación {estado_checkpoint['generacion']}")
+    
+    evaluador = None
+    try:
+        # Paso 1: Inicializar población (o recuperarla del checkpoint)
+        if estado_checkpoint is not None:
+            poblacion = estado_checkpoint['poblacion']
+        else:
+            poblacion = inicializar_poblacion(
+                tamaño_poblacion=config_ga['tamaño_poblacion'],
+                piezas_requeridas_df=piezas_requeridas_df,
+                barras_estandar_disponibles=barras_estandar_disponibles,
+                desperdicios_reutilizables_previos=desperdicios_reutilizables_previos,
+                estrategia_inicializacion=config_ga['estrategia_inicializacion'],
+                config_ga=config_ga,
+                token_cancelacion=token_cancelacion
+            )
         
-        # Paso 2: Evaluar población inicial
-        valores_fitness = []
-        for cromosoma in poblacion:
-            fitness = calcular_fitness(cromosoma, piezas_requeridas_df)
-            valores_fitness.append(fitness)
+        # Compilar la demanda una sola vez; el fitness no vuelve a recorrer el DataFrame
+        if demanda is None:
+            demanda = compilar_demanda(piezas_requeridas_df)
         
-        # Registrar generación inicial
-        registro.registrar_generacion(0, poblacion, valores_fitness, 0.0)
+        # Cota inferior de Gilmore–Gomory: el AG se detiene en cuanto la alcanza
+        cota_inferior = None
+        if config_ga.get('parada_por_cota_inferior', False):
+            cota_inferior = calcular_cota_inferior(
+                demanda,
+                barras_estandar_disponibles,
+                desperdicios_reutilizables_previos
+            )
+            registro.registrar_cota_inferior(cota_inferior)
         
-        # Paso 3: Bucle evolutivo principal
-        generacion = 1
-        tiempo_inicio_total = time.time()
+        # Caché de fitness por firma canónica, válida solo durante esta ejecución
+        cache = None
+        if config_ga.get('cache_fitness', False):
+            cache = CacheFitness(config_ga.get('tamaño_cache_fitness', 10000))
         
-        while generacion <= config_ga['max_generaciones']:
-            tiempo_inicio_generacion = time.time()
-            
-            # Verificar criterios de parada
-            if verificar_criterios_parada(
-                generacion, 
-                registro.mejor_fitness_por_generacion,
-                tiempo_inicio_total,
+        # Evaluación y descendencia repartidas entre procesos trabajadores. El estado
+        # estacionario síncrono evalúa uno o dos hijos por paso y no usaría el pool
+        estado_estacionario_sincrono = (
+            config_ga.get('estrategia_reemplazo') in ESTRATEGIAS_ESTADO_ESTACIONARIO
+            and not config_ga.get('evolucion_asincrona', False)
+        )
+        if config_ga.get('paralelizar_evaluacion', False) and not estado_estacionario_sincrono:
+            evaluador = EvaluadorParalelo(
+                piezas_requeridas_df,
+                demanda,
+                barras_estandar_disponibles,
+                desperdicios_reutilizables_previos,
                 config_ga
-            ):
-                if config_ga.get('logging_habilitado', True):
-                    print(f"Criterio de parada alcanzado en generación {generacion}")
-                break
-            
-            # Paso 3.1: Selección de padres
-            num_padres = config_ga['tamaño_poblacion']
-            if config_ga['elitismo']:
-                # Reservar espacio para élite
-                num_padres = config_ga['tamaño_poblacion'] - config_ga['tamaño_elite']
+            )
+        
+        if estado_checkpoint is not None:
+            valores_fitness = estado_checkpoint['valores_fitness']
+            generacion_inicial = estado_checkpoint['generacion'] + 1
+            tiempo_bucle_previo = estado_checkpoint['tiempo_bucle']
+            restaurar_estado_aleatorio(estado_checkpoint['estado_aleatorio'])
+        else:
+            # Paso 2: Evaluar población inicial
+            valores_fitness = _evaluar_poblacion(poblacion, demanda, cache, registro, evaluador)
             
-            padres = seleccionar_padres(
-                poblacion=poblacion,
-                valores_fitness=valores_fitness,
-                numero_de_padres_a_seleccionar=num_padres,
-                metodo_seleccion=config_ga['metodo_seleccion'],
-                tamaño_torneo=config_ga['tamaño_torneo']
+            # Registrar generación inicial
+            registro.registrar_generacion(0, poblacion, valores_fitness, 0.0)
+            generacion_inicial = 1
+            tiempo_bucle_previo = 0.0
+        
+        # Paso 3: Bucle evolutivo principal
+        if evaluador is not None and config_ga.get('evolucion_asincrona', False):
+            # Los trabajadores generan y evalúan hijos sin esperar al resto de la generación
+            _evolucionar_asincrono(
+                poblacion,
+                valores_fitness,
+                config_ga,
+                demanda,
+                registro,
+                evaluador,
+                cota_inferior,
+                token_cancelacion
             )
+        else:
+            generacion = generacion_inicial
+            tiempo_inicio_total = time.time() - tiempo_bucle_previo
             
-            # Paso 3.2: Formar parejas y aplicar cruce
-            hijos = []
-            if len(padres) >= 2:
-                parejas = seleccionar_parejas_para_cruce(padres, 'aleatorio')
+            while generacion <= config_ga['max_generaciones']:
+                tiempo_inicio_generacion = time.time()
                 
-                for padre1, padre2 in parejas:
-                    hijo1, hijo2 = cruzar(
-                        padre1_cromosoma=padre1,
-                        padre2_cromosoma=padre2,
-                        piezas_requeridas_df=piezas_requeridas_df,
-                        tasa_cruce=config_ga['tasa_cruce'],
-                        estrategia_cruce=config_ga['estrategia_cruce'],
-                        config_ga={
-                            **config_ga,
-                            'barras_disponibles': barras_estandar_disponibles,
-                            'desperdicios_disponibles': desperdicios_reutilizables_previos
-                        }
-                    )
-                    hijos.extend([hijo1, hijo2])
-            else:
-                # Si hay muy pocos padres, clonar los existentes
-                for padre in padres:
-                    hijos.append(padre.clonar())
-                    if len(hijos) < num_padres:
-                        hijos.append(padre.clonar())
-            
-            # Ajustar número de hijos si es necesario
-            if len(hijos) > num_padres:
-                hijos = hijos[:num_padres]
-            elif len(hijos) < num_padres:
-                # Completar con padres adicionales si es necesario
-                while len(hijos) < num_padres:
-                    hijos.append(random.choice(padres).clonar())
-            
-            # Paso 3.3: Aplicar mutación
-            hijos_mutados = []
-            for hijo in hijos:
-                hijo_mutado = mutar(
-                    cromosoma=hijo,
-                    piezas_requeridas_df=piezas_requeridas_df,
-                    barras_estandar_disponibles=barras_estandar_disponibles,
-                    desperdicios_reutilizables_previos=desperdicios_reutilizables_previos,
-                    tasa_mutacion_individuo=config_ga['tasa_mutacion_individuo'],
-                    tasa_mutacion_gen=config_ga['tasa_mutacion_gen'],
-                    config_ga=config_ga
+                # Verificar criterios de parada
+                if verificar_criterios_parada(
+                    generacion, 
+                    registro.mejor_fitness_por_generacion,
+                    tiempo_inicio_total,
+                    config_ga,
+                    mejor_cromosoma=registro.mejor_cromosoma_global,
+                    demanda=demanda,
+                    cota_inferior=cota_inferior,
+                    token_cancelacion=token_cancelacion
+                ):
+                    if config_ga.get('logging_habilitado', True):
+                        print(f"Criterio de parada alcanzado en generación {generacion}")
+                    break
+                
+                # Pasos 3.1 a 3.5: selección, cruce, mutación, evaluación y reemplazo
+                poblacion, valores_fitness = evolucionar_generacion(
+                    poblacion,
+                    valores_fitness,
+                    piezas_requeridas_df,
+                    barras_estandar_disponibles,
+                    desperdicios_reutilizables_previos,
+                    config_ga,
+                    demanda,
+                    cache,
+                    registro,
+                    evaluador
                 )
-                hijos_mutados.append(hijo_mutado)
-            
-            # Paso 3.4: Evaluar nueva generación
-            valores_fitness_hijos = []
-            for hijo in hijos_mutados:
-                fitness = calcular_fitness(hijo, piezas_requeridas_df)
-                valores_fitness_hijos.append(fitness)
-            
-            # Paso 3.5: Aplicar elitismo y reemplazo generacional
-            nueva_poblacion, nuevos_valores_fitness = aplicar_elitismo_y_reemplazo(
-                poblacion_actual=poblacion,
-                valores_fitness_actual=valores_fitness,
-                poblacion_hijos=hijos_mutados,
-                valores_fitness_hijos=valores_fitness_hijos,
-                config_ga=config_ga
-            )
-            
-            # Actualizar población
-            poblacion = nueva_poblacion
-            valores_fitness = nuevos_valores_fitness
-            
-            # Registrar estadísticas de la generación
-            tiempo_generacion = time.time() - tiempo_inicio_generacion
-            registro.registrar_generacion(generacion, poblacion, valores_fitness, tiempo_generacion)
-            
-            generacion += 1
+                
+                # Registrar estadísticas de la generación
+                tiempo_generacion = time.time() - tiempo_inicio_generacion
+                registro.registrar_generacion(generacion, poblacion, valores_fitness, tiempo_generacion)
+                
+                if ruta_checkpoint and generacion % config_ga.get('intervalo_checkpoint', 10) == 0:
+                    guardar_checkpoint(ruta_checkpoint, clave_checkpoint, {
+                        'generacion': generacion,
+                        'poblacion': poblacion,
+                        'valores_fitness': valores_fitness,
+                        'registro': registro,
+                        'estado_aleatorio': capturar_estado_aleatorio(),
+                        'tiempo_transcurrido': time.time() - registro.tiempo_inicio,
+                        'tiempo_bucle': time.time() - tiempo_inicio_total
+                    })
+                
+                generacion += 1
         
         # Finalizar registro
         registro.finalizar_registro()
+        motivo_cancelacion = token_cancelacion.motivo if token_cancelacion is not None else None
+        
+        # La ejecución terminó: el checkpoint ya no es necesario (salvo para reanudar una cancelada)
+        if ruta_checkpoint and motivo_cancelacion is None:
+            eliminar_checkpoint(ruta_checkpoint)
         
         if config_ga.get('logging_habilitado', True):
+            if motivo_cancelacion is not None:
+                print(f"Algoritmo genético detenido ({motivo_cancelacion})")
             print(f"Algoritmo genético completado en {registro.tiempo_total:.2f} segundos")
             print(f"Mejor fitness: {registro.mejor_fitness_global:.4f}")
         
-        return registro.mejor_cromosoma_global, registro.obtener_resumen()
+        return registro.mejor_cromosoma_global, {
+            **registro.obtener_resumen(),
+            'motivo_cancelacion': motivo_cancelacion
+        }
     
     except Exception as e:
         registro.finalizar_registro()
         if config_ga.get('logging_habilitado', True):
             print(f"Error durante la ejecución del algoritmo genético: {e}")
         raise
+    
+    finally:
+        if evaluador is not None:
+            evaluador.cerrar()
+
+
+def evolucionar_generacion(
+    poblacion: List[Cromosoma],
+    valores_fitness: List[float],
+    piezas_requeridas_df: pd.DataFrame,
+    barras_estandar_disponibles: List[Dict[str, Any]],
+    desperdicios_reutilizables_previos: List[Dict[str, Any]],
+    config_ga: Dict[str, Any],
+    demanda: DemandaCompilada,
+    cache: Optional[CacheFitness],
+    registro: RegistroEvolucion,
+    evaluador: Optional[EvaluadorParalelo] = None
+) -> Tuple[List[Cromosoma], List[float]]:
+    """
+    Produce la siguiente generación: selección, cruce, mutación, evaluación y reemplazo.
+    
+    Con estrategia_reemplazo 'reemplazo_peor' o 'reemplazo_torneo' la generación
+    se recorre en modo de estado estacionario (ver _evolucionar_estado_estacionario).
+    
+    Args:
+        poblacion: Población actual.
+        valores_fitness: Fitness de la población actual.
+        piezas_requeridas_df: DataFrame con las piezas requeridas.
+        barras_estandar_disponibles: Lista de barras estándar disponibles.
+        desperdicios_reutilizables_previos: Lista de desperdicios reutilizables.
+        config_ga: Configuración completa del algoritmo genético.
+        demanda: Demanda compilada de la ejecución.
+        cache: Caché de fitness o None si está deshabilitada.
+        registro: Registro donde se acumulan los contadores de la caché.
+        evaluador: Evaluador paralelo o None para trabajar en el proceso actual.
+    
+    Returns:
+        Tuple[List[Cromosoma], List[float]]: Nueva población y sus valores de fitness.
+    """
+    # Paso 3.1: Selección de padres
+    num_padres = config_ga['tamaño_poblacion']
+    if config_ga['elitismo']:
+        # Reservar espacio para élite
+        num_padres = config_ga['tamaño_poblacion'] - config_ga['tamaño_elite']
+    
+    if config_ga.get('estrategia_reemplazo', 'elitismo') in ESTRATEGIAS_ESTADO_ESTACIONARIO:
+        return _evolucionar_estado_estacionario(
+            poblacion,
+            valores_fitness,
+            max(1, num_padres),
+            piezas_requeridas_df,
+            barras_estandar_disponibles,
+            desperdicios_reutilizables_previos,
+            config_ga,
+            demanda,
+            cache,
+            registro
+        )
+    
+    padres = seleccionar_padres(
+        poblacion=poblacion,
+        valores_fitness=valores_fitness,
+        numero_de_padres_a_seleccionar=num_padres,
+        metodo_seleccion=config_ga['metodo_seleccion'],
+        tamaño_torneo=config_ga['tamaño_torneo']
+    )
+    
+    # Paso 3.2 y 3.3: Cruce, reparación y mutación
+    if evaluador is not None and len(padres) >= 2:
+        parejas = seleccionar_parejas_para_cruce(padres, 'aleatorio')
+        hijos_mutados = evaluador.generar_descendencia(parejas)[:num_padres]
+        if len(hijos_mutados) < num_padres:
+            hijos_mutados.extend(evaluador.mutar([
+                random.choice(padres).clonar()
+                for _ in range(num_padres - len(hijos_mutados))
+            ]))
+    else:
+        hijos_mutados = _generar_descendencia(
+            padres,
+            num_padres,
+            piezas_requeridas_df,
+            barras_estandar_disponibles,
+            desperdicios_reutilizables_previos,
+            config_ga
+        )
+    
+    # Paso 3.4: Evaluar nueva generación
+    valores_fitness_hijos = _evaluar_poblacion(hijos_mutados, demanda, cache, registro, evaluador)
+    
+    # Paso 3.5: Aplicar elitismo y reemplazo generacional
+    nueva_poblacion, nuevos_valores_fitness = aplicar_elitismo_y_reemplazo(
+        poblacion_actual=poblacion,
+        valores_fitness_actual=valores_fitness,
+        poblacion_hijos=hijos_mutados,
+        valores_fitness_hijos=valores_fitness_hijos,
+        config_ga=config_ga
+    )
+    
+    return nueva_poblacion, nuevos_valores_fitness
+
+
+def _evolucionar_asincrono(
+    poblacion: List[Cromosoma],
+    valores_fitness: List[float],
+    config_ga: Dict[str, Any],
+    demanda: DemandaCompilada,
+    registro: RegistroEvolucion,
+    evaluador: EvaluadorParalelo,
+    cota_inferior: Optional[Dict[str, Any]] = None,
+    token_cancelacion: Optional[TokenCancelacion] = None
+) -> None:
+    """
+    Bucle evolutivo asíncrono maestro–trabajador.
+    
+    El proceso principal mantiene hasta dos tareas por trabajador en vuelo; cada
+    tarea cruza, muta y evalúa una pareja de padres. Los hijos se insertan en la
+    población en cuanto llegan, con el reemplazo de estado estacionario
+    configurado ('reemplazo_peor' si estrategia_reemplazo es generacional), y de
+    inmediato se envía una nueva tarea. Cada vez que llegan tantos hijos como en
+    una generación del modo generacional se registra una generación virtual y se
+    verifican los criterios de parada; al terminar, los hijos restantes se
+    registran como una generación parcial. Población y registro se modifican en sitio.
+    
+    Args:
+        poblacion: Población inicial evaluada.
+        valores_fitness: Fitness de la población inicial.
+        config_ga: Configuración completa del algoritmo genético.
+        demanda: Demanda compilada de la ejecución.
+        registro: Registro de evolución de la ejecución.
+        evaluador: Evaluador paralelo cuyos procesos ejecutan las tareas.
+        cota_inferior: Cota inferior para el criterio de parada, o None.
+        token_cancelacion: Token de cancelación que se consulta en cada generación virtual.
+    """
+    config_reemplazo = config_ga
+    if config_ga.get('estrategia_reemplazo') not in ESTRATEGIAS_ESTADO_ESTACIONARIO:
+        config_reemplazo = {**config_ga, 'estrategia_reemplazo': 'reemplazo_peor'}
+    
+    hijos_por_generacion = config_ga['tamaño_poblacion']
+    if config_ga['elitismo']:
+        hijos_por_generacion = max(1, hijos_por_generacion - config_ga['tamaño_elite'])
+    hijos_por_paso = config_ga.get('hijos_por_paso', 2)
+    max_tareas_en_vuelo = 2 * evaluador.num_trabajadores
+    
+    firmas = [calcular_firma_canonica(cromosoma) for cromosoma in poblacion]
+    pendientes = set()
+    hijos_recibidos = 0
+    generacion = 1
+    tiempo_inicio_total = time.time()
+    tiempo_inicio_generacion = tiempo_inicio_total
+    
+    try:
+        while not verificar_criterios_parada(
+            generacion,
+            registro.mejor_fitness_por_generacion,
+            tiempo_inicio_total,
+            config_ga,
+            mejor_cromosoma=registro.mejor_cromosoma_global,
+            demanda=demanda,
+            cota_inferior=cota_inferior,
+            token_cancelacion=token_cancelacion
+        ):
+            while len(pendientes) < max_tareas_en_vuelo:
+                padre1, padre2 = seleccionar_padres(
+                    poblacion=poblacion,
+                    valores_fitness=valores_fitness,
+                    numero_de_padres_a_seleccionar=2,
+                    metodo_seleccion=config_ga['metodo_seleccion'],
+                    tamaño_torneo=config_ga['tamaño_torneo']
+                )
+                pendientes.add(evaluador.enviar_pareja(padre1, padre2))
+            
+            completadas, pendientes = wait(pendientes, return_when=FIRST_COMPLETED)
+            for tarea in completadas:
+                hijos, valores_fitness_hijos = tarea.result()
+                hijos = hijos[:hijos_por_paso]
+                for hijo, fitness_hijo in zip(hijos, valores_fitness_hijos):
+                    aplicar_reemplazo_estado_estacionario(
+                        poblacion, valores_fitness, firmas, hijo, fitness_hijo, config_reemplazo
+                    )
+                hijos_recibidos += len(hijos)
+            
+            # Generación virtual: tantos hijos como una generación del modo generacional
+            if hijos_recibidos >= hijos_por_generacion:
+                registro.registrar_generacion(
+                    generacion, poblacion, valores_fitness, time.time() - tiempo_inicio_generacion
+                )
+                hijos_recibidos -= hijos_por_generacion
+                generacion += 1
+                tiempo_inicio_generacion = time.time()
+        
+        # Los hijos insertados después de la última generación virtual ya están en la
+        # población: se registran como una generación parcial para no perder al mejor
+        if hijos_recibidos > 0:
+            registro.registrar_generacion(
+                generacion, poblacion, valores_fitness, time.time() - tiempo_inicio_generacion
+            )
+        
+        if config_ga.get('logging_habilitado', True):
+            print(f"Criterio de parada alcanzado en generación {generacion}")
+    finally:
+        for tarea in pendientes:
+            tarea.cancel()
+
+
+def _evolucionar_estado_estacionario(
+    poblacion: List[Cromosoma],
+    valores_fitness: List[float],
+    num_hijos: int,
+    piezas_requeridas_df: pd.DataFrame,
+    barras_estandar_disponibles: List[Dict[str, Any]],
+    desperdicios_reutilizables_previos: List[Dict[str, Any]],
+    config_ga: Dict[str, Any],
+    demanda: DemandaCompilada,
+    cache: Optional[CacheFitness],
+    registro: RegistroEvolucion
+) -> Tuple[List[Cromosoma], List[float]]:
+    """
+    Recorre una generación en modo de estado estacionario.
+    
+    En cada paso se seleccionan dos padres, se generan hijos_por_paso hijos con
+    los operadores de cruce y mutación y cada hijo se inserta de inmediato con
+    aplicar_reemplazo_estado_estacionario, de modo que los pasos siguientes ya
+    pueden seleccionarlo. Una generación equivale a num_hijos evaluaciones, igual
+    que en el modo generacional.
+    
+    Args:
+        poblacion: Población actual.
+        valores_fitness: Fitness de la población actual.
+        num_hijos: Hijos a generar y evaluar en esta generación.
+        piezas_requeridas_df: DataFrame con las piezas requeridas.
+        barras_estandar_disponibles: Lista de barras estándar disponibles.
+        desperdicios_reutilizables_previos: Lista de desperdicios reutilizables.
+        config_ga: Configuración completa del algoritmo genético.
+        demanda: Demanda compilada de la ejecución.
+        cache: Caché de fitness o None si está deshabilitada.
+        registro: Registro donde se acumulan los contadores de la caché.
+    
+    Returns:
+        Tuple[List[Cromosoma], List[float]]: Nueva población y sus valores de fitness.
+    """
+    poblacion = list(poblacion)
+    valores_fitness = list(valores_fitness)
+    firmas = [calcular_firma_canonica(cromosoma) for cromosoma in poblacion]
+    hijos_por_paso = config_ga.get('hijos_por_paso', 2)
+    
+    hijos_generados = 0
+    while hijos_generados < num_hijos:
+        num_hijos_paso = min(hijos_por_paso, num_hijos - hijos_generados)
+        padres = seleccionar_padres(
+            poblacion=poblacion,
+            valores_fitness=valores_fitness,
+            numero_de_padres_a_seleccionar=2,
+            metodo_seleccion=config_ga['metodo_seleccion'],
+            tamaño_torneo=config_ga['tamaño_torneo']
+        )
+        hijos = _generar_descendencia(
+            padres,
+            num_hijos_paso,
+            piezas_requeridas_df,
+            barras_estandar_disponibles,
+            desperdicios_reutilizables_previos,
+            config_ga
+        )
+        valores_fitness_hijos = _evaluar_poblacion(hijos, demanda, cache, registro)
+        for hijo, fitness_hijo in zip(hijos, valores_fitness_hijos):
+            aplicar_reemplazo_estado_estacionario(
+                poblacion, valores_fitness, firmas, hijo, fitness_hijo, config_ga
+            )
+        hijos_generados += num_hijos_paso
+    
+    return poblacion, valores_fitness
+
+
+def aplicar_reemplazo_estado_estacionario(
+    poblacion: List[Cromosoma],
+    valores_fitness: List[float],
+    firmas: List[str],
+    hijo: Cromosoma,
+    fitness_hijo: float,
+    config_ga: Dict[str, Any]
+) -> bool:
+    """
+    Inserta un hijo en la población reemplazando a un individuo peor.
+    
+    Con 'reemplazo_peor' compite contra el peor de la población; con
+    'reemplazo_torneo' contra el peor de tamaño_torneo individuos al azar. El hijo
+    solo entra si mejora al individuo elegido y no duplica a otro ya presente, por
+    lo que el mejor individuo nunca se pierde. Las listas se modifican en sitio.
+    
+    Args:
+        poblacion: Población actual.
+        valores_fitness: Fitness de la población actual.
+        firmas: Firmas canónicas de la población actual.
+        hijo: Cromosoma candidato.
+        fitness_hijo: Fitness del candidato.
+        config_ga: Configuración del algoritmo genético.
+    
+    Returns:
+        bool: True si el hijo entró en la población.
+    """
+    if config_ga['estrategia_reemplazo'] == 'reemplazo_torneo':
+        candidatos = random.sample(
+            range(len(poblacion)),
+            min(config_ga.get('tamaño_torneo', 3), len(poblacion))
+        )
+    else:
+        candidatos = range(len(poblacion))
+    indice_reemplazo = max(candidatos, key=lambda i: valores_fitness[i])
+    
+    if fitness_hijo >= valores_fitness[indice_reemplazo]:
+        return False
+    
+    firma_hijo = calcular_firma_canonica(hijo)
+    if firma_hijo in firmas:
+        return False
+    
+    poblacion[indice_reemplazo] = hijo
+    valores_fitness[indice_reemplazo] = fitness_hijo
+    firmas[indice_reemplazo] = firma_hijo
+    return True
+
+
+def _generar_descendencia(
+    padres: List[Cromosoma],
+    num_padres: int,
+    piezas_requeridas_df: pd.DataFrame,
+    barras_estandar_disponibles: List[Dict[str, Any]],
+    desperdicios_reutilizables_previos: List[Dict[str, Any]],
+    config_ga: Dict[str, Any]
+) -> List[Cromosoma]:
+    """
+    Genera num_padres hijos mediante cruce y mutación en el proceso actual.
+    
+    Args:
+        padres: Padres seleccionados.
+        num_padres: Número de hijos a generar.
+        piezas_requeridas_df: DataFrame con las piezas requeridas.
+        barras_estandar_disponibles: Lista de barras estándar disponibles.
+        desperdicios_reutilizables_previos: Lista de desperdicios reutilizables.
+        config_ga: Configuración del algoritmo genético.
+    
+    Returns:
+        List[Cromosoma]: Hijos mutados.
+    """
+    # Paso 3.2: Formar parejas y aplicar cruce
+    hijos = []
+    if len(padres) >= 2:
+        parejas = seleccionar_parejas_para_cruce(padres, 'aleatorio')
+        
+        for padre1, padre2 in parejas:
+            hijo1, hijo2 = cruzar(
+                padre1_cromosoma=padre1,
+                padre2_cromosoma=padre2,
+                piezas_requeridas_df=piezas_requeridas_df,
+                tasa_cruce=config_ga['tasa_cruce'],
+                estrategia_cruce=config_ga['estrategia_cruce'],
+                config_ga={
+                    **config_ga,
+                    'barras_disponibles': barras_estandar_disponibles,
+                    'desperdicios_disponibles': desperdicios_reutilizables_previos
+                }
+            )
+            hijos.extend([hijo1, hijo2])
+    else:
+        # Si hay muy pocos padres, clonar los existentes
+        for padre in padres:
+            hijos.append(padre.clonar())
+            if len(hijos) < num_padres:
+                hijos.append(padre.clonar())
+    
+    # Ajustar número de hijos si es necesario
+    if len(hijos) > num_padres:
+        hijos = hijos[:num_padres]
+    elif len(hijos) < num_padres:
+        # Completar con padres adicionales si es necesario
+        while len(hijos) < num_padres:
+            hijos.append(random.choice(padres).clonar())
+    
+    # Paso 3.3: Aplicar mutación
+    hijos_mutados = []
+    for hijo in hijos:
+        hijo_mutado = mutar(
+            cromosoma=hijo,
+            piezas_requeridas_df=piezas_requeridas_df,
+            barras_estandar_disponibles=barras_estandar_disponibles,
+            desperdicios_reutilizables_previos=desperdicios_reutilizables_previos,
+            tasa_mutacion_individuo=config_ga['tasa_mutacion_individuo'],
+            tasa_mutacion_gen=config_ga['tasa_mutacion_gen'],
+            config_ga=config_ga
+        )
+        hijos_mutados.append(hijo_mutado)
+    
+    return hijos_mutados
+
+
+def _evaluar_poblacion(
+    poblacion: List[Cromosoma],
+    demanda: DemandaCompilada,
+    cache: Optional[CacheFitness],
+    registro: RegistroEvolucion,
+    evaluador: Optional[EvaluadorParalelo] = None
+) -> List[float]:
+    """
+    Evalúa una población, consultando la caché de fitness si está habilitada.
+    
+    Args:
+        poblacion: Cromosomas a evaluar.
+        demanda: Demanda compilada de la ejecución.
+        cache: Caché de fitness o None si está deshabilitada.
+        registro: Registro donde se acumulan los contadores de la caché.
+        evaluador: Evaluador paralelo o None para evaluar en el proceso actual.
+    
+    Returns:
+        List[float]: Fitness de cada cromosoma.
+    """
+    funcion_evaluacion = evaluador.evaluar if evaluador is not None else None
+    
+    if cache is None:
+        if funcion_evaluacion is not None:
+            return funcion_evaluacion(poblacion)
+        return calcular_fitness_poblacion(poblacion, demanda)
+    
+    valores_fitness = cache.evaluar_poblacion(poblacion, demanda, funcion_evaluacion=funcion_evaluacion)
+    registro.registrar_cache_fitness(cache.aciertos, cache.fallos)
+    return valores_fitness
 
 
 def verificar_criterios_parada(
     generacion_actual: int,
     historial_mejor_fitness: List[float],
     tiempo_inicio: float,
-    config_ga: Dict[str, Any]
+    config_ga: Dict[str, Any],
+    mejor_cromosoma: Optional[Cromosoma] = None,
+    demanda: Optional[DemandaCompilada] = None,
+    cota_inferior: Optional[Dict[str, Any]] = None,
+    token_cancelacion: Optional[TokenCancelacion] = None
 ) -> bool:
     """
     Verifica si se debe detener el algoritmo genético.
@@ -211,10 +724,19 @@ def verificar_criterios_parada(
         historial_mejor_fitness: Lista de mejores fitness por generación.
         tiempo_inicio: Tiempo de inicio del algoritmo.
         config_ga: Configuración del algoritmo genético.
+        mejor_cromosoma: Mejor cromosoma encontrado hasta el momento.
+        demanda: Demanda compilada de la ejecución.
+        cota_inferior: Cota de calcular_cota_inferior; si el mejor cromosoma la
+            alcanza, ninguna generación adicional puede reducir sus barras estándar.
+        token_cancelacion: Token de cancelación y límites de recursos de la ejecución.
     
     Returns:
         bool: True si se debe detener, False en caso contrario.
     """
+    # Criterio 0: Cancelación o límite de recursos
+    if token_cancelacion is not None and token_cancelacion.cancelado:
+        return True
+    
     # Criterio 1: Número máximo de generaciones
     if generacion_actual >= config_ga.get('max_generaciones', 100):
         return True
@@ -241,6 +763,11 @@ def verificar_criterios_parada(
         ):
             return True
     
+    # Criterio 5: El mejor cromosoma alcanza la cota inferior
+    if cota_inferior is not None and demanda is not None:
+        if alcanza_cota_inferior(mejor_cromosoma, demanda, cota_inferior):
+            return True
+    
     return False
 
 
@@ -411,6 +938,31 @@ def validar_configuracion_ga(config_ga: Dict[str, Any]) -> List[str]:
     if config_ga.get('metodo_seleccion') not in metodos_seleccion_validos:
         errores.append(f"Método de selección debe ser uno de: {metodos_seleccion_validos}")
     
+    if config_ga.get('paralelizar_evaluacion', False):
+        num_trabajadores = config_ga.get('num_trabajadores')
+        if num_trabajadores is not None and num_trabajadores < 1:
+            errores.append("El número de trabajadores debe ser al menos 1")
+        if config_ga.get('tamaño_lote_paralelo', 1) < 1:
+            errores.append("El tamaño de lote paralelo debe ser al menos 1")
+    elif config_ga.get('evolucion_asincrona', False):
+        errores.append("La evolución asíncrona requiere paralelizar_evaluacion")
+    
+    if config_ga.get('cache_fitness', False) and config_ga.get('tamaño_cache_fitness', 1) < 1:
+        errores.append("El tamaño de la caché de fitness debe ser al menos 1")
+    
+    if config_ga.get('num_islas', 1) > 1:
+        if config_ga.get('intervalo_migracion', 1) < 1:
+            errores.append("El intervalo de migración debe ser al menos 1")
+        if not 0 <= config_ga.get('num_migrantes', 0) < config_ga.get('tamaño_poblacion', 0):
+            errores.append("El número de migrantes debe estar entre 0 y el tamaño de población")
+    
+    estrategias_reemplazo_validas = ['elitismo', *ESTRATEGIAS_ESTADO_ESTACIONARIO]
+    if config_ga.get('estrategia_reemplazo', 'elitismo') not in estrategias_reemplazo_validas:
+        errores.append(f"Estrategia de reemplazo debe ser una de: {estrategias_reemplazo_validas}")
+    elif config_ga.get('estrategia_reemplazo') in ESTRATEGIAS_ESTADO_ESTACIONARIO:
+        if config_ga.get('hijos_por_paso', 2) not in (1, 2):
+            errores.append("El número de hijos por paso debe ser 1 o 2")
+    
     estrategias_cruce_validas = ['un_punto', 'dos_puntos', 'basado_en_piezas']
     if config_ga.get('estrategia_cruce') not in estrategias_cruce_validas:
         errores.append(f"Estrategia de cruce debe ser una de: {estrategias_cruce_validas}")
@@ -0,0 +1,406 @@
+"""
+Solver exacto por ramificación y acotamiento para subproblemas pequeños.
+
+Este módulo resuelve de forma exacta los grupos de ejecución con pocas piezas,
+donde el algoritmo genético es más costoso que la propia búsqueda exhaustiva.
+La búsqueda asigna las piezas, de mayor a menor, a barras abiertas, a un
+desperdicio reutilizable o a una barra estándar nueva, y minimiza el mismo
+fitness que el AG para un plan exacto (sin faltantes ni sobrantes).
+
+La longitud de cada barra estándar se decide al cerrar la búsqueda: una barra
+abierta admite hasta la barra estándar más larga y se corta de la más corta
+en la que cabe su carga. Las podas combinan la cota L2 de Martello y Toth con
+una cota por longitud, y la simetría se rompe entre piezas iguales y entre
+barras abiertas equivalentes.
+
+Si se agota el presupuesto de nodos o de tiempo, el solver retorna None y el
+llamador recurre al algoritmo genético.
+"""
+
+import time
+from bisect import bisect_left
+from collections import defaultdict, deque
+from typing import List, Dict, Any, Optional, Tuple
+import pandas as pd
+
+from .chromosome import Cromosoma, Patron
+from .demand import compilar_demanda
+from .fitness import calcular_fitness, obtener_config_fitness_default
+from .lower_bound import calcular_cota_inferior, calcular_cota_fitness
+from .population import generar_individuo_heuristico_ffd, generar_individuo_heuristico_bfd
+from .units import a_milimetros, milimetros_a_metros, longitudes_en_milimetros
+
+
+# Presupuesto de la búsqueda; al agotarse no hay garantía de optimalidad
+MAX_NODOS_SOLVER_EXACTO = 200_000
+TIEMPO_LIMITE_SOLVER_EXACTO_SEGUNDOS = 5.0
+
+# Nodos entre consultas al reloj
+NODOS_ENTRE_CONTROLES_TIEMPO = 1000
+
+TOLERANCIA_COSTO = 1e-9
+
+BARRA_ESTANDAR = -1  # Origen de una barra abierta que no es un desperdicio
+
+
+class _PresupuestoAgotado(Exception):
+    """Se agotó el presupuesto de nodos o de tiempo de la búsqueda."""
+
+
+class _OptimoDemostrado(Exception):
+    """La mejor solución alcanzó la cota inferior global y no puede mejorarse."""
+
+
+def _cota_l2(longitudes: List[int], capacidad: int) -> int:
+    """
+    Cota L2 de Martello y Toth sobre el número de barras de una capacidad dada.
+
+    Args:
+        longitudes: Longitudes de las piezas, todas menores o iguales a la capacidad.
+        capacidad: Capacidad de cada barra.
+
+    Returns:
+        int: Número mínimo de barras necesarias.
+    """
+    if not longitudes:
+        return 0
+
+    mejor = -(-sum(longitudes) // capacidad)
+    mitad = capacidad / 2
+    for alfa in {0} | {longitud for longitud in longitudes if longitud <= mitad}:
+        grandes = [longitud for longitud in longitudes if longitud > capacidad - alfa]
+        medianas = [longitud for longitud in longitudes if mitad < longitud <= capacidad - alfa]
+        pequeñas = sum(longitud for longitud in longitudes if alfa <= longitud <= mitad)
+        holgura_medianas = len(medianas) * capacidad - sum(medianas)
+        exceso = pequeñas - holgura_medianas
+        mejor = max(mejor, len(grandes) + len(medianas) + max(0, -(-exceso // capacidad)))
+    return mejor
+
+
+class _BusquedaExacta:
+    """
+    Estado de la búsqueda por ramificación y acotamiento.
+
+    Las longitudes se manejan en milímetros enteros y los costos en unidades de
+    fitness: una barra estándar de longitud L cuesta peso_desperdicio·L más la
+    penalización por barra, y un desperdicio de longitud L cuesta
+    (peso_desperdicio - bonificación)·L. El costo total de un plan exacto es la
+    suma de sus barras menos peso_desperdicio por la longitud de las piezas.
+    """
+
+    def __init__(
+        self,
+        piezas: List[int],
+        longitudes_estandar: List[int],
+        longitudes_desperdicios: List[int],
+        config_fitness: Dict[str, float],
+        max_nodos: int,
+        tiempo_limite_segundos: float
+    ):
+        self.piezas = piezas
+        self.longitudes_estandar = longitudes_estandar
+        self.capacidad_estandar = longitudes_estandar[-1]
+        self.longitudes_desperdicios = longitudes_desperdicios
+
+        self.peso_desperdicio = config_fitness.get('peso_desperdicio', 1.0)
+        self.penalizacion_barra = config_fitness.get('penalizacion_num_barras_estandar', 5.0)
+        self.costo_desperdicios = [
+            (self.peso_desperdicio - config_fitness.get('bonificacion_uso_desperdicios', 3.0))
+            * milimetros_a_metros(longitud)
+            for longitud in longitudes_desperdicios
+        ]
+        self.costo_piezas = self.peso_desperdicio * milimetros_a_metros(sum(piezas))
+
+        # Longitud restante y cota L2 de cada sufijo de piezas (las piezas se asignan en orden)
+        self.longitud_sufijos = [sum(piezas[k:]) for k in range(len(piezas) + 1)]
+        self.l2_sufijos = [_cota_l2(piezas[k:], self.capacidad_estandar) for k in range(len(piezas) + 1)]
+
+        # La cota L2 supone que ninguna barra disponible supera a la estándar más larga
+        self.usar_l2 = all(longitud <= self.capacidad_estandar for longitud in longitudes_desperdicios)
+
+        self.max_nodos = max_nodos
+        self.tiempo_limite = time.time() + tiempo_limite_segundos
+        self.nodos = 0
+
+        self.cargas: List[int] = []
+        self.origenes: List[int] = []  # BARRA_ESTANDAR o índice del desperdicio
+        self.desperdicio_usado = [False] * len(longitudes_desperdicios)
+        self.asignacion = [0] * len(piezas)
+
+        self.mejor_costo = float('inf')
+        self.cota_global = -float('inf')
+        self.mejor_solucion: Optional[Tuple[List[int], List[int]]] = None
+
+    def _longitud_estandar_para(self, carga: int) -> int:
+        """Retorna la barra estándar más corta en la que cabe una carga."""
+        return self.longitudes_estandar[bisect_left(self.longitudes_estandar, carga)]
+
+    def _capacidad(self, barra: int) -> int:
+        origen = self.origenes[barra]
+        if origen == BARRA_ESTANDAR:
+            return self.capacidad_estandar
+        return self.longitudes_desperdicios[origen]
+
+    def _costo_barras_abiertas(self) -> float:
+        costo = 0.0
+        for carga, origen in zip(self.cargas, self.origenes):
+            if origen == BARRA_ESTANDAR:
+                longitud = self._longitud_estandar_para(carga)
+                costo += self.peso_desperdicio * milimetros_a_metros(longitud) + self.penalizacion_barra
+            else:
+                costo += self.costo_desperdicios[origen]
+        return costo
+
+    def _cota_inferior(self, k: int, costo_abiertas: float) -> float:
+        """
+        Cota inferior del costo de cualquier plan que complete la asignación parcial.
+
+        Sin costo adicional, las piezas restantes solo caben en los desperdicios
+        y en lo que sobra de cada barra estándar abierta hasta su longitud actual.
+        Cada milímetro restante exige un milímetro más de barra estándar, sea
+        ampliando una barra abierta o abriendo una nueva; lo que no quepa ni
+        ampliando las barras abiertas requiere barras nuevas, al menos tantas
+        como indique la cota L2 descontando las barras ya disponibles.
+        """
+        pieza_menor = self.piezas[-1]
+        espacio_sin_costo = 0
+        espacio_ampliable = 0
+        for barra, carga in enumerate(self.cargas):
+            if self.origenes[barra] == BARRA_ESTANDAR:
+                longitud_actual = self._longitud_estandar_para(carga)
+                espacio_sin_costo += longitud_actual - carga
+                espacio_ampliable += self.capacidad_estandar - longitud_actual
+            else:
+                espacio_sin_costo += self._capacidad(barra) - carga
+
+        desperdicios_libres = [
+            j for j, usado in enumerate(self.desperdicio_usado)
+            if not usado and self.longitudes_desperdicios[j] >= pieza_menor
+        ]
+        espacio_sin_costo += sum(self.longitudes_desperdicios[j] for j in desperdicios_libres)
+        ahorro_desperdicios = sum(min(0.0, self.costo_desperdicios[j]) for j in desperdicios_libres)
+
+        longitud_adicional = max(0, self.longitud_sufijos[k] - espacio_sin_costo)
+        exceso = max(0, longitud_adicional - espacio_ampliable)
+        barras_nuevas = -(-exceso // self.capacidad_estandar)
+        if self.usar_l2:
+            barras_nuevas = max(barras_nuevas, self.l2_sufijos[k] - len(self.cargas) - len(desperdicios_libres))
+        return (
+            costo_abiertas
+            + ahorro_desperdicios
+            + self.peso_desperdicio * milimetros_a_metros(longitud_adicional)
+            + self.penalizacion_barra * barras_nuevas
+            - self.costo_piezas
+        )
+
+    def _colocar(self, k: int, barra: int) -> None:
+        self.cargas[barra] += self.piezas[k]
+        self.asignacion[k] = barra
+        self._ramificar(k + 1)
+        self.cargas[barra] -= self.piezas[k]
+
+    def _abrir_y_colocar(self, k: int, origen: int) -> None:
+        self.cargas.append(0)
+        self.origenes.append(origen)
+        if origen != BARRA_ESTANDAR:
+            self.desperdicio_usado[origen] = True
+        self._colocar(k, len(self.cargas) - 1)
+        if origen != BARRA_ESTANDAR:
+            self.desperdicio_usado[origen] = False
+        self.origenes.pop()
+        self.cargas.pop()
+
+    def _ramificar(self, k: int) -> None:
+        self.nodos += 1
+        if self.nodos > self.max_nodos:
+            raise _PresupuestoAgotado()
+        if self.nodos % NODOS_ENTRE_CONTROLES_TIEMPO == 0 and time.time() > self.tiempo_limite:
+            raise _PresupuestoAgotado()
+
+        costo_abiertas = self._costo_barras_abiertas()
+        if k == len(self.piezas):
+            costo = costo_abiertas - self.costo_piezas
+            if costo < self.mejor_costo - TOLERANCIA_COSTO:
+                self.mejor_costo = costo
+                self.mejor_solucion = (list(self.asignacion), list(self.origenes))
+                if costo <= self.cota_global + TOLERANCIA_COSTO:
+                    raise _OptimoDemostrado()
+            return
+
+        if self._cota_inferior(k, costo_abiertas) >= self.mejor_costo - TOLERANCIA_COSTO:
+            return
+
+        longitud = self.piezas[k]
+
+        # Piezas iguales se asignan a barras de índice no decreciente
+        inicio = self.asignacion[k - 1] if k > 0 and self.piezas[k - 1] == longitud else 0
+
+        # Barras abiertas, de la más ajustada a la más holgada; las barras con el
+        # mismo origen y la misma carga son intercambiables y se prueban una vez
+        candidatas = [
+            barra for barra in range(inicio, len(self.cargas))
+            if self._capacidad(barra) - self.cargas[barra] >= longitud
+        ]
+        candidatas.sort(key=lambda barra: self._capacidad(barra) - self.cargas[barra])
+        probadas = set()
+        for barra in candidatas:
+            clase = (self._capacidad(barra) if self.origenes[barra] != BARRA_ESTANDAR else None, self.cargas[barra])
+            if clase in probadas:
+                continue
+            probadas.add(clase)
+            self._colocar(k, barra)
+
+        # Un desperdicio sin usar por cada longitud distinta, del más corto al más largo
+        longitudes_probadas = set()
+        for j, longitud_desperdicio in enumerate(self.longitudes_desperdicios):
+            if self.desperdicio_usado[j] or longitud_desperdicio < longitud:
+                continue
+            if longitud_desperdicio in longitudes_probadas:
+                continue
+            longitudes_probadas.add(longitud_desperdicio)
+            self._abrir_y_colocar(k, j)
+
+        self._abrir_y_colocar(k, BARRA_ESTANDAR)
+
+    def resolver(self, costo_inicial: float, cota_global: float = -float('inf')) -> bool:
+        """
+        Ejecuta la búsqueda con un costo de referencia como primera cota superior.
+
+        Args:
+            costo_inicial: Costo de la mejor solución conocida.
+            cota_global: Cota inferior del costo; la búsqueda termina al alcanzarla.
+
+        Returns:
+            bool: True si la búsqueda demostró la optimalidad dentro del presupuesto.
+        """
+        self.mejor_costo = costo_inicial
+        self.cota_global = cota_global
+        if costo_inicial <= cota_global + TOLERANCIA_COSTO:
+            return True
+        try:
+            self._ramificar(0)
+        except _PresupuestoAgotado:
+            return False
+        except _OptimoDemostrado:
+            pass
+        return True
+
+
+def _construir_cromosoma(
+    busqueda: _BusquedaExacta,
+    unidades_por_longitud: Dict[int, deque],
+    barras_por_longitud: Dict[int, Any],
+    desperdicios: List[Any],
+    en_milimetros: bool = False
+) -> Cromosoma:
+    """Convierte la mejor asignación de la búsqueda en un cromosoma."""
+    asignacion, origenes = busqueda.mejor_solucion
+    piezas_por_barra: List[Dict[Tuple[Any, Any], int]] = [defaultdict(int) for _ in origenes]
+    cargas = [0] * len(origenes)
+
+    for longitud, barra in zip(busqueda.piezas, asignacion):
+        id_pedido, longitud_original = unidades_por_longitud[longitud].popleft()
+        piezas_por_barra[barra][(id_pedido, longitud_original)] += 1
+        cargas[barra] += longitud
+
+    patrones = []
+    for barra, origen in enumerate(origenes):
+        if origen == BARRA_ESTANDAR:
+            longitud_barra = barras_por_longitud[busqueda._longitud_estandar_para(cargas[barra])]
+            tipo = 'estandar'
+        else:
+            longitud_barra = desperdicios[origen]
+            tipo = 'desperdicio'
+        patrones.append(Patron(
+            origen_barra_longitud=longitud_barra,
+            origen_barra_tipo=tipo,
+            piezas_cortadas=[
+                {'id_pedido': id_pedido, 'longitud_pieza': longitud_pieza, 'cantidad_pieza_en_patron': cantidad}
+                for (id_pedido, longitud_pieza), cantidad in piezas_por_barra[barra].items()
+            ],
+            en_milimetros=en_milimetros
+        ))
+    return Cromosoma(patrones)
+
+
+def resolver_exacto(
+    piezas_requeridas_df: pd.DataFrame,
+    barras_estandar_disponibles: List[Dict[str, Any]],
+    desperdicios_reutilizables_previos: List[Dict[str, Any]],
+    max_nodos: int = MAX_NODOS_SOLVER_EXACTO,
+    tiempo_limite_segundos: float = TIEMPO_LIMITE_SOLVER_EXACTO_SEGUNDOS,
+    config_fitness: Optional[Dict[str, float]] = None
+) -> Optional[Cromosoma]:
+    """
+    Encuentra el plan exacto de menor fitness mediante ramificación y acotamiento.
+
+    La mejor solución de FFD y BFD sirve como cota superior inicial; si la
+    búsqueda demuestra que es óptima, se retorna esa misma solución. La cota de
+    Gilmore–Gomory detiene la búsqueda en cuanto una solución la alcanza.
+
+    Args:
+        piezas_requeridas_df: DataFrame con las piezas requeridas.
+        barras_estandar_disponibles: Lista de barras estándar disponibles.
+        desperdicios_reutilizables_previos: Lista de desperdicios reutilizables.
+        max_nodos: Nodos máximos de la búsqueda.
+        tiempo_limite_segundos: Tiempo máximo de la búsqueda.
+        config_fitness: Pesos del fitness. Si no se proporcionan, se usan los del AG.
+
+    Returns:
+        Optional[Cromosoma]: Cromosoma óptimo, o None si se agota el presupuesto,
+            no hay piezas o alguna pieza no cabe en ninguna barra estándar.
+    """
+    if config_fitness is None:
+        config_fitness = obtener_config_fitness_default()
+
+    # Piezas individuales en milímetros, de mayor a menor, con su pedido y longitud original
+    en_milimetros = longitudes_en_milimetros(piezas_requeridas_df)
+    unidades_por_longitud: Dict[int, deque] = defaultdict(deque)
+    for _, fila in piezas_requeridas_df.iterrows():
+        longitud = fila['longitud_pieza_requerida']
+        for _ in range(int(fila['cantidad_requerida'])):
+            unidades_por_longitud[a_milimetros(longitud, en_milimetros)].append((fila['id_pedido'], longitud))
+    piezas = sorted(
+        (longitud for longitud, unidades in unidades_por_longitud.items() for _ in unidades),
+        reverse=True
+    )
+
+    barras_por_longitud = {
+        a_milimetros(barra['longitud'], en_milimetros): barra['longitud'] for barra in barras_estandar_disponibles
+    }
+    longitudes_estandar = sorted(barras_por_longitud)
+    if not piezas or not longitudes_estandar or piezas[0] > longitudes_estandar[-1]:
+        return None
+
+    desperdicios = [desperdicio['longitud'] for desperdicio in desperdicios_reutilizables_previos]
+
+    # Cota superior inicial: la mejor de las heurísticas constructivas
+    demanda = compilar_demanda(piezas_requeridas_df)
+    heuristicas = [
+        generar_individuo_heuristico_ffd(piezas_requeridas_df, barras_estandar_disponibles, desperdicios_reutilizables_previos),
+        generar_individuo_heuristico_bfd(piezas_requeridas_df, barras_estandar_disponibles, desperdicios_reutilizables_previos)
+    ]
+    fitness_heuristicas = [calcular_fitness(cromosoma, demanda, config_fitness) for cromosoma in heuristicas]
+    mejor_fitness = min(fitness_heuristicas)
+    mejor_heuristica = heuristicas[fitness_heuristicas.index(mejor_fitness)]
+
+    busqueda = _BusquedaExacta(
+        piezas,
+        longitudes_estandar,
+        [a_milimetros(longitud, en_milimetros) for longitud in desperdicios],
+        config_fitness,
+        max_nodos,
+        tiempo_limite_segundos
+    )
+    cota_global = calcular_cota_fitness(
+        calcular_cota_inferior(demanda, barras_estandar_disponibles, desperdicios_reutilizables_previos),
+        demanda,
+        desperdicios_reutilizables_previos,
+        config_fitness
+    )
+    if not busqueda.resolver(mejor_fitness, cota_global):
+        return None
+
+    if busqueda.mejor_solucion is None:
+        return mejor_heuristica
+    return _construir_cromosoma(busqueda, unidades_por_longitud, barras_por_longitud, desperdicios, en_milimetros)
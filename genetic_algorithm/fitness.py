@@ -5,11 +5,15 @@ Este módulo implementa la función de fitness y funciones auxiliares para evalu
 la calidad de las soluciones (cromosomas) en el algoritmo genético.
 """
 
-from typing import Dict, Tuple, Any, Optional
+from collections import OrderedDict
+from typing import Dict, List, Tuple, Any, Optional, Union, Callable
+import numpy as np
 import pandas as pd
 
 from .chromosome import Cromosoma
-from .chromosome_utils import calcular_sumario_piezas_en_cromosoma
+from .chromosome_utils import calcular_firma_canonica
+from .demand import DemandaCompilada, compilar_demanda
+from .units import a_metros
 
 
 def obtener_config_fitness_default() -> Dict[str, float]:
@@ -35,7 +39,7 @@ def obtener_config_fitness_default() -> Dict[str, float]:
 
 def calcular_penalizacion_faltantes(
     sumario_piezas: Dict[Tuple[Any, float], int],
-    piezas_requeridas_df: pd.DataFrame,
+    piezas_requeridas: Union[pd.DataFrame, DemandaCompilada],
     peso: float
 ) -> float:
     """
@@ -44,74 +48,44 @@ def calcular_penalizacion_faltantes(
     Args:
         sumario_piezas: Diccionario con el resumen de piezas en el cromosoma.
             Las claves son tuplas (id_pedido, longitud_pieza) y los valores son las cantidades.
-        piezas_requeridas_df: DataFrame con las piezas requeridas.
-            Debe tener columnas 'id_pedido', 'longitud_pieza_requerida' y 'cantidad_requerida'.
+        piezas_requeridas: Demanda compilada, o DataFrame con las piezas requeridas
+            (columnas 'id_pedido', 'longitud_pieza_requerida' y 'cantidad_requerida').
         peso: Factor de penalización por unidad de longitud faltante.
     
     Returns:
         float: Valor de la penalización por piezas faltantes.
     """
-    penalizacion_total = 0.0
+    demanda = compilar_demanda(piezas_requeridas)
+    conteos, _ = demanda.vectorizar_sumario(sumario_piezas)
     
-    # Calcular faltantes para cada pieza requerida
-    for _, fila in piezas_requeridas_df.iterrows():
-        id_pedido = fila['id_pedido']
-        longitud = fila['longitud_pieza_requerida']
-        cantidad_requerida = fila['cantidad_requerida']
-        
-        # Cantidad de esta pieza en el cromosoma
-        cantidad_en_cromosoma = sumario_piezas.get((id_pedido, longitud), 0)
-        
-        # Si hay faltantes, aplicar penalización
-        cantidad_faltante = max(0, cantidad_requerida - cantidad_en_cromosoma)
-        if cantidad_faltante > 0:
-            # La penalización es proporcional a la longitud y cantidad faltante
-            penalizacion_total += cantidad_faltante * longitud * peso
-    
-    return penalizacion_total
+    # La penalización es proporcional a la longitud y cantidad faltante
+    return float(demanda.calcular_longitud_faltante(conteos)) * peso
 
 
 def calcular_penalizacion_sobrantes(
     sumario_piezas: Dict[Tuple[Any, float], int],
-    piezas_requeridas_df: pd.DataFrame,
+    piezas_requeridas: Union[pd.DataFrame, DemandaCompilada],
     peso: float
 ) -> float:
     """
     Calcula la penalización por piezas sobrantes (producir más de lo necesario).
     
+    Las piezas que no forman parte de la demanda cuentan como sobrantes en su totalidad.
+    
     Args:
         sumario_piezas: Diccionario con el resumen de piezas en el cromosoma.
             Las claves son tuplas (id_pedido, longitud_pieza) y los valores son las cantidades.
-        piezas_requeridas_df: DataFrame con las piezas requeridas.
-            Debe tener columnas 'id_pedido', 'longitud_pieza_requerida' y 'cantidad_requerida'.
+        piezas_requeridas: Demanda compilada, o DataFrame con las piezas requeridas
+            (columnas 'id_pedido', 'longitud_pieza_requerida' y 'cantidad_requerida').
         peso: Factor de penalización por unidad de longitud sobrante.
     
     Returns:
         float: Valor de la penalización por piezas sobrantes.
     """
-    penalizacion_total = 0.0
+    demanda = compilar_demanda(piezas_requeridas)
+    conteos, longitud_no_demandada = demanda.vectorizar_sumario(sumario_piezas)
     
-    # Crear un diccionario de piezas requeridas para búsqueda rápida
-    piezas_requeridas = {}
-    for _, fila in piezas_requeridas_df.iterrows():
-        clave = (fila['id_pedido'], fila['longitud_pieza_requerida'])
-        piezas_requeridas[clave] = fila['cantidad_requerida']
-    
-    # Verificar cada pieza en el cromosoma
-    for (id_pedido, longitud), cantidad_en_cromosoma in sumario_piezas.items():
-        clave = (id_pedido, longitud)
-        
-        # Si la pieza está en los requerimientos, verificar exceso
-        if clave in piezas_requeridas:
-            cantidad_requerida = piezas_requeridas[clave]
-            cantidad_sobrante = max(0, cantidad_en_cromosoma - cantidad_requerida)
-            if cantidad_sobrante > 0:
-                penalizacion_total += cantidad_sobrante * longitud * peso
-        else:
-            # Si la pieza no está en los requerimientos, todo es sobrante
-            penalizacion_total += cantidad_en_cromosoma * longitud * peso
-    
-    return penalizacion_total
+    return float(demanda.calcular_longitud_sobrante(conteos, longitud_no_demandada)) * peso
 
 
 def calcular_penalizacion_barras_usadas(
@@ -129,7 +103,7 @@ def calcular_penalizacion_barras_usadas(
         float: Valor de la penalización por barras estándar utilizadas.
     """
     # Contar el número de barras estándar utilizadas
-    num_barras_estandar = cromosoma.contar_barras_estandar()
+    num_barras_estandar = cromosoma.obtener_resumen().num_barras_estandar
     
     return num_barras_estandar * peso
 
@@ -149,14 +123,14 @@ def calcular_bonificacion_uso_desperdicios(
         float: Valor de la bonificación por uso de desperdicios.
     """
     # Calcular la longitud total de desperdicios utilizados
-    longitud_desperdicios_usados = cromosoma.longitud_total_desperdicios_usados()
+    longitud_desperdicios_usados = cromosoma.obtener_resumen().longitud_desperdicios_usados_metros()
     
     return longitud_desperdicios_usados * peso
 
 
 def calcular_fitness(
     cromosoma: Cromosoma,
-    piezas_requeridas_df: pd.DataFrame,
+    piezas_requeridas_df: Union[pd.DataFrame, DemandaCompilada],
     config_fitness: Optional[Dict[str, float]] = None
 ) -> float:
     """
@@ -164,11 +138,18 @@ def calcular_fitness(
     
     El fitness evalúa la calidad de la solución, considerando el desperdicio generado,
     el cumplimiento de la demanda y otros factores. Un valor menor indica una mejor solución.
+    Los pesos se definen por metro; las longitudes en milímetros enteros se convierten
+    a metros, de modo que ambos modos de aritmética producen el mismo valor.
+    
+    Los agregados se leen del resumen en caché del cromosoma, que los operadores de
+    mutación mantienen de forma incremental; solo se recorre el cromosoma completo
+    si el resumen no se ha calculado aún.
     
     Args:
         cromosoma: El cromosoma a evaluar.
-        piezas_requeridas_df: DataFrame con las piezas requeridas.
-            Debe tener columnas 'id_pedido', 'longitud_pieza_requerida' y 'cantidad_requerida'.
+        piezas_requeridas_df: DataFrame con las piezas requeridas o su DemandaCompilada.
+            El DataFrame debe tener columnas 'id_pedido', 'longitud_pieza_requerida' y
+            'cantidad_requerida'; pasar la demanda compilada evita recompilarla en cada llamada.
         config_fitness: Diccionario con los pesos de los factores.
             Si no se proporciona, se utiliza la configuración por defecto.
     
@@ -179,23 +160,27 @@ def calcular_fitness(
     if config_fitness is None:
         config_fitness = obtener_config_fitness_default()
     
-    # Calcular el sumario de piezas en el cromosoma
-    sumario_piezas = calcular_sumario_piezas_en_cromosoma(cromosoma)
+    # Compilar la demanda una sola vez para ambas penalizaciones
+    demanda = compilar_demanda(piezas_requeridas_df)
+    
+    # Sumario de piezas y desperdicio total, tomados del resumen del cromosoma
+    resumen = cromosoma.obtener_resumen()
+    sumario_piezas = resumen.conteos_piezas
     
     # Calcular el desperdicio total
-    desperdicio_total = cromosoma.calcular_desperdicio_total()
+    desperdicio_total = resumen.desperdicio_total_metros()
     valor_desperdicio = desperdicio_total * config_fitness.get('peso_desperdicio', 1.0)
     
     # Calcular penalizaciones
     valor_penalizacion_faltantes = calcular_penalizacion_faltantes(
         sumario_piezas,
-        piezas_requeridas_df,
+        demanda,
         config_fitness.get('penalizacion_faltantes', 1000.0)
     )
     
     valor_penalizacion_sobrantes = calcular_penalizacion_sobrantes(
         sumario_piezas,
-        piezas_requeridas_df,
+        demanda,
         config_fitness.get('penalizacion_sobrantes', 500.0)
     )
     
@@ -222,9 +207,202 @@ def calcular_fitness(
     return fitness
 
 
+def calcular_fitness_poblacion(
+    poblacion: List[Cromosoma],
+    piezas_requeridas_df: Union[pd.DataFrame, DemandaCompilada],
+    config_fitness: Optional[Dict[str, float]] = None
+) -> List[float]:
+    """
+    Calcula el fitness de toda una población en una sola pasada vectorizada.
+    
+    Construye una matriz población × tipos de pieza demandados a partir del resumen
+    en caché de cada individuo, junto con vectores de desperdicio, barras estándar
+    y longitud de desperdicios reutilizados, y evalúa todos los términos con NumPy.
+    El resultado coincide con aplicar calcular_fitness a cada cromosoma.
+    
+    Args:
+        poblacion: Lista de cromosomas a evaluar.
+        piezas_requeridas_df: DataFrame con las piezas requeridas o su DemandaCompilada.
+        config_fitness: Diccionario con los pesos de los factores.
+            Si no se proporciona, se utiliza la configuración por defecto.
+    
+    Returns:
+        List[float]: Valor de fitness de cada cromosoma, en el orden de la población.
+    """
+    if config_fitness is None:
+        config_fitness = obtener_config_fitness_default()
+    
+    if not poblacion:
+        return []
+    
+    demanda = compilar_demanda(piezas_requeridas_df)
+    num_tipos = demanda.num_tipos_demandados
+    
+    conteos = np.zeros((len(poblacion), num_tipos), dtype=np.int64)
+    longitud_no_demandada = np.zeros(len(poblacion), dtype=np.float64)
+    desperdicio_total = []
+    num_barras_estandar = np.zeros(len(poblacion), dtype=np.int64)
+    longitud_desperdicios_usados = []
+    
+    for fila, cromosoma in enumerate(poblacion):
+        resumen = cromosoma.obtener_resumen()
+        conteos_fila = conteos[fila]
+        
+        # Mismo orden de acumulación que vectorizar_sumario
+        longitud_extra = 0.0
+        for clave, cantidad in resumen.conteos_piezas.items():
+            indice = demanda.buscar_indice(*clave)
+            if indice is not None and indice < num_tipos:
+                conteos_fila[indice] += cantidad
+            else:
+                longitud_extra += cantidad * a_metros(clave[1], demanda.en_milimetros)
+        longitud_no_demandada[fila] = longitud_extra
+        
+        desperdicio_total.append(resumen.desperdicio_total_metros())
+        num_barras_estandar[fila] = resumen.num_barras_estandar
+        longitud_desperdicios_usados.append(resumen.longitud_desperdicios_usados_metros())
+    
+    valor_desperdicio = np.array(desperdicio_total, dtype=np.float64) * config_fitness.get('peso_desperdicio', 1.0)
+    valor_penalizacion_faltantes = (
+        demanda.calcular_longitud_faltante(conteos) *
+        config_fitness.get('penalizacion_faltantes', 1000.0)
+    )
+    valor_penalizacion_sobrantes = (
+        demanda.calcular_longitud_sobrante(conteos, longitud_no_demandada) *
+        config_fitness.get('penalizacion_sobrantes', 500.0)
+    )
+    valor_penalizacion_barras = num_barras_estandar * config_fitness.get('penalizacion_num_barras_estandar', 5.0)
+    valor_bonificacion_desperdicios = (
+        np.array(longitud_desperdicios_usados, dtype=np.float64) *
+        config_fitness.get('bonificacion_uso_desperdicios', 3.0)
+    )
+    
+    fitness = (
+        valor_desperdicio +
+        valor_penalizacion_faltantes +
+        valor_penalizacion_sobrantes +
+        valor_penalizacion_barras -
+        valor_bonificacion_desperdicios
+    )
+    
+    return fitness.tolist()
+
+
+class CacheFitness:
+    """
+    Caché LRU acotada de valores de fitness indexada por firma canónica.
+    
+    Los élites, las copias que no pasan por el cruce y los hijos no mutados
+    reaparecen generación tras generación; con la caché su fitness se calcula
+    una sola vez. La caché es válida para una única demanda y configuración de
+    pesos, por lo que debe crearse una por ejecución del algoritmo.
+    """
+    
+    def __init__(self, capacidad: int = 10000):
+        """
+        Inicializa la caché.
+        
+        Args:
+            capacidad: Número máximo de firmas almacenadas.
+        """
+        self.capacidad = max(1, capacidad)
+        self.aciertos = 0
+        self.fallos = 0
+        self._valores: 'OrderedDict[str, float]' = OrderedDict()
+    
+    def obtener(self, firma: str) -> Optional[float]:
+        """
+        Busca el fitness asociado a una firma y la marca como usada recientemente.
+        
+        Args:
+            firma: Firma canónica del cromosoma.
+        
+        Returns:
+            Optional[float]: Fitness almacenado o None si la firma no está en la caché.
+        """
+        valor = self._valores.get(firma)
+        if valor is None:
+            self.fallos += 1
+            return None
+        self._valores.move_to_end(firma)
+        self.aciertos += 1
+        return valor
+    
+    def guardar(self, firma: str, valor: float) -> None:
+        """
+        Almacena un valor de fitness, descartando el menos usado si se excede la capacidad.
+        
+        Args:
+            firma: Firma canónica del cromosoma.
+            valor: Fitness calculado.
+        """
+        self._valores[firma] = valor
+        self._valores.move_to_end(firma)
+        if len(self._valores) > self.capacidad:
+            self._valores.popitem(last=False)
+    
+    def evaluar_poblacion(
+        self,
+        poblacion: List[Cromosoma],
+        piezas_requeridas: Union[pd.DataFrame, DemandaCompilada],
+        config_fitness: Optional[Dict[str, float]] = None,
+        funcion_evaluacion: Optional[Callable[[List[Cromosoma]], List[float]]] = None
+    ) -> List[float]:
+        """
+        Calcula el fitness de una población reutilizando los valores en caché.
+        
+        Solo los cromosomas cuya firma no está en la caché se evalúan, en un único
+        lote vectorizado; los duplicados dentro del lote se evalúan una vez.
+        
+        Args:
+            poblacion: Lista de cromosomas a evaluar.
+            piezas_requeridas: DataFrame con las piezas requeridas o su DemandaCompilada.
+            config_fitness: Diccionario con los pesos de los factores.
+            funcion_evaluacion: Función que evalúa el lote de cromosomas no cacheados
+                (por ejemplo, un evaluador paralelo). Por defecto, calcular_fitness_poblacion.
+        
+        Returns:
+            List[float]: Valor de fitness de cada cromosoma, en el orden de la población.
+        """
+        firmas = [calcular_firma_canonica(cromosoma) for cromosoma in poblacion]
+        valores: List[Optional[float]] = []
+        pendientes: Dict[str, Cromosoma] = {}
+        
+        for firma, cromosoma in zip(firmas, poblacion):
+            if firma in pendientes:
+                self.aciertos += 1
+                valores.append(None)
+                continue
+            valor = self.obtener(firma)
+            if valor is None:
+                pendientes[firma] = cromosoma
+            valores.append(valor)
+        
+        if pendientes:
+            if funcion_evaluacion is None:
+                nuevos_valores = calcular_fitness_poblacion(
+                    list(pendientes.values()), piezas_requeridas, config_fitness
+                )
+            else:
+                nuevos_valores = funcion_evaluacion(list(pendientes.values()))
+            calculados = dict(zip(pendientes.keys(), nuevos_valores))
+            for firma, valor in calculados.items():
+                self.guardar(firma, valor)
+            valores = [
+                calculados[firma] if valor is None else valor
+                for firma, valor in zip(firmas, valores)
+            ]
+        
+        return valores
+    
+    def __len__(self) -> int:
+        """Retorna el número de firmas almacenadas."""
+        return len(self._valores)
+
+
 def analizar_componentes_fitness(
     cromosoma: Cromosoma,
-    piezas_requeridas_df: pd.DataFrame,
+    piezas_requeridas_df: Union[pd.DataFrame, DemandaCompilada],
     config_fitness: Optional[Dict[str, float]] = None
 ) -> Dict[str, float]:
     """
@@ -234,7 +412,7 @@ def analizar_componentes_fitness(
     
     Args:
         cromosoma: El cromosoma a evaluar.
-        piezas_requeridas_df: DataFrame con las piezas requeridas.
+        piezas_requeridas_df: DataFrame con las piezas requeridas o su DemandaCompilada.
         config_fitness: Diccionario con los pesos de los factores.
     
     Returns:
@@ -244,22 +422,26 @@ def analizar_componentes_fitness(
     if config_fitness is None:
         config_fitness = obtener_config_fitness_default()
     
-    # Calcular el sumario de piezas en el cromosoma
-    sumario_piezas = calcular_sumario_piezas_en_cromosoma(cromosoma)
+    # Compilar la demanda una sola vez para ambas penalizaciones
+    demanda = compilar_demanda(piezas_requeridas_df)
+    
+    # Sumario de piezas y desperdicio total, tomados del resumen del cromosoma
+    resumen = cromosoma.obtener_resumen()
+    sumario_piezas = resumen.conteos_piezas
     
     # Calcular componentes
-    desperdicio_total = cromosoma.calcular_desperdicio_total()
+    desperdicio_total = resumen.desperdicio_total_metros()
     valor_desperdicio = desperdicio_total * config_fitness.get('peso_desperdicio', 1.0)
     
     valor_penalizacion_faltantes = calcular_penalizacion_faltantes(
         sumario_piezas,
-        piezas_requeridas_df,
+        demanda,
         config_fitness.get('penalizacion_faltantes', 1000.0)
     )
     
     valor_penalizacion_sobrantes = calcular_penalizacion_sobrantes(
         sumario_piezas,
-        piezas_requeridas_df,
+        demanda,
         config_fitness.get('penalizacion_sobrantes', 500.0)
     )
     
@@ -290,6 +472,6 @@ def analizar_componentes_fitness(
         'penalizacion_barras': valor_penalizacion_barras,
         'bonificacion_desperdicios': valor_bonificacion_desperdicios,
         'desperdicio_sin_peso': desperdicio_total,
-        'numero_barras_estandar': cromosoma.contar_barras_estandar(),
-        'longitud_desperdicios_usados': cromosoma.longitud_total_desperdicios_usados()
+        'numero_barras_estandar': resumen.num_barras_estandar,
+        'longitud_desperdicios_usados': resumen.longitud_desperdicios_usados_metros()
     } 
\ No newline at end of file
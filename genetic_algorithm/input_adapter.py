@@ -8,19 +8,27 @@ esperado por el algoritmo genético.
 from typing import List, Dict, Any, Tuple
 import pandas as pd
 
+from .units import metros_a_milimetros, marcar_longitudes_en_milimetros
+
 
 def adaptar_entrada_para_ag(
     piezas_df: pd.DataFrame,
     barras_disponibles: List[float],
-    desperdicios_previos: List[float]
+    desperdicios_previos: List[float],
+    en_milimetros: bool = False
 ) -> Tuple[pd.DataFrame, List[Dict[str, Any]], List[Dict[str, Any]]]:
     """
     Adapta los datos de entrada del formato de main.py al formato del AG.
     
+    La unidad de las longitudes queda registrada en el DataFrame de piezas
+    (ver units.marcar_longitudes_en_milimetros), de donde la toman la demanda
+    compilada, las heurísticas y los solvers.
+    
     Args:
         piezas_df: DataFrame con columnas ['id_pedido', 'longitud_pieza_requerida', 'cantidad_requerida']
         barras_disponibles: Lista de longitudes de barras estándar disponibles
         desperdicios_previos: Lista de longitudes de desperdicios de grupos anteriores
+        en_milimetros: Si las longitudes están en milímetros enteros (por defecto, metros)
     
     Returns:
         Tuple: (piezas_requeridas_df, barras_estandar_disponibles, desperdicios_reutilizables_previos)
@@ -40,21 +48,24 @@ def adaptar_entrada_para_ag(
         # Renombrar si viene con nombre alternativo
         piezas_requeridas_df = piezas_requeridas_df.rename(columns={'longitud': 'longitud_pieza_requerida'})
     
+    marcar_longitudes_en_milimetros(piezas_requeridas_df, en_milimetros)
+    
     # Convertir barras disponibles a formato de diccionarios
-    barras_estandar_disponibles = longitudes_a_barras_dict(barras_disponibles)
+    barras_estandar_disponibles = longitudes_a_barras_dict(barras_disponibles, en_milimetros)
     
     # Convertir desperdicios a formato de diccionarios
-    desperdicios_reutilizables_previos = longitudes_a_desperdicios_dict(desperdicios_previos)
+    desperdicios_reutilizables_previos = longitudes_a_desperdicios_dict(desperdicios_previos, en_milimetros)
     
     return piezas_requeridas_df, barras_estandar_disponibles, desperdicios_reutilizables_previos
 
 
-def longitudes_a_barras_dict(longitudes: List[float]) -> List[Dict[str, Any]]:
+def longitudes_a_barras_dict(longitudes: List[float], en_milimetros: bool = False) -> List[Dict[str, Any]]:
     """
     Convierte una lista de longitudes a formato de diccionarios para barras estándar.
     
     Args:
         longitudes: Lista de longitudes de barras estándar
+        en_milimetros: Si las longitudes están en milímetros enteros (por defecto, metros)
     
     Returns:
         List[Dict]: Lista de diccionarios con formato para el AG
@@ -64,19 +75,20 @@ def longitudes_a_barras_dict(longitudes: List[float]) -> List[Dict[str, Any]]:
     for longitud in longitudes:
         if longitud > 0:  # Solo incluir longitudes válidas
             barras_dict.append({
-                'longitud': float(longitud),
+                'longitud': int(longitud) if en_milimetros else float(longitud),
                 'tipo': 'estandar'
             })
     
     return barras_dict
 
 
-def longitudes_a_desperdicios_dict(longitudes: List[float]) -> List[Dict[str, Any]]:
+def longitudes_a_desperdicios_dict(longitudes: List[float], en_milimetros: bool = False) -> List[Dict[str, Any]]:
     """
     Convierte una lista de longitudes a formato de diccionarios para desperdicios.
     
     Args:
         longitudes: Lista de longitudes de desperdicios
+        en_milimetros: Si las longitudes están en milímetros enteros (por defecto, metros)
     
     Returns:
         List[Dict]: Lista de diccionarios con formato para el AG
@@ -86,7 +98,7 @@ def longitudes_a_desperdicios_dict(longitudes: List[float]) -> List[Dict[str, An
     for longitud in longitudes:
         if longitud > 0:  # Solo incluir longitudes válidas
             desperdicios_dict.append({
-                'longitud': float(longitud),
+                'longitud': int(longitud) if en_milimetros else float(longitud),
                 'tipo': 'desperdicio'
             })
     
@@ -185,9 +197,9 @@ def limpiar_datos_entrada(
     # Asegurar que cantidad_requerida sea entero
     piezas_limpio['cantidad_requerida'] = piezas_limpio['cantidad_requerida'].astype(int)
     
-    # Redondear longitudes a 3 decimales
+    # Redondear longitudes a 3 decimales (en metros, siempre float)
     col_longitud = 'longitud_pieza_requerida' if 'longitud_pieza_requerida' in piezas_limpio.columns else 'longitud'
-    piezas_limpio[col_longitud] = piezas_limpio[col_longitud].round(3)
+    piezas_limpio[col_longitud] = piezas_limpio[col_longitud].astype(float).round(3)
     
     # Eliminar filas con cantidad 0 o negativa
     piezas_limpio = piezas_limpio[piezas_limpio['cantidad_requerida'] > 0]
@@ -321,13 +333,72 @@ def generar_resumen_entrada(
     }
 
 
+def cuantizar_entrada_a_milimetros(
+    piezas_df: pd.DataFrame,
+    barras_disponibles: List[float],
+    desperdicios_previos: List[float]
+) -> Tuple[pd.DataFrame, List[int], List[int]]:
+    """
+    Convierte todas las longitudes de entrada de metros a milímetros enteros.
+    
+    Args:
+        piezas_df: DataFrame de piezas requeridas con longitudes en metros
+        barras_disponibles: Lista de longitudes de barras en metros
+        desperdicios_previos: Lista de longitudes de desperdicios en metros
+    
+    Returns:
+        Tuple: (piezas_df, barras_mm, desperdicios_mm) con longitudes enteras
+    """
+    piezas_mm = piezas_df.copy()
+    col_longitud = 'longitud_pieza_requerida' if 'longitud_pieza_requerida' in piezas_mm.columns else 'longitud'
+    piezas_mm[col_longitud] = [
+        metros_a_milimetros(longitud) for longitud in piezas_mm[col_longitud]
+    ]
+    
+    barras_mm = [metros_a_milimetros(barra) for barra in barras_disponibles]
+    desperdicios_mm = [metros_a_milimetros(desperdicio) for desperdicio in desperdicios_previos]
+    
+    return piezas_mm, barras_mm, desperdicios_mm
+
+
+def normalizar_entrada_a_metros(
+    piezas_df: pd.DataFrame,
+    barras_disponibles: List[float],
+    desperdicios_previos: List[float]
+) -> Tuple[pd.DataFrame, List[float], List[float]]:
+    """
+    Convierte todas las longitudes de entrada en metros a float.
+    
+    Una cartilla con longitudes en metros enteros (p. ej. int64 leído de un CSV)
+    queda con la misma representación que una con decimales, de modo que las
+    claves de pieza y los redondeos del desperdicio no dependen del tipo.
+    
+    Args:
+        piezas_df: DataFrame de piezas requeridas con longitudes en metros
+        barras_disponibles: Lista de longitudes de barras en metros
+        desperdicios_previos: Lista de longitudes de desperdicios en metros
+    
+    Returns:
+        Tuple: (piezas_df, barras_m, desperdicios_m) con longitudes float
+    """
+    piezas_m = piezas_df.copy()
+    col_longitud = 'longitud_pieza_requerida' if 'longitud_pieza_requerida' in piezas_m.columns else 'longitud'
+    piezas_m[col_longitud] = piezas_m[col_longitud].astype(float)
+    
+    barras_m = [float(barra) for barra in barras_disponibles]
+    desperdicios_m = [float(desperdicio) for desperdicio in desperdicios_previos]
+    
+    return piezas_m, barras_m, desperdicios_m
+
+
 def adaptar_entrada_completa(
     piezas_df: pd.DataFrame,
     barras_disponibles: List[float],
     desperdicios_previos: List[float],
     longitud_minima_desperdicio: float = 0.5,
     consolidar_piezas: bool = True,
-    limpiar_datos: bool = True
+    limpiar_datos: bool = True,
+    aritmetica_entera: bool = False
 ) -> Tuple[pd.DataFrame, List[Dict[str, Any]], List[Dict[str, Any]], Dict[str, Any]]:
     """
     Adaptación completa de entrada con todas las opciones de procesamiento.
@@ -339,6 +410,10 @@ def adaptar_entrada_completa(
         longitud_minima_desperdicio: Longitud mínima para desperdicios
         consolidar_piezas: Si consolidar piezas idénticas
         limpiar_datos: Si limpiar y normalizar datos
+        aritmetica_entera: Si cuantizar todas las longitudes a milímetros enteros.
+            El resumen se mantiene en metros y el formateador de salida convierte
+            los resultados de vuelta a metros. Sin aritmética entera, todas las
+            longitudes se convierten a metros float, aunque lleguen como enteros.
     
     Returns:
         Tuple: (piezas_df, barras_dict, desperdicios_dict, resumen)
@@ -356,9 +431,19 @@ def adaptar_entrada_completa(
     # Generar resumen antes de la adaptación
     resumen = generar_resumen_entrada(piezas_df, barras_disponibles, desperdicios_previos)
     
-    # Adaptar al formato del AG
+    # Cuantizar longitudes a milímetros enteros si se solicita; si no, asegurar metros float
+    if aritmetica_entera:
+        piezas_df, barras_disponibles, desperdicios_previos = cuantizar_entrada_a_milimetros(
+            piezas_df, barras_disponibles, desperdicios_previos
+        )
+    else:
+        piezas_df, barras_disponibles, desperdicios_previos = normalizar_entrada_a_metros(
+            piezas_df, barras_disponibles, desperdicios_previos
+        )
+    
+    # Adaptar al formato del AG, registrando la unidad de las longitudes
     piezas_adaptadas, barras_dict, desperdicios_dict = adaptar_entrada_para_ag(
-        piezas_df, barras_disponibles, desperdicios_previos
+        piezas_df, barras_disponibles, desperdicios_previos, en_milimetros=aritmetica_entera
     )
     
     return piezas_adaptadas, barras_dict, desperdicios_dict, resumen 
\ No newline at end of file
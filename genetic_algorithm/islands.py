@@ -0,0 +1,334 @@
+"""
+Modelo de islas para el algoritmo genético.
+
+Este módulo ejecuta varias subpoblaciones (islas) en procesos separados. Cada
+isla evoluciona de forma independiente, con su propia variante de configuración
+(estrategia de cruce, método de selección), y cada intervalo_migracion
+generaciones envía sus mejores individuos a la isla siguiente en un anillo.
+El proceso principal enruta los migrantes a través de tuberías y decide la
+parada con los mismos criterios que ejecutar_algoritmo_genetico. Cada isla
+consulta además el token de cancelación y el plazo de tiempo entre generaciones,
+de modo que una época larga no retrasa la parada.
+"""
+
+import math
+import multiprocessing
+import random
+import time
+from typing import List, Dict, Any, Optional, Tuple
+import numpy as np
+import pandas as pd
+
+from .chromosome import Cromosoma
+from .demand import compilar_demanda
+from .population import inicializar_poblacion
+from .fitness import CacheFitness
+from .metrics import RegistroEvolucion, CallbackProgreso
+from .engine import evolucionar_generacion, verificar_criterios_parada, _evaluar_poblacion
+from .lower_bound import calcular_cota_inferior
+from .cancellation import TokenCancelacion, CancelacionSolicitada
+from . import CONFIG_GA_DEFAULT
+
+
+def _ejecutar_isla(
+    indice_isla: int,
+    piezas_requeridas_df: pd.DataFrame,
+    barras_estandar_disponibles: List[Dict[str, Any]],
+    desperdicios_reutilizables_previos: List[Dict[str, Any]],
+    config_isla: Dict[str, Any],
+    semilla: int,
+    conexion,
+    fin_plazo: float,
+    token_cancelacion: Optional[TokenCancelacion] = None
+) -> None:
+    """
+    Bucle de una isla en su proceso hijo.
+
+    Tras cada época de intervalo_migracion generaciones envía
+    ('epoca', migrantes, estadisticas) y espera ('migrar', inmigrantes) o
+    ('detener',). Al detenerse responde ('final', mejor_cromosoma, resumen).
+    La época termina antes si se alcanza fin_plazo o se cancela el token; el
+    motivo viaja en estadisticas['motivo_cancelacion']. Una cancelación durante
+    la inicialización se comunica como ('cancelada', motivo) y cualquier otra
+    excepción como ('error', mensaje).
+    """
+    try:
+        random.seed(semilla)
+        np.random.seed(semilla % (2 ** 32))
+
+        registro = RegistroEvolucion()
+        registro.iniciar_registro(config_isla)
+
+        demanda = compilar_demanda(piezas_requeridas_df)
+        poblacion = inicializar_poblacion(
+            tamaño_poblacion=config_isla['tamaño_poblacion'],
+            piezas_requeridas_df=piezas_requeridas_df,
+            barras_estandar_disponibles=barras_estandar_disponibles,
+            desperdicios_reutilizables_previos=desperdicios_reutilizables_previos,
+            estrategia_inicializacion=config_isla['estrategia_inicializacion'],
+            config_ga=config_isla,
+            token_cancelacion=token_cancelacion
+        )
+
+        cache = None
+        if config_isla.get('cache_fitness', False):
+            cache = CacheFitness(config_isla.get('tamaño_cache_fitness', 10000))
+
+        valores_fitness = _evaluar_poblacion(poblacion, demanda, cache, registro)
+        registro.registrar_generacion(0, poblacion, valores_fitness, 0.0)
+
+        generacion = 1
+        num_migrantes = config_isla['num_migrantes']
+        while True:
+            for _ in range(config_isla['intervalo_migracion']):
+                if time.time() >= fin_plazo or (
+                    token_cancelacion is not None and token_cancelacion.cancelado
+                ):
+                    break
+                tiempo_inicio_generacion = time.time()
+                poblacion, valores_fitness = evolucionar_generacion(
+                    poblacion,
+                    valores_fitness,
+                    piezas_requeridas_df,
+                    barras_estandar_disponibles,
+                    desperdicios_reutilizables_previos,
+                    config_isla,
+                    demanda,
+                    cache,
+                    registro
+                )
+                registro.registrar_generacion(
+                    generacion, poblacion, valores_fitness, time.time() - tiempo_inicio_generacion
+                )
+                generacion += 1
+
+            # Emigran los mejores individuos de la isla
+            orden = sorted(range(len(poblacion)), key=lambda i: valores_fitness[i])
+            migrantes = [
+                (poblacion[i].clonar(), valores_fitness[i]) for i in orden[:num_migrantes]
+            ]
+            conexion.send(('epoca', migrantes, {
+                'fitness_promedio': registro.fitness_promedio_por_generacion[-1],
+                'diversidad': registro.diversidad_por_generacion[-1],
+                'evaluaciones': registro.evaluaciones_fitness_total,
+                'motivo_cancelacion': token_cancelacion.motivo if token_cancelacion is not None else None
+            }))
+
+            mensaje = conexion.recv()
+            if mensaje[0] == 'detener':
+                break
+
+            # Los inmigrantes reemplazan a los peores individuos de la isla
+            inmigrantes = mensaje[1]
+            for indice, (cromosoma, fitness) in zip(reversed(orden), inmigrantes):
+                poblacion[indice] = cromosoma
+                valores_fitness[indice] = fitness
+
+        registro.finalizar_registro()
+        conexion.send(('final', registro.mejor_cromosoma_global, registro.obtener_resumen()))
+    except CancelacionSolicitada as e:
+        conexion.send(('cancelada', e.motivo))
+    except Exception as e:
+        conexion.send(('error', f"Isla {indice_isla}: {type(e).__name__}: {e}"))
+    finally:
+        conexion.close()
+
+
+def ejecutar_modelo_islas(
+    piezas_requeridas_df: pd.DataFrame,
+    barras_estandar_disponibles: List[Dict[str, Any]],
+    desperdicios_reutilizables_previos: List[Dict[str, Any]],
+    config_ga: Optional[Dict[str, Any]] = None,
+    variantes_islas: Optional[List[Dict[str, Any]]] = None,
+    callback_progreso: Optional[CallbackProgreso] = None,
+    token_cancelacion: Optional[TokenCancelacion] = None
+) -> Tuple[Cromosoma, Dict[str, Any]]:
+    """
+    Ejecuta el algoritmo genético con el modelo de islas y migración en anillo.
+
+    Args:
+        piezas_requeridas_df: DataFrame con las piezas requeridas.
+        barras_estandar_disponibles: Lista de barras estándar disponibles.
+        desperdicios_reutilizables_previos: Lista de desperdicios reutilizables.
+        config_ga: Configuración del algoritmo genético. 'num_islas',
+            'intervalo_migracion' y 'num_migrantes' controlan el modelo; el
+            tamaño de población se aplica a cada isla.
+        variantes_islas: Parámetros que cada isla sobrescribe sobre config_ga
+            (por ejemplo 'estrategia_cruce' o 'metodo_seleccion'). La isla i usa
+            variantes_islas[i % len(variantes_islas)].
+        callback_progreso: Receptor de un evento por época con las estadísticas
+            agregadas de todas las islas.
+        token_cancelacion: Token de cancelación y límites de recursos. Cada isla
+            recibe una copia y la consulta entre generaciones (la cancelación le
+            llega a través de ruta_senal); al cancelarse, las islas se detienen
+            y se retorna el mejor cromosoma.
+
+    Returns:
+        Tuple[Cromosoma, Dict]: Mejor cromosoma de todas las islas y resumen con
+            'mejor_fitness_global', 'generaciones_ejecutadas',
+            'tiempo_total_segundos', 'num_islas', 'migraciones',
+            'mejor_fitness_por_isla', 'cota_inferior' y 'motivo_cancelacion'.
+
+    Raises:
+        ValueError: Si no hay piezas requeridas.
+        CancelacionSolicitada: Si la ejecución se cancela mientras las islas
+            inicializan su población (aún no hay resultado parcial).
+        RuntimeError: Si alguna isla falla durante la evolución.
+    """
+    config_completa = CONFIG_GA_DEFAULT.copy()
+    if config_ga is not None:
+        config_completa.update(config_ga)
+    config_ga = config_completa
+
+    if piezas_requeridas_df.empty:
+        raise ValueError("No hay piezas requeridas para optimizar")
+
+    tiempo_inicio = time.time()
+    fin_plazo = tiempo_inicio + config_ga.get('tiempo_limite_segundos', 300)
+    num_islas = max(1, config_ga['num_islas'])
+    intervalo_migracion = max(1, config_ga['intervalo_migracion'])
+
+    demanda = compilar_demanda(piezas_requeridas_df)
+    cota_inferior = None
+    if config_ga.get('parada_por_cota_inferior', False):
+        cota_inferior = calcular_cota_inferior(
+            demanda,
+            barras_estandar_disponibles,
+            desperdicios_reutilizables_previos
+        )
+
+    # El proceso principal evalúa la convergencia por épocas, no por generaciones
+    config_parada = {
+        **config_ga,
+        'generaciones_sin_mejora_max': max(
+            1, math.ceil(config_ga.get('generaciones_sin_mejora_max', 20) / intervalo_migracion)
+        )
+    }
+
+    contexto = multiprocessing.get_context()
+    semilla_base = random.randrange(2 ** 32)
+    conexiones = []
+    procesos = []
+    for indice in range(num_islas):
+        config_isla = {
+            **config_ga,
+            **(variantes_islas[indice % len(variantes_islas)] if variantes_islas else {}),
+            'intervalo_migracion': intervalo_migracion,
+            'paralelizar_evaluacion': False,  # Cada isla ya ocupa un proceso
+            'logging_habilitado': False
+        }
+        conexion_principal, conexion_isla = contexto.Pipe()
+        proceso = contexto.Process(
+            target=_ejecutar_isla,
+            args=(
+                indice,
+                piezas_requeridas_df,
+                barras_estandar_disponibles,
+                desperdicios_reutilizables_previos,
+                config_isla,
+                semilla_base + indice,
+                conexion_isla,
+                fin_plazo,
+                token_cancelacion
+            ),
+            daemon=True
+        )
+        proceso.start()
+        conexion_isla.close()
+        conexiones.append(conexion_principal)
+        procesos.append(proceso)
+
+    historial_mejor_fitness = []
+    mejor_cromosoma = None
+    mejor_fitness = float('inf')
+    generacion = 0
+    migraciones = 0
+    finales = []
+
+    def _recibir(conexion):
+        mensaje = conexion.recv()
+        if mensaje[0] == 'error':
+            raise RuntimeError(mensaje[1])
+        if mensaje[0] == 'cancelada':
+            raise CancelacionSolicitada(mensaje[1])
+        return mensaje
+
+    try:
+        while True:
+            epocas = [_recibir(conexion) for conexion in conexiones]
+            generacion += intervalo_migracion
+
+            # Una isla que cortó su época por cancelación la propaga al proceso principal
+            for _, _, estadisticas_isla in epocas:
+                motivo_isla = estadisticas_isla['motivo_cancelacion']
+                if motivo_isla is not None and token_cancelacion is not None:
+                    token_cancelacion.cancelar(motivo_isla)
+
+            mejor_fitness_epoca = min(migrantes[0][1] for _, migrantes, _ in epocas)
+            for _, migrantes, _ in epocas:
+                cromosoma, fitness = migrantes[0]
+                if fitness < mejor_fitness:
+                    mejor_cromosoma, mejor_fitness = cromosoma, fitness
+            historial_mejor_fitness.append(mejor_fitness)
+
+            if callback_progreso is not None:
+                tiempo_transcurrido = time.time() - tiempo_inicio
+                estadisticas = [estadisticas_isla for _, _, estadisticas_isla in epocas]
+                callback_progreso({
+                    'tipo': 'generacion',
+                    'generacion': generacion,
+                    'mejor_fitness': mejor_fitness_epoca,
+                    'mejor_fitness_global': mejor_fitness,
+                    'fitness_promedio': sum(e['fitness_promedio'] for e in estadisticas) / num_islas,
+                    'diversidad': sum(e['diversidad'] for e in estadisticas) / num_islas,
+                    'tiempo_transcurrido_segundos': tiempo_transcurrido,
+                    'evaluaciones_por_segundo': (
+                        sum(e['evaluaciones'] for e in estadisticas) / tiempo_transcurrido
+                        if tiempo_transcurrido > 0 else 0.0
+                    ),
+                    'num_islas': num_islas
+                })
+
+            if verificar_criterios_parada(
+                generacion,
+                historial_mejor_fitness,
+                tiempo_inicio,
+                config_parada,
+                mejor_cromosoma=mejor_cromosoma,
+                demanda=demanda,
+                cota_inferior=cota_inferior,
+                token_cancelacion=token_cancelacion
+            ):
+                break
+
+            # Migración en anillo: la isla i recibe los migrantes de la isla i - 1
+            for indice, conexion in enumerate(conexiones):
+                conexion.send(('migrar', epocas[indice - 1][1]))
+            migraciones += 1
+
+        for conexion in conexiones:
+            conexion.send(('detener',))
+        finales = [_recibir(conexion) for conexion in conexiones]
+    finally:
+        for proceso in procesos:
+            if proceso.is_alive() and not finales:
+                proceso.terminate()
+            proceso.join()
+        for conexion in conexiones:
+            conexion.close()
+
+    mejor_fitness_por_isla = [resumen['mejor_fitness_global'] for _, _, resumen in finales]
+    for _, cromosoma, resumen in finales:
+        if resumen['mejor_fitness_global'] < mejor_fitness:
+            mejor_cromosoma, mejor_fitness = cromosoma, resumen['mejor_fitness_global']
+
+    return mejor_cromosoma, {
+        'mejor_fitness_global': mejor_fitness,
+        'generaciones_ejecutadas': generacion,
+        'tiempo_total_segundos': time.time() - tiempo_inicio,
+        'num_islas': num_islas,
+        'migraciones': migraciones,
+        'mejor_fitness_por_isla': mejor_fitness_por_isla,
+        'cota_inferior': cota_inferior,
+        'motivo_cancelacion': token_cancelacion.motivo if token_cancelacion is not None else None
+    }
@@ -0,0 +1,433 @@
+"""
+Cota inferior de la relajación lineal de Gilmore–Gomory.
+
+Este módulo calcula, para un subproblema de corte (un número de barra y un
+grupo de ejecución), la longitud mínima de barras estándar que necesita
+cualquier plan que cubra la demanda. La relajación lineal se resuelve por
+generación de columnas: un simplex revisado resuelve el problema maestro
+restringido y, en cada iteración, se agregan los patrones de corte que la
+mochila de precios encuentra con costo reducido negativo.
+
+El modelo primal es:
+
+    min  sum_p L_p x_p              (solo patrones sobre barras estándar)
+    s.a. sum_p a_ip x_p >= d_i      para cada tipo de pieza i
+         sum_{p en j} x_p <= u_j    para cada longitud de desperdicio j
+         x_p >= 0
+
+Los desperdicios reutilizables tienen costo cero pero disponibilidad
+limitada. Con una única longitud de barra estándar, la cota equivale al
+número mínimo de barras redondeado hacia arriba.
+"""
+
+import heapq
+import math
+from functools import reduce
+from typing import List, Dict, Tuple, Any, Optional, Union
+import numpy as np
+import pandas as pd
+
+from .chromosome import Cromosoma
+from .demand import DemandaCompilada, compilar_demanda
+from .fitness import obtener_config_fitness_default
+from .units import a_metros, a_milimetros, milimetros_a_metros
+
+
+# Iteraciones máximas de generación de columnas; si no converge, no hay cota válida
+MAX_ITERACIONES_GENERACION_COLUMNAS = 500
+
+# Pivoteos máximos del simplex en cada resolución del problema maestro
+MAX_PIVOTEOS_SIMPLEX = 20_000
+
+# La inversa de la base se recalcula desde cero cada cierto número de pivoteos
+PIVOTEOS_ENTRE_REFACTORIZACIONES = 50
+
+TOLERANCIA_SIMPLEX = 1e-9
+
+
+class _ProblemaMaestro:
+    """
+    Problema maestro restringido, resuelto con el simplex revisado primal.
+
+    Las filas son las piezas (sum a_ip x_p - s_i = d_i) seguidas de los
+    desperdicios (sum x_p + t_j = u_j). Las columnas generadas se agregan sin
+    perder la base, de modo que cada resolución parte del óptimo anterior. La
+    base inicial (un patrón de una sola pieza por tipo y las holguras de los
+    desperdicios) es la identidad y ya es factible.
+    """
+
+    def __init__(self, cantidades: List[int], disponibles: List[int], costos_iniciales: List[float]):
+        num_piezas = len(cantidades)
+        self.num_filas = num_piezas + len(disponibles)
+        self.lado_derecho = np.array(cantidades + disponibles, dtype=np.float64)
+
+        identidad = np.eye(self.num_filas)
+        excedentes = -identidad[:, :num_piezas]
+        holguras = identidad[:, num_piezas:]
+        patrones_iniciales = identidad[:, :num_piezas]
+        self.columnas = np.hstack([excedentes, holguras, patrones_iniciales])
+        self.costos = np.array(
+            [0.0] * self.num_filas + list(costos_iniciales),
+            dtype=np.float64
+        )
+
+        self.base = list(range(self.num_filas, self.num_filas + num_piezas))
+        self.base += list(range(num_piezas, self.num_filas))
+        self.inversa_base = np.eye(self.num_filas)
+        self.valores_base = self.lado_derecho.copy()
+        self._pivoteos_sin_refactorizar = 0
+
+    def agregar_columna(self, columna: np.ndarray, costo: float) -> None:
+        """Agrega una columna (patrón) al problema maestro."""
+        self.columnas = np.hstack([self.columnas, columna.reshape(-1, 1)])
+        self.costos = np.append(self.costos, costo)
+
+    def duales(self) -> np.ndarray:
+        """Retorna los precios duales de la base actual."""
+        return self.costos[self.base] @ self.inversa_base
+
+    def valor(self) -> float:
+        """Retorna el valor objetivo de la base actual."""
+        return float(self.costos[self.base] @ self.valores_base)
+
+    def _refactorizar(self) -> None:
+        """Recalcula la inversa de la base para acotar el error numérico acumulado."""
+        self.inversa_base = np.linalg.inv(self.columnas[:, self.base])
+        self.valores_base = self.inversa_base @ self.lado_derecho
+        self._pivoteos_sin_refactorizar = 0
+
+    def resolver(self) -> bool:
+        """
+        Optimiza el problema maestro desde la base actual.
+
+        Se usa la regla de Dantzig y, tras un pivoteo degenerado, la regla de
+        Bland para evitar ciclos.
+
+        Returns:
+            bool: True si se alcanzó el óptimo, False si no converge.
+        """
+        usar_bland = False
+        for _ in range(MAX_PIVOTEOS_SIMPLEX):
+            costos_reducidos = self.costos - self.duales() @ self.columnas
+            tolerancia = TOLERANCIA_SIMPLEX * max(1.0, float(np.abs(self.costos).max()))
+            candidatas = np.flatnonzero(costos_reducidos < -tolerancia)
+            if candidatas.size == 0:
+                return True
+
+            if usar_bland:
+                entrante = int(candidatas[0])
+            else:
+                entrante = int(candidatas[np.argmin(costos_reducidos[candidatas])])
+
+            direccion = self.inversa_base @ self.columnas[:, entrante]
+            filas_validas = np.flatnonzero(direccion > TOLERANCIA_SIMPLEX)
+            if filas_validas.size == 0:
+                return False
+
+            razones = self.valores_base[filas_validas] / direccion[filas_validas]
+            razon_minima = razones.min()
+            empatadas = filas_validas[razones <= razon_minima + TOLERANCIA_SIMPLEX]
+            saliente = int(min(empatadas, key=lambda fila: self.base[fila]))
+            usar_bland = razon_minima <= TOLERANCIA_SIMPLEX
+
+            # Actualización de la inversa en forma producto
+            pivote = direccion[saliente]
+            self.valores_base -= razon_minima * direccion
+            self.valores_base[saliente] = razon_minima
+            fila_pivote = self.inversa_base[saliente] / pivote
+            self.inversa_base -= np.outer(direccion, fila_pivote)
+            self.inversa_base[saliente] = fila_pivote
+            self.base[saliente] = entrante
+
+            self._pivoteos_sin_refactorizar += 1
+            if self._pivoteos_sin_refactorizar >= PIVOTEOS_ENTRE_REFACTORIZACIONES:
+                self._refactorizar()
+
+        return False
+
+
+class _MochilaPrecios:
+    """
+    Mochila acotada de precios duales sobre longitudes enteras.
+
+    Cada tipo de pieza se descompone en bloques de 1, 2, 4, ... unidades para
+    resolver la mochila acotada como mochila 0/1. Una sola tabla hasta la
+    capacidad máxima sirve para todas las longitudes de barra, porque dp[c] es
+    el mejor valor con capacidad c.
+    """
+
+    def __init__(self, longitudes: List[int], cantidades: List[int], capacidad_maxima: int):
+        self.capacidad_maxima = capacidad_maxima
+        self.bloques: List[Tuple[int, int]] = []  # (tipo de pieza, unidades)
+        for tipo, (longitud, cantidad) in enumerate(zip(longitudes, cantidades)):
+            restantes = min(cantidad, capacidad_maxima // longitud)
+            unidades = 1
+            while restantes > 0:
+                tomadas = min(unidades, restantes)
+                self.bloques.append((tipo, tomadas))
+                restantes -= tomadas
+                unidades *= 2
+        self.longitudes = longitudes
+        self.valores = np.zeros(capacidad_maxima + 1)
+        self._tomados: List[np.ndarray] = []
+
+    def resolver(self, precios: np.ndarray) -> None:
+        """Calcula la tabla de valores máximos para los precios duales dados."""
+        valores = np.zeros(self.capacidad_maxima + 1)
+        self._tomados = []
+        for tipo, unidades in self.bloques:
+            peso = unidades * self.longitudes[tipo]
+            tomado = np.zeros(self.capacidad_maxima + 1, dtype=bool)
+            if precios[tipo] > TOLERANCIA_SIMPLEX:
+                candidato = valores[:-peso] + unidades * precios[tipo]
+                mejora = candidato > valores[peso:] + TOLERANCIA_SIMPLEX
+                tomado[peso:] = mejora
+                valores = valores.copy()
+                valores[peso:][mejora] = candidato[mejora]
+            self._tomados.append(tomado)
+        self.valores = valores
+
+    def patron(self, capacidad: int) -> Tuple[int, ...]:
+        """Reconstruye el patrón óptimo para una capacidad tras resolver()."""
+        conteos = [0] * len(self.longitudes)
+        for (tipo, unidades), tomado in zip(reversed(self.bloques), reversed(self._tomados)):
+            if tomado[capacidad]:
+                conteos[tipo] += unidades
+                capacidad -= unidades * self.longitudes[tipo]
+        return tuple(conteos)
+
+
+def _redondear_a_combinacion(valor: float, longitudes_barras: List[int]) -> int:
+    """
+    Redondea una longitud hacia arriba a la menor suma alcanzable de barras estándar.
+
+    Cualquier plan entero consume una suma de longitudes de barras estándar, así
+    que la cota puede subir hasta la primera suma alcanzable. Las sumas se
+    clasifican por su resto módulo la barra más corta: para cada resto se busca
+    la menor suma alcanzable (Dijkstra) y desde ella se avanza de a una barra corta.
+    """
+    minimo = max(0, math.ceil(valor - TOLERANCIA_SIMPLEX * max(1.0, valor)))
+    modulo = min(longitudes_barras)
+    menor_suma = [math.inf] * modulo
+    menor_suma[0] = 0
+    pendientes = [(0, 0)]
+    while pendientes:
+        suma, resto = heapq.heappop(pendientes)
+        if suma > menor_suma[resto]:
+            continue
+        for longitud in longitudes_barras:
+            nueva_suma = suma + longitud
+            nuevo_resto = nueva_suma % modulo
+            if nueva_suma < menor_suma[nuevo_resto]:
+                menor_suma[nuevo_resto] = nueva_suma
+                heapq.heappush(pendientes, (nueva_suma, nuevo_resto))
+
+    mejor = math.inf
+    for suma in menor_suma:
+        if suma < minimo:
+            suma += math.ceil((minimo - suma) / modulo) * modulo
+        mejor = min(mejor, suma)
+    return int(mejor)
+
+
+def calcular_cota_inferior(
+    piezas_requeridas: Union[pd.DataFrame, DemandaCompilada],
+    barras_estandar_disponibles: List[Dict[str, Any]],
+    desperdicios_reutilizables_previos: Optional[List[Dict[str, Any]]] = None,
+    max_iteraciones: int = MAX_ITERACIONES_GENERACION_COLUMNAS
+) -> Optional[Dict[str, Any]]:
+    """
+    Calcula la cota de Gilmore–Gomory sobre la longitud de barras estándar.
+
+    Args:
+        piezas_requeridas: DataFrame de piezas requeridas o demanda compilada.
+        barras_estandar_disponibles: Barras estándar (disponibilidad ilimitada).
+        desperdicios_reutilizables_previos: Desperdicios reutilizables, cada uno
+            disponible una sola vez.
+        max_iteraciones: Iteraciones máximas de generación de columnas.
+
+    Returns:
+        Optional[Dict]: 'valor_lp_mm' (óptimo de la relajación), 'longitud_minima_mm'
+            (cota redondeada a una suma alcanzable de barras), 'barras_minimas'
+            (cota sobre el número de barras estándar: la longitud mínima dividida
+            por la barra más larga, redondeada hacia arriba), 'iteraciones' y
+            'patrones_generados'. None si no hay demanda, alguna pieza no cabe en
+            ninguna barra estándar o la generación de columnas no converge.
+    """
+    demanda = compilar_demanda(piezas_requeridas)
+    en_milimetros = demanda.en_milimetros
+
+    # Tipos de pieza por longitud en milímetros; el id del pedido no afecta la cota
+    cantidades_por_longitud: Dict[int, int] = {}
+    for indice in range(demanda.num_tipos_demandados):
+        cantidad = int(demanda.cantidades_requeridas[indice])
+        if cantidad > 0:
+            longitud = a_milimetros(demanda.longitudes[indice], en_milimetros)
+            cantidades_por_longitud[longitud] = cantidades_por_longitud.get(longitud, 0) + cantidad
+
+    longitudes_estandar = sorted({a_milimetros(barra['longitud'], en_milimetros) for barra in barras_estandar_disponibles})
+    if not cantidades_por_longitud or not longitudes_estandar:
+        return None
+    if max(cantidades_por_longitud) > longitudes_estandar[-1]:
+        return None
+
+    disponibles_por_longitud: Dict[int, int] = {}
+    for desperdicio in desperdicios_reutilizables_previos or []:
+        longitud = a_milimetros(desperdicio['longitud'], en_milimetros)
+        if longitud >= min(cantidades_por_longitud):
+            disponibles_por_longitud[longitud] = disponibles_por_longitud.get(longitud, 0) + 1
+
+    # Todas las longitudes se expresan en múltiplos de su máximo común divisor
+    longitudes_piezas = sorted(cantidades_por_longitud)
+    longitudes_desperdicios = sorted(disponibles_por_longitud)
+    unidad = reduce(math.gcd, longitudes_piezas + longitudes_estandar + longitudes_desperdicios)
+    piezas = [longitud // unidad for longitud in longitudes_piezas]
+    estandar = [longitud // unidad for longitud in longitudes_estandar]
+    desperdicios = [longitud // unidad for longitud in longitudes_desperdicios]
+    cantidades = [cantidades_por_longitud[longitud] for longitud in longitudes_piezas]
+
+    # Patrones iniciales de una sola pieza en la barra estándar más corta donde cabe
+    num_piezas = len(piezas)
+    costos_iniciales = [
+        float(next(longitud_barra for longitud_barra in estandar if longitud_barra >= longitud))
+        for longitud in piezas
+    ]
+    maestro = _ProblemaMaestro(
+        cantidades,
+        [disponibles_por_longitud[longitud] for longitud in longitudes_desperdicios],
+        costos_iniciales
+    )
+    mochila = _MochilaPrecios(piezas, cantidades, max(estandar + desperdicios))
+    patrones_registrados = set()
+
+    for iteracion in range(1, max_iteraciones + 1):
+        if not maestro.resolver():
+            return None
+        duales = maestro.duales()
+        mochila.resolver(np.maximum(duales[:num_piezas], 0.0))
+
+        # Un patrón sobre una barra estándar cuesta su longitud; sobre el desperdicio j
+        # no cuesta, pero consume una unidad cuyo precio dual es -duales[n + j] >= 0
+        nuevos = 0
+        destinos = [(longitud, float(longitud), None) for longitud in estandar]
+        destinos += [
+            (longitud, -float(duales[num_piezas + j]), j)
+            for j, longitud in enumerate(desperdicios)
+        ]
+        for capacidad, limite, indice_desperdicio in destinos:
+            if mochila.valores[capacidad] <= limite + TOLERANCIA_SIMPLEX * max(1.0, limite):
+                continue
+            patron = mochila.patron(capacidad)
+            clave = (patron, capacidad, indice_desperdicio)
+            if clave in patrones_registrados:
+                continue
+            patrones_registrados.add(clave)
+
+            columna = np.zeros(maestro.num_filas)
+            columna[:num_piezas] = patron
+            if indice_desperdicio is None:
+                maestro.agregar_columna(columna, float(capacidad))
+            else:
+                columna[num_piezas + indice_desperdicio] = 1.0
+                maestro.agregar_columna(columna, 0.0)
+            nuevos += 1
+
+        if nuevos == 0:
+            valor = maestro.valor()
+            longitud_minima = _redondear_a_combinacion(valor, estandar) * unidad
+            return {
+                'valor_lp_mm': valor * unidad,
+                'longitud_minima_mm': longitud_minima,
+                'barras_minimas': math.ceil(longitud_minima / longitudes_estandar[-1]),
+                'iteraciones': iteracion,
+                'patrones_generados': len(patrones_registrados) + num_piezas
+            }
+
+    return None
+
+
+def calcular_cota_fitness(
+    cota: Optional[Dict[str, Any]],
+    piezas_requeridas: Union[pd.DataFrame, DemandaCompilada],
+    desperdicios_reutilizables_previos: Optional[List[Dict[str, Any]]] = None,
+    config_fitness: Optional[Dict[str, float]] = None
+) -> float:
+    """
+    Traduce la cota de barras estándar a una cota inferior del fitness de un plan exacto.
+
+    Ningún plan usa menos longitud ni menos barras estándar que la cota, y ninguno
+    ahorra más que usando todos los desperdicios en los que cabe alguna pieza.
+
+    Args:
+        cota: Resultado de calcular_cota_inferior, o None.
+        piezas_requeridas: DataFrame de piezas requeridas o demanda compilada.
+        desperdicios_reutilizables_previos: Desperdicios reutilizables.
+        config_fitness: Pesos del fitness. Si no se proporcionan, se usan los del AG.
+
+    Returns:
+        float: Cota inferior del fitness, o -inf si no hay cota.
+    """
+    if cota is None:
+        return -float('inf')
+    if config_fitness is None:
+        config_fitness = obtener_config_fitness_default()
+
+    demanda = compilar_demanda(piezas_requeridas)
+    longitudes_piezas = demanda.longitudes_metros[:demanda.num_tipos_demandados]
+    longitud_piezas = float((demanda.cantidades_requeridas * longitudes_piezas).sum())
+    pieza_menor = float(longitudes_piezas[demanda.cantidades_requeridas > 0].min())
+
+    peso_desperdicio = config_fitness.get('peso_desperdicio', 1.0)
+    costo_por_metro_desperdicio = peso_desperdicio - config_fitness.get('bonificacion_uso_desperdicios', 3.0)
+    ahorro_desperdicios = sum(
+        min(0.0, costo_por_metro_desperdicio * a_metros(desperdicio['longitud'], demanda.en_milimetros))
+        for desperdicio in desperdicios_reutilizables_previos or []
+        if a_metros(desperdicio['longitud'], demanda.en_milimetros) >= pieza_menor
+    )
+    return (
+        peso_desperdicio * milimetros_a_metros(cota['longitud_minima_mm'])
+        + config_fitness.get('penalizacion_num_barras_estandar', 5.0) * cota['barras_minimas']
+        + ahorro_desperdicios
+        - peso_desperdicio * longitud_piezas
+    )
+
+
+def alcanza_cota_inferior(
+    cromosoma: Optional[Cromosoma],
+    demanda: DemandaCompilada,
+    cota: Optional[Dict[str, Any]]
+) -> bool:
+    """
+    Indica si un cromosoma ya alcanza la cota inferior y no puede mejorarse en barras estándar.
+
+    Se exige un plan exacto (sin faltantes ni sobrantes) cuya longitud de barras
+    estándar sea la mínima y cuyo número de barras estándar sea el mínimo.
+
+    Args:
+        cromosoma: Cromosoma a comprobar (el mejor encontrado).
+        demanda: Demanda compilada de la ejecución.
+        cota: Resultado de calcular_cota_inferior, o None.
+
+    Returns:
+        bool: True si el cromosoma alcanza la cota.
+    """
+    if cromosoma is None or cota is None:
+        return False
+
+    resumen = cromosoma.obtener_resumen()
+    if resumen.num_barras_estandar > cota['barras_minimas']:
+        return False
+
+    longitud_estandar = sum(
+        a_milimetros(patron.origen_barra_longitud, patron.en_milimetros)
+        for patron in cromosoma.patrones
+        if patron.origen_barra_tipo == 'estandar'
+    )
+    if longitud_estandar > cota['longitud_minima_mm']:
+        return False
+
+    conteos, longitud_no_demandada = demanda.vectorizar_sumario(resumen.conteos_piezas)
+    return (
+        demanda.calcular_longitud_faltante(conteos) == 0
+        and demanda.calcular_longitud_sobrante(conteos, longitud_no_demandada) == 0
+    )
@@ -6,22 +6,32 @@ el progreso del algoritmo genético durante su ejecución.
 """
 
 import time
-from typing import List, Dict, Any, Optional, Tuple
+from typing import List, Dict, Any, Optional, Tuple, Callable
 import statistics
 import numpy as np
 
 from .chromosome import Cromosoma
 
 
+# Receptor de eventos de progreso: recibe un diccionario por evento
+CallbackProgreso = Callable[[Dict[str, Any]], None]
+
+
 class RegistroEvolucion:
     """
     Clase para mantener un registro completo de la evolución del algoritmo genético.
     
     Registra estadísticas por generación y métricas globales para análisis posterior.
+    Si tiene un callback_progreso, emite además un evento estructurado por generación.
     """
     
-    def __init__(self):
-        """Inicializa un nuevo registro de evolución."""
+    def __init__(self, callback_progreso: Optional[CallbackProgreso] = None):
+        """
+        Inicializa un nuevo registro de evolución.
+        
+        Args:
+            callback_progreso: Receptor de los eventos de progreso por generación.
+        """
         # Estadísticas por generación
         self.generaciones = []
         self.mejor_fitness_por_generacion = []
@@ -37,10 +47,20 @@ class RegistroEvolucion:
         self.tiempo_inicio = None
         self.tiempo_total = 0.0
         self.evaluaciones_fitness_total = 0
+        self.cache_fitness_aciertos = 0
+        self.cache_fitness_fallos = 0
+        self.cota_inferior = None
         
         # Configuración
         self.logging_habilitado = True
         self.logging_frecuencia = 10
+        self.callback_progreso = callback_progreso
+    
+    def __getstate__(self) -> Dict[str, Any]:
+        # El callback no se serializa (checkpoints, envío entre procesos)
+        estado = self.__dict__.copy()
+        estado['callback_progreso'] = None
+        return estado
     
     def iniciar_registro(self, config_ga: Optional[Dict[str, Any]] = None) -> None:
         """
@@ -98,6 +118,41 @@ class RegistroEvolucion:
         # Logging
         if self.logging_habilitado and generacion % self.logging_frecuencia == 0:
             self._log_generacion(generacion, mejor_fitness, fitness_promedio, diversidad)
+        
+        if self.callback_progreso is not None:
+            tiempo_transcurrido = time.time() - self.tiempo_inicio if self.tiempo_inicio else 0.0
+            self.callback_progreso({
+                'tipo': 'generacion',
+                'generacion': generacion,
+                'mejor_fitness': mejor_fitness,
+                'mejor_fitness_global': self.mejor_fitness_global,
+                'fitness_promedio': fitness_promedio,
+                'diversidad': diversidad,
+                'tiempo_transcurrido_segundos': tiempo_transcurrido,
+                'evaluaciones_por_segundo': (
+                    self.evaluaciones_fitness_total / tiempo_transcurrido if tiempo_transcurrido > 0 else 0.0
+                )
+            })
+    
+    def registrar_cache_fitness(self, aciertos: int, fallos: int) -> None:
+        """
+        Registra los contadores acumulados de la caché de fitness.
+        
+        Args:
+            aciertos: Evaluaciones resueltas desde la caché.
+            fallos: Evaluaciones que requirieron calcular el fitness.
+        """
+        self.cache_fitness_aciertos = aciertos
+        self.cache_fitness_fallos = fallos
+    
+    def registrar_cota_inferior(self, cota_inferior: Optional[Dict[str, Any]]) -> None:
+        """
+        Registra la cota inferior de Gilmore–Gomory calculada para la ejecución.
+        
+        Args:
+            cota_inferior: Resultado de calcular_cota_inferior, o None si no hay cota.
+        """
+        self.cota_inferior = cota_inferior
     
     def finalizar_registro(self) -> None:
         """Finaliza el registro y calcula métricas finales."""
@@ -123,7 +178,10 @@ class RegistroEvolucion:
                 self.mejor_fitness_por_generacion[0] - self.mejor_fitness_global
                 if self.mejor_fitness_por_generacion else 0
             ),
-            'convergencia_detectada': self._detectar_convergencia_final()
+            'convergencia_detectada': self._detectar_convergencia_final(),
+            'cache_fitness_aciertos': self.cache_fitness_aciertos,
+            'cache_fitness_fallos': self.cache_fitness_fallos,
+            'cota_inferior': self.cota_inferior
         }
     
     def _log_generacion(
@@ -11,7 +11,6 @@ from typing import List, Dict, Any, Optional
 import pandas as pd
 
 from .chromosome import Cromosoma, Patron
-from .chromosome_utils import calcular_sumario_piezas_en_cromosoma
 from .population import generar_individuo_heuristico_bfd
 
 
@@ -54,10 +53,11 @@ def mutacion_cambiar_origen_patron(
     # Seleccionar una nueva barra aleatoriamente
     nueva_barra = random.choice(barras_validas)
     
-    # Actualizar el patrón
-    patron.origen_barra_longitud = nueva_barra['longitud']
-    patron.origen_barra_tipo = nueva_barra.get('tipo', 'estandar')
-    patron._calcular_desperdicio()
+    # Actualizar el patrón (se copia si está compartido con otro cromosoma)
+    with cromosoma.editar_patron(indice_patron) as patron:
+        patron.origen_barra_longitud = nueva_barra['longitud']
+        patron.origen_barra_tipo = nueva_barra.get('tipo', 'estandar')
+        patron._calcular_desperdicio()
     
     return True
 
@@ -98,7 +98,7 @@ def mutacion_reoptimizar_patron(
     
     if len(cromosoma_temp.patrones) > 0:
         # Reemplazar el patrón original con el primer patrón optimizado
-        cromosoma.patrones[indice_patron] = cromosoma_temp.patrones[0]
+        cromosoma.reemplazar_patron(indice_patron, cromosoma_temp.patrones[0])
         return True
     
     return False
@@ -150,36 +150,38 @@ def mutacion_mover_pieza(
     if espacio_disponible < longitud_pieza:
         return False
     
-    # Realizar el movimiento
-    pieza_a_mover = patron_orig.piezas_cortadas[pieza_encontrada]
-    
-    # Reducir cantidad en el patrón origen
-    if pieza_a_mover['cantidad_pieza_en_patron'] > 1:
-        pieza_a_mover['cantidad_pieza_en_patron'] -= 1
-    else:
-        # Eliminar la pieza completamente
-        patron_orig.piezas_cortadas.pop(pieza_encontrada)
-    
-    # Añadir la pieza al patrón destino
-    pieza_existente = None
-    for pieza in patron_dest.piezas_cortadas:
-        if (pieza['id_pedido'] == pieza_info['id_pedido'] and
-            pieza['longitud_pieza'] == pieza_info['longitud_pieza']):
-            pieza_existente = pieza
-            break
-    
-    if pieza_existente:
-        pieza_existente['cantidad_pieza_en_patron'] += 1
-    else:
-        patron_dest.piezas_cortadas.append({
-            'id_pedido': pieza_info['id_pedido'],
-            'longitud_pieza': pieza_info['longitud_pieza'],
-            'cantidad_pieza_en_patron': 1
-        })
-    
-    # Recalcular desperdicios
-    patron_orig._calcular_desperdicio()
-    patron_dest._calcular_desperdicio()
+    # Realizar el movimiento sobre copias propias de ambos patrones
+    with cromosoma.editar_patron(patron_origen) as patron_orig, \
+            cromosoma.editar_patron(patron_destino) as patron_dest:
+        pieza_a_mover = patron_orig.piezas_cortadas[pieza_encontrada]
+        
+        # Reducir cantidad en el patrón origen
+        if pieza_a_mover['cantidad_pieza_en_patron'] > 1:
+            pieza_a_mover['cantidad_pieza_en_patron'] -= 1
+        else:
+            # Eliminar la pieza completamente
+            patron_orig.piezas_cortadas.pop(pieza_encontrada)
+        
+        # Añadir la pieza al patrón destino
+        pieza_existente = None
+        for pieza in patron_dest.piezas_cortadas:
+            if (pieza['id_pedido'] == pieza_info['id_pedido'] and
+                pieza['longitud_pieza'] == pieza_info['longitud_pieza']):
+                pieza_existente = pieza
+                break
+        
+        if pieza_existente:
+            pieza_existente['cantidad_pieza_en_patron'] += 1
+        else:
+            patron_dest.piezas_cortadas.append({
+                'id_pedido': pieza_info['id_pedido'],
+                'longitud_pieza': pieza_info['longitud_pieza'],
+                'cantidad_pieza_en_patron': 1
+            })
+        
+        # Recalcular desperdicios
+        patron_orig._calcular_desperdicio()
+        patron_dest._calcular_desperdicio()
     
     return True
 
@@ -198,8 +200,8 @@ def mutacion_ajustar_cantidad_piezas(
     Returns:
         bool: True si la mutación fue exitosa, False en caso contrario.
     """
-    # Calcular sumario actual
-    sumario_actual = calcular_sumario_piezas_en_cromosoma(cromosoma)
+    # Sumario actual, tomado del resumen incremental del cromosoma
+    sumario_actual = cromosoma.obtener_resumen().conteos_piezas
     
     # Crear diccionario de piezas requeridas
     piezas_requeridas = {}
@@ -227,30 +229,31 @@ def mutacion_ajustar_cantidad_piezas(
         clave_faltante, _ = random.choice(faltantes)
         id_pedido, longitud_pieza = clave_faltante
         
-        for patron in cromosoma.patrones:
+        for indice_patron, patron in enumerate(cromosoma.patrones):
             espacio_disponible = (patron.origen_barra_longitud - 
                                 sum(p['longitud_pieza'] * p['cantidad_pieza_en_patron'] 
                                     for p in patron.piezas_cortadas))
             
             if espacio_disponible >= longitud_pieza:
                 # Añadir la pieza
-                pieza_existente = None
-                for pieza in patron.piezas_cortadas:
-                    if (pieza['id_pedido'] == id_pedido and
-                        pieza['longitud_pieza'] == longitud_pieza):
-                        pieza_existente = pieza
-                        break
-                
-                if pieza_existente:
-                    pieza_existente['cantidad_pieza_en_patron'] += 1
-                else:
-                    patron.piezas_cortadas.append({
-                        'id_pedido': id_pedido,
-                        'longitud_pieza': longitud_pieza,
-                        'cantidad_pieza_en_patron': 1
-                    })
-                
-                patron._calcular_desperdicio()
+                with cromosoma.editar_patron(indice_patron) as patron:
+                    pieza_existente = None
+                    for pieza in patron.piezas_cortadas:
+                        if (pieza['id_pedido'] == id_pedido and
+                            pieza['longitud_pieza'] == longitud_pieza):
+                            pieza_existente = pieza
+                            break
+                    
+                    if pieza_existente:
+                        pieza_existente['cantidad_pieza_en_patron'] += 1
+                    else:
+                        patron.piezas_cortadas.append({
+                            'id_pedido': id_pedido,
+                            'longitud_pieza': longitud_pieza,
+                            'cantidad_pieza_en_patron': 1
+                        })
+                    
+                    patron._calcular_desperdicio()
                 return True
     
     elif sobrantes:
@@ -258,17 +261,19 @@ def mutacion_ajustar_cantidad_piezas(
         clave_sobrante, _ = random.choice(sobrantes)
         id_pedido, longitud_pieza = clave_sobrante
         
-        for patron in cromosoma.patrones:
+        for indice_patron, patron in enumerate(cromosoma.patrones):
             for i, pieza in enumerate(patron.piezas_cortadas):
                 if (pieza['id_pedido'] == id_pedido and
                     pieza['longitud_pieza'] == longitud_pieza):
                     
-                    if pieza['cantidad_pieza_en_patron'] > 1:
-                        pieza['cantidad_pieza_en_patron'] -= 1
-                    else:
-                        patron.piezas_cortadas.pop(i)
-                    
-                    patron._calcular_desperdicio()
+                    with cromosoma.editar_patron(indice_patron) as patron:
+                        pieza = patron.piezas_cortadas[i]
+                        if pieza['cantidad_pieza_en_patron'] > 1:
+                            pieza['cantidad_pieza_en_patron'] -= 1
+                        else:
+                            patron.piezas_cortadas.pop(i)
+                        
+                        patron._calcular_desperdicio()
                     return True
     
     return False
@@ -324,18 +329,20 @@ def mutacion_dividir_patron(
     patron1 = Patron(
         origen_barra_longitud=barra1['longitud'],
         origen_barra_tipo=barra1.get('tipo', 'estandar'),
-        piezas_cortadas=copy.deepcopy(grupo1)
+        piezas_cortadas=copy.deepcopy(grupo1),
+        en_milimetros=patron.en_milimetros
     )
     
     patron2 = Patron(
         origen_barra_longitud=barra2['longitud'],
         origen_barra_tipo=barra2.get('tipo', 'estandar'),
-        piezas_cortadas=copy.deepcopy(grupo2)
+        piezas_cortadas=copy.deepcopy(grupo2),
+        en_milimetros=patron.en_milimetros
     )
     
     # Reemplazar el patrón original con los dos nuevos
-    cromosoma.patrones[indice_patron] = patron1
-    cromosoma.patrones.insert(indice_patron + 1, patron2)
+    cromosoma.reemplazar_patron(indice_patron, patron1)
+    cromosoma.insertar_patron(indice_patron + 1, patron2)
     
     return True
 
@@ -401,17 +408,18 @@ def mutacion_combinar_patrones(
     patron_combinado = Patron(
         origen_barra_longitud=barra_seleccionada['longitud'],
         origen_barra_tipo=barra_seleccionada.get('tipo', 'estandar'),
-        piezas_cortadas=todas_las_piezas
+        piezas_cortadas=todas_las_piezas,
+        en_milimetros=patron1.en_milimetros
     )
     
     # Reemplazar los patrones originales
     # Eliminar el patrón con índice mayor primero para no afectar los índices
     if indice1 > indice2:
-        cromosoma.patrones.pop(indice1)
-        cromosoma.patrones[indice2] = patron_combinado
+        cromosoma.eliminar_patron(indice1)
+        cromosoma.reemplazar_patron(indice2, patron_combinado)
     else:
-        cromosoma.patrones.pop(indice2)
-        cromosoma.patrones[indice1] = patron_combinado
+        cromosoma.eliminar_patron(indice2)
+        cromosoma.reemplazar_patron(indice1, patron_combinado)
     
     return True
 
@@ -447,8 +455,8 @@ def mutar(
     if random.random() > tasa_mutacion_individuo:
         return cromosoma
     
-    # Crear una copia del cromosoma para mutar
-    cromosoma_mutado = copy.deepcopy(cromosoma)
+    # Crear una copia del cromosoma para mutar; los patrones se copian al modificarse
+    cromosoma_mutado = cromosoma.clonar()
     
     # Obtener operaciones de mutación habilitadas
     operaciones_mutacion = config_ga.get('operaciones_mutacion', [
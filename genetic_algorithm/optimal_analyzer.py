@@ -6,27 +6,155 @@ la combinación óptima de longitudes de barras en casos donde hay pocas
 variaciones en las longitudes requeridas.
 """
 
-from typing import List, Dict, Tuple, Any
+from typing import List, Dict, Tuple, Any, Optional
 import pandas as pd
-from itertools import product
-import math
+
+from .units import a_milimetros
+
+
+# Límite de estados (tipos de barra × piezas) de la programación dinámica; por
+# encima se usa una aproximación voraz para no bloquear la inicialización
+MAX_ESTADOS_PROGRAMACION_DINAMICA = 2_000_000
+
+CostoCombinacion = Tuple[int, int]  # (longitud total de barras, número de barras)
+
+
+def _tablas_costo_minimo(
+    cantidad_requerida: int,
+    piezas_por_tipo: List[int],
+    longitudes_enteras: List[int]
+) -> List[List[Optional[CostoCombinacion]]]:
+    """
+    Calcula las tablas de costo mínimo para cubrir q piezas con los tipos de barra i en adelante.
+    
+    tablas[i][q] es el menor (longitud total, número de barras), en orden
+    lexicográfico, de una combinación de barras de los tipos i..m-1 que produce al
+    menos q piezas, o None si no existe. Minimizar la longitud total equivale a
+    minimizar el desperdicio, porque la longitud de las piezas requeridas es fija.
+    """
+    num_tipos = len(piezas_por_tipo)
+    tablas: List[List[Optional[CostoCombinacion]]] = [[] for _ in range(num_tipos + 1)]
+    tablas[num_tipos] = [(0, 0)] + [None] * cantidad_requerida
+    
+    for i in reversed(range(num_tipos)):
+        piezas = piezas_por_tipo[i]
+        longitud = longitudes_enteras[i]
+        actual = list(tablas[i + 1])
+        
+        if piezas > 0:
+            # Problema de cambio de monedas no acotado: una barra de tipo i más el
+            # mejor costo para las piezas restantes con los mismos tipos
+            for q in range(1, cantidad_requerida + 1):
+                previo = actual[q - piezas] if q > piezas else actual[0]
+                if previo is not None:
+                    candidato = (previo[0] + longitud, previo[1] + 1)
+                    if actual[q] is None or candidato < actual[q]:
+                        actual[q] = candidato
+        
+        tablas[i] = actual
+    
+    return tablas
+
+
+def _combinacion_programacion_dinamica(
+    cantidad_requerida: int,
+    piezas_por_tipo: List[int],
+    longitudes_enteras: List[int]
+) -> Optional[List[int]]:
+    """
+    Obtiene la combinación de barras de menor desperdicio y, a igualdad, menos barras.
+    
+    Entre las combinaciones empatadas retorna la menor en orden lexicográfico, la
+    misma que encontraría primero la enumeración exhaustiva.
+    
+    Returns:
+        Optional[List[int]]: Cantidad de barras de cada tipo, o None si ninguna
+            combinación cubre la demanda.
+    """
+    tablas = _tablas_costo_minimo(cantidad_requerida, piezas_por_tipo, longitudes_enteras)
+    if tablas[0][cantidad_requerida] is None:
+        return None
+    
+    combinacion = []
+    restantes = cantidad_requerida
+    for i, (piezas, longitud) in enumerate(zip(piezas_por_tipo, longitudes_enteras)):
+        objetivo = tablas[i][restantes]
+        cantidad = 0
+        while True:
+            siguiente = max(0, restantes - cantidad * piezas)
+            costo_resto = tablas[i + 1][siguiente]
+            if (costo_resto is not None and
+                    (costo_resto[0] + cantidad * longitud, costo_resto[1] + cantidad) == objetivo):
+                break
+            cantidad += 1
+        combinacion.append(cantidad)
+        restantes = max(0, restantes - cantidad * piezas)
+    
+    return combinacion
+
+
+def _combinacion_voraz(
+    cantidad_requerida: int,
+    piezas_por_tipo: List[int],
+    longitudes_enteras: List[int]
+) -> Optional[List[int]]:
+    """
+    Aproxima la combinación de barras cuando la programación dinámica es demasiado grande.
+    
+    Usa barras completas del tipo con menor longitud por pieza y cubre el resto
+    con la barra más corta que lo admite.
+    
+    Returns:
+        Optional[List[int]]: Cantidad de barras de cada tipo, o None si ninguna
+            barra admite la pieza.
+    """
+    tipos_validos = [i for i, piezas in enumerate(piezas_por_tipo) if piezas > 0]
+    if not tipos_validos:
+        return None
+    
+    combinacion = [0] * len(piezas_por_tipo)
+    # Menor longitud de barra por pieza; a igualdad, la barra más corta
+    mejor = min(
+        tipos_validos,
+        key=lambda i: (longitudes_enteras[i] / piezas_por_tipo[i], longitudes_enteras[i])
+    )
+    combinacion[mejor], resto = divmod(cantidad_requerida, piezas_por_tipo[mejor])
+    
+    if resto > 0:
+        tipos_resto = [i for i in tipos_validos if piezas_por_tipo[i] >= resto]
+        tipo_resto = min(tipos_resto, key=lambda i: longitudes_enteras[i]) if tipos_resto else mejor
+        combinacion[tipo_resto] += 1
+    
+    return combinacion
 
 
 def calcular_solucion_optima_homogenea(
     longitud_pieza: float,
     cantidad_requerida: int,
-    longitudes_barras: List[float]
+    longitudes_barras: List[float],
+    max_estados: int = MAX_ESTADOS_PROGRAMACION_DINAMICA,
+    en_milimetros: bool = False
 ) -> Dict[str, Any]:
     """
     Calcula la solución óptima para un caso homogéneo (una sola longitud de pieza).
     
+    Resuelve por programación dinámica sobre el número de piezas (cambio de
+    monedas no acotado con longitudes enteras en milímetros), en tiempo
+    proporcional a cantidad_requerida × número de tipos de barra. Si ese tamaño
+    supera max_estados se retorna una aproximación voraz.
+    
     Args:
         longitud_pieza: Longitud de la pieza requerida
         cantidad_requerida: Cantidad total de piezas requeridas
         longitudes_barras: Lista de longitudes de barras disponibles
+        max_estados: Tamaño máximo de la programación dinámica antes de recurrir
+            a la aproximación voraz
+        en_milimetros: Si las longitudes están en milímetros enteros
     
     Returns:
-        Dict: Diccionario con la solución óptima
+        Dict: Diccionario con la solución óptima, o None si ninguna barra admite
+            la pieza. La clave 'metodo' indica si se obtuvo por
+            'programacion_dinamica' o de forma 'voraz'.
     """
     
     # Calcular cuántas piezas caben en cada tipo de barra
@@ -40,71 +168,54 @@ def calcular_solucion_optima_homogenea(
         piezas_por_barra[longitud_barra] = piezas_caben
         desperdicio_por_barra[longitud_barra] = desperdicio
     
-    # Generar todas las combinaciones posibles
-    mejor_solucion = None
-    menor_desperdicio_total = float('inf')
-    menor_num_barras = float('inf')
+    piezas_por_tipo = [piezas_por_barra[longitud_barra] for longitud_barra in longitudes_barras]
+    longitudes_enteras = [a_milimetros(longitud_barra, en_milimetros) for longitud_barra in longitudes_barras]
     
-    # Calcular límite superior para cada tipo de barra
-    limites = []
-    for longitud_barra in longitudes_barras:
-        if piezas_por_barra[longitud_barra] > 0:
-            limite = math.ceil(cantidad_requerida / piezas_por_barra[longitud_barra])
-        else:
-            limite = 0
-        limites.append(limite)
-    
-    # Evaluar todas las combinaciones
-    for combinacion in product(*[range(limite + 1) for limite in limites]):
-        # Verificar si esta combinación satisface la demanda
-        piezas_totales = sum(
-            combinacion[i] * piezas_por_barra[longitudes_barras[i]]
+    if (cantidad_requerida + 1) * len(longitudes_barras) <= max_estados:
+        metodo = 'programacion_dinamica'
+        combinacion = _combinacion_programacion_dinamica(cantidad_requerida, piezas_por_tipo, longitudes_enteras)
+    else:
+        metodo = 'voraz'
+        combinacion = _combinacion_voraz(cantidad_requerida, piezas_por_tipo, longitudes_enteras)
+    
+    if combinacion is None:
+        return None
+    
+    # Calcular métricas de la combinación elegida
+    piezas_totales = sum(
+        combinacion[i] * piezas_por_barra[longitudes_barras[i]]
+        for i in range(len(longitudes_barras))
+    )
+    num_barras_total = sum(combinacion)
+    desperdicio_total = sum(
+        combinacion[i] * desperdicio_por_barra[longitudes_barras[i]]
+        for i in range(len(longitudes_barras))
+    )
+    
+    # Ajustar por exceso de piezas producidas
+    exceso_piezas = piezas_totales - cantidad_requerida
+    desperdicio_por_exceso = exceso_piezas * longitud_pieza
+    desperdicio_total += desperdicio_por_exceso
+    
+    return {
+        'combinacion_barras': dict(zip(longitudes_barras, combinacion)),
+        'piezas_producidas': piezas_totales,
+        'piezas_exceso': exceso_piezas,
+        'desperdicio_total': desperdicio_total,
+        'num_barras_total': num_barras_total,
+        'eficiencia': 1 - (desperdicio_total / sum(
+            combinacion[i] * longitudes_barras[i]
             for i in range(len(longitudes_barras))
-        )
-        
-        if piezas_totales >= cantidad_requerida:
-            # Calcular métricas de esta combinación
-            num_barras_total = sum(combinacion)
-            desperdicio_total = sum(
-                combinacion[i] * desperdicio_por_barra[longitudes_barras[i]]
-                for i in range(len(longitudes_barras))
-            )
-            
-            # Ajustar por exceso de piezas producidas
-            exceso_piezas = piezas_totales - cantidad_requerida
-            desperdicio_por_exceso = exceso_piezas * longitud_pieza
-            desperdicio_total += desperdicio_por_exceso
-            
-            # Evaluar si es mejor que la solución actual
-            es_mejor = False
-            if desperdicio_total < menor_desperdicio_total:
-                es_mejor = True
-            elif desperdicio_total == menor_desperdicio_total and num_barras_total < menor_num_barras:
-                es_mejor = True
-            
-            if es_mejor:
-                menor_desperdicio_total = desperdicio_total
-                menor_num_barras = num_barras_total
-                
-                mejor_solucion = {
-                    'combinacion_barras': dict(zip(longitudes_barras, combinacion)),
-                    'piezas_producidas': piezas_totales,
-                    'piezas_exceso': exceso_piezas,
-                    'desperdicio_total': desperdicio_total,
-                    'num_barras_total': num_barras_total,
-                    'eficiencia': 1 - (desperdicio_total / sum(
-                        combinacion[i] * longitudes_barras[i]
-                        for i in range(len(longitudes_barras))
-                    )) if num_barras_total > 0 else 0
-                }
-    
-    return mejor_solucion
+        )) if num_barras_total > 0 else 0,
+        'metodo': metodo
+    }
 
 
 def analizar_casos_homogeneos(
     piezas_requeridas_df: pd.DataFrame,
     longitudes_barras: List[float],
-    tolerancia_homogeneidad: float = 0.01
+    tolerancia_homogeneidad: float = 0.01,
+    en_milimetros: bool = False
 ) -> Dict[Tuple[Any, float], Dict[str, Any]]:
     """
     Identifica y analiza casos homogéneos en el DataFrame de piezas requeridas.
@@ -113,6 +224,7 @@ def analizar_casos_homogeneos(
         piezas_requeridas_df: DataFrame con las piezas requeridas
         longitudes_barras: Lista de longitudes de barras disponibles
         tolerancia_homogeneidad: Tolerancia para considerar longitudes como iguales
+        en_milimetros: Si las longitudes están en milímetros enteros
     
     Returns:
         Dict: Diccionario con análisis de casos homogéneos
@@ -150,7 +262,7 @@ def analizar_casos_homogeneos(
         # Solo analizar si hay una cantidad significativa
         if cantidad_total >= 10:  # Umbral mínimo
             solucion_optima = calcular_solucion_optima_homogenea(
-                longitud_pieza, cantidad_total, longitudes_barras
+                longitud_pieza, cantidad_total, longitudes_barras, en_milimetros=en_milimetros
             )
             
             # Crear clave identificadora
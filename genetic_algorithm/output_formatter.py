@@ -7,6 +7,7 @@ al formato esperado por el sistema principal en main.py.
 
 from typing import List, Dict, Any, Tuple
 from .chromosome import Cromosoma, Patron
+from .units import a_metros
 
 
 def formatear_salida_desde_cromosoma(
@@ -16,6 +17,9 @@ def formatear_salida_desde_cromosoma(
     """
     Convierte un cromosoma del AG al formato esperado por main.py.
     
+    Las longitudes en milímetros enteros (modo de aritmética entera) se convierten
+    a metros, de modo que la salida siempre se expresa en metros.
+    
     Args:
         mejor_cromosoma: El mejor cromosoma encontrado por el algoritmo genético.
         longitud_minima_desperdicio: Longitud mínima para considerar un desperdicio utilizable.
@@ -35,8 +39,9 @@ def formatear_salida_desde_cromosoma(
         patrones_de_corte_generados.append(patron_dict)
         
         # Extraer desperdicios utilizables
-        if patron.es_desperdicio_utilizable and patron.desperdicio_patron_longitud >= longitud_minima_desperdicio:
-            nuevos_desperdicios_utilizables.append(round(patron.desperdicio_patron_longitud, 3))
+        desperdicio_metros = a_metros(patron.desperdicio_patron_longitud, patron.en_milimetros)
+        if patron.es_desperdicio_utilizable and desperdicio_metros >= longitud_minima_desperdicio:
+            nuevos_desperdicios_utilizables.append(round(desperdicio_metros, 3))
     
     # Validar formato de salida
     if not validar_formato_salida(patrones_de_corte_generados, nuevos_desperdicios_utilizables):
@@ -60,7 +65,7 @@ def patron_a_dict(patron: Patron) -> Dict[str, Any]:
     piezas_obtenidas = []
     
     for pieza_info in patron.piezas_cortadas:
-        longitud_pieza = pieza_info['longitud_pieza']
+        longitud_pieza = a_metros(pieza_info['longitud_pieza'], patron.en_milimetros)
         cantidad_en_patron = pieza_info['cantidad_pieza_en_patron']
         id_pedido = pieza_info['id_pedido']
         
@@ -73,10 +78,10 @@ def patron_a_dict(patron: Patron) -> Dict[str, Any]:
             })
     
     return {
-        'barra_origen_longitud': patron.origen_barra_longitud,
+        'barra_origen_longitud': a_metros(patron.origen_barra_longitud, patron.en_milimetros),
         'cortes_realizados': cortes_realizados,
         'piezas_obtenidas': piezas_obtenidas,
-        'desperdicio_resultante': round(patron.desperdicio_patron_longitud, 3)
+        'desperdicio_resultante': round(a_metros(patron.desperdicio_patron_longitud, patron.en_milimetros), 3)
     }
 
 
@@ -97,8 +102,9 @@ def extraer_desperdicios_utilizables(
     desperdicios = []
     
     for patron in cromosoma.patrones:
-        if patron.es_desperdicio_utilizable and patron.desperdicio_patron_longitud >= longitud_minima:
-            desperdicios.append(round(patron.desperdicio_patron_longitud, 3))
+        desperdicio_metros = a_metros(patron.desperdicio_patron_longitud, patron.en_milimetros)
+        if patron.es_desperdicio_utilizable and desperdicio_metros >= longitud_minima:
+            desperdicios.append(round(desperdicio_metros, 3))
     
     return sorted(desperdicios, reverse=True)  # Ordenar de mayor a menor
 
@@ -280,12 +286,13 @@ def convertir_cromosoma_a_formato_legacy(cromosoma: Cromosoma) -> List[Dict[str,
     patrones_legacy = []
     
     for patron in cromosoma.patrones:
+        longitud_barra = a_metros(patron.origen_barra_longitud, patron.en_milimetros)
         patron_legacy = {
-            'barra_origen': f"{patron.origen_barra_tipo}_{patron.origen_barra_longitud}m",
-            'longitud_barra': patron.origen_barra_longitud,
+            'barra_origen': f"{patron.origen_barra_tipo}_{longitud_barra}m",
+            'longitud_barra': longitud_barra,
             'tipo_barra': patron.origen_barra_tipo,
             'cortes': [],
-            'desperdicio': patron.desperdicio_patron_longitud,
+            'desperdicio': a_metros(patron.desperdicio_patron_longitud, patron.en_milimetros),
             'utilizable': patron.es_desperdicio_utilizable
         }
         
@@ -293,7 +300,7 @@ def convertir_cromosoma_a_formato_legacy(cromosoma: Cromosoma) -> List[Dict[str,
             for _ in range(pieza_info['cantidad_pieza_en_patron']):
                 patron_legacy['cortes'].append({
                     'pedido': pieza_info['id_pedido'],
-                    'longitud': pieza_info['longitud_pieza']
+                    'longitud': a_metros(pieza_info['longitud_pieza'], patron.en_milimetros)
                 })
         
         patrones_legacy.append(patron_legacy)
@@ -0,0 +1,226 @@
+"""
+Evaluación y generación de descendencia en paralelo.
+
+Este módulo implementa la opción 'paralelizar_evaluacion' del algoritmo
+genético. Un EvaluadorParalelo reparte en lotes la evaluación de fitness y la
+generación de descendencia (cruce, reparación y mutación) entre los procesos
+de un ProcessPoolExecutor. Para la evolución asíncrona también envía tareas
+individuales (pareja → hijos → fitness) cuyo resultado se recoge como Future.
+
+Cada proceso recibe una sola vez, al inicializarse, la demanda compilada, las
+barras disponibles y la configuración; las tareas solo transportan los
+cromosomas del lote.
+"""
+
+import os
+import random
+from concurrent.futures import ProcessPoolExecutor, Future
+from typing import List, Dict, Any, Optional, Tuple
+import pandas as pd
+
+from .chromosome import Cromosoma
+from .demand import DemandaCompilada
+from .fitness import calcular_fitness_poblacion
+from .crossover import cruzar
+from .mutation import mutar
+
+
+# Estado de cada proceso trabajador, fijado por _inicializar_trabajador
+_ESTADO_TRABAJADOR: Dict[str, Any] = {}
+
+
+def _inicializar_trabajador(
+    piezas_requeridas_df: pd.DataFrame,
+    demanda: DemandaCompilada,
+    barras_estandar_disponibles: List[Dict[str, Any]],
+    desperdicios_reutilizables_previos: List[Dict[str, Any]],
+    config_ga: Dict[str, Any],
+    semilla: int
+) -> None:
+    """
+    Inicializa el estado compartido de un proceso trabajador.
+
+    La semilla se combina con el PID para que los trabajadores no repitan la
+    misma secuencia aleatoria al heredar el estado del proceso principal.
+    """
+    _ESTADO_TRABAJADOR.update({
+        'piezas_requeridas_df': piezas_requeridas_df,
+        'demanda': demanda,
+        'barras_estandar_disponibles': barras_estandar_disponibles,
+        'desperdicios_reutilizables_previos': desperdicios_reutilizables_previos,
+        'config_ga': config_ga,
+        'config_cruce': {
+            **config_ga,
+            'barras_disponibles': barras_estandar_disponibles,
+            'desperdicios_disponibles': desperdicios_reutilizables_previos
+        }
+    })
+    random.seed(semilla ^ os.getpid())
+
+
+def _evaluar_lote(lote: List[Cromosoma]) -> List[float]:
+    """Calcula el fitness de un lote de cromosomas en el proceso trabajador."""
+    return calcular_fitness_poblacion(lote, _ESTADO_TRABAJADOR['demanda'])
+
+
+def _mutar_en_trabajador(cromosoma: Cromosoma) -> Cromosoma:
+    """Aplica el operador de mutación con el estado del proceso trabajador."""
+    config_ga = _ESTADO_TRABAJADOR['config_ga']
+    return mutar(
+        cromosoma=cromosoma,
+        piezas_requeridas_df=_ESTADO_TRABAJADOR['piezas_requeridas_df'],
+        barras_estandar_disponibles=_ESTADO_TRABAJADOR['barras_estandar_disponibles'],
+        desperdicios_reutilizables_previos=_ESTADO_TRABAJADOR['desperdicios_reutilizables_previos'],
+        tasa_mutacion_individuo=config_ga['tasa_mutacion_individuo'],
+        tasa_mutacion_gen=config_ga['tasa_mutacion_gen'],
+        config_ga=config_ga
+    )
+
+
+def _generar_descendencia_lote(parejas: List[Tuple[Cromosoma, Cromosoma]]) -> List[Cromosoma]:
+    """Cruza, repara y muta un lote de parejas en el proceso trabajador."""
+    config_ga = _ESTADO_TRABAJADOR['config_ga']
+    hijos = []
+    for padre1, padre2 in parejas:
+        hijo1, hijo2 = cruzar(
+            padre1_cromosoma=padre1,
+            padre2_cromosoma=padre2,
+            piezas_requeridas_df=_ESTADO_TRABAJADOR['piezas_requeridas_df'],
+            tasa_cruce=config_ga['tasa_cruce'],
+            estrategia_cruce=config_ga['estrategia_cruce'],
+            config_ga=_ESTADO_TRABAJADOR['config_cruce']
+        )
+        hijos.append(_mutar_en_trabajador(hijo1))
+        hijos.append(_mutar_en_trabajador(hijo2))
+    return hijos
+
+
+def _mutar_lote(lote: List[Cromosoma]) -> List[Cromosoma]:
+    """Muta un lote de cromosomas en el proceso trabajador."""
+    return [_mutar_en_trabajador(cromosoma) for cromosoma in lote]
+
+
+def _generar_y_evaluar_pareja(pareja: Tuple[Cromosoma, Cromosoma]) -> Tuple[List[Cromosoma], List[float]]:
+    """Cruza, repara, muta y evalúa los dos hijos de una pareja en el proceso trabajador."""
+    hijos = _generar_descendencia_lote([pareja])
+    return hijos, _evaluar_lote(hijos)
+
+
+def _dividir_en_lotes(elementos: List[Any], tamaño_lote: int) -> List[List[Any]]:
+    """Divide una lista en lotes consecutivos de tamaño máximo tamaño_lote."""
+    return [elementos[i:i + tamaño_lote] for i in range(0, len(elementos), tamaño_lote)]
+
+
+class EvaluadorParalelo:
+    """
+    Reparte la evaluación de fitness y la generación de descendencia entre procesos.
+
+    Los resultados conservan el orden de entrada. Debe cerrarse con cerrar() o
+    usarse como gestor de contexto para liberar los procesos.
+    """
+
+    def __init__(
+        self,
+        piezas_requeridas_df: pd.DataFrame,
+        demanda: DemandaCompilada,
+        barras_estandar_disponibles: List[Dict[str, Any]],
+        desperdicios_reutilizables_previos: List[Dict[str, Any]],
+        config_ga: Dict[str, Any]
+    ):
+        """
+        Crea el pool de procesos e inicializa cada trabajador con los datos del problema.
+
+        Args:
+            piezas_requeridas_df: DataFrame con las piezas requeridas (usado por los operadores).
+            demanda: Demanda compilada usada para el fitness.
+            barras_estandar_disponibles: Lista de barras estándar disponibles.
+            desperdicios_reutilizables_previos: Lista de desperdicios reutilizables.
+            config_ga: Configuración del algoritmo genético. Se leen 'num_trabajadores'
+                (None usa todos los núcleos) y 'tamaño_lote_paralelo'.
+        """
+        self.num_trabajadores = config_ga.get('num_trabajadores') or os.cpu_count() or 1
+        self.tamaño_lote = max(1, config_ga.get('tamaño_lote_paralelo', 8))
+        self._pool = ProcessPoolExecutor(
+            max_workers=self.num_trabajadores,
+            initializer=_inicializar_trabajador,
+            initargs=(
+                piezas_requeridas_df,
+                demanda,
+                barras_estandar_disponibles,
+                desperdicios_reutilizables_previos,
+                config_ga,
+                random.getrandbits(32)
+            )
+        )
+
+    def _mapear_lotes(self, funcion, elementos: List[Any]) -> List[Any]:
+        """Aplica una función de lote en paralelo y concatena los resultados en orden."""
+        resultados = []
+        for resultado_lote in self._pool.map(funcion, _dividir_en_lotes(elementos, self.tamaño_lote)):
+            resultados.extend(resultado_lote)
+        return resultados
+
+    def evaluar(self, poblacion: List[Cromosoma]) -> List[float]:
+        """
+        Calcula el fitness de una población en paralelo.
+
+        Args:
+            poblacion: Cromosomas a evaluar.
+
+        Returns:
+            List[float]: Fitness de cada cromosoma, en el orden de la población.
+        """
+        if not poblacion:
+            return []
+        return self._mapear_lotes(_evaluar_lote, poblacion)
+
+    def generar_descendencia(self, parejas: List[Tuple[Cromosoma, Cromosoma]]) -> List[Cromosoma]:
+        """
+        Genera dos hijos cruzados, reparados y mutados por cada pareja, en paralelo.
+
+        Args:
+            parejas: Parejas de padres.
+
+        Returns:
+            List[Cromosoma]: Hijos en el orden de las parejas.
+        """
+        if not parejas:
+            return []
+        return self._mapear_lotes(_generar_descendencia_lote, parejas)
+
+    def mutar(self, cromosomas: List[Cromosoma]) -> List[Cromosoma]:
+        """
+        Aplica el operador de mutación a una lista de cromosomas en paralelo.
+
+        Args:
+            cromosomas: Cromosomas a mutar.
+
+        Returns:
+            List[Cromosoma]: Cromosomas mutados, en el mismo orden.
+        """
+        if not cromosomas:
+            return []
+        return self._mapear_lotes(_mutar_lote, cromosomas)
+
+    def enviar_pareja(self, padre1: Cromosoma, padre2: Cromosoma) -> Future:
+        """
+        Envía una pareja a un trabajador sin esperar el resultado.
+
+        Args:
+            padre1: Primer padre.
+            padre2: Segundo padre.
+
+        Returns:
+            Future: Se resuelve con (hijos, fitness de los hijos).
+        """
+        return self._pool.submit(_generar_y_evaluar_pareja, (padre1, padre2))
+
+    def cerrar(self) -> None:
+        """Detiene los procesos trabajadores."""
+        self._pool.shutdown(wait=True, cancel_futures=True)
+
+    def __enter__(self) -> 'EvaluadorParalelo':
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.cerrar()
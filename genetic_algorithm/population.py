@@ -5,9 +5,10 @@ Este módulo implementa diferentes estrategias para crear la población inicial
 del algoritmo genético, incluyendo métodos heurísticos, aleatorios e híbridos.
 """
 
+import bisect
 import random
 import copy
-from typing import List, Dict, Any, Optional, Tuple
+from typing import List, Dict, Any, Optional, Tuple, Callable, Iterable
 import pandas as pd
 
 from .chromosome import Cromosoma, Patron
@@ -17,6 +18,99 @@ from .chromosome_utils import (
     calcular_sumario_piezas_en_cromosoma
 )
 from .optimal_analyzer import analizar_casos_homogeneos, calcular_solucion_optima_homogenea
+from .demand import ClavePieza
+from .units import en_unidades_de, longitudes_en_milimetros
+from .cancellation import TokenCancelacion, verificar_cancelacion
+
+
+class _ArbolMaximos:
+    """
+    Árbol de segmentos sobre las capacidades restantes de las barras abiertas.
+    
+    Permite encontrar en O(log n) la primera barra (en orden de apertura) cuya
+    capacidad restante es al menos una longitud dada, como exige First Fit.
+    """
+    
+    def __init__(self, capacidad: int):
+        """
+        Inicializa el árbol para un máximo de `capacidad` barras.
+        
+        Args:
+            capacidad: Número máximo de barras que se pueden abrir.
+        """
+        self._tamaño = 1
+        while self._tamaño < max(1, capacidad):
+            self._tamaño *= 2
+        self._maximos = [float('-inf')] * (2 * self._tamaño)
+    
+    def asignar(self, indice: int, valor: float) -> None:
+        """Fija la capacidad restante de la barra `indice` y actualiza los máximos."""
+        nodo = indice + self._tamaño
+        self._maximos[nodo] = valor
+        nodo //= 2
+        while nodo:
+            izquierdo = self._maximos[2 * nodo]
+            derecho = self._maximos[2 * nodo + 1]
+            self._maximos[nodo] = izquierdo if izquierdo >= derecho else derecho
+            nodo //= 2
+    
+    def primera_con_capacidad(self, longitud: float) -> int:
+        """
+        Retorna el índice de la primera barra con capacidad restante >= longitud.
+        
+        Returns:
+            int: Índice de la barra, o -1 si ninguna tiene capacidad suficiente.
+        """
+        if not self._maximos[1] >= longitud:
+            return -1
+        nodo = 1
+        while nodo < self._tamaño:
+            nodo *= 2
+            if not self._maximos[nodo] >= longitud:
+                nodo += 1
+        return nodo - self._tamaño
+
+
+def _expandir_conteos_ordenados(conteos_piezas: Iterable[Tuple[ClavePieza, int]]) -> List[Dict[str, Any]]:
+    """
+    Crea la lista de piezas individuales ordenadas por longitud descendente.
+    
+    El ordenamiento es estable: piezas de igual longitud conservan el orden de entrada.
+    """
+    piezas_individuales = []
+    for (id_pedido, longitud_pieza), cantidad in conteos_piezas:
+        for _ in range(int(cantidad)):
+            piezas_individuales.append({
+                'id_pedido': id_pedido,
+                'longitud_pieza': longitud_pieza
+            })
+    
+    piezas_individuales.sort(key=lambda x: x['longitud_pieza'], reverse=True)
+    return piezas_individuales
+
+
+def _expandir_piezas_ordenadas(piezas_requeridas_df: pd.DataFrame) -> List[Dict[str, Any]]:
+    """Crea la lista de piezas individuales ordenadas a partir del DataFrame de piezas."""
+    conteos_piezas = [
+        ((fila['id_pedido'], fila['longitud_pieza_requerida']), int(fila['cantidad_requerida']))
+        for _, fila in piezas_requeridas_df.iterrows()
+    ]
+    return _expandir_conteos_ordenados(conteos_piezas)
+
+
+def _barras_abiertas_a_cromosoma(barras_abiertas: List[Dict[str, Any]], en_milimetros: bool = False) -> Cromosoma:
+    """Convierte las barras abiertas por FFD/BFD en un cromosoma."""
+    patrones = []
+    for barra_abierta in barras_abiertas:
+        patron = Patron(
+            origen_barra_longitud=barra_abierta['origen_barra_longitud'],
+            origen_barra_tipo=barra_abierta['origen_barra_tipo'],
+            piezas_cortadas=barra_abierta['piezas_cortadas'],
+            en_milimetros=en_milimetros
+        )
+        patrones.append(patron)
+    
+    return Cromosoma(patrones)
 
 
 def generar_individuo_heuristico_ffd(
@@ -27,6 +121,9 @@ def generar_individuo_heuristico_ffd(
     """
     Genera un individuo usando la heurística First Fit Decreasing (FFD).
     
+    La barra abierta donde cabe cada pieza se localiza con un árbol de segmentos
+    sobre las capacidades restantes, en O(log n) por pieza.
+    
     Args:
         piezas_requeridas_df: DataFrame con las piezas requeridas.
         barras_disponibles: Lista de barras estándar disponibles.
@@ -36,16 +133,7 @@ def generar_individuo_heuristico_ffd(
         Cromosoma: Un cromosoma generado con la heurística FFD.
     """
     # Crear lista de todas las piezas individuales ordenadas por longitud (descendente)
-    piezas_individuales = []
-    for _, fila in piezas_requeridas_df.iterrows():
-        for _ in range(int(int(fila['cantidad_requerida']))):
-            piezas_individuales.append({
-                'id_pedido': fila['id_pedido'],
-                'longitud_pieza': fila['longitud_pieza_requerida']
-            })
-    
-    # Ordenar piezas por longitud descendente (FFD)
-    piezas_individuales.sort(key=lambda x: x['longitud_pieza'], reverse=True)
+    piezas_individuales = _expandir_piezas_ordenadas(piezas_requeridas_df)
     
     # Crear lista de barras disponibles (desperdicios primero, luego estándar)
     barras_para_usar = []
@@ -64,66 +152,53 @@ def generar_individuo_heuristico_ffd(
             'tipo': 'estandar'
         })
     
-    # CORRECCIÓN: Ordenar barras por eficiencia (menos desperdicio unitario) en lugar de solo longitud
-    # Esto asegura que se prefieran las barras que minimizan realmente el desperdicio
-    barras_para_usar.sort(key=lambda x: x['longitud'], reverse=True)  # Barras más grandes primero
+    # Barras más grandes primero: al abrir una barra se toma siempre la primera de
+    # la lista. Los desperdicios usados se consumen desde el frente; las barras
+    # estándar no se agotan, así que basta con avanzar un índice.
+    barras_para_usar.sort(key=lambda x: x['longitud'], reverse=True)
+    inicio_barras = 0
     
-    patrones = []
     barras_abiertas = []  # Lista de barras que están siendo utilizadas
+    capacidades = _ArbolMaximos(len(piezas_individuales))
     
     for pieza in piezas_individuales:
-        colocada = False
+        longitud_pieza = pieza['longitud_pieza']
+        
+        # Intentar colocar en la primera barra abierta con espacio (First Fit)
+        indice = capacidades.primera_con_capacidad(longitud_pieza)
+        if indice >= 0:
+            barra_abierta = barras_abiertas[indice]
+            barra_abierta['piezas_cortadas'].append({
+                'id_pedido': pieza['id_pedido'],
+                'longitud_pieza': longitud_pieza,
+                'cantidad_pieza_en_patron': 1
+            })
+            barra_abierta['longitud_restante'] -= longitud_pieza
+            capacidades.asignar(indice, barra_abierta['longitud_restante'])
+            continue
         
-        # Intentar colocar en una barra ya abierta (First Fit)
-        for i, barra_abierta in enumerate(barras_abiertas):
-            espacio_restante = barra_abierta['longitud_restante']
-            if espacio_restante >= pieza['longitud_pieza']:
-                # Añadir pieza al patrón existente
-                barra_abierta['piezas_cortadas'].append({
+        # Si no se pudo colocar, abrir una nueva barra (la más grande disponible)
+        if inicio_barras < len(barras_para_usar) and barras_para_usar[inicio_barras]['longitud'] >= longitud_pieza:
+            barra_seleccionada = barras_para_usar[inicio_barras]
+            nueva_barra = {
+                'origen_barra_longitud': barra_seleccionada['longitud'],
+                'origen_barra_tipo': barra_seleccionada['tipo'],
+                'piezas_cortadas': [{
                     'id_pedido': pieza['id_pedido'],
-                    'longitud_pieza': pieza['longitud_pieza'],
+                    'longitud_pieza': longitud_pieza,
                     'cantidad_pieza_en_patron': 1
-                })
-                barra_abierta['longitud_restante'] -= pieza['longitud_pieza']
-                colocada = True
-                break
-        
-        # Si no se pudo colocar, abrir una nueva barra
-        if not colocada:
-            # Buscar la barra más pequeña que pueda contener la pieza
-            barra_seleccionada = None
-            for barra in barras_para_usar:
-                if barra['longitud'] >= pieza['longitud_pieza']:
-                    barra_seleccionada = barra
-                    break
+                }],
+                'longitud_restante': barra_seleccionada['longitud'] - longitud_pieza
+            }
+            capacidades.asignar(len(barras_abiertas), nueva_barra['longitud_restante'])
+            barras_abiertas.append(nueva_barra)
             
-            if barra_seleccionada:
-                nueva_barra = {
-                    'origen_barra_longitud': barra_seleccionada['longitud'],
-                    'origen_barra_tipo': barra_seleccionada['tipo'],
-                    'piezas_cortadas': [{
-                        'id_pedido': pieza['id_pedido'],
-                        'longitud_pieza': pieza['longitud_pieza'],
-                        'cantidad_pieza_en_patron': 1
-                    }],
-                    'longitud_restante': barra_seleccionada['longitud'] - pieza['longitud_pieza']
-                }
-                barras_abiertas.append(nueva_barra)
-                
-                # Si es un desperdicio, removerlo de la lista disponible
-                if barra_seleccionada['tipo'] == 'desperdicio':
-                    barras_para_usar.remove(barra_seleccionada)
+            # Si es un desperdicio, deja de estar disponible
+            if barra_seleccionada['tipo'] == 'desperdicio':
+                inicio_barras += 1
     
     # Convertir barras abiertas a patrones
-    for barra_abierta in barras_abiertas:
-        patron = Patron(
-            origen_barra_longitud=barra_abierta['origen_barra_longitud'],
-            origen_barra_tipo=barra_abierta['origen_barra_tipo'],
-            piezas_cortadas=barra_abierta['piezas_cortadas']
-        )
-        patrones.append(patron)
-    
-    return Cromosoma(patrones)
+    return _barras_abiertas_a_cromosoma(barras_abiertas, longitudes_en_milimetros(piezas_requeridas_df))
 
 
 def generar_individuo_heuristico_bfd(
@@ -142,19 +217,59 @@ def generar_individuo_heuristico_bfd(
     Returns:
         Cromosoma: Un cromosoma generado con la heurística BFD.
     """
-    # Crear lista de todas las piezas individuales ordenadas por longitud (descendente)
-    piezas_individuales = []
-    for _, fila in piezas_requeridas_df.iterrows():
-        for _ in range(int(int(fila['cantidad_requerida']))):
-            piezas_individuales.append({
-                'id_pedido': fila['id_pedido'],
-                'longitud_pieza': fila['longitud_pieza_requerida']
-            })
+    return _colocar_piezas_bfd(
+        _expandir_piezas_ordenadas(piezas_requeridas_df),
+        barras_disponibles,
+        desperdicios_disponibles,
+        longitudes_en_milimetros(piezas_requeridas_df)
+    )
+
+
+def generar_individuo_bfd_desde_conteos(
+    conteos_piezas: Iterable[Tuple[ClavePieza, int]],
+    barras_disponibles: List[Dict[str, Any]],
+    desperdicios_disponibles: List[Dict[str, Any]],
+    en_milimetros: bool = False
+) -> Cromosoma:
+    """
+    Genera un individuo con BFD a partir de conteos de piezas agregados.
     
-    # Ordenar piezas por longitud descendente (BFD)
-    piezas_individuales.sort(key=lambda x: x['longitud_pieza'], reverse=True)
+    Equivale a generar_individuo_heuristico_bfd sobre un DataFrame con las mismas
+    filas en el mismo orden, sin construir el DataFrame.
     
-    # Crear lista de barras disponibles
+    Args:
+        conteos_piezas: Pares ((id_pedido, longitud_pieza), cantidad).
+        barras_disponibles: Lista de barras estándar disponibles.
+        desperdicios_disponibles: Lista de desperdicios reutilizables.
+        en_milimetros: Si las longitudes están en milímetros enteros.
+    
+    Returns:
+        Cromosoma: Un cromosoma generado con la heurística BFD.
+    """
+    return _colocar_piezas_bfd(
+        _expandir_conteos_ordenados(conteos_piezas),
+        barras_disponibles,
+        desperdicios_disponibles,
+        en_milimetros
+    )
+
+
+def _colocar_piezas_bfd(
+    piezas_individuales: List[Dict[str, Any]],
+    barras_disponibles: List[Dict[str, Any]],
+    desperdicios_disponibles: List[Dict[str, Any]],
+    en_milimetros: bool = False
+) -> Cromosoma:
+    """
+    Coloca piezas individuales, ya ordenadas, con la heurística Best Fit Decreasing.
+    
+    Las barras abiertas se mantienen en una lista ordenada por capacidad restante:
+    el mejor ajuste se localiza por búsqueda binaria en O(log n), pero reubicar la
+    barra elegida (del + insort) desplaza la lista en O(n). Ese desplazamiento es
+    un memmove, más barato en la práctica que un árbol balanceado en Python puro.
+    Ante empates en el desperdicio resultante se elige la barra abierta primero.
+    """
+    # Crear lista de barras disponibles (desperdicios primero, luego estándar)
     barras_para_usar = []
     
     # Añadir desperdicios disponibles
@@ -171,71 +286,70 @@ def generar_individuo_heuristico_bfd(
             'tipo': 'estandar'
         })
     
-    patrones = []
+    # Barras ordenadas de menor a mayor una sola vez; a igual longitud se conserva
+    # el orden original (desperdicios antes que estándar)
+    barras_ordenadas = sorted(barras_para_usar, key=lambda x: x['longitud'])
+    claves_barras = [(barra['longitud'], posicion) for posicion, barra in enumerate(barras_ordenadas)]
+    
     barras_abiertas = []
+    capacidades_ordenadas: List[Tuple[float, int]] = []  # (longitud_restante, índice de barra abierta)
     
     for pieza in piezas_individuales:
-        colocada = False
-        mejor_ajuste = None
-        mejor_indice = -1
-        menor_desperdicio = float('inf')
+        longitud_pieza = pieza['longitud_pieza']
         
         # Buscar el mejor ajuste entre las barras abiertas (Best Fit)
-        for i, barra_abierta in enumerate(barras_abiertas):
-            espacio_restante = barra_abierta['longitud_restante']
-            if espacio_restante >= pieza['longitud_pieza']:
-                desperdicio = espacio_restante - pieza['longitud_pieza']
-                if desperdicio < menor_desperdicio:
-                    menor_desperdicio = desperdicio
-                    mejor_ajuste = barra_abierta
-                    mejor_indice = i
-        
-        # Si se encontró un buen ajuste, colocar la pieza
-        if mejor_ajuste is not None:
+        posicion = bisect.bisect_left(capacidades_ordenadas, (longitud_pieza, -1))
+        if posicion < len(capacidades_ordenadas):
+            restante, mejor_indice = capacidades_ordenadas[posicion]
+            menor_desperdicio = restante - longitud_pieza
+            mejor_posicion = posicion
+            
+            # Capacidades distintas pueden dar el mismo desperdicio redondeado;
+            # entre ellas gana la barra abierta primero
+            siguiente = posicion + 1
+            while (siguiente < len(capacidades_ordenadas) and
+                   capacidades_ordenadas[siguiente][0] - longitud_pieza == menor_desperdicio):
+                if capacidades_ordenadas[siguiente][1] < mejor_indice:
+                    mejor_indice = capacidades_ordenadas[siguiente][1]
+                    mejor_posicion = siguiente
+                siguiente += 1
+            
+            mejor_ajuste = barras_abiertas[mejor_indice]
             mejor_ajuste['piezas_cortadas'].append({
                 'id_pedido': pieza['id_pedido'],
-                'longitud_pieza': pieza['longitud_pieza'],
+                'longitud_pieza': longitud_pieza,
                 'cantidad_pieza_en_patron': 1
             })
-            mejor_ajuste['longitud_restante'] -= pieza['longitud_pieza']
-            colocada = True
+            mejor_ajuste['longitud_restante'] -= longitud_pieza
+            
+            del capacidades_ordenadas[mejor_posicion]
+            bisect.insort(capacidades_ordenadas, (mejor_ajuste['longitud_restante'], mejor_indice))
+            continue
         
-        # Si no se pudo colocar, abrir una nueva barra
-        if not colocada:
-            # Buscar la barra más pequeña que pueda contener la pieza
-            barra_seleccionada = None
-            for barra in sorted(barras_para_usar, key=lambda x: x['longitud']):
-                if barra['longitud'] >= pieza['longitud_pieza']:
-                    barra_seleccionada = barra
-                    break
+        # Si no se pudo colocar, abrir la barra más pequeña que pueda contener la pieza
+        posicion_barra = bisect.bisect_left(claves_barras, (longitud_pieza, -1))
+        if posicion_barra < len(claves_barras):
+            barra_seleccionada = barras_ordenadas[posicion_barra]
+            nueva_barra = {
+                'origen_barra_longitud': barra_seleccionada['longitud'],
+                'origen_barra_tipo': barra_seleccionada['tipo'],
+                'piezas_cortadas': [{
+                    'id_pedido': pieza['id_pedido'],
+                    'longitud_pieza': longitud_pieza,
+                    'cantidad_pieza_en_patron': 1
+                }],
+                'longitud_restante': barra_seleccionada['longitud'] - longitud_pieza
+            }
+            bisect.insort(capacidades_ordenadas, (nueva_barra['longitud_restante'], len(barras_abiertas)))
+            barras_abiertas.append(nueva_barra)
             
-            if barra_seleccionada:
-                nueva_barra = {
-                    'origen_barra_longitud': barra_seleccionada['longitud'],
-                    'origen_barra_tipo': barra_seleccionada['tipo'],
-                    'piezas_cortadas': [{
-                        'id_pedido': pieza['id_pedido'],
-                        'longitud_pieza': pieza['longitud_pieza'],
-                        'cantidad_pieza_en_patron': 1
-                    }],
-                    'longitud_restante': barra_seleccionada['longitud'] - pieza['longitud_pieza']
-                }
-                barras_abiertas.append(nueva_barra)
-                
-                # Si es un desperdicio, removerlo de la lista disponible
-                if barra_seleccionada['tipo'] == 'desperdicio':
-                    barras_para_usar.remove(barra_seleccionada)
+            # Si es un desperdicio, deja de estar disponible
+            if barra_seleccionada['tipo'] == 'desperdicio':
+                del barras_ordenadas[posicion_barra]
+                del claves_barras[posicion_barra]
     
     # Convertir barras abiertas a patrones
-    for barra_abierta in barras_abiertas:
-        patron = Patron(
-            origen_barra_longitud=barra_abierta['origen_barra_longitud'],
-            origen_barra_tipo=barra_abierta['origen_barra_tipo'],
-            piezas_cortadas=barra_abierta['piezas_cortadas']
-        )
-        patrones.append(patron)
-    
-    return Cromosoma(patrones)
+    return _barras_abiertas_a_cromosoma(barras_abiertas, en_milimetros)
 
 
 def generar_individuo_aleatorio_con_reparacion(
@@ -254,6 +368,8 @@ def generar_individuo_aleatorio_con_reparacion(
     Returns:
         Cromosoma: Un cromosoma aleatorio reparado.
     """
+    en_milimetros = longitudes_en_milimetros(piezas_requeridas_df)
+    
     # Crear lista de todas las piezas individuales
     piezas_individuales = []
     for _, fila in piezas_requeridas_df.iterrows():
@@ -312,7 +428,8 @@ def generar_individuo_aleatorio_con_reparacion(
                         'id_pedido': pieza['id_pedido'],
                         'longitud_pieza': pieza['longitud_pieza'],
                         'cantidad_pieza_en_patron': 1
-                    }]
+                    }],
+                    en_milimetros=en_milimetros
                 )
                 patrones.append(patron)
                 colocada = True
@@ -340,7 +457,8 @@ def generar_individuo_aleatorio_con_reparacion(
                             'id_pedido': pieza['id_pedido'],
                             'longitud_pieza': pieza['longitud_pieza'],
                             'cantidad_pieza_en_patron': 1
-                        }]
+                        }],
+                        en_milimetros=en_milimetros
                     )
                     patrones.append(patron)
                     break
@@ -376,37 +494,20 @@ def reparar_cromosoma(
     Returns:
         Cromosoma: El cromosoma reparado.
     """
-    # Extraer todas las piezas del cromosoma
-    todas_las_piezas = []
+    # Agregar las piezas del cromosoma por (id_pedido, longitud_pieza)
+    conteos_piezas: Dict[ClavePieza, int] = {}
     for patron in cromosoma.patrones:
-        for pieza_info in patron.piezas_cortadas:
-            for _ in range(pieza_info['cantidad_pieza_en_patron']):
-                todas_las_piezas.append({
-                    'id_pedido': pieza_info['id_pedido'],
-                    'longitud_pieza': pieza_info['longitud_pieza']
-                })
-    
-    # Usar BFD para reorganizar las piezas de manera más eficiente
-    piezas_df_temp = pd.DataFrame([
-        {
-            'id_pedido': pieza['id_pedido'],
-            'longitud_pieza_requerida': pieza['longitud_pieza'],
-            'cantidad_requerida': 1
-        }
-        for pieza in todas_las_piezas
-    ])
-    
-    # Agrupar piezas idénticas
-    piezas_agrupadas = piezas_df_temp.groupby(['id_pedido', 'longitud_pieza_requerida']).size().reset_index(name='cantidad_requerida')
-    
-    # Generar un nuevo cromosoma usando BFD
-    cromosoma_reparado = generar_individuo_heuristico_bfd(
-        piezas_agrupadas,
+        for clave, cantidad in patron.obtener_conteos_piezas():
+            conteos_piezas[clave] = conteos_piezas.get(clave, 0) + cantidad
+    
+    # Reorganizar las piezas con BFD, en el orden de clave que produciría un
+    # agrupamiento por (id_pedido, longitud_pieza)
+    return generar_individuo_bfd_desde_conteos(
+        sorted(conteos_piezas.items(), key=lambda item: item[0]),
         barras_disponibles,
-        desperdicios_disponibles
+        desperdicios_disponibles,
+        longitudes_en_milimetros(piezas_requeridas_df)
     )
-    
-    return cromosoma_reparado
 
 
 def generar_individuo_con_analisis_optimo(
@@ -427,10 +528,14 @@ def generar_individuo_con_analisis_optimo(
     """
     # Obtener longitudes de barras
     longitudes_barras = [barra['longitud'] for barra in barras_disponibles]
+    en_milimetros = longitudes_en_milimetros(piezas_requeridas_df)
     
-    # Analizar casos homogéneos
+    # Analizar casos homogéneos (tolerancia de 1 cm en la unidad de las longitudes)
     casos_homogeneos = analizar_casos_homogeneos(
-        piezas_requeridas_df, longitudes_barras, tolerancia_homogeneidad=0.01
+        piezas_requeridas_df,
+        longitudes_barras,
+        tolerancia_homogeneidad=en_unidades_de(0.01, en_milimetros),
+        en_milimetros=en_milimetros
     )
     
     patrones = []
@@ -479,7 +584,8 @@ def generar_individuo_con_analisis_optimo(
                         patron = Patron(
                             origen_barra_longitud=longitud_barra,
                             origen_barra_tipo='estandar',
-                            piezas_cortadas=piezas_cortadas
+                            piezas_cortadas=piezas_cortadas,
+                            en_milimetros=en_milimetros
                         )
                         patrones.append(patron)
         
@@ -500,13 +606,152 @@ def generar_individuo_con_analisis_optimo(
     return Cromosoma(patrones)
 
 
+def _retirar_unidad_pieza(patron: Patron, indice_pieza: int) -> None:
+    """Retira una unidad de la pieza indicada, eliminando la entrada si queda vacía."""
+    pieza = patron.piezas_cortadas[indice_pieza]
+    if pieza['cantidad_pieza_en_patron'] > 1:
+        pieza['cantidad_pieza_en_patron'] -= 1
+    else:
+        patron.piezas_cortadas.pop(indice_pieza)
+
+
+def _añadir_unidad_pieza(patron: Patron, id_pedido: Any, longitud_pieza: float) -> None:
+    """Añade una unidad de pieza al patrón, acumulándola si ya existe la entrada."""
+    for pieza in patron.piezas_cortadas:
+        if pieza['id_pedido'] == id_pedido and pieza['longitud_pieza'] == longitud_pieza:
+            pieza['cantidad_pieza_en_patron'] += 1
+            return
+    patron.piezas_cortadas.append({
+        'id_pedido': id_pedido,
+        'longitud_pieza': longitud_pieza,
+        'cantidad_pieza_en_patron': 1
+    })
+
+
+def _longitud_usada(patron: Patron) -> float:
+    """Suma exacta de las longitudes cortadas en el patrón."""
+    return sum(
+        pieza['longitud_pieza'] * pieza['cantidad_pieza_en_patron']
+        for pieza in patron.piezas_cortadas
+    )
+
+
+def perturbar_individuo(cromosoma: Cromosoma, num_operaciones: Optional[int] = None) -> Cromosoma:
+    """
+    Genera una variante de un cromosoma mediante movimientos factibles de piezas.
+    
+    Sobre una copia del cromosoma se aplican intercambios de una pieza entre dos
+    patrones y traslados de una pieza a otro patrón con espacio suficiente; los
+    patrones que quedan vacíos se eliminan. Las piezas cortadas no cambian, por lo
+    que la variante cubre la misma demanda que el original.
+    
+    Args:
+        cromosoma: Cromosoma de partida (no se modifica).
+        num_operaciones: Número de movimientos a aplicar. Por defecto, la mitad
+            del número de patrones (al menos uno).
+    
+    Returns:
+        Cromosoma: Variante perturbada del cromosoma.
+    """
+    variante = cromosoma.clonar()
+    patrones = variante.patrones
+    
+    if len(patrones) < 2:
+        return variante
+    
+    if num_operaciones is None:
+        num_operaciones = max(1, len(patrones) // 2)
+    
+    realizadas = 0
+    intentos = 0
+    while realizadas < num_operaciones and intentos < num_operaciones * 4 and len(patrones) >= 2:
+        intentos += 1
+        i, j = random.sample(range(len(patrones)), 2)
+        patron_i, patron_j = patrones[i], patrones[j]
+        if not patron_i.piezas_cortadas:
+            continue
+        
+        indice_a = random.randrange(len(patron_i.piezas_cortadas))
+        pieza_a = patron_i.piezas_cortadas[indice_a]
+        id_a, longitud_a = pieza_a['id_pedido'], pieza_a['longitud_pieza']
+        usada_i = _longitud_usada(patron_i)
+        usada_j = _longitud_usada(patron_j)
+        
+        if random.random() < 0.5:
+            # Trasladar una unidad de la pieza a al patrón j si cabe
+            if usada_j + longitud_a > patron_j.origen_barra_longitud:
+                continue
+            with variante.editar_patron(i) as patron_i, variante.editar_patron(j) as patron_j:
+                _retirar_unidad_pieza(patron_i, indice_a)
+                _añadir_unidad_pieza(patron_j, id_a, longitud_a)
+                patron_i._calcular_desperdicio()
+                patron_j._calcular_desperdicio()
+        else:
+            # Intercambiar una unidad de a por una unidad de b de otra longitud
+            if not patron_j.piezas_cortadas:
+                continue
+            indice_b = random.randrange(len(patron_j.piezas_cortadas))
+            pieza_b = patron_j.piezas_cortadas[indice_b]
+            id_b, longitud_b = pieza_b['id_pedido'], pieza_b['longitud_pieza']
+            if longitud_a == longitud_b:
+                continue
+            if (usada_i - longitud_a + longitud_b > patron_i.origen_barra_longitud or
+                    usada_j - longitud_b + longitud_a > patron_j.origen_barra_longitud):
+                continue
+            with variante.editar_patron(i) as patron_i, variante.editar_patron(j) as patron_j:
+                _retirar_unidad_pieza(patron_i, indice_a)
+                _retirar_unidad_pieza(patron_j, indice_b)
+                _añadir_unidad_pieza(patron_i, id_b, longitud_b)
+                _añadir_unidad_pieza(patron_j, id_a, longitud_a)
+                patron_i._calcular_desperdicio()
+                patron_j._calcular_desperdicio()
+        
+        if not patron_i.piezas_cortadas:
+            variante.eliminar_patron(i)
+        realizadas += 1
+    
+    return variante
+
+
+def _generar_desde_semillas(
+    generadores_semilla: List[Callable[[], Cromosoma]],
+    cantidad: int
+) -> List[Cromosoma]:
+    """
+    Genera individuos alternando semillas deterministas sin recalcularlas.
+    
+    Cada generador se ejecuta como máximo una vez; la primera aparición de una
+    semilla se usa tal cual y las siguientes son variantes perturbadas de ella.
+    
+    Args:
+        generadores_semilla: Funciones sin argumentos que producen cada semilla.
+        cantidad: Número de individuos a generar.
+    
+    Returns:
+        List[Cromosoma]: Individuos generados.
+    """
+    semillas: List[Optional[Cromosoma]] = [None] * len(generadores_semilla)
+    individuos = []
+    
+    for k in range(cantidad):
+        indice = k % len(generadores_semilla)
+        if semillas[indice] is None:
+            semillas[indice] = generadores_semilla[indice]()
+            individuos.append(semillas[indice])
+        else:
+            individuos.append(perturbar_individuo(semillas[indice]))
+    
+    return individuos
+
+
 def inicializar_poblacion(
     tamaño_poblacion: int,
     piezas_requeridas_df: pd.DataFrame,
     barras_estandar_disponibles: List[Dict[str, Any]],
     desperdicios_reutilizables_previos: List[Dict[str, Any]],
     estrategia_inicializacion: str = 'hibrida',
-    config_ga: Optional[Dict[str, Any]] = None
+    config_ga: Optional[Dict[str, Any]] = None,
+    token_cancelacion: Optional[TokenCancelacion] = None
 ) -> List[Cromosoma]:
     """
     Inicializa una población de cromosomas usando diferentes estrategias.
@@ -518,9 +763,13 @@ def inicializar_poblacion(
         desperdicios_reutilizables_previos: Lista de desperdicios reutilizables.
         estrategia_inicializacion: Estrategia a usar ('heuristica', 'aleatoria', 'hibrida').
         config_ga: Configuración adicional del algoritmo genético.
+        token_cancelacion: Token que se consulta entre individuos generados.
     
     Returns:
         List[Cromosoma]: Lista de cromosomas que forman la población inicial.
+    
+    Raises:
+        CancelacionSolicitada: Si el token se cancela durante la inicialización.
     """
     if config_ga is None:
         config_ga = {}
@@ -528,26 +777,29 @@ def inicializar_poblacion(
     proporcion_heuristicos = config_ga.get('proporcion_heuristicos', 0.6)
     poblacion = []
     
+    # Las heurísticas FFD/BFD y el análisis óptimo son deterministas: cada semilla
+    # se calcula una sola vez y el resto de individuos son variantes perturbadas
+    generadores_heuristicos = [
+        lambda: generar_individuo_heuristico_ffd(
+            piezas_requeridas_df,
+            barras_estandar_disponibles,
+            desperdicios_reutilizables_previos
+        ),
+        lambda: generar_individuo_heuristico_bfd(
+            piezas_requeridas_df,
+            barras_estandar_disponibles,
+            desperdicios_reutilizables_previos
+        )
+    ]
+    
     if estrategia_inicializacion == 'heuristica':
         # Solo individuos heurísticos
-        for i in range(tamaño_poblacion):
-            if i % 2 == 0:
-                individuo = generar_individuo_heuristico_ffd(
-                    piezas_requeridas_df,
-                    barras_estandar_disponibles,
-                    desperdicios_reutilizables_previos
-                )
-            else:
-                individuo = generar_individuo_heuristico_bfd(
-                    piezas_requeridas_df,
-                    barras_estandar_disponibles,
-                    desperdicios_reutilizables_previos
-                )
-            poblacion.append(individuo)
+        poblacion.extend(_generar_desde_semillas(generadores_heuristicos, tamaño_poblacion))
     
     elif estrategia_inicializacion == 'aleatoria':
         # Solo individuos aleatorios
         for _ in range(tamaño_poblacion):
+            verificar_cancelacion(token_cancelacion)
             individuo = generar_individuo_aleatorio_con_reparacion(
                 piezas_requeridas_df,
                 barras_estandar_disponibles,
@@ -562,32 +814,20 @@ def inicializar_poblacion(
         num_aleatorios = tamaño_poblacion - num_optimos - num_heuristicos
         
         # Generar individuos con análisis óptimo
-        for _ in range(num_optimos):
-            individuo = generar_individuo_con_analisis_optimo(
-                piezas_requeridas_df,
-                barras_estandar_disponibles,
-                desperdicios_reutilizables_previos
-            )
-            poblacion.append(individuo)
+        generador_optimo = lambda: generar_individuo_con_analisis_optimo(
+            piezas_requeridas_df,
+            barras_estandar_disponibles,
+            desperdicios_reutilizables_previos
+        )
+        poblacion.extend(_generar_desde_semillas([generador_optimo], num_optimos))
+        verificar_cancelacion(token_cancelacion)
         
         # Generar individuos heurísticos
-        for i in range(num_heuristicos):
-            if i % 2 == 0:
-                individuo = generar_individuo_heuristico_ffd(
-                    piezas_requeridas_df,
-                    barras_estandar_disponibles,
-                    desperdicios_reutilizables_previos
-                )
-            else:
-                individuo = generar_individuo_heuristico_bfd(
-                    piezas_requeridas_df,
-                    barras_estandar_disponibles,
-                    desperdicios_reutilizables_previos
-                )
-            poblacion.append(individuo)
+        poblacion.extend(_generar_desde_semillas(generadores_heuristicos, num_heuristicos))
         
         # Generar individuos aleatorios
         for _ in range(num_aleatorios):
+            verificar_cancelacion(token_cancelacion)
             individuo = generar_individuo_aleatorio_con_reparacion(
                 piezas_requeridas_df,
                 barras_estandar_disponibles,
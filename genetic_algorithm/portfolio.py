@@ -0,0 +1,299 @@
+"""
+Portafolio de solvers para un subproblema de corte.
+
+Este módulo ejecuta en procesos separados varios métodos de solución (FFD, BFD,
+análisis óptimo de casos homogéneos, solver exacto y algoritmo genético) sobre
+el mismo subproblema y bajo un plazo común. Conserva el resultado de menor
+fitness y cancela los procesos restantes en cuanto una solución alcanza la
+cota inferior demostrada, vence el plazo o se cancela el token de la ejecución.
+Los eventos de progreso de los solvers se reenvían por la misma cola de
+resultados al callback del proceso principal.
+
+El resumen de cada ejecución indica qué solver ganó; registrar_resultado_portafolio
+lo agrega a un historial JSON Lines que sirve para ajustar el portafolio más adelante.
+"""
+
+import json
+import multiprocessing
+import queue
+import time
+from typing import List, Dict, Any, Optional, Tuple, Callable, Sequence
+import pandas as pd
+
+from .chromosome import Cromosoma
+from .demand import compilar_demanda
+from .fitness import calcular_fitness
+from .population import (
+    generar_individuo_heuristico_ffd,
+    generar_individuo_heuristico_bfd,
+    generar_individuo_con_analisis_optimo
+)
+from .exact_solver import resolver_exacto
+from .engine import ejecutar_algoritmo_genetico
+from .cancellation import TokenCancelacion, CancelacionSolicitada
+from .metrics import CallbackProgreso
+from .lower_bound import calcular_cota_inferior, calcular_cota_fitness
+
+
+SOLVERS_PORTAFOLIO_DEFAULT = ('ffd', 'bfd', 'analisis_optimo', 'exacto', 'algoritmo_genetico')
+
+# Fracción del plazo común que se concede al AG como tiempo límite propio, para
+# que termine y entregue su mejor cromosoma antes de ser cancelado
+FRACCION_PLAZO_ALGORITMO_GENETICO = 0.9
+
+TOLERANCIA_FITNESS = 1e-9
+
+# Cada cuánto se consulta el token de cancelación mientras se esperan resultados
+INTERVALO_VERIFICACION_CANCELACION_SEGUNDOS = 0.1
+
+ResultadoSolver = Tuple[Optional[Cromosoma], bool]  # (cromosoma, optimalidad demostrada)
+
+
+def _resolver_ffd(piezas_requeridas_df, barras, desperdicios, config_ga,
+                 callback_progreso=None) -> ResultadoSolver:
+    return generar_individuo_heuristico_ffd(piezas_requeridas_df, barras, desperdicios), False
+
+
+def _resolver_bfd(piezas_requeridas_df, barras, desperdicios, config_ga,
+                 callback_progreso=None) -> ResultadoSolver:
+    return generar_individuo_heuristico_bfd(piezas_requeridas_df, barras, desperdicios), False
+
+
+def _resolver_analisis_optimo(piezas_requeridas_df, barras, desperdicios, config_ga,
+                             callback_progreso=None) -> ResultadoSolver:
+    return generar_individuo_con_analisis_optimo(piezas_requeridas_df, barras, desperdicios), False
+
+
+def _resolver_exacto(piezas_requeridas_df, barras, desperdicios, config_ga,
+                    callback_progreso=None) -> ResultadoSolver:
+    # Si el solver exacto retorna un cromosoma, su optimalidad está demostrada
+    cromosoma = resolver_exacto(piezas_requeridas_df, barras, desperdicios)
+    return cromosoma, cromosoma is not None
+
+
+def _resolver_algoritmo_genetico(piezas_requeridas_df, barras, desperdicios, config_ga,
+                                 callback_progreso=None) -> ResultadoSolver:
+    cromosoma, _ = ejecutar_algoritmo_genetico(
+        piezas_requeridas_df, barras, desperdicios, config_ga, callback_progreso=callback_progreso
+    )
+    return cromosoma, False
+
+
+SOLVERS_PORTAFOLIO: Dict[str, Callable[..., ResultadoSolver]] = {
+    'ffd': _resolver_ffd,
+    'bfd': _resolver_bfd,
+    'analisis_optimo': _resolver_analisis_optimo,
+    'exacto': _resolver_exacto,
+    'algoritmo_genetico': _resolver_algoritmo_genetico
+}
+
+
+def _ejecutar_solver(
+    nombre: str,
+    piezas_requeridas_df: pd.DataFrame,
+    barras_estandar_disponibles: List[Dict[str, Any]],
+    desperdicios_reutilizables_previos: List[Dict[str, Any]],
+    config_ga: Dict[str, Any],
+    cola_resultados: multiprocessing.Queue,
+    reenviar_progreso: bool = False
+) -> None:
+    """Ejecuta un solver en el proceso hijo y envía su progreso y su resultado por la cola."""
+    callback_progreso = None
+    if reenviar_progreso:
+        def callback_progreso(evento):
+            cola_resultados.put(('progreso', nombre, evento))
+
+    tiempo_inicio = time.time()
+    try:
+        cromosoma, optimo = SOLVERS_PORTAFOLIO[nombre](
+            piezas_requeridas_df,
+            barras_estandar_disponibles,
+            desperdicios_reutilizables_previos,
+            config_ga,
+            callback_progreso=callback_progreso
+        )
+        error = None
+    except Exception as e:
+        cromosoma, optimo, error = None, False, f"{type(e).__name__}: {e}"
+    cola_resultados.put(('resultado', nombre, cromosoma, optimo, error, time.time() - tiempo_inicio))
+
+
+def ejecutar_portafolio(
+    piezas_requeridas_df: pd.DataFrame,
+    barras_estandar_disponibles: List[Dict[str, Any]],
+    desperdicios_reutilizables_previos: List[Dict[str, Any]],
+    config_ga: Dict[str, Any],
+    tiempo_limite_segundos: float,
+    solvers: Sequence[str] = SOLVERS_PORTAFOLIO_DEFAULT,
+    token_cancelacion: Optional[TokenCancelacion] = None,
+    callback_progreso: Optional[CallbackProgreso] = None
+) -> Tuple[Cromosoma, Dict[str, Any]]:
+    """
+    Ejecuta varios solvers en paralelo sobre un subproblema y retorna el mejor resultado.
+
+    Args:
+        piezas_requeridas_df: DataFrame con las piezas requeridas.
+        barras_estandar_disponibles: Lista de barras estándar disponibles.
+        desperdicios_reutilizables_previos: Lista de desperdicios reutilizables.
+        config_ga: Configuración del algoritmo genético. Su tiempo límite se ajusta
+            al plazo común y la evaluación paralela se desactiva, porque cada solver
+            ya ocupa un proceso.
+        tiempo_limite_segundos: Plazo común para todos los solvers.
+        solvers: Nombres de los solvers a ejecutar (claves de SOLVERS_PORTAFOLIO).
+        token_cancelacion: Token que se consulta mientras se esperan resultados. Al
+            cancelarse se terminan los solvers pendientes y se retorna el mejor
+            resultado recibido hasta ese momento.
+        callback_progreso: Receptor de los eventos de progreso de los solvers (los
+            del AG), con la clave 'solver' agregada.
+
+    Returns:
+        Tuple[Cromosoma, Dict]: Mejor cromosoma y resumen con 'ganador',
+            'fitness_ganador', 'optimo_demostrado', 'cota_fitness',
+            'tiempo_total_segundos', 'motivo_cancelacion' y 'resultados'
+            (fitness, tiempo, error y cancelación de cada solver).
+
+    Raises:
+        ValueError: Si se solicita un solver desconocido.
+        CancelacionSolicitada: Si el token se cancela antes de que algún solver
+            produzca una solución.
+        RuntimeError: Si ningún solver produce una solución dentro del plazo.
+    """
+    desconocidos = [nombre for nombre in solvers if nombre not in SOLVERS_PORTAFOLIO]
+    if desconocidos:
+        raise ValueError(f"Solvers desconocidos en el portafolio: {desconocidos}")
+
+    tiempo_inicio = time.time()
+    plazo = tiempo_inicio + tiempo_limite_segundos
+
+    demanda = compilar_demanda(piezas_requeridas_df)
+    cota_fitness = calcular_cota_fitness(
+        calcular_cota_inferior(demanda, barras_estandar_disponibles, desperdicios_reutilizables_previos),
+        demanda,
+        desperdicios_reutilizables_previos
+    )
+
+    config_solver = {
+        **config_ga,
+        'paralelizar_evaluacion': False,
+        'tiempo_limite_segundos': min(
+            config_ga.get('tiempo_limite_segundos', tiempo_limite_segundos),
+            tiempo_limite_segundos * FRACCION_PLAZO_ALGORITMO_GENETICO
+        )
+    }
+
+    contexto = multiprocessing.get_context()
+    cola_resultados = contexto.Queue()
+    procesos = {}
+    for nombre in solvers:
+        proceso = contexto.Process(
+            target=_ejecutar_solver,
+            args=(
+                nombre,
+                piezas_requeridas_df,
+                barras_estandar_disponibles,
+                desperdicios_reutilizables_previos,
+                config_solver,
+                cola_resultados,
+                callback_progreso is not None
+            ),
+            daemon=True
+        )
+        proceso.start()
+        procesos[nombre] = proceso
+
+    resultados = {
+        nombre: {'fitness': None, 'tiempo_segundos': None, 'error': None, 'cancelado': False}
+        for nombre in solvers
+    }
+    pendientes = set(solvers)
+    mejor_cromosoma = None
+    mejor_fitness = float('inf')
+    ganador = None
+    optimo_demostrado = False
+
+    try:
+        while pendientes:
+            if token_cancelacion is not None and token_cancelacion.cancelado:
+                break
+            restante = plazo - time.time()
+            if restante <= 0:
+                break
+            try:
+                mensaje = cola_resultados.get(
+                    timeout=min(restante, INTERVALO_VERIFICACION_CANCELACION_SEGUNDOS)
+                )
+            except queue.Empty:
+                continue
+
+            if mensaje[0] == 'progreso':
+                _, nombre, evento = mensaje
+                callback_progreso({**evento, 'solver': nombre})
+                continue
+
+            _, nombre, cromosoma, optimo, error, tiempo_solver = mensaje
+            pendientes.discard(nombre)
+            resultados[nombre]['tiempo_segundos'] = tiempo_solver
+            resultados[nombre]['error'] = error
+            if cromosoma is None:
+                continue
+
+            fitness = calcular_fitness(cromosoma, demanda)
+            resultados[nombre]['fitness'] = fitness
+            if fitness < mejor_fitness:
+                mejor_cromosoma, mejor_fitness, ganador = cromosoma, fitness, nombre
+
+            # Un óptimo demostrado no puede mejorarse: se cancelan los demás solvers
+            if optimo or mejor_fitness <= cota_fitness + TOLERANCIA_FITNESS:
+                optimo_demostrado = True
+                break
+    finally:
+        for nombre in pendientes:
+            resultados[nombre]['cancelado'] = True
+            procesos[nombre].terminate()
+        for proceso in procesos.values():
+            proceso.join()
+        cola_resultados.close()
+
+    motivo_cancelacion = token_cancelacion.motivo if token_cancelacion is not None else None
+    if mejor_cromosoma is None:
+        if motivo_cancelacion is not None:
+            raise CancelacionSolicitada(motivo_cancelacion)
+        raise RuntimeError("Ningún solver del portafolio produjo una solución dentro del plazo")
+
+    return mejor_cromosoma, {
+        'ganador': ganador,
+        'fitness_ganador': mejor_fitness,
+        'optimo_demostrado': optimo_demostrado,
+        'cota_fitness': cota_fitness,
+        'tiempo_total_segundos': time.time() - tiempo_inicio,
+        'motivo_cancelacion': motivo_cancelacion,
+        'resultados': resultados
+    }
+
+
+def registrar_resultado_portafolio(
+    ruta_historial: str,
+    piezas_requeridas_df: pd.DataFrame,
+    resumen_portafolio: Dict[str, Any]
+) -> None:
+    """
+    Agrega el resultado de una ejecución del portafolio a un historial JSON Lines.
+
+    Cada línea guarda las características del subproblema junto con el solver
+    ganador y el fitness y tiempo de cada solver.
+
+    Args:
+        ruta_historial: Ruta del archivo de historial.
+        piezas_requeridas_df: DataFrame con las piezas requeridas del subproblema.
+        resumen_portafolio: Resumen retornado por ejecutar_portafolio.
+    """
+    registro = {
+        'fecha': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'num_tipos_piezas': int(len(piezas_requeridas_df)),
+        'num_piezas': int(piezas_requeridas_df['cantidad_requerida'].sum()),
+        'ganador': resumen_portafolio['ganador'],
+        'optimo_demostrado': resumen_portafolio['optimo_demostrado'],
+        'resultados': resumen_portafolio['resultados']
+    }
+    with open(ruta_historial, 'a', encoding='utf-8') as archivo:
+        archivo.write(json.dumps(registro, ensure_ascii=False) + '\n')
@@ -0,0 +1,164 @@
+"""
+Reparto de un presupuesto de tiempo entre subproblemas de corte.
+
+Los perfiles del AG asignan la misma población y el mismo número de
+generaciones a todos los subproblemas, tengan 3 piezas o 3.000. Este módulo
+estima la dificultad de cada subproblema (número de piezas, variedad de
+longitudes y brecha entre FFD y la cota inferior de Gilmore–Gomory) y reparte
+un presupuesto único en proporción a ella: los subproblemas que FFD ya resuelve
+en la cota reciben el mínimo, y los difíciles conservan el paralelismo del perfil.
+"""
+
+import math
+from typing import List, Dict, Any, Optional
+import pandas as pd
+
+from .demand import compilar_demanda
+from .population import generar_individuo_heuristico_ffd
+from .lower_bound import calcular_cota_inferior
+from .units import a_milimetros
+
+
+# Tiempo límite de los subproblemas que FFD ya resuelve en la cota inferior
+TIEMPO_SUBPROBLEMA_TRIVIAL_SEGUNDOS = 0.1
+
+# Tiempo límite mínimo de los demás subproblemas
+TIEMPO_MINIMO_SUBPROBLEMA_SEGUNDOS = 0.5
+
+# Límites del escalado de la configuración respecto a la del perfil
+GENERACIONES_MINIMAS = 5
+POBLACION_MINIMA = 10
+FACTOR_MAXIMO_GENERACIONES = 4.0
+FACTOR_MAXIMO_POBLACION = 2.0
+
+# Parámetros que dejan un subproblema en un solo proceso
+PARAMETROS_SIN_PARALELISMO = {
+    'paralelizar_evaluacion': False,
+    'evolucion_asincrona': False,
+    'num_islas': 1
+}
+
+
+def estimar_dificultad(
+    piezas_requeridas_df: pd.DataFrame,
+    barras_estandar_disponibles: List[Dict[str, Any]],
+    desperdicios_reutilizables_previos: Optional[List[Dict[str, Any]]] = None
+) -> Dict[str, float]:
+    """
+    Estima la dificultad de un subproblema.
+
+    La dificultad es el número de barras estándar que FFD usa por encima de la
+    cota inferior, multiplicado por el número de piezas y por el logaritmo de
+    la variedad de longitudes. Es cero si FFD ya alcanza la cota.
+
+    Args:
+        piezas_requeridas_df: DataFrame con las piezas requeridas.
+        barras_estandar_disponibles: Lista de barras estándar disponibles.
+        desperdicios_reutilizables_previos: Lista de desperdicios reutilizables.
+
+    Returns:
+        Dict: 'num_piezas', 'longitudes_distintas', 'brecha_barras' (barras de la
+            longitud más corta que FFD usa por encima de la cota; 1 si no hay
+            cota) y 'dificultad'.
+    """
+    desperdicios = desperdicios_reutilizables_previos or []
+    demanda = compilar_demanda(piezas_requeridas_df)
+    num_piezas = int(piezas_requeridas_df['cantidad_requerida'].sum())
+    longitudes_distintas = int(piezas_requeridas_df['longitud_pieza_requerida'].nunique())
+
+    cromosoma_ffd = generar_individuo_heuristico_ffd(piezas_requeridas_df, barras_estandar_disponibles, desperdicios)
+    longitud_estandar_ffd = sum(
+        a_milimetros(patron.origen_barra_longitud, patron.en_milimetros) for patron in cromosoma_ffd.patrones
+        if patron.origen_barra_tipo == 'estandar'
+    )
+
+    cota = calcular_cota_inferior(demanda, barras_estandar_disponibles, desperdicios)
+    if cota is None:
+        brecha_barras = 1.0
+    else:
+        barra_mas_corta = min(
+            a_milimetros(barra['longitud'], demanda.en_milimetros) for barra in barras_estandar_disponibles
+        )
+        brecha_barras = max(0, longitud_estandar_ffd - cota['longitud_minima_mm']) / barra_mas_corta
+
+    return {
+        'num_piezas': num_piezas,
+        'longitudes_distintas': longitudes_distintas,
+        'brecha_barras': brecha_barras,
+        'dificultad': brecha_barras * num_piezas * math.log2(1 + longitudes_distintas)
+    }
+
+
+def asignar_presupuesto(
+    dificultades: List[float],
+    presupuesto_segundos: float,
+    config_ga: Dict[str, Any]
+) -> List[Dict[str, Any]]:
+    """
+    Reparte un presupuesto de tiempo entre subproblemas según su dificultad.
+
+    Cada subproblema recibe un tiempo mínimo y el resto del presupuesto se reparte
+    en proporción a la dificultad. Las generaciones y la población del perfil se
+    escalan con la dificultad relativa a la media de los subproblemas no triviales
+    (la población con su raíz cuadrada). Solo los subproblemas de dificultad igual
+    o mayor que la media conservan la evaluación paralela y las islas del perfil.
+
+    Args:
+        dificultades: Dificultad de cada subproblema (estimar_dificultad).
+        presupuesto_segundos: Suma de los tiempos límite de todos los subproblemas.
+        config_ga: Configuración del AG del perfil.
+
+    Returns:
+        List[Dict]: Parámetros del AG que cada subproblema sobrescribe, en el mismo
+            orden que dificultades.
+    """
+    if not dificultades:
+        return []
+
+    minimos = [
+        TIEMPO_MINIMO_SUBPROBLEMA_SEGUNDOS if dificultad > 0 else TIEMPO_SUBPROBLEMA_TRIVIAL_SEGUNDOS
+        for dificultad in dificultades
+    ]
+    suma_minimos = sum(minimos)
+    suma_dificultades = sum(dificultades)
+    if suma_minimos >= presupuesto_segundos or suma_dificultades == 0:
+        escala = presupuesto_segundos / suma_minimos
+        tiempos = [minimo * escala for minimo in minimos]
+    else:
+        sobrante = presupuesto_segundos - suma_minimos
+        tiempos = [
+            minimo + sobrante * dificultad / suma_dificultades
+            for minimo, dificultad in zip(minimos, dificultades)
+        ]
+
+    no_triviales = [dificultad for dificultad in dificultades if dificultad > 0]
+    dificultad_media = sum(no_triviales) / len(no_triviales) if no_triviales else 0.0
+    generaciones_perfil = config_ga.get('max_generaciones', 100)
+    poblacion_perfil = config_ga.get('tamaño_poblacion', 50)
+    poblacion_minima = max(
+        POBLACION_MINIMA,
+        2 * config_ga.get('tamaño_elite', 0),
+        config_ga.get('tamaño_torneo', 0)
+    )
+
+    asignaciones = []
+    for dificultad, tiempo in zip(dificultades, tiempos):
+        factor = dificultad / dificultad_media if dificultad_media > 0 else 0.0
+        parametros = {
+            'tiempo_limite_segundos': tiempo,
+            'max_generaciones': int(min(
+                max(GENERACIONES_MINIMAS, round(generaciones_perfil * factor)),
+                generaciones_perfil * FACTOR_MAXIMO_GENERACIONES
+            )),
+            'tamaño_poblacion': int(min(
+                max(poblacion_minima, round(poblacion_perfil * math.sqrt(factor))),
+                max(poblacion_minima, poblacion_perfil * FACTOR_MAXIMO_POBLACION)
+            ))
+        }
+        if factor < 1:
+            parametros.update(PARAMETROS_SIN_PARALELISMO)
+        if dificultad == 0:
+            # FFD ya alcanza la cota: el AG se detiene en cuanto la comprueba
+            parametros['parada_por_cota_inferior'] = True
+        asignaciones.append(parametros)
+    return asignaciones
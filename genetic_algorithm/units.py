@@ -0,0 +1,127 @@
+"""
+Utilidades de unidades de longitud para el algoritmo genético.
+
+Las longitudes pueden representarse en metros o, en el modo de aritmética
+entera, en milímetros enteros. La unidad no se deduce del tipo del valor (un
+entero puede ser una longitud en metros, p. ej. int64 leído de un CSV): se
+indica de forma explícita con el flag en_milimetros. adaptar_entrada_completa
+lo fija una sola vez en el DataFrame de piezas (ver marcar_longitudes_en_milimetros)
+y de ahí lo toman la demanda compilada y los patrones construidos sobre ella.
+Los cálculos internos operan en la unidad de la entrada y solo se convierte a
+metros al reportar resultados o al aplicar pesos de fitness definidos por metro.
+"""
+
+from typing import Any, Union
+
+from . import ESCALA_MILIMETROS
+
+
+Longitud = Union[int, float]
+
+
+# Clave de DataFrame.attrs con la que el adaptador marca las piezas en milímetros
+ATRIBUTO_LONGITUDES_EN_MILIMETROS = 'longitudes_en_milimetros'
+
+
+def marcar_longitudes_en_milimetros(piezas_df: Any, en_milimetros: bool = True) -> None:
+    """
+    Registra en el DataFrame de piezas la unidad de sus longitudes.
+    
+    Args:
+        piezas_df: DataFrame de piezas requeridas (se modifica en el lugar).
+        en_milimetros: Si las longitudes están en milímetros enteros.
+    """
+    piezas_df.attrs[ATRIBUTO_LONGITUDES_EN_MILIMETROS] = bool(en_milimetros)
+
+
+def longitudes_en_milimetros(piezas_requeridas: Any) -> bool:
+    """
+    Indica si las longitudes de un conjunto de piezas están en milímetros enteros.
+    
+    Args:
+        piezas_requeridas: DataFrame de piezas requeridas o demanda compilada.
+    
+    Returns:
+        bool: True si la entrada se marcó en milímetros; False (metros) por defecto.
+    """
+    if hasattr(piezas_requeridas, 'en_milimetros'):
+        return piezas_requeridas.en_milimetros
+    return bool(getattr(piezas_requeridas, 'attrs', {}).get(ATRIBUTO_LONGITUDES_EN_MILIMETROS, False))
+
+
+def metros_a_milimetros(longitud_metros: float) -> int:
+    """
+    Convierte una longitud en metros a milímetros enteros.
+    
+    Args:
+        longitud_metros: Longitud en metros.
+    
+    Returns:
+        int: Longitud redondeada al milímetro más cercano.
+    """
+    return int(round(float(longitud_metros) * ESCALA_MILIMETROS))
+
+
+def milimetros_a_metros(longitud_mm: int) -> float:
+    """
+    Convierte una longitud en milímetros enteros a metros.
+    
+    Args:
+        longitud_mm: Longitud en milímetros.
+    
+    Returns:
+        float: Longitud en metros.
+    """
+    return int(longitud_mm) / ESCALA_MILIMETROS
+
+
+def a_metros(longitud: Longitud, en_milimetros: bool = False) -> float:
+    """
+    Expresa en metros una longitud que puede estar en milímetros enteros.
+    
+    Las longitudes en metros se retornan como float.
+    
+    Args:
+        longitud: Longitud en metros o en milímetros.
+        en_milimetros: Si la longitud está en milímetros enteros.
+    
+    Returns:
+        float: Longitud en metros.
+    """
+    if en_milimetros:
+        return milimetros_a_metros(longitud)
+    return float(longitud)
+
+
+def en_unidades_de(longitud_metros: float, en_milimetros: bool = False) -> Longitud:
+    """
+    Expresa una longitud en metros en la unidad indicada.
+    
+    Args:
+        longitud_metros: Longitud en metros.
+        en_milimetros: Si se expresa en milímetros enteros.
+    
+    Returns:
+        Longitud: Milímetros enteros o metros.
+    """
+    if en_milimetros:
+        return metros_a_milimetros(longitud_metros)
+    return longitud_metros
+
+
+def a_milimetros(longitud: Longitud, en_milimetros: bool = False) -> int:
+    """
+    Expresa en milímetros enteros una longitud que puede estar en metros.
+    
+    Las longitudes ya expresadas en milímetros enteros se retornan sin modificar.
+    
+    Args:
+        longitud: Longitud en metros o en milímetros.
+        en_milimetros: Si la longitud ya está en milímetros enteros.
+    
+    Returns:
+        int: Longitud en milímetros.
+    """
+    if en_milimetros:
+        return int(longitud)
+    return metros_a_milimetros(longitud)
@@ -4,10 +4,30 @@ import os
 import json
 import time
 import tempfile
+import threading
+import uuid
+import multiprocessing
 import matplotlib
+from concurrent.futures import ProcessPoolExecutor
 from genetic_algorithm.engine import ejecutar_algoritmo_genetico
+from genetic_algorithm.islands import ejecutar_modelo_islas
 from genetic_algorithm.input_adapter import adaptar_entrada_completa
 from genetic_algorithm.output_formatter import formatear_salida_desde_cromosoma
+from genetic_algorithm.exact_solver import resolver_exacto
+from genetic_algorithm.portfolio import ejecutar_portafolio, registrar_resultado_portafolio
+from genetic_algorithm.population import generar_individuo_heuristico_ffd, generar_individuo_heuristico_bfd
+from genetic_algorithm.fitness import calcular_fitness
+from genetic_algorithm.demand import compilar_demanda
+from genetic_algorithm.units import a_metros, milimetros_a_metros
+from genetic_algorithm.lower_bound import calcular_cota_inferior
+from genetic_algorithm.scheduler import estimar_dificultad, asignar_presupuesto
+from genetic_algorithm.cancellation import TokenCancelacion, CancelacionSolicitada
+from genetic_algorithm.checkpoint import (
+    calcular_clave_problema,
+    guardar_checkpoint,
+    cargar_checkpoint,
+    eliminar_checkpoint
+)
 from flask import send_file
 from weasyprint import HTML
 matplotlib.use('Agg')
@@ -40,11 +60,115 @@ def clean_nans(obj):
         return [clean_nans(i) for i in obj]
     return obj
 
+# Registro de los /upload cancelables, compartido por todos los procesos del servidor:
+# <id>.reservado (id emitido por /upload/id-trabajo), <id>.en_curso y <id>.cancelar
+DIRECTORIO_UPLOADS = os.path.join(tempfile.gettempdir(), 'oica_uploads')
+ANTIGUEDAD_MAXIMA_RESERVA_UPLOAD_SEGUNDOS = 3600  # Reservas sin usar y señales huérfanas
+
+def _ruta_upload(id_trabajo, estado):
+    """Archivo del registro que marca el estado ('reservado', 'en_curso' o 'cancelar') de un /upload."""
+    if not id_trabajo or not id_trabajo.isalnum():
+        return None
+    return os.path.join(DIRECTORIO_UPLOADS, f"{id_trabajo}.{estado}")
+
+def _reservar_id_upload():
+    """Emite un id aleatorio para un /upload y elimina las reservas y señales antiguas."""
+    os.makedirs(DIRECTORIO_UPLOADS, exist_ok=True)
+    limite = time.time() - ANTIGUEDAD_MAXIMA_RESERVA_UPLOAD_SEGUNDOS
+    for entrada in os.scandir(DIRECTORIO_UPLOADS):
+        if entrada.name.endswith(('.reservado', '.cancelar')):
+            try:
+                if entrada.stat().st_mtime < limite:
+                    os.remove(entrada.path)
+            except FileNotFoundError:
+                pass
+    id_trabajo = uuid.uuid4().hex
+    open(_ruta_upload(id_trabajo, 'reservado'), 'x').close()
+    return id_trabajo
+
+def _iniciar_upload(id_trabajo):
+    """
+    Marca como en curso un id reservado; False si el id no fue emitido o ya se usó.
+
+    Una señal de cancelación que haya quedado de antes se descarta, para que no
+    detenga la optimización que empieza.
+    """
+    ruta_reserva = _ruta_upload(id_trabajo, 'reservado')
+    if ruta_reserva is None:
+        return False
+    try:
+        os.rename(ruta_reserva, _ruta_upload(id_trabajo, 'en_curso'))
+    except FileNotFoundError:
+        return False
+    _eliminar_si_existe(_ruta_upload(id_trabajo, 'cancelar'))
+    return True
+
+def _finalizar_upload(id_trabajo):
+    """Quita del registro un /upload terminado junto con su señal de cancelación."""
+    _eliminar_si_existe(_ruta_upload(id_trabajo, 'en_curso'))
+    _eliminar_si_existe(_ruta_upload(id_trabajo, 'cancelar'))
+
+def _eliminar_si_existe(ruta):
+    try:
+        os.remove(ruta)
+    except FileNotFoundError:
+        pass
+
+def _limite_positivo(valor, por_defecto):
+    """Convierte un límite del formulario a float; None si no se envió ni hay valor por defecto."""
+    if not valor:
+        return por_defecto
+    limite = float(valor)
+    if limite <= 0:
+        raise ValueError
+    return limite
+
+def _optimizar_cartilla_upload(df, barras_estandar_dict, plazo_segundos, perfil, paralelo,
+                               ruta_senal, limite_tiempo_cpu_segundos, limite_memoria_mb):
+    """
+    Optimiza la cartilla de un /upload con su propio token de cancelación.
+
+    Returns:
+        tuple: (resultados_globales, desperdicios_globales_por_tipo_barra, motivo_cancelacion)
+    """
+    token_cancelacion = TokenCancelacion(
+        ruta_senal=ruta_senal,
+        limite_tiempo_cpu_segundos=limite_tiempo_cpu_segundos,
+        limite_memoria_mb=limite_memoria_mb
+    )
+    if plazo_segundos is not None:
+        # Modo anytime: mejor plan completo encontrado dentro del plazo global
+        resultados_globales, desperdicios_globales_por_tipo_barra = procesar_cartilla_con_plazo(
+            df,
+            barras_estandar_dict,
+            plazo_segundos,
+            config_algoritmo=perfil,
+            verbose=False,
+            token_cancelacion=token_cancelacion
+        )
+    else:
+        # Cada número de barra es independiente; se puede procesar en paralelo
+        resultados_globales, desperdicios_globales_por_tipo_barra = procesar_cartilla(
+            df,
+            barras_estandar_dict,
+            config_algoritmo=perfil,  # <-- Aquí se usa el perfil
+            paralelo=paralelo,
+            verbose=False,
+            token_cancelacion=token_cancelacion
+        )
+    return resultados_globales, desperdicios_globales_por_tipo_barra, token_cancelacion.motivo
+
 @app.route('/upload', methods=['POST'])
 def upload_file():
     """
     Endpoint para recibir un archivo XLSX o CSV desde el frontend,
     procesarlo y devolver resultados avanzados de optimización.
+
+    Con el campo opcional 'id_trabajo', obtenido antes en /upload/id-trabajo, la
+    optimización puede cancelarse desde /upload/<id_trabajo>/cancel; cada id sirve
+    para un solo upload. 'limite_tiempo_cpu_segundos' y 'limite_memoria_mb' la
+    detienen al superar esos recursos. En ambos casos se responden los resultados
+    parciales junto con 'motivo_cancelacion'.
     """
     print("===> Entrando a /upload")
     if 'file' not in request.files:
@@ -54,13 +178,36 @@ def upload_file():
     file = request.files['file']
     document_number = request.form.get('documentNumber', '')
     perfil = request.form.get('perfil', 'balanceado')  # Nuevo: recibe el perfil del frontend
+    paralelo_form = request.form.get('paralelo')
+    paralelo = PARALELIZAR_DIAMETROS if paralelo_form is None else paralelo_form.lower() in ('1', 'true', 'si', 'sí')
+    plazo_form = request.form.get('plazo_segundos')
+    plazo_segundos = PLAZO_GLOBAL_SEGUNDOS if not plazo_form else plazo_form
+    id_trabajo = request.form.get('id_trabajo', '')
+    try:
+        limite_tiempo_cpu_segundos = _limite_positivo(
+            request.form.get('limite_tiempo_cpu_segundos'), LIMITE_TIEMPO_CPU_TRABAJO_SEGUNDOS
+        )
+        limite_memoria_mb = _limite_positivo(request.form.get('limite_memoria_mb'), LIMITE_MEMORIA_TRABAJO_MB)
+    except ValueError:
+        return jsonify({'error': 'Los límites de recursos deben ser números positivos'}), 400
 
     if file.filename == '':
         print("Error: No selected file")
         return jsonify({'error': 'No selected file'}), 400
 
+    if id_trabajo and not _iniciar_upload(id_trabajo):
+        return jsonify({'error': 'id_trabajo desconocido o ya usado; solicite uno en /upload/id-trabajo'}), 404
+
     try:
         print("===> Entrando al try de /upload")
+        if plazo_segundos is not None:
+            try:
+                plazo_segundos = float(plazo_segundos)
+            except ValueError:
+                plazo_segundos = -1
+            if plazo_segundos <= 0:
+                print("Error: plazo_segundos inválido")
+                return jsonify({'error': 'plazo_segundos debe ser un número positivo'}), 400
         filename = file.filename.lower()
         if filename.endswith('.csv'):
             df = pd.read_csv(file, sep=';')
@@ -102,58 +249,21 @@ def upload_file():
             print("Error: No se pudieron cargar las barras estándar")
             return jsonify({'error': 'No se pudieron cargar las barras estándar'}), 500
 
-        resultados_globales = []
-        desperdicios_globales_por_tipo_barra = {tipo: [] for tipo in barras_estandar_dict.keys()}
-
-        numeros_barra_unicos = df['numero_barra'].unique()
-        for num_barra_actual in numeros_barra_unicos:
-            cartilla_num_barra_df = df[df['numero_barra'] == num_barra_actual].copy()
-            if cartilla_num_barra_df.empty:
-                continue
-
-            barras_estandar_para_tipo_actual = barras_estandar_dict.get(num_barra_actual, [])
-            if not barras_estandar_para_tipo_actual:
-                continue
-
-            desperdicios_acumulados_para_este_tipo = list(desperdicios_globales_por_tipo_barra[num_barra_actual])
-            grupos_ejecucion_unicos = sorted(cartilla_num_barra_df['grupo_ejecucion'].unique())
-
-            for grupo_ej_actual in grupos_ejecucion_unicos:
-                piezas_requeridas_grupo_df = cartilla_num_barra_df[
-                    cartilla_num_barra_df['grupo_ejecucion'] == grupo_ej_actual
-                ][['id_pedido', 'longitud_pieza_requerida', 'cantidad_requerida']].copy()
-
-                if piezas_requeridas_grupo_df.empty:
-                    continue
-
-                # Aquí se pasa el perfil seleccionado como configuración al algoritmo
-                patrones_generados, nuevos_desperdicios_de_este_grupo = \
-                    algoritmo_optimizacion_corte(
-                        piezas_requeridas_grupo_df,
-                        barras_estandar_para_tipo_actual,
-                        list(desperdicios_acumulados_para_este_tipo),
-                        config_algoritmo=perfil  # <-- Aquí se usa el perfil
-                    )
-
-                for patron in patrones_generados:
-                    resultados_globales.append({
-                        'numero_barra': num_barra_actual,
-                        'grupo_ejecucion': grupo_ej_actual,
-                        **patron
-                    })
-
-                if nuevos_desperdicios_de_este_grupo:
-                    desperdicios_acumulados_para_este_tipo.extend(nuevos_desperdicios_de_este_grupo)
-                    desperdicios_acumulados_para_este_tipo = consolidar_desperdicios(
-                        desperdicios_acumulados_para_este_tipo,
-                        LONGITUD_MINIMA_DESPERDICIO_UTILIZABLE
-                    )
-                    desperdicios_acumulados_para_este_tipo = priorizar_desperdicios(
-                        desperdicios_acumulados_para_este_tipo,
-                        'mayor_primero'
-                    )
-
-            desperdicios_globales_por_tipo_barra[num_barra_actual] = desperdicios_acumulados_para_este_tipo
+        argumentos_optimizacion = (
+            df, barras_estandar_dict, plazo_segundos, perfil, paralelo,
+            _ruta_upload(id_trabajo, 'cancelar'), limite_tiempo_cpu_segundos, limite_memoria_mb
+        )
+        if limite_tiempo_cpu_segundos is None and limite_memoria_mb is None:
+            resultados_globales, desperdicios_globales_por_tipo_barra, motivo_cancelacion = (
+                _optimizar_cartilla_upload(*argumentos_optimizacion)
+            )
+        else:
+            # Los límites se miden sobre el árbol de procesos del token: en un proceso
+            # propio no se mezclan con los de otros /upload atendidos a la vez
+            with ProcessPoolExecutor(max_workers=1) as executor:
+                resultados_globales, desperdicios_globales_por_tipo_barra, motivo_cancelacion = (
+                    executor.submit(_optimizar_cartilla_upload, *argumentos_optimizacion).result()
+                )
 
         if resultados_globales:
             resultados_df = pd.DataFrame(resultados_globales)
@@ -172,7 +282,8 @@ def upload_file():
                 'columns': list(df.columns),
                 'resultados': resultados_df.to_dict(orient='records'),
                 'metricas': metricas_desperdicios,
-                'cartilla': df.to_dict(orient='records')
+                'cartilla': df.to_dict(orient='records'),
+                'motivo_cancelacion': motivo_cancelacion
             }
             response_json = convert_np(response_json)
             response_json = clean_nans(response_json)
@@ -181,12 +292,39 @@ def upload_file():
             return jsonify(response_json)
         else:
             print("Error: No se generaron patrones de corte")
-            return jsonify({'error': 'No se generaron patrones de corte'}), 422
+            return jsonify({
+                'error': 'No se generaron patrones de corte',
+                'motivo_cancelacion': motivo_cancelacion
+            }), 422
 
     except Exception as e:
         print(f"Error inesperado: {e}")
         return jsonify({'error': str(e)}), 500
 
+    finally:
+        if id_trabajo:
+            _finalizar_upload(id_trabajo)
+
+@app.route('/upload/id-trabajo', methods=['POST'])
+def reservar_id_upload():
+    """
+    Emite un id_trabajo aleatorio para enviarlo en el siguiente /upload y poder
+    cancelarlo; solo quien recibió el id puede cancelar ese upload.
+    """
+    return jsonify({'id_trabajo': _reservar_id_upload()}), 201
+
+@app.route('/upload/<id_trabajo>/cancel', methods=['POST'])
+def cancelar_upload(id_trabajo):
+    """
+    Cancela el /upload en curso enviado con este id_trabajo; responde con los
+    patrones obtenidos hasta que la optimización detecta la señal.
+    """
+    ruta_en_curso = _ruta_upload(id_trabajo, 'en_curso')
+    if ruta_en_curso is None or not os.path.exists(ruta_en_curso):
+        return jsonify({'error': 'No hay un upload en curso con ese id_trabajo'}), 404
+    TokenCancelacion(ruta_senal=_ruta_upload(id_trabajo, 'cancelar')).cancelar()
+    return jsonify({'id_trabajo': id_trabajo, 'estado': 'cancelacion_solicitada'}), 202
+
 @app.route('/descargar-pdf', methods=['POST'])
 def descargar_pdf():
     """
@@ -273,7 +411,8 @@ CONFIGURACIONES_AG = {
         'criterio_convergencia': 'generaciones_sin_mejora',
         'generaciones_sin_mejora_max': 8,
         'tiempo_limite_segundos': 30,
-        'logging_habilitado': False
+        'logging_habilitado': False,
+        'parada_por_cota_inferior': True  # Detener al alcanzar la cota de Gilmore–Gomory
     },
     'balanceado': {
         'tamaño_poblacion': 30,
@@ -291,7 +430,8 @@ CONFIGURACIONES_AG = {
         'generaciones_sin_mejora_max': 15,
         'tiempo_limite_segundos': 120,
         'logging_habilitado': True,
-        'logging_frecuencia': 10
+        'logging_frecuencia': 10,
+        'parada_por_cota_inferior': True
     },
     'intensivo': {
         'tamaño_poblacion': 50,
@@ -309,13 +449,57 @@ CONFIGURACIONES_AG = {
         'generaciones_sin_mejora_max': 25,
         'tiempo_limite_segundos': 300,
         'logging_habilitado': True,
-        'logging_frecuencia': 5
+        'logging_frecuencia': 5,
+        'paralelizar_evaluacion': True,  # Evaluación y descendencia en todos los núcleos
+        'tamaño_lote_paralelo': 4,
+        'num_islas': 4,  # Modelo de islas: 4 subpoblaciones en procesos separados
+        'intervalo_migracion': 5,
+        'num_migrantes': 2,
+        'parada_por_cota_inferior': True
     }
 }
 
 # Configuración por defecto del AG (se puede cambiar aquí)
 PERFIL_AG_DEFAULT = 'rapido'
 
+# Procesar cada número de barra (diámetro) en un proceso distinto
+PARALELIZAR_DIAMETROS = False
+
+# Grupos con hasta este número de piezas se resuelven con el solver exacto; si agota
+# su presupuesto de nodos o de tiempo, se ejecuta el AG
+UMBRAL_PIEZAS_SOLVER_EXACTO = 30
+
+# Modo portafolio: FFD, BFD, análisis óptimo, solver exacto y AG compiten en procesos
+# separados con el tiempo límite del perfil como plazo común. Se activa aquí o con
+# {'portafolio': True} en config_algoritmo
+MODO_PORTAFOLIO = False
+RUTA_HISTORIAL_PORTAFOLIO = 'historial_portafolio.jsonl'
+
+# Directorio de checkpoints: tras cada grupo de ejecución se guardan los resultados y
+# el inventario de desperdicios de cada número de barra, y el AG guarda su propio
+# checkpoint por grupo. Una corrida interrumpida se reanuda desde ahí (None = desactivado)
+DIRECTORIO_CHECKPOINTS = None
+
+# Plazo global (modo anytime): toda la cartilla se resuelve dentro de este número de
+# segundos, primero con FFD/BFD y luego mejorando los subproblemas de mayor ganancia
+# estimada (None = sin plazo global; cada subproblema usa el tiempo límite del perfil)
+PLAZO_GLOBAL_SEGUNDOS = None
+RESERVA_PLAZO_GLOBAL_SEGUNDOS = 0.2  # Margen para ensamblar el plan antes del plazo
+TIEMPO_MINIMO_MEJORA_SEGUNDOS = 0.5  # No se inicia una mejora con menos tiempo que este
+TOLERANCIA_GANANCIA_METROS = 1e-6
+
+# Presupuesto global: suma de los tiempos límite de todos los subproblemas, repartida
+# según su dificultad estimada (ver genetic_algorithm/scheduler.py). La población y las
+# generaciones del perfil también se escalan con la dificultad (None = cada subproblema
+# usa la configuración del perfil)
+PRESUPUESTO_GLOBAL_SEGUNDOS = None
+
+# Límites de recursos por trabajo (/upload): al superarlos, la optimización se detiene
+# entre generaciones o subproblemas y retorna los resultados obtenidos hasta ese momento
+# (None = sin límite)
+LIMITE_TIEMPO_CPU_TRABAJO_SEGUNDOS = None
+LIMITE_MEMORIA_TRABAJO_MB = None
+
 # --- Funciones de Carga de Datos ---
 def cargar_cartilla_acero(ruta_archivo):
     """
@@ -363,7 +547,9 @@ def cargar_barras_estandar(ruta_archivo):
 def algoritmo_optimizacion_corte(piezas_requeridas_df,
                                  barras_estandar_disponibles_para_tipo,
                                  desperdicios_reutilizables_previos,
-                                 config_algoritmo=None):
+                                 config_algoritmo=None,
+                                 callback_progreso=None,
+                                 token_cancelacion=None):
     """
     Algoritmo de optimización de corte usando Algoritmo Genético.
 
@@ -373,6 +559,11 @@ def algoritmo_optimizacion_corte(piezas_requeridas_df,
         barras_estandar_disponibles_para_tipo (list): Lista de longitudes de barras estándar (ej. [6.0, 12.0]).
         desperdicios_reutilizables_previos (list): Lista de longitudes de desperdicios de grupos anteriores.
         config_algoritmo (dict, optional): Configuración específica para el algoritmo.
+        callback_progreso (callable, optional): Receptor de los eventos de progreso por
+                                                generación del AG.
+        token_cancelacion (TokenCancelacion, optional): Token de cancelación y límites de
+                                                        recursos; al cancelarse, el AG retorna
+                                                        su mejor solución hasta el momento.
 
     Returns:
         tuple: (patrones_de_corte_generados, nuevos_desperdicios_utilizables)
@@ -417,16 +608,68 @@ def algoritmo_optimizacion_corte(piezas_requeridas_df,
             desperdicios_reutilizables_previos,
             LONGITUD_MINIMA_DESPERDICIO_UTILIZABLE,
             consolidar_piezas=True,
-            limpiar_datos=True
+            limpiar_datos=True,
+            aritmetica_entera=config_ga.get('aritmetica_entera', False)
         )
         
-        # Ejecutar algoritmo genético
-        mejor_cromosoma, estadisticas = ejecutar_algoritmo_genetico(
-            piezas_adaptadas,
-            barras_dict,
-            desperdicios_dict,
-            config_ga
-        )
+        usar_portafolio = MODO_PORTAFOLIO
+        if isinstance(config_algoritmo, dict):
+            usar_portafolio = config_algoritmo.get('portafolio', MODO_PORTAFOLIO)
+        
+        if usar_portafolio:
+            mejor_cromosoma, resumen_portafolio = ejecutar_portafolio(
+                piezas_adaptadas,
+                barras_dict,
+                desperdicios_dict,
+                config_ga,
+                tiempo_limite_segundos=config_ga.get('tiempo_limite_segundos', 300),
+                token_cancelacion=token_cancelacion,
+                callback_progreso=callback_progreso
+            )
+            registrar_resultado_portafolio(RUTA_HISTORIAL_PORTAFOLIO, piezas_adaptadas, resumen_portafolio)
+            patrones_de_corte_generados, nuevos_desperdicios_utilizables = formatear_salida_desde_cromosoma(
+                mejor_cromosoma,
+                LONGITUD_MINIMA_DESPERDICIO_UTILIZABLE
+            )
+            print(f"Portafolio: ganó '{resumen_portafolio['ganador']}' con fitness "
+                  f"{resumen_portafolio['fitness_ganador']:.4f} en {resumen_portafolio['tiempo_total_segundos']:.2f} segundos"
+                  f"{' (óptimo demostrado)' if resumen_portafolio['optimo_demostrado'] else ''}")
+            print("--- Fin Algoritmo Genético ---")
+            return patrones_de_corte_generados, nuevos_desperdicios_utilizables
+        
+        # Subproblemas pequeños: solver exacto por ramificación y acotamiento
+        if piezas_adaptadas['cantidad_requerida'].sum() <= UMBRAL_PIEZAS_SOLVER_EXACTO:
+            cromosoma_exacto = resolver_exacto(piezas_adaptadas, barras_dict, desperdicios_dict)
+            if cromosoma_exacto is not None:
+                patrones_de_corte_generados, nuevos_desperdicios_utilizables = formatear_salida_desde_cromosoma(
+                    cromosoma_exacto,
+                    LONGITUD_MINIMA_DESPERDICIO_UTILIZABLE
+                )
+                print(f"Solución óptima del solver exacto en {time.time() - tiempo_inicio:.2f} segundos")
+                print("--- Fin Algoritmo Genético ---")
+                return patrones_de_corte_generados, nuevos_desperdicios_utilizables
+            print("Solver exacto sin solución demostrada dentro del presupuesto; se ejecuta el AG")
+        
+        # Ejecutar algoritmo genético (modelo de islas si el perfil define varias)
+        if config_ga.get('num_islas', 1) > 1:
+            mejor_cromosoma, estadisticas = ejecutar_modelo_islas(
+                piezas_adaptadas,
+                barras_dict,
+                desperdicios_dict,
+                config_ga,
+                variantes_islas=_variantes_islas(config_ga),
+                callback_progreso=callback_progreso,
+                token_cancelacion=token_cancelacion
+            )
+        else:
+            mejor_cromosoma, estadisticas = ejecutar_algoritmo_genetico(
+                piezas_adaptadas,
+                barras_dict,
+                desperdicios_dict,
+                config_ga,
+                callback_progreso=callback_progreso,
+                token_cancelacion=token_cancelacion
+            )
         
         # Formatear salida al formato esperado por main.py
         patrones_de_corte_generados, nuevos_desperdicios_utilizables = formatear_salida_desde_cromosoma(
@@ -453,6 +696,10 @@ def algoritmo_optimizacion_corte(piezas_requeridas_df,
         print("--- Fin Algoritmo Genético ---")
         return patrones_de_corte_generados, nuevos_desperdicios_utilizables
         
+    except CancelacionSolicitada:
+        # La cancelación no se resuelve con el algoritmo de respaldo: se propaga al orquestador
+        raise
+        
     except Exception as e:
         print(f"ERROR en el algoritmo genético: {e}")
         print("Ejecutando algoritmo de respaldo (First Fit Decreasing)...")
@@ -605,6 +852,26 @@ def priorizar_desperdicios(desperdicios_lista, estrategia='mayor_primero'):
         return desperdicios_lista
 
 
+def _actualizar_desperdicios(desperdicios_acumulados, nuevos_desperdicios):
+    """
+    Agrega los desperdicios de un grupo al inventario disponible para los grupos siguientes.
+
+    Args:
+        desperdicios_acumulados (list): Inventario antes del grupo.
+        nuevos_desperdicios (list): Desperdicios utilizables generados por el grupo.
+
+    Returns:
+        list: Inventario consolidado y priorizado para el siguiente grupo.
+    """
+    if not nuevos_desperdicios:
+        return list(desperdicios_acumulados)
+    desperdicios = consolidar_desperdicios(
+        list(desperdicios_acumulados) + list(nuevos_desperdicios),
+        LONGITUD_MINIMA_DESPERDICIO_UTILIZABLE
+    )
+    return priorizar_desperdicios(desperdicios, 'mayor_primero')
+
+
 def generar_metricas_desperdicios(desperdicios_por_tipo, resultados_df):
     """
     Genera métricas detalladas sobre el uso de desperdicios.
@@ -648,111 +915,894 @@ def generar_metricas_desperdicios(desperdicios_por_tipo, resultados_df):
     return metricas
 
 
-# --- Lógica Principal ---
-def main():
+def procesar_numero_barra(num_barra_actual, cartilla_num_barra_df, barras_estandar_para_tipo_actual,
+                          desperdicios_iniciales=None, config_algoritmo=None, verbose=True,
+                          directorio_checkpoints=None, callback_progreso=None,
+                          parametros_por_grupo=None, token_cancelacion=None):
     """
-    Función principal para orquestar el proceso de optimización de cortes.
+    Procesa secuencialmente todos los grupos de ejecución de un número de barra.
+
+    Los desperdicios solo se comparten dentro del mismo número de barra y de un grupo
+    de ejecución a los posteriores, por lo que cada número de barra es independiente.
+
+    Args:
+        num_barra_actual: Número de barra (diámetro) a procesar.
+        cartilla_num_barra_df (pd.DataFrame): Filas de la cartilla de este número de barra.
+        barras_estandar_para_tipo_actual (list): Longitudes de barras estándar para el tipo.
+        desperdicios_iniciales (list, optional): Desperdicios disponibles antes del primer grupo.
+        config_algoritmo (str | dict, optional): Perfil o configuración del AG.
+        verbose (bool): Si se imprime el progreso por grupo.
+        directorio_checkpoints (str, optional): Directorio donde se guarda el avance tras
+            cada grupo; si ya contiene un checkpoint de estos mismos datos, los grupos
+            completados no se vuelven a optimizar.
+        callback_progreso (callable, optional): Receptor de eventos de progreso. Recibe
+            'inicio_subproblema' y 'fin_subproblema' por grupo y los eventos por generación
+            del AG, todos con 'numero_barra' y 'grupo_ejecucion'.
+        parametros_por_grupo (dict, optional): Parámetros del AG que cada grupo de
+            ejecución sobrescribe (ver _planificar_presupuesto).
+        token_cancelacion (TokenCancelacion, optional): Se consulta antes y después de cada
+            grupo; al cancelarse no se inician más grupos y se retornan los ya resueltos
+            más el plan parcial del grupo interrumpido. Ese grupo no se marca como
+            completado en el checkpoint: al reanudar se vuelve a optimizar, partiendo del
+            checkpoint de su AG.
+
+    Returns:
+        tuple: (resultados, desperdicios_finales)
+               resultados (list): Patrones generados con 'numero_barra' y 'grupo_ejecucion'.
+               desperdicios_finales (list): Desperdicios acumulados tras el último grupo.
     """
-    print("Iniciando proceso de optimización de cortes de acero...")
+    resultados = []
+    # Desperdicios acumulados específicamente para este 'numero_barra' a través de sus grupos de ejecución
+    desperdicios_acumulados_para_este_tipo = list(desperdicios_iniciales or [])
+    grupos_completados = []
+
+    ruta_checkpoint = None
+    if directorio_checkpoints:
+        ruta_checkpoint = os.path.join(directorio_checkpoints, f"barra_{num_barra_actual}.ckpt")
+        clave_checkpoint = calcular_clave_problema(
+            cartilla_num_barra_df,
+            barras_estandar_para_tipo_actual,
+            desperdicios_iniciales,
+            config_algoritmo,
+            parametros_por_grupo
+        )
+        estado = cargar_checkpoint(ruta_checkpoint, clave_checkpoint)
+        if estado is not None:
+            resultados = estado['resultados']
+            desperdicios_acumulados_para_este_tipo = estado['desperdicios']
+            grupos_completados = estado['grupos_completados']
+            if verbose:
+                print(f"Reanudando {num_barra_actual}: grupos ya completados {grupos_completados}")
+
+    # Agrupar por 'grupo_ejecucion' (orden de uso en obra) y procesar secuencialmente
+    grupos_ejecucion_unicos = sorted(cartilla_num_barra_df['grupo_ejecucion'].unique())
+    if verbose:
+        print(f"Procesando grupos de ejecución para {num_barra_actual}: {grupos_ejecucion_unicos}")
 
-    # 1. Cargar datos
-    cartilla_df = cargar_cartilla_acero(RUTA_CARTILLA_ACERO)
-    barras_estandar_dict = cargar_barras_estandar(RUTA_BARRAS_ESTANDAR)
+    for grupo_ej_actual in grupos_ejecucion_unicos:
+        if grupo_ej_actual in grupos_completados:
+            continue
 
-    if cartilla_df.empty or not barras_estandar_dict:
-        print("No se pudieron cargar los datos necesarios. Terminando ejecución.")
-        return
+        if token_cancelacion is not None and token_cancelacion.cancelado:
+            if verbose:
+                print(f"Procesamiento de {num_barra_actual} detenido ({token_cancelacion.motivo}) antes del grupo {grupo_ej_actual}")
+            break
+
+        if verbose:
+            print(f"\n--- Procesando Grupo de Ejecución: {grupo_ej_actual} (para Barra {num_barra_actual}) ---")
+
+        piezas_requeridas_grupo_df = cartilla_num_barra_df[
+            cartilla_num_barra_df['grupo_ejecucion'] == grupo_ej_actual
+        ][['id_pedido', 'longitud_pieza_requerida', 'cantidad_requerida']].copy()
+
+        if piezas_requeridas_grupo_df.empty:
+            if verbose:
+                print(f"No hay piezas requeridas para el grupo de ejecución {grupo_ej_actual} de la barra {num_barra_actual}.")
+            continue
+
+        if verbose:
+            print(f"Desperdicios disponibles de grupos anteriores para {num_barra_actual}: {desperdicios_acumulados_para_este_tipo}")
+
+        # Los desperdicios_acumulados_para_este_tipo son los que vienen de grupos de ejecución ANTERIORES
+        # para ESTE MISMO numero_barra.
+        config_grupo = config_algoritmo
+        if ruta_checkpoint:
+            # El AG del grupo guarda su propio checkpoint junto al del número de barra
+            config_grupo = _config_con_parametros(
+                config_algoritmo,
+                ruta_checkpoint=os.path.join(
+                    directorio_checkpoints, f"barra_{num_barra_actual}_grupo_{grupo_ej_actual}.ckpt"
+                )
+            )
+        if parametros_por_grupo and grupo_ej_actual in parametros_por_grupo:
+            config_grupo = _config_con_parametros(config_grupo, **parametros_por_grupo[grupo_ej_actual])
+
+        callback_grupo = None
+        if callback_progreso is not None:
+            callback_grupo = _callback_con_subproblema(callback_progreso, num_barra_actual, grupo_ej_actual)
+            callback_grupo({
+                'tipo': 'inicio_subproblema',
+                'num_piezas': int(piezas_requeridas_grupo_df['cantidad_requerida'].sum())
+            })
+        tiempo_inicio_grupo = time.time()
+
+        try:
+            patrones_generados, nuevos_desperdicios_de_este_grupo = \
+                algoritmo_optimizacion_corte(piezas_requeridas_grupo_df,
+                                             barras_estandar_para_tipo_actual,
+                                             list(desperdicios_acumulados_para_este_tipo), # Pasar una copia
+                                             config_algoritmo=config_grupo,
+                                             callback_progreso=callback_grupo,
+                                             token_cancelacion=token_cancelacion)
+        except CancelacionSolicitada as e:
+            if verbose:
+                print(f"Grupo {grupo_ej_actual} de {num_barra_actual} detenido ({e.motivo}) sin solución")
+            break
+
+        if callback_grupo is not None:
+            callback_grupo({
+                'tipo': 'fin_subproblema',
+                'num_patrones': len(patrones_generados),
+                'tiempo_segundos': time.time() - tiempo_inicio_grupo
+            })
+
+        # Guardar resultados de este grupo
+        for patron in patrones_generados:
+            resultados.append({
+                'numero_barra': num_barra_actual,
+                'grupo_ejecucion': grupo_ej_actual,
+                **patron # Desempaqueta el diccionario del patrón
+            })
+
+        # Actualizar la lista de desperdicios acumulados para el SIGUIENTE grupo de ejecución
+        if nuevos_desperdicios_de_este_grupo:
+            desperdicios_acumulados_para_este_tipo = _actualizar_desperdicios(
+                desperdicios_acumulados_para_este_tipo,
+                nuevos_desperdicios_de_este_grupo
+            )
+
+            if verbose:
+                print(f"Desperdicios actualizados para {num_barra_actual} después del grupo {grupo_ej_actual}: {desperdicios_acumulados_para_este_tipo}")
+
+        if token_cancelacion is not None and token_cancelacion.cancelado:
+            # El plan del grupo se cortó antes de tiempo: se retorna como parcial, pero no se
+            # marca como completado, para que al reanudar se optimice desde su propio checkpoint
+            if verbose:
+                print(f"Grupo {grupo_ej_actual} de {num_barra_actual} detenido ({token_cancelacion.motivo}) con un plan parcial")
+            break
+
+        if ruta_checkpoint:
+            grupos_completados.append(grupo_ej_actual)
+            guardar_checkpoint(ruta_checkpoint, clave_checkpoint, {
+                'resultados': resultados,
+                'desperdicios': desperdicios_acumulados_para_este_tipo,
+                'grupos_completados': grupos_completados
+            })
+
+    return resultados, desperdicios_acumulados_para_este_tipo
+
+
+def _callback_con_subproblema(callback_progreso, num_barra_actual, grupo_ej_actual):
+    """
+    Envuelve un callback de progreso para que cada evento indique su subproblema.
+
+    Args:
+        callback_progreso (callable): Receptor de eventos original.
+        num_barra_actual: Número de barra del subproblema.
+        grupo_ej_actual: Grupo de ejecución del subproblema.
+
+    Returns:
+        callable: Callback que agrega 'numero_barra' y 'grupo_ejecucion' a cada evento.
+    """
+    subproblema = {'numero_barra': _a_tipo_nativo(num_barra_actual), 'grupo_ejecucion': _a_tipo_nativo(grupo_ej_actual)}
+
+    def callback_grupo(evento):
+        callback_progreso({**evento, **subproblema})
+
+    return callback_grupo
+
+
+def _a_tipo_nativo(valor):
+    """Convierte escalares de numpy a tipos de Python para que los eventos sean serializables."""
+    return valor.item() if isinstance(valor, np.generic) else valor
+
+
+class _EmisorColaProgreso:
+    """Callback serializable que reenvía los eventos de un proceso trabajador a una cola."""
+
+    def __init__(self, cola):
+        self.cola = cola
+
+    def __call__(self, evento):
+        self.cola.put(evento)
+
+
+def _procesar_numero_barra_en_trabajador(*args, token_cancelacion=None, **kwargs):
+    """
+    Ejecuta procesar_numero_barra en un proceso trabajador.
+
+    Returns:
+        tuple: Resultado de procesar_numero_barra y motivo de cancelación visto por la
+            copia del token del trabajador (None si no se detuvo).
+    """
+    resultado = procesar_numero_barra(*args, token_cancelacion=token_cancelacion, **kwargs)
+    return resultado, token_cancelacion.motivo if token_cancelacion is not None else None
+
+
+def _reenviar_eventos(cola, callback_progreso):
+    """Entrega al callback los eventos de la cola hasta recibir None."""
+    for evento in iter(cola.get, None):
+        callback_progreso(evento)
+
+
+def _variantes_islas(config_ga):
+    """
+    Construye las variantes de operadores de cada isla a partir de los perfiles del AG.
+
+    La primera isla conserva los operadores de config_ga; las demás toman la
+    estrategia de cruce y el método de selección de los perfiles de CONFIGURACIONES_AG.
+
+    Args:
+        config_ga (dict): Configuración del AG de la ejecución.
+
+    Returns:
+        list: Diccionarios de parámetros que cada isla sobrescribe.
+    """
+    claves_operadores = ('estrategia_cruce', 'metodo_seleccion', 'tamaño_torneo')
+    variantes = [{}]
+    for perfil in CONFIGURACIONES_AG.values():
+        variante = {clave: perfil[clave] for clave in claves_operadores if clave in perfil}
+        if variante not in variantes and any(variante.get(c) != config_ga.get(c) for c in variante):
+            variantes.append(variante)
+    return variantes
+
+
+def _config_con_parametros(config_algoritmo, **parametros_adicionales):
+    """
+    Normaliza la configuración del AG y le agrega parámetros.
+
+    Args:
+        config_algoritmo (str | dict | None): Perfil o configuración del AG.
+        **parametros_adicionales: Parámetros del AG que se sobrescriben.
+
+    Returns:
+        dict: Configuración con 'perfil' y 'parametros'; las demás claves se conservan.
+    """
+    if isinstance(config_algoritmo, dict):
+        config = dict(config_algoritmo)
+        config.setdefault('perfil', PERFIL_AG_DEFAULT)
+        config['parametros'] = {**config_algoritmo.get('parametros', {}), **parametros_adicionales}
+    else:
+        config = {
+            'perfil': config_algoritmo or PERFIL_AG_DEFAULT,
+            'parametros': dict(parametros_adicionales)
+        }
+    return config
+
+
+def _config_sin_paralelismo_interno(config_algoritmo):
+    """
+    Desactiva la evaluación paralela y las islas del AG cuando los diámetros ya corren en procesos separados.
+
+    Args:
+        config_algoritmo (str | dict | None): Perfil o configuración del AG.
+
+    Returns:
+        dict: Configuración con 'perfil' y 'parametros' equivalente a la original.
+    """
+    return _config_con_parametros(config_algoritmo, paralelizar_evaluacion=False, num_islas=1)
+
+
+def _config_ga_efectiva(config_algoritmo):
+    """
+    Construye la configuración del AG de un perfil con sus parámetros personalizados.
+
+    Args:
+        config_algoritmo (str | dict | None): Perfil o configuración del AG.
+
+    Returns:
+        dict: Configuración del perfil (o de PERFIL_AG_DEFAULT si no existe) con los
+              'parametros' de config_algoritmo aplicados.
+    """
+    config_normalizada = _config_con_parametros(config_algoritmo)
+    config_ga = CONFIGURACIONES_AG.get(config_normalizada['perfil'], CONFIGURACIONES_AG[PERFIL_AG_DEFAULT]).copy()
+    config_ga.update(config_normalizada['parametros'])
+    return config_ga
+
+
+def _planificar_presupuesto(cartilla_df, barras_estandar_dict, presupuesto_segundos,
+                            config_algoritmo=None, verbose=True):
+    """
+    Reparte el presupuesto de tiempo de la cartilla entre sus subproblemas.
+
+    La dificultad de cada (número de barra, grupo de ejecución) se estima sin los
+    desperdicios de grupos anteriores, que solo se conocen al resolverlos.
+
+    Args:
+        cartilla_df (pd.DataFrame): Cartilla completa con 'numero_barra' y 'grupo_ejecucion'.
+        barras_estandar_dict (dict): Longitudes de barras estándar por número de barra.
+        presupuesto_segundos (float): Suma de los tiempos límite de todos los subproblemas.
+        config_algoritmo (str | dict, optional): Perfil o configuración del AG.
+        verbose (bool): Si se imprime el reparto.
+
+    Returns:
+        dict: Parámetros del AG por número de barra y grupo de ejecución
+              ({numero_barra: {grupo_ejecucion: parametros}}).
+    """
+    config_ga = _config_ga_efectiva(config_algoritmo)
+    subproblemas = []
+    dificultades = []
+    for (num_barra, grupo_ej), piezas_df in cartilla_df.groupby(['numero_barra', 'grupo_ejecucion'], sort=False):
+        barras_tipo = barras_estandar_dict.get(num_barra, [])
+        if not barras_tipo:
+            continue
+        piezas_adaptadas, barras_dict, _, _ = adaptar_entrada_completa(
+            piezas_df[['id_pedido', 'longitud_pieza_requerida', 'cantidad_requerida']],
+            barras_tipo,
+            [],
+            LONGITUD_MINIMA_DESPERDICIO_UTILIZABLE,
+            consolidar_piezas=True,
+            limpiar_datos=True,
+            aritmetica_entera=config_ga.get('aritmetica_entera', False)
+        )
+        if piezas_adaptadas.empty:
+            continue
+        estimacion = estimar_dificultad(piezas_adaptadas, barras_dict)
+        subproblemas.append((num_barra, grupo_ej))
+        dificultades.append(estimacion['dificultad'])
+        if verbose:
+            print(f"Dificultad estimada de {num_barra}, grupo {grupo_ej}: {estimacion['dificultad']:.1f} "
+                  f"({estimacion['num_piezas']} piezas, {estimacion['brecha_barras']:.1f} barras sobre la cota)")
+
+    parametros_por_subproblema = {}
+    for (num_barra, grupo_ej), parametros in zip(
+        subproblemas, asignar_presupuesto(dificultades, presupuesto_segundos, config_ga)
+    ):
+        parametros_por_subproblema.setdefault(num_barra, {})[grupo_ej] = parametros
+    return parametros_por_subproblema
+
+
+def procesar_cartilla(cartilla_df, barras_estandar_dict, config_algoritmo=None,
+                      paralelo=False, num_trabajadores=None, verbose=True,
+                      directorio_checkpoints=None, callback_progreso=None,
+                      presupuesto_segundos=None, token_cancelacion=None):
+    """
+    Procesa todos los números de barra de la cartilla.
 
-    # Estructura para almacenar todos los resultados
+    En modo paralelo cada número de barra se envía a un proceso distinto; los
+    resultados se combinan en el orden de aparición de los números de barra, de
+    modo que la salida tiene el mismo orden que en modo secuencial.
+
+    Args:
+        cartilla_df (pd.DataFrame): Cartilla completa con 'numero_barra' y 'grupo_ejecucion'.
+        barras_estandar_dict (dict): Longitudes de barras estándar por número de barra.
+        config_algoritmo (str | dict, optional): Perfil o configuración del AG.
+        paralelo (bool): Si se procesan los números de barra en procesos separados.
+        num_trabajadores (int, optional): Máximo de procesos (por defecto, uno por núcleo).
+        verbose (bool): Si se imprime el progreso.
+        directorio_checkpoints (str, optional): Directorio de checkpoints por número de
+            barra (ver procesar_numero_barra). Se eliminan al completar la cartilla.
+        callback_progreso (callable, optional): Receptor de eventos de progreso (ver
+            procesar_numero_barra). En modo paralelo los eventos llegan desde los procesos
+            trabajadores a través de una cola y se entregan en un hilo del proceso principal.
+        presupuesto_segundos (float, optional): Presupuesto de tiempo de toda la cartilla,
+            repartido entre los subproblemas según su dificultad (ver _planificar_presupuesto).
+        token_cancelacion (TokenCancelacion, optional): Token de cancelación y límites de
+            recursos (ver procesar_numero_barra). En modo paralelo la cancelación llega a
+            los procesos trabajadores solo a través de su archivo de señal. Si se cancela,
+            se retornan los resultados parciales y se conservan los checkpoints.
+
+    Returns:
+        tuple: (resultados_globales, desperdicios_globales_por_tipo_barra)
+    """
     resultados_globales = []
     # Estructura para llevar cuenta de los desperdicios por tipo de barra a través de los grupos de ejecución
     desperdicios_globales_por_tipo_barra = {tipo: [] for tipo in barras_estandar_dict.keys()}
 
-
-    # 2. Agrupar por 'numero_barra' (diámetro)
+    # Agrupar por 'numero_barra' (diámetro)
     numeros_barra_unicos = cartilla_df['numero_barra'].unique()
-    print(f"\nProcesando los siguientes tipos de barra (diámetros): {numeros_barra_unicos}")
+    if verbose:
+        print(f"\nProcesando los siguientes tipos de barra (diámetros): {numeros_barra_unicos}")
+
+    parametros_por_subproblema = {}
+    if presupuesto_segundos is not None:
+        parametros_por_subproblema = _planificar_presupuesto(
+            cartilla_df, barras_estandar_dict, presupuesto_segundos, config_algoritmo, verbose
+        )
 
+    tareas = []
     for num_barra_actual in numeros_barra_unicos:
-        print(f"\n===== Procesando Número de Barra: {num_barra_actual} =====")
-        
         cartilla_num_barra_df = cartilla_df[cartilla_df['numero_barra'] == num_barra_actual].copy()
         if cartilla_num_barra_df.empty:
-            print(f"No hay pedidos para el número de barra {num_barra_actual}.")
+            if verbose:
+                print(f"No hay pedidos para el número de barra {num_barra_actual}.")
             continue
 
         barras_estandar_para_tipo_actual = barras_estandar_dict.get(num_barra_actual, [])
         if not barras_estandar_para_tipo_actual:
-            print(f"ADVERTENCIA: No se encontraron longitudes de barras estándar definidas para {num_barra_actual}. Saltando este tipo.")
+            if verbose:
+                print(f"ADVERTENCIA: No se encontraron longitudes de barras estándar definidas para {num_barra_actual}. Saltando este tipo.")
             continue
-        
-        # Desperdicios acumulados específicamente para este 'numero_barra' a través de sus grupos de ejecución
-        desperdicios_acumulados_para_este_tipo = list(desperdicios_globales_por_tipo_barra[num_barra_actual]) # Copia para modificarla localmente
 
+        tareas.append((
+            num_barra_actual,
+            cartilla_num_barra_df,
+            barras_estandar_para_tipo_actual,
+            list(desperdicios_globales_por_tipo_barra[num_barra_actual])
+        ))
+
+    if paralelo and len(tareas) > 1:
+        max_trabajadores = min(len(tareas), num_trabajadores or os.cpu_count() or 1)
+        config_trabajador = _config_sin_paralelismo_interno(config_algoritmo)
+        gestor = None
+        callback_trabajador = None
+        if callback_progreso is not None:
+            gestor = multiprocessing.Manager()
+            cola_progreso = gestor.Queue()
+            callback_trabajador = _EmisorColaProgreso(cola_progreso)
+            hilo_reenvio = threading.Thread(
+                target=_reenviar_eventos, args=(cola_progreso, callback_progreso), daemon=True
+            )
+            hilo_reenvio.start()
+        try:
+            with ProcessPoolExecutor(max_workers=max_trabajadores) as executor:
+                futuros = [
+                    executor.submit(
+                        _procesar_numero_barra_en_trabajador, *tarea, config_trabajador, verbose,
+                        directorio_checkpoints=directorio_checkpoints,
+                        callback_progreso=callback_trabajador,
+                        parametros_por_grupo=parametros_por_subproblema.get(tarea[0]),
+                        token_cancelacion=token_cancelacion
+                    )
+                    for tarea in tareas
+                ]
+                # Combinar en el orden de los números de barra, no en el de finalización
+                resultados_por_tarea = []
+                for futuro in futuros:
+                    resultado, motivo = futuro.result()
+                    resultados_por_tarea.append(resultado)
+                    # El motivo con que se detuvo un trabajador queda registrado en el token de la cartilla
+                    if motivo is not None and token_cancelacion.motivo is None:
+                        token_cancelacion.cancelar(motivo)
+        finally:
+            if gestor is not None:
+                cola_progreso.put(None)
+                hilo_reenvio.join()
+                gestor.shutdown()
+    else:
+        resultados_por_tarea = []
+        for tarea in tareas:
+            if verbose:
+                print(f"\n===== Procesando Número de Barra: {tarea[0]} =====")
+            resultados_por_tarea.append(procesar_numero_barra(
+                *tarea, config_algoritmo, verbose,
+                directorio_checkpoints=directorio_checkpoints,
+                callback_progreso=callback_progreso,
+                parametros_por_grupo=parametros_por_subproblema.get(tarea[0]),
+                token_cancelacion=token_cancelacion
+            ))
+
+    for tarea, (resultados, desperdicios_finales) in zip(tareas, resultados_por_tarea):
+        resultados_globales.extend(resultados)
+        desperdicios_globales_por_tipo_barra[tarea[0]] = desperdicios_finales
+
+    # Cartilla completa: los checkpoints de cada número de barra ya no son necesarios
+    if directorio_checkpoints and not (token_cancelacion is not None and token_cancelacion.cancelado):
+        for tarea in tareas:
+            eliminar_checkpoint(os.path.join(directorio_checkpoints, f"barra_{tarea[0]}.ckpt"))
+
+    return resultados_globales, desperdicios_globales_por_tipo_barra
+
+
+def _resolver_subproblema_con_plazo(piezas_requeridas_df, barras_estandar_para_tipo, desperdicios_disponibles,
+                                    config_ga, tiempo_limite_segundos=None, token_cancelacion=None):
+    """
+    Resuelve un subproblema para el modo de plazo global.
 
-        # 3. Agrupar por 'grupo_ejecucion' (orden de uso en obra) y procesar secuencialmente
-        grupos_ejecucion_unicos = sorted(cartilla_num_barra_df['grupo_ejecucion'].unique())
-        print(f"Procesando grupos de ejecución para {num_barra_actual}: {grupos_ejecucion_unicos}")
+    Sin tiempo límite se usa la mejor solución entre FFD y BFD. Con tiempo límite
+    se ejecuta el solver exacto (subproblemas pequeños) o el AG dentro de ese
+    tiempo, y se conserva el mejor resultado entre el obtenido y las heurísticas.
+    Si ningún candidato cubre la demanda (piezas más largas que toda barra), se
+    usa el que deja menos metros sin cortar, como en el modo sin plazo.
 
-        for grupo_ej_actual in grupos_ejecucion_unicos:
-            print(f"\n--- Procesando Grupo de Ejecución: {grupo_ej_actual} (para Barra {num_barra_actual}) ---")
-            
-            piezas_requeridas_grupo_df = cartilla_num_barra_df[
+    La ganancia estimada se calcula con la cota continua, que es barata; la de
+    Gilmore–Gomory se calcula después con _refinar_ganancia_estimada, solo para
+    los subproblemas que se consideran para mejorar.
+
+    Args:
+        piezas_requeridas_df (pd.DataFrame): Piezas del subproblema.
+        barras_estandar_para_tipo (list): Longitudes de barras estándar.
+        desperdicios_disponibles (list): Desperdicios disponibles para el subproblema.
+        config_ga (dict): Configuración del AG.
+        tiempo_limite_segundos (float, optional): Tiempo para mejorar la solución heurística.
+        token_cancelacion (TokenCancelacion, optional): Token de cancelación para el AG.
+
+    Returns:
+        dict: 'patrones', 'nuevos_desperdicios', 'longitud_estandar' (metros de barra
+              estándar usados), 'longitud_faltante' (metros de piezas sin cortar),
+              'ganancia_estimada' (metros por encima de la cota inferior continua) y
+              'ganancia_refinada' (False).
+    """
+    piezas_adaptadas, barras_dict, desperdicios_dict, _ = adaptar_entrada_completa(
+        piezas_requeridas_df,
+        barras_estandar_para_tipo,
+        desperdicios_disponibles,
+        LONGITUD_MINIMA_DESPERDICIO_UTILIZABLE,
+        consolidar_piezas=True,
+        limpiar_datos=True,
+        aritmetica_entera=config_ga.get('aritmetica_entera', False)
+    )
+    demanda = compilar_demanda(piezas_adaptadas)
+
+    candidatos = [
+        generar_individuo_heuristico_ffd(piezas_adaptadas, barras_dict, desperdicios_dict),
+        generar_individuo_heuristico_bfd(piezas_adaptadas, barras_dict, desperdicios_dict)
+    ]
+    if tiempo_limite_segundos is not None:
+        cromosoma = None
+        if piezas_adaptadas['cantidad_requerida'].sum() <= UMBRAL_PIEZAS_SOLVER_EXACTO:
+            cromosoma = resolver_exacto(
+                piezas_adaptadas, barras_dict, desperdicios_dict,
+                tiempo_limite_segundos=tiempo_limite_segundos
+            )
+        if cromosoma is None:
+            cromosoma, _ = ejecutar_algoritmo_genetico(
+                piezas_adaptadas,
+                barras_dict,
+                desperdicios_dict,
+                {**config_ga, 'tiempo_limite_segundos': tiempo_limite_segundos, 'logging_habilitado': False},
+                demanda=demanda,
+                token_cancelacion=token_cancelacion
+            )
+        candidatos.append(cromosoma)
+
+    # Primero la demanda cubierta (los planes completos) y luego el fitness
+    def _longitud_faltante(cromosoma):
+        return demanda.calcular_longitud_faltante(
+            demanda.vectorizar_sumario(cromosoma.obtener_resumen().conteos_piezas)[0]
+        )
+    mejor_cromosoma = min(candidatos, key=lambda c: (_longitud_faltante(c), calcular_fitness(c, demanda)))
+    longitud_faltante = a_metros(_longitud_faltante(mejor_cromosoma), demanda.en_milimetros)
+    if longitud_faltante > 0:
+        print(f"ADVERTENCIA: {longitud_faltante:.2f} m de piezas no caben en las barras disponibles y quedan sin cortar")
+
+    patrones, nuevos_desperdicios = formatear_salida_desde_cromosoma(
+        mejor_cromosoma,
+        LONGITUD_MINIMA_DESPERDICIO_UTILIZABLE
+    )
+    longitud_estandar = sum(
+        a_metros(patron.origen_barra_longitud, patron.en_milimetros) for patron in mejor_cromosoma.patrones
+        if patron.origen_barra_tipo == 'estandar'
+    )
+    longitud_piezas = float(demanda.longitudes_metros @ demanda.cantidades_requeridas)
+    longitud_minima = max(
+        0.0, longitud_piezas - sum(a_metros(d['longitud'], demanda.en_milimetros) for d in desperdicios_dict)
+    )
+    return {
+        'patrones': patrones,
+        'nuevos_desperdicios': nuevos_desperdicios,
+        'longitud_estandar': longitud_estandar,
+        'longitud_faltante': longitud_faltante,
+        'ganancia_estimada': longitud_estandar - longitud_minima,
+        'ganancia_refinada': False
+    }
+
+
+def _refinar_ganancia_estimada(grupo, config_ga):
+    """
+    Recalcula la ganancia estimada de un grupo con la cota de Gilmore–Gomory.
+
+    La cota continua nunca supera a la de Gilmore–Gomory, así que la ganancia
+    refinada es menor o igual que la estimada; si la cota no se puede calcular,
+    se conserva la estimación continua.
+
+    Args:
+        grupo (dict): Grupo de una cadena del modo de plazo global.
+        config_ga (dict): Configuración del AG.
+
+    Returns:
+        dict: Copia del grupo con la ganancia refinada.
+    """
+    piezas_adaptadas, barras_dict, desperdicios_dict, _ = adaptar_entrada_completa(
+        grupo['piezas_df'],
+        grupo['barras'],
+        grupo['desperdicios_entrada'],
+        LONGITUD_MINIMA_DESPERDICIO_UTILIZABLE,
+        consolidar_piezas=True,
+        limpiar_datos=True,
+        aritmetica_entera=config_ga.get('aritmetica_entera', False)
+    )
+    solucion = {**grupo['solucion'], 'ganancia_refinada': True}
+    cota = calcular_cota_inferior(compilar_demanda(piezas_adaptadas), barras_dict, desperdicios_dict)
+    if cota is not None:
+        solucion['ganancia_estimada'] = solucion['longitud_estandar'] - milimetros_a_metros(cota['longitud_minima_mm'])
+    return {**grupo, 'solucion': solucion}
+
+
+def _plazo_agotado(tiempo_limite_global, token_cancelacion):
+    """Indica si venció el plazo global o se canceló la ejecución."""
+    if tiempo_limite_global is not None and time.time() >= tiempo_limite_global:
+        return True
+    return token_cancelacion is not None and token_cancelacion.cancelado
+
+
+def _replanificar_cadena(cadena, desperdicios_iniciales, config_ga, desde_indice=0,
+                         tiempo_limite_global=None, token_cancelacion=None):
+    """
+    Recalcula el inventario de desperdicios de cada grupo de un número de barra.
+
+    Los grupos posteriores a desde_indice cuya entrada cambia se vuelven a resolver
+    con FFD/BFD, porque su plan anterior podía usar desperdicios que ya no existen.
+    Antes de resolver cada grupo se comprueban el plazo global y el token; si alguno
+    se agotó, la replanificación se interrumpe.
+
+    Args:
+        cadena (list): Grupos del número de barra en orden de ejecución.
+        desperdicios_iniciales (list): Desperdicios disponibles antes del primer grupo.
+        config_ga (dict): Configuración del AG.
+        desde_indice (int): Primer grupo cuya solución cambió.
+        tiempo_limite_global (float, optional): Instante (time.time()) en que vence el plazo.
+        token_cancelacion (TokenCancelacion, optional): Token de cancelación.
+
+    Returns:
+        tuple: (nueva_cadena, completa). nueva_cadena contiene copias de los grupos
+               modificados; si completa es False, solo llega hasta el último grupo
+               que se pudo replanificar.
+    """
+    nueva_cadena = []
+    desperdicios = list(desperdicios_iniciales)
+    for indice, grupo in enumerate(cadena):
+        if indice > desde_indice and desperdicios != grupo['desperdicios_entrada']:
+            if _plazo_agotado(tiempo_limite_global, token_cancelacion):
+                return nueva_cadena, False
+            grupo = {
+                **grupo,
+                'desperdicios_entrada': list(desperdicios),
+                'solucion': _resolver_subproblema_con_plazo(
+                    grupo['piezas_df'], grupo['barras'], desperdicios, config_ga
+                ),
+                'mejorado': False
+            }
+        nueva_cadena.append(grupo)
+        desperdicios = _actualizar_desperdicios(desperdicios, grupo['solucion']['nuevos_desperdicios'])
+    return nueva_cadena, True
+
+
+def _longitud_estandar_cadena(cadena):
+    """Metros de barra estándar usados por todos los grupos de un número de barra."""
+    return sum(grupo['solucion']['longitud_estandar'] for grupo in cadena)
+
+
+def procesar_cartilla_con_plazo(cartilla_df, barras_estandar_dict, plazo_segundos,
+                                config_algoritmo=None, verbose=True, callback_progreso=None,
+                                token_cancelacion=None):
+    """
+    Procesa la cartilla completa dentro de un plazo global (modo anytime).
+
+    Primero se obtiene un plan completo con FFD/BFD para todos los subproblemas
+    (número de barra, grupo de ejecución). El tiempo restante se reparte entre los
+    subproblemas en orden de ganancia estimada: metros de barra estándar por encima
+    de la cota inferior del subproblema. La cota de Gilmore–Gomory solo se calcula
+    para el subproblema mejor clasificado con la cota continua. Cada
+    mejora se acepta solo si reduce los metros de barra estándar de su número de
+    barra, tras replanificar los grupos posteriores que dependen de sus desperdicios.
+    Al vencer el plazo se retorna el mejor plan completo encontrado; si vence
+    durante el plan inicial, se retornan los grupos resueltos hasta ese momento.
+
+    Args:
+        cartilla_df (pd.DataFrame): Cartilla completa con 'numero_barra' y 'grupo_ejecucion'.
+        barras_estandar_dict (dict): Longitudes de barras estándar por número de barra.
+        plazo_segundos (float): Plazo global para toda la cartilla.
+        config_algoritmo (str | dict, optional): Perfil o configuración del AG.
+        verbose (bool): Si se imprime el progreso.
+        callback_progreso (callable, optional): Receptor de eventos 'plan_inicial' y
+            'plan_mejorado' con los metros de barra estándar del plan.
+        token_cancelacion (TokenCancelacion, optional): Al cancelarse se dejan de mejorar
+            subproblemas y se retorna el mejor plan encontrado.
+
+    Returns:
+        tuple: (resultados_globales, desperdicios_globales_por_tipo_barra), con el mismo
+               formato que procesar_cartilla.
+    """
+    tiempo_limite_global = time.time() + plazo_segundos
+    config_ga = _config_ga_efectiva(config_algoritmo)
+
+    # Fase 1: plan completo con heurísticas rápidas
+    cadenas = {}
+    for num_barra_actual in cartilla_df['numero_barra'].unique():
+        barras_tipo = barras_estandar_dict.get(num_barra_actual, [])
+        if not barras_tipo:
+            if verbose:
+                print(f"ADVERTENCIA: No se encontraron longitudes de barras estándar definidas para {num_barra_actual}. Saltando este tipo.")
+            continue
+        cartilla_num_barra_df = cartilla_df[cartilla_df['numero_barra'] == num_barra_actual]
+        cadena = []
+        for grupo_ej_actual in sorted(cartilla_num_barra_df['grupo_ejecucion'].unique()):
+            piezas_df = cartilla_num_barra_df[
                 cartilla_num_barra_df['grupo_ejecucion'] == grupo_ej_actual
             ][['id_pedido', 'longitud_pieza_requerida', 'cantidad_requerida']].copy()
+            if not piezas_df.empty:
+                cadena.append({
+                    'grupo_ejecucion': grupo_ej_actual,
+                    'piezas_df': piezas_df,
+                    'barras': barras_tipo,
+                    'desperdicios_entrada': None,
+                    'solucion': None,
+                    'mejorado': False
+                })
+        cadenas[num_barra_actual], completa = _replanificar_cadena(
+            cadena, [], config_ga, desde_indice=-1,
+            tiempo_limite_global=tiempo_limite_global, token_cancelacion=token_cancelacion
+        )
+        if not completa:
+            if verbose:
+                print("ADVERTENCIA: El plazo global venció o se canceló la ejecución durante el plan inicial; "
+                      "se retornan los grupos resueltos hasta ese momento")
+            break
 
-            if piezas_requeridas_grupo_df.empty:
-                print(f"No hay piezas requeridas para el grupo de ejecución {grupo_ej_actual} de la barra {num_barra_actual}.")
-                continue
-            
-            print(f"Desperdicios disponibles de grupos anteriores para {num_barra_actual}: {desperdicios_acumulados_para_este_tipo}")
+    def _longitud_total():
+        return sum(_longitud_estandar_cadena(cadena) for cadena in cadenas.values())
 
-            # Llamada al algoritmo de optimización
-            # Los desperdicios_acumulados_para_este_tipo son los que vienen de grupos de ejecución ANTERIORES
-            # para ESTE MISMO numero_barra.
-            patrones_generados, nuevos_desperdicios_de_este_grupo = \
-                algoritmo_optimizacion_corte(piezas_requeridas_grupo_df,
-                                             barras_estandar_para_tipo_actual,
-                                             list(desperdicios_acumulados_para_este_tipo), # Pasar una copia
-                                             config_algoritmo=None) # Aquí iría la config del AG
+    if verbose:
+        print(f"Plan inicial (FFD/BFD): {_longitud_total():.2f} m de barra estándar")
+    if callback_progreso is not None:
+        callback_progreso({'tipo': 'plan_inicial', 'longitud_estandar_total': _longitud_total()})
 
-            # Guardar resultados de este grupo
-            for patron in patrones_generados:
+    # Fase 2: mejorar subproblemas en orden de ganancia estimada mientras quede plazo
+    intentados = set()
+    while True:
+        restante = tiempo_limite_global - time.time() - RESERVA_PLAZO_GLOBAL_SEGUNDOS
+        if restante < TIEMPO_MINIMO_MEJORA_SEGUNDOS:
+            break
+        if token_cancelacion is not None and token_cancelacion.cancelado:
+            if verbose:
+                print(f"Mejora del plan detenida ({token_cancelacion.motivo})")
+            break
+
+        pendientes = [
+            (grupo['solucion']['ganancia_estimada'], num_barra, indice)
+            for num_barra, cadena in cadenas.items()
+            for indice, grupo in enumerate(cadena)
+            if not grupo['mejorado']
+            and (num_barra, indice, tuple(grupo['desperdicios_entrada'])) not in intentados
+            and grupo['solucion']['ganancia_estimada'] > TOLERANCIA_GANANCIA_METROS
+        ]
+        if not pendientes:
+            break
+
+        ganancia, num_barra, indice = max(pendientes, key=lambda pendiente: pendiente[0])
+        if not cadenas[num_barra][indice]['solucion']['ganancia_refinada']:
+            # La ganancia refinada no supera a la continua: se vuelve a clasificar
+            cadenas[num_barra][indice] = _refinar_ganancia_estimada(cadenas[num_barra][indice], config_ga)
+            continue
+        ganancia_pendiente_total = sum(pendiente[0] for pendiente in pendientes)
+        tiempo_asignado = min(
+            restante,
+            config_ga.get('tiempo_limite_segundos', restante),
+            max(TIEMPO_MINIMO_MEJORA_SEGUNDOS, restante * ganancia / ganancia_pendiente_total)
+        )
+
+        cadena = cadenas[num_barra]
+        grupo = cadena[indice]
+        intentados.add((num_barra, indice, tuple(grupo['desperdicios_entrada'])))
+        try:
+            solucion = _resolver_subproblema_con_plazo(
+                grupo['piezas_df'], grupo['barras'], grupo['desperdicios_entrada'], config_ga, tiempo_asignado,
+                token_cancelacion=token_cancelacion
+            )
+        except CancelacionSolicitada:
+            break
+
+        cadena_candidata = list(cadena)
+        cadena_candidata[indice] = {**grupo, 'solucion': solucion, 'mejorado': True}
+        cadena_candidata, completa = _replanificar_cadena(
+            cadena_candidata, [], config_ga, desde_indice=indice,
+            tiempo_limite_global=tiempo_limite_global, token_cancelacion=token_cancelacion
+        )
+        if not completa:
+            # La mejora no se pudo propagar a los grupos posteriores antes del plazo
+            break
+        if _longitud_estandar_cadena(cadena_candidata) < _longitud_estandar_cadena(cadena) - TOLERANCIA_GANANCIA_METROS:
+            cadenas[num_barra] = cadena_candidata
+            if verbose:
+                print(f"Mejora en {num_barra}, grupo {grupo['grupo_ejecucion']}: {_longitud_total():.2f} m de barra estándar")
+            if callback_progreso is not None:
+                callback_progreso({
+                    'tipo': 'plan_mejorado',
+                    'numero_barra': _a_tipo_nativo(num_barra),
+                    'grupo_ejecucion': _a_tipo_nativo(grupo['grupo_ejecucion']),
+                    'longitud_estandar_total': _longitud_total()
+                })
+        else:
+            cadena[indice] = {**grupo, 'mejorado': True}
+
+    # Ensamblar el mejor plan completo
+    resultados_globales = []
+    desperdicios_globales_por_tipo_barra = {tipo: [] for tipo in barras_estandar_dict.keys()}
+    for num_barra, cadena in cadenas.items():
+        desperdicios = []
+        for grupo in cadena:
+            for patron in grupo['solucion']['patrones']:
                 resultados_globales.append({
-                    'numero_barra': num_barra_actual,
-                    'grupo_ejecucion': grupo_ej_actual,
-                    **patron # Desempaqueta el diccionario del patrón
+                    'numero_barra': num_barra,
+                    'grupo_ejecucion': grupo['grupo_ejecucion'],
+                    **patron
                 })
-            
-            # Actualizar la lista de desperdicios acumulados para el SIGUIENTE grupo de ejecución
-            # DENTRO de este MISMO 'numero_barra'
-            # Se añaden los nuevos desperdicios generados en esta corrida.
-            if nuevos_desperdicios_de_este_grupo:
-                desperdicios_acumulados_para_este_tipo.extend(nuevos_desperdicios_de_este_grupo)
-                
-                # Consolidar y priorizar desperdicios
-                desperdicios_acumulados_para_este_tipo = consolidar_desperdicios(
-                    desperdicios_acumulados_para_este_tipo,
-                    LONGITUD_MINIMA_DESPERDICIO_UTILIZABLE
-                )
-                desperdicios_acumulados_para_este_tipo = priorizar_desperdicios(
-                    desperdicios_acumulados_para_este_tipo,
-                    'mayor_primero'
-                )
-                
-                print(f"Desperdicios actualizados para {num_barra_actual} después del grupo {grupo_ej_actual}: {desperdicios_acumulados_para_este_tipo}")
+            desperdicios = _actualizar_desperdicios(desperdicios, grupo['solucion']['nuevos_desperdicios'])
+        desperdicios_globales_por_tipo_barra[num_barra] = desperdicios
+
+    return resultados_globales, desperdicios_globales_por_tipo_barra
+
+
+# --- Lógica Principal ---
+def main(paralelizar_diametros=None, callback_progreso=None, plazo_segundos=None,
+         presupuesto_segundos=None, config_algoritmo=None, token_cancelacion=None):
+    """
+    Función principal para orquestar el proceso de optimización de cortes.
 
-        # Al final de procesar todos los grupos de ejecución para un 'numero_barra',
-        # los desperdicios_acumulados_para_este_tipo son los que quedan para ese tipo de barra.
-        # Esta línea es más para ilustrar, ya que la lógica de compartición entre tipos de barra no está implementada.
-        # La regla dice "sólo se pueden compartir desperdicios entre barras del mismo grupo (número de barra)".
-        # Y "el Grupo 1 puede compartir desperdicios con Grupos posteriores (2, 3, 4, ...), pero no al revés."
-        # Esto ya se maneja con `desperdicios_acumulados_para_este_tipo` que se pasa secuencialmente.
-        desperdicios_globales_por_tipo_barra[num_barra_actual] = desperdicios_acumulados_para_este_tipo
+    Args:
+        paralelizar_diametros (bool, optional): Procesa cada número de barra en un proceso
+            distinto. Por defecto se usa PARALELIZAR_DIAMETROS.
+        callback_progreso (callable, optional): Receptor de eventos de progreso por
+            subproblema y por generación (ver procesar_cartilla).
+        plazo_segundos (float, optional): Plazo global para toda la cartilla (ver
+            procesar_cartilla_con_plazo). Por defecto se usa PLAZO_GLOBAL_SEGUNDOS.
+        presupuesto_segundos (float, optional): Presupuesto de tiempo repartido entre los
+            subproblemas según su dificultad. Por defecto se usa PRESUPUESTO_GLOBAL_SEGUNDOS.
+        config_algoritmo (str | dict, optional): Perfil o configuración del AG. Por defecto
+            se usa PERFIL_AG_DEFAULT.
+        token_cancelacion (TokenCancelacion, optional): Token de cancelación y límites de
+            recursos; al cancelarse se guardan los resultados obtenidos hasta ese momento.
 
+    Returns:
+        bool: True si se generaron patrones y se guardaron en
+              'resultados_optimizacion_cortes.csv'; False si no se pudieron cargar los
+              datos, no se generaron patrones o falló la escritura del CSV.
+    """
+    print("Iniciando proceso de optimización de cortes de acero...")
 
-    # 4. Mostrar/Guardar resultados consolidados
+    # 1. Cargar datos
+    cartilla_df = cargar_cartilla_acero(RUTA_CARTILLA_ACERO)
+    barras_estandar_dict = cargar_barras_estandar(RUTA_BARRAS_ESTANDAR)
+
+    if cartilla_df.empty or not barras_estandar_dict:
+        print("No se pudieron cargar los datos necesarios. Terminando ejecución.")
+        return False
+
+    # 2. Procesar cada 'numero_barra' (diámetro) y sus grupos de ejecución
+    if paralelizar_diametros is None:
+        paralelizar_diametros = PARALELIZAR_DIAMETROS
+    if plazo_segundos is None:
+        plazo_segundos = PLAZO_GLOBAL_SEGUNDOS
+    if presupuesto_segundos is None:
+        presupuesto_segundos = PRESUPUESTO_GLOBAL_SEGUNDOS
+    if plazo_segundos is not None:
+        resultados_globales, desperdicios_globales_por_tipo_barra = procesar_cartilla_con_plazo(
+            cartilla_df,
+            barras_estandar_dict,
+            plazo_segundos,
+            config_algoritmo=config_algoritmo,
+            callback_progreso=callback_progreso,
+            token_cancelacion=token_cancelacion
+        )
+    else:
+        resultados_globales, desperdicios_globales_por_tipo_barra = procesar_cartilla(
+            cartilla_df,
+            barras_estandar_dict,
+            config_algoritmo=config_algoritmo,
+            paralelo=paralelizar_diametros,
+            directorio_checkpoints=DIRECTORIO_CHECKPOINTS,
+            callback_progreso=callback_progreso,
+            presupuesto_segundos=presupuesto_segundos,
+            token_cancelacion=token_cancelacion
+        )
+
+    if token_cancelacion is not None and token_cancelacion.cancelado:
+        print(f"\nProcesamiento detenido ({token_cancelacion.motivo}): se guardan los resultados parciales.")
+
+    # 3. Mostrar/Guardar resultados consolidados
     print("\n\n===== RESULTADOS GLOBALES DE OPTIMIZACIÓN =====")
+    resultados_guardados = False
     if resultados_globales:
         resultados_df = pd.DataFrame(resultados_globales)
         # Reordenar columnas para mejor visualización
@@ -768,6 +1818,7 @@ def main():
         # Opcional: Guardar en un archivo
         try:
             resultados_df.to_csv('resultados_optimizacion_cortes.csv', index=False)
+            resultados_guardados = True
             print("\nResultados guardados en 'resultados_optimizacion_cortes.csv'")
         except Exception as e:
             print(f"Error al guardar los resultados en CSV: {e}")
@@ -840,8 +1891,12 @@ def main():
             print(f"  - {tipo}: Ninguno")
 
     print("\n===== PROCESO COMPLETADO =====")
-    print("Proceso de optimización de cortes terminado exitosamente.")
-    print("Resultados guardados en 'resultados_optimizacion_cortes.csv'")
+    if resultados_guardados:
+        print("Proceso de optimización de cortes terminado exitosamente.")
+        print("Resultados guardados en 'resultados_optimizacion_cortes.csv'")
+    else:
+        print("Proceso de optimización de cortes terminado sin resultados.")
+    return resultados_guardados
 
 def generar_plan_de_corte_ejecutable(resultados_df, cartilla_df, desperdicios_finales, metricas):
     from datetime import datetime
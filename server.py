@@ -3,21 +3,33 @@ Flask API para ejecutar OICA - Optimizador Inteligente de Cortes de Acero
 Servidor que proporciona endpoints para procesar cartillas de acero
 """
 
-from flask import Flask, request, jsonify
+from flask import Flask, request, jsonify, Response, stream_with_context
 from flask_cors import CORS
 import logging
 import traceback
 import threading
+import queue
 import time
 import os
 import json
+import heapq
+import shutil
+import uuid
+import multiprocessing
 import pandas as pd
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from datetime import datetime
 from werkzeug.utils import secure_filename
 
 # Importar la función main del módulo principal
 try:
-    from main import main, cargar_cartilla_acero, cargar_barras_estandar
+    from main import (
+        main, cargar_cartilla_acero, cargar_barras_estandar, RUTA_CARTILLA_ACERO, RUTA_BARRAS_ESTANDAR,
+        _config_sin_paralelismo_interno
+    )
+    from genetic_algorithm.cancellation import TokenCancelacion
 except ImportError as e:
     print(f"Error importando módulos principales: {e}")
     main = None
@@ -34,6 +46,20 @@ MAX_CONTENT_LENGTH = 16 * 1024 * 1024  # 16MB max file size
 # Crear directorio de archivos si no existe
 os.makedirs(UPLOAD_PATH, exist_ok=True)
 
+# Configuración de trabajos: cada trabajo se ejecuta en su propio directorio y en un
+# proceso del pool; como máximo MAX_CONCURRENT_JOBS trabajos corren a la vez. Cada
+# trabajo usa un solo proceso (sin islas, evaluación paralela ni diámetros en paralelo),
+# de modo que el pool no ocupa más procesos que núcleos
+JOBS_PATH = os.environ.get('JOBS_PATH', os.path.join(os.path.dirname(UPLOAD_PATH), 'jobs'))
+MAX_CONCURRENT_JOBS = int(os.environ.get('MAX_CONCURRENT_JOBS', os.cpu_count() or 1))
+# Trabajos terminados que se conservan (registro y directorio); los más antiguos se eliminan
+MAX_FINISHED_JOBS = int(os.environ.get('MAX_FINISHED_JOBS', 100))
+
+# Límites de recursos por defecto de cada trabajo (vacío = sin límite). Al superarlos,
+# el trabajo se detiene entre generaciones o subproblemas y conserva un resultado parcial
+JOB_CPU_LIMIT_SECONDS = float(os.environ['JOB_CPU_LIMIT_SECONDS']) if os.environ.get('JOB_CPU_LIMIT_SECONDS') else None
+JOB_MEMORY_LIMIT_MB = float(os.environ['JOB_MEMORY_LIMIT_MB']) if os.environ.get('JOB_MEMORY_LIMIT_MB') else None
+
 # Configuración de logging
 logging.basicConfig(
     level=logging.INFO,
@@ -42,9 +68,434 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 # Variables globales para el estado del procesamiento
-procesamiento_activo = False
 ultimo_resultado = None
-historial_procesamiento = []
+
+# Eventos de progreso (Server-Sent Events)
+TAMAÑO_HISTORIAL_EVENTOS = 500  # Eventos recientes que recibe un cliente al conectarse
+TAMAÑO_COLA_CLIENTE_SSE = 1000  # Eventos pendientes por cliente; si se llena, se descartan
+INTERVALO_KEEPALIVE_SSE = 15  # Segundos sin eventos antes de enviar un comentario keepalive
+
+
+class CanalEventos:
+    """
+    Difunde los eventos de progreso del procesamiento a los clientes SSE conectados.
+
+    Cada evento recibe un id creciente; un cliente que se reconecta con el
+    encabezado Last-Event-ID recibe los eventos recientes que no alcanzó a ver.
+    """
+
+    def __init__(self, tamaño_historial=TAMAÑO_HISTORIAL_EVENTOS):
+        self._lock = threading.Lock()
+        self._suscriptores = []
+        self._historial = deque(maxlen=tamaño_historial)
+        self._siguiente_id = 1
+
+    def publicar(self, evento):
+        """Agrega id y marca de tiempo al evento y lo entrega a todos los suscriptores."""
+        with self._lock:
+            evento = {'id': self._siguiente_id, 'timestamp': datetime.now().isoformat(), **evento}
+            self._siguiente_id += 1
+            self._historial.append(evento)
+            for cola in self._suscriptores:
+                try:
+                    cola.put_nowait(evento)
+                except queue.Full:
+                    pass  # Cliente lento: pierde eventos en lugar de frenar el procesamiento
+
+    def suscribir(self, desde_id=0):
+        """Crea la cola de un cliente, precargada con los eventos posteriores a desde_id."""
+        cola = queue.Queue(maxsize=TAMAÑO_COLA_CLIENTE_SSE)
+        with self._lock:
+            for evento in self._historial:
+                if evento['id'] > desde_id:
+                    cola.put_nowait(evento)
+            self._suscriptores.append(cola)
+        return cola
+
+    def cancelar(self, cola):
+        """Elimina la cola de un cliente desconectado."""
+        with self._lock:
+            if cola in self._suscriptores:
+                self._suscriptores.remove(cola)
+
+    @property
+    def ultimo_evento(self):
+        with self._lock:
+            return self._historial[-1] if self._historial else None
+
+
+canal_eventos = CanalEventos()
+
+
+def formatear_evento_sse(evento):
+    """Serializa un evento en el formato de Server-Sent Events."""
+    return f"id: {evento['id']}\nevent: {evento['tipo']}\ndata: {json.dumps(evento, default=str)}\n\n"
+
+
+ESTADOS_TRABAJO_FINALES = ('completado', 'error', 'cancelado')
+
+# Archivo del directorio del trabajo cuya existencia cancela un trabajo en ejecución
+ARCHIVO_SENAL_CANCELACION = 'CANCELAR'
+
+# Cola de eventos de progreso del proceso trabajador actual (ver _inicializar_trabajador)
+_cola_eventos_trabajador = None
+
+
+def _inicializar_trabajador(cola_eventos):
+    """Guarda en cada proceso del pool la cola por la que se envían los eventos de progreso."""
+    global _cola_eventos_trabajador
+    _cola_eventos_trabajador = cola_eventos
+
+
+class _EmisorEventosTrabajo:
+    """Callback de progreso que envía al servidor los eventos de un trabajo."""
+
+    def __init__(self, trabajo_id):
+        self.trabajo_id = trabajo_id
+
+    def __call__(self, evento):
+        _cola_eventos_trabajador.put({**evento, 'trabajo_id': self.trabajo_id})
+
+
+def ejecutar_trabajo(trabajo_id, directorio_trabajo, config_algoritmo,
+                     limite_tiempo_cpu_segundos=None, limite_memoria_mb=None):
+    """
+    Ejecuta main() de OICA en un proceso del pool, dentro del directorio del trabajo.
+
+    main() lee la cartilla y las barras estándar y escribe sus resultados con rutas
+    relativas; al cambiar al directorio del trabajo, los trabajos simultáneos no
+    comparten archivos. El paralelismo interno del AG se desactiva: la concurrencia
+    la da el pool. El trabajo se detiene con un resultado parcial si aparece
+    ARCHIVO_SENAL_CANCELACION en su directorio o si supera sus límites de recursos.
+
+    Returns:
+        dict: Nombres de los archivos generados por el trabajo y motivo de la
+            cancelación (None si terminó completo).
+
+    Raises:
+        RuntimeError: Si main() no generó resultados sin haber sido cancelado.
+    """
+    token_cancelacion = TokenCancelacion(
+        ruta_senal=os.path.join(os.path.abspath(directorio_trabajo), ARCHIVO_SENAL_CANCELACION),
+        limite_tiempo_cpu_segundos=limite_tiempo_cpu_segundos,
+        limite_memoria_mb=limite_memoria_mb
+    )
+    directorio_original = os.getcwd()
+    archivos_entrada = set(os.listdir(directorio_trabajo))
+    os.chdir(directorio_trabajo)
+    try:
+        resultados_guardados = main(
+            paralelizar_diametros=False,
+            callback_progreso=_EmisorEventosTrabajo(trabajo_id),
+            config_algoritmo=_config_sin_paralelismo_interno(config_algoritmo),
+            token_cancelacion=token_cancelacion
+        )
+    finally:
+        os.chdir(directorio_original)
+    if not resultados_guardados and token_cancelacion.motivo is None:
+        raise RuntimeError(
+            "No se generaron resultados: revise que la cartilla y las barras estándar "
+            "tengan las columnas requeridas y produzcan patrones de corte"
+        )
+    return {
+        'archivos_generados': sorted(
+            set(os.listdir(directorio_trabajo)) - archivos_entrada - {ARCHIVO_SENAL_CANCELACION}
+        ),
+        'motivo_cancelacion': token_cancelacion.motivo
+    }
+
+
+class GestorTrabajos:
+    """
+    Cola de trabajos de OICA con un pool acotado de procesos.
+
+    Los trabajos esperan en una cola por prioridad (mayor prioridad primero y, a
+    igual prioridad, por orden de llegada) y se envían al pool solo cuando hay un
+    proceso libre, de modo que un trabajo en cola siempre puede cancelarse. Cada
+    trabajo tiene un id y un directorio propios. Un trabajo en ejecución se cancela
+    con un archivo de señal en su directorio y termina con un resultado parcial.
+    Se conservan los max_terminados trabajos terminados más recientes.
+
+    funcion_trabajo es la función que ejecuta cada trabajo en el pool, con la firma
+    de ejecutar_trabajo.
+    """
+
+    def __init__(self, directorio_base=JOBS_PATH, max_trabajos=MAX_CONCURRENT_JOBS,
+                 max_terminados=MAX_FINISHED_JOBS, funcion_trabajo=ejecutar_trabajo):
+        self.directorio_base = directorio_base
+        self.funcion_trabajo = funcion_trabajo
+        self.max_trabajos = max(1, max_trabajos)
+        self.max_terminados = max(1, max_terminados)
+        self._lock = threading.RLock()
+        self._trabajos = {}
+        self._cola = []  # Montículo de (-prioridad, secuencia, trabajo_id)
+        self._secuencia = 0
+        self._en_ejecucion = 0
+        self._executor = None
+        self._cola_eventos = None
+
+    def _iniciar_pool(self):
+        """Crea el pool y el hilo que publica en /events los eventos de los trabajos."""
+        contexto = multiprocessing.get_context()
+        self._cola_eventos = contexto.Queue()
+        self._executor = ProcessPoolExecutor(
+            max_workers=self.max_trabajos,
+            mp_context=contexto,
+            initializer=_inicializar_trabajador,
+            initargs=(self._cola_eventos,)
+        )
+        threading.Thread(target=self._reenviar_eventos, daemon=True).start()
+
+    def _reenviar_eventos(self):
+        for evento in iter(self._cola_eventos.get, None):
+            canal_eventos.publicar(evento)
+
+    def _descartar_pool(self):
+        """Descarta un pool roto (un proceso murió); el siguiente despacho crea uno nuevo."""
+        self._executor.shutdown(wait=False)
+        self._cola_eventos.put(None)
+        self._executor = None
+        self._cola_eventos = None
+
+    def enviar(self, archivo_cartilla, archivo_barras, config_algoritmo=None, prioridad=0,
+               limite_tiempo_cpu_segundos=JOB_CPU_LIMIT_SECONDS, limite_memoria_mb=JOB_MEMORY_LIMIT_MB):
+        """
+        Crea un trabajo con copias de sus archivos de entrada y lo pone en cola.
+
+        Args:
+            archivo_cartilla (str): Ruta de la cartilla de acero.
+            archivo_barras (str): Ruta del archivo de barras estándar.
+            config_algoritmo (str | dict, optional): Perfil o configuración del AG.
+            prioridad (int): Los trabajos de mayor prioridad se ejecutan primero.
+            limite_tiempo_cpu_segundos (float, optional): Tiempo de CPU máximo del trabajo.
+            limite_memoria_mb (float, optional): Memoria residente máxima del trabajo en MB.
+
+        Returns:
+            dict: Registro del trabajo.
+        """
+        trabajo_id = uuid.uuid4().hex
+        directorio = os.path.join(self.directorio_base, trabajo_id)
+        os.makedirs(directorio)
+        shutil.copyfile(archivo_cartilla, os.path.join(directorio, RUTA_CARTILLA_ACERO))
+        shutil.copyfile(archivo_barras, os.path.join(directorio, RUTA_BARRAS_ESTANDAR))
+
+        trabajo = {
+            "id": trabajo_id,
+            "estado": "en_cola",
+            "prioridad": prioridad,
+            "creado": datetime.now().isoformat(),
+            "inicio": None,
+            "fin": None,
+            "duracion": None,
+            "perfil": config_algoritmo.get('perfil') if isinstance(config_algoritmo, dict) else config_algoritmo,
+            "config_algoritmo": config_algoritmo,
+            "limite_tiempo_cpu_segundos": limite_tiempo_cpu_segundos,
+            "limite_memoria_mb": limite_memoria_mb,
+            "cancelacion_solicitada": False,
+            "archivo_cartilla": archivo_cartilla,
+            "archivo_barras": archivo_barras,
+            "directorio": directorio,
+            "resultado": None,
+            "error": None
+        }
+        with self._lock:
+            self._trabajos[trabajo_id] = trabajo
+            heapq.heappush(self._cola, (-prioridad, self._secuencia, trabajo_id))
+            self._secuencia += 1
+            self._despachar()
+        return trabajo
+
+    def _despachar(self):
+        """Envía trabajos de la cola al pool mientras haya procesos libres."""
+        with self._lock:
+            while self._cola and self._en_ejecucion < self.max_trabajos:
+                _, _, trabajo_id = heapq.heappop(self._cola)
+                trabajo = self._trabajos[trabajo_id]
+                if self._executor is None:
+                    self._iniciar_pool()
+                trabajo["estado"] = "ejecutando"
+                trabajo["inicio"] = datetime.now().isoformat()
+                trabajo["_inicio_tiempo"] = time.time()
+                self._en_ejecucion += 1
+                canal_eventos.publicar({
+                    'tipo': 'inicio_procesamiento',
+                    'procesamiento_id': trabajo_id,
+                    'trabajo_id': trabajo_id,
+                    'perfil': trabajo["perfil"]
+                })
+                try:
+                    futuro = self._executor.submit(
+                        self.funcion_trabajo,
+                        trabajo_id,
+                        trabajo["directorio"],
+                        trabajo["config_algoritmo"],
+                        trabajo["limite_tiempo_cpu_segundos"],
+                        trabajo["limite_memoria_mb"]
+                    )
+                except BrokenProcessPool as e:
+                    # Un trabajo anterior mató a su proceso (p. ej. por falta de memoria)
+                    logger.error(f"Pool de trabajos roto; se reinicia: {e}")
+                    self._descartar_pool()
+                    self._registrar_fin(trabajo_id, error=e)
+                    continue
+                trabajo["_executor"] = self._executor
+                futuro.add_done_callback(
+                    lambda futuro, trabajo_id=trabajo_id: self._finalizar(trabajo_id, futuro)
+                )
+
+    def _finalizar(self, trabajo_id, futuro):
+        """Registra el resultado de un trabajo terminado y despacha el siguiente."""
+        with self._lock:
+            error = futuro.exception()
+            if isinstance(error, BrokenProcessPool) and self._trabajos[trabajo_id]["_executor"] is self._executor:
+                # El proceso del trabajo murió: el pool no admite más trabajos y se reinicia
+                self._descartar_pool()
+            self._registrar_fin(trabajo_id, error=error, resultado=futuro.result() if error is None else None)
+            self._despachar()
+
+    def _registrar_fin(self, trabajo_id, error=None, resultado=None):
+        """Registra el estado final de un trabajo en ejecución y libera su proceso."""
+        global ultimo_resultado
+
+        with self._lock:
+            trabajo = self._trabajos[trabajo_id]
+            trabajo.pop("_executor", None)
+            duracion = round(time.time() - trabajo.pop("_inicio_tiempo"), 2)
+            trabajo["fin"] = datetime.now().isoformat()
+            trabajo["duracion"] = duracion
+            if error is None and resultado["motivo_cancelacion"] is not None:
+                motivo = resultado["motivo_cancelacion"]
+                trabajo["estado"] = "cancelado"
+                trabajo["resultado"] = {
+                    "status": "cancelled",
+                    "message": f"Procesamiento OICA detenido ({motivo}); los resultados son parciales",
+                    "duracion_segundos": duracion,
+                    "perfil_usado": trabajo["perfil"],
+                    **resultado,
+                    "timestamp": datetime.now().isoformat()
+                }
+                logger.info(f"Trabajo {trabajo_id} detenido ({motivo}) tras {duracion:.2f} segundos")
+            elif error is None:
+                trabajo["estado"] = "completado"
+                trabajo["resultado"] = {
+                    "status": "success",
+                    "message": "Procesamiento OICA completado exitosamente",
+                    "duracion_segundos": duracion,
+                    "perfil_usado": trabajo["perfil"],
+                    **resultado,
+                    "timestamp": datetime.now().isoformat()
+                }
+                logger.info(f"Trabajo {trabajo_id} completado en {duracion:.2f} segundos")
+            else:
+                trabajo["estado"] = "error"
+                trabajo["error"] = str(error)
+                trabajo["resultado"] = {
+                    "status": "error",
+                    "message": f"Error durante el procesamiento: {error}",
+                    "duracion_segundos": duracion,
+                    "timestamp": datetime.now().isoformat()
+                }
+                logger.error(f"Error en el trabajo {trabajo_id}: {error}")
+            ultimo_resultado = trabajo["resultado"]
+            self._en_ejecucion -= 1
+            canal_eventos.publicar({
+                'tipo': 'fin_procesamiento',
+                'procesamiento_id': trabajo_id,
+                'trabajo_id': trabajo_id,
+                'estado': trabajo["estado"],
+                'error': trabajo["error"],
+                'duracion_segundos': duracion
+            })
+            self._podar()
+
+    def _podar(self):
+        """Elimina los trabajos terminados más antiguos que excedan max_terminados."""
+        with self._lock:
+            terminados = [
+                trabajo_id for trabajo_id, trabajo in self._trabajos.items()
+                if trabajo["estado"] in ESTADOS_TRABAJO_FINALES
+            ]
+            for trabajo_id in terminados[:max(0, len(terminados) - self.max_terminados)]:
+                trabajo = self._trabajos.pop(trabajo_id)
+                shutil.rmtree(trabajo["directorio"], ignore_errors=True)
+
+    def cancelar(self, trabajo_id):
+        """
+        Cancela un trabajo en cola o en ejecución.
+
+        Un trabajo en cola queda cancelado de inmediato. A un trabajo en ejecución
+        se le envía la señal de cancelación: se detiene en la siguiente generación o
+        subproblema y _finalizar lo registra como cancelado con su resultado parcial.
+
+        Returns:
+            tuple | None: (cancelacion_aceptada, estado) con el estado del trabajo tras
+                la llamada: 'ejecutando' si se envió la señal, 'cancelado' si estaba en
+                cola, o el estado final si ya había terminado (cancelacion_aceptada es
+                False). None si el trabajo no existe.
+        """
+        with self._lock:
+            trabajo = self._trabajos.get(trabajo_id)
+            if trabajo is None:
+                return None
+            if trabajo["estado"] == "ejecutando":
+                TokenCancelacion(
+                    ruta_senal=os.path.join(trabajo["directorio"], ARCHIVO_SENAL_CANCELACION)
+                ).cancelar()
+                trabajo["cancelacion_solicitada"] = True
+                canal_eventos.publicar({
+                    'tipo': 'cancelacion_solicitada',
+                    'procesamiento_id': trabajo_id,
+                    'trabajo_id': trabajo_id
+                })
+                return True, "ejecutando"
+            if trabajo["estado"] != "en_cola":
+                return False, trabajo["estado"]
+            self._cola = [entrada for entrada in self._cola if entrada[2] != trabajo_id]
+            heapq.heapify(self._cola)
+            trabajo["estado"] = "cancelado"
+            trabajo["fin"] = datetime.now().isoformat()
+            canal_eventos.publicar({
+                'tipo': 'fin_procesamiento',
+                'procesamiento_id': trabajo_id,
+                'trabajo_id': trabajo_id,
+                'estado': 'cancelado'
+            })
+            self._podar()
+            return True, "cancelado"
+
+    def obtener(self, trabajo_id):
+        """Retorna una copia pública del registro del trabajo, o None si no existe."""
+        with self._lock:
+            trabajo = self._trabajos.get(trabajo_id)
+            if trabajo is None:
+                return None
+            registro = {clave: valor for clave, valor in trabajo.items() if not clave.startswith('_')}
+            if trabajo["estado"] == "en_cola":
+                ordenados = sorted(self._cola)
+                registro["posicion_en_cola"] = [t for _, _, t in ordenados].index(trabajo_id) + 1
+            return registro
+
+    def listar(self):
+        """Retorna los registros de todos los trabajos, en orden de envío."""
+        with self._lock:
+            return [self.obtener(trabajo_id) for trabajo_id in self._trabajos]
+
+    def contar(self, estado):
+        with self._lock:
+            return sum(1 for trabajo in self._trabajos.values() if trabajo["estado"] == estado)
+
+    def cerrar(self):
+        """Espera a que terminen los trabajos en ejecución y cierra el pool."""
+        with self._lock:
+            executor, cola_eventos = self._executor, self._cola_eventos
+            self._executor = None
+            self._cola_eventos = None
+        if executor is not None:
+            executor.shutdown(wait=True)
+            cola_eventos.put(None)
+
+
+gestor_trabajos = GestorTrabajos()
 
 @app.route('/health', methods=['GET'])
 def health_check():
@@ -64,12 +515,51 @@ def get_status():
     Endpoint para obtener el estado actual del procesamiento
     """
     return jsonify({
-        "procesamiento_activo": procesamiento_activo,
+        "procesamiento_activo": gestor_trabajos.contar("ejecutando") > 0,
+        "trabajos_en_ejecucion": gestor_trabajos.contar("ejecutando"),
+        "trabajos_en_cola": gestor_trabajos.contar("en_cola"),
+        "max_trabajos_simultaneos": gestor_trabajos.max_trabajos,
         "ultimo_resultado": ultimo_resultado,
-        "historial_procesamiento": len(historial_procesamiento),
+        "ultimo_evento": canal_eventos.ultimo_evento,
+        "historial_procesamiento": len(gestor_trabajos.listar()),
         "timestamp": datetime.now().isoformat()
     }), 200
 
+@app.route('/events', methods=['GET'])
+def stream_events():
+    """
+    Endpoint Server-Sent Events con el progreso del procesamiento
+
+    Emite eventos 'inicio_procesamiento', 'inicio_subproblema', 'generacion',
+    'fin_subproblema' y 'fin_procesamiento', todos con el 'trabajo_id' que los
+    originó. Los eventos de generación incluyen mejor fitness, fitness promedio,
+    diversidad, tiempo transcurrido, evaluaciones por segundo y el subproblema
+    (numero_barra, grupo_ejecucion).
+    """
+    try:
+        desde_id = int(request.headers.get('Last-Event-ID', 0))
+    except ValueError:
+        desde_id = 0
+    cola = canal_eventos.suscribir(desde_id)
+
+    def generar():
+        try:
+            while True:
+                try:
+                    evento = cola.get(timeout=INTERVALO_KEEPALIVE_SSE)
+                except queue.Empty:
+                    yield ": keepalive\n\n"
+                    continue
+                yield formatear_evento_sse(evento)
+        finally:
+            canal_eventos.cancelar(cola)
+
+    return Response(
+        stream_with_context(generar()),
+        mimetype='text/event-stream',
+        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+    )
+
 @app.route('/files', methods=['GET'])
 def list_files():
     """
@@ -189,25 +679,22 @@ def upload_file():
 @app.route('/start-oica', methods=['POST'])
 def start_oica():
     """
-    Endpoint principal para iniciar el proceso de optimización OICA
+    Endpoint principal para encolar un trabajo de optimización OICA
     
     Acepta parámetros de configuración opcionalmente:
     - perfil_algoritmo: 'rapido', 'balanceado', 'intensivo'
     - archivo_cartilla: ruta personalizada del archivo de cartilla
     - archivo_barras: ruta personalizada del archivo de barras estándar
     - parametros_algoritmo: configuraciones específicas del AG
-    """
-    global procesamiento_activo, ultimo_resultado
+    - prioridad: los trabajos de mayor prioridad se ejecutan primero (por defecto 0)
+    - limite_tiempo_cpu_segundos, limite_memoria_mb: límites de recursos del trabajo
+      (por defecto JOB_CPU_LIMIT_SECONDS y JOB_MEMORY_LIMIT_MB); al superarlos el
+      trabajo termina cancelado con un resultado parcial
     
+    Cada trabajo recibe un id y un directorio propios; su estado y resultado se
+    consultan en /jobs/<id>.
+    """
     try:
-        # Verificar si ya hay un procesamiento en curso
-        # if procesamiento_activo:
-        #     return jsonify({
-        #         "error": "Ya hay un procesamiento en curso",
-        #         "message": "Espere a que termine el procesamiento actual",
-        #         "status": "busy"
-        #     }), 409
-        
         # Verificar que la función main esté disponible
         if main is None:
             return jsonify({
@@ -224,7 +711,29 @@ def start_oica():
         archivo_barras = data.get('archivo_barras', 'barras_estandar.json')
         parametros_personalizados = data.get('parametros_algoritmo', {})
         
-        logger.info(f"Iniciando procesamiento OICA con perfil: {perfil_algoritmo}")
+        try:
+            prioridad = int(data.get('prioridad', 0))
+        except (TypeError, ValueError):
+            return jsonify({
+                "error": "Prioridad no válida",
+                "message": "La prioridad debe ser un número entero",
+                "status": "error"
+            }), 400
+        
+        limites = {}
+        for campo, por_defecto in (('limite_tiempo_cpu_segundos', JOB_CPU_LIMIT_SECONDS),
+                                   ('limite_memoria_mb', JOB_MEMORY_LIMIT_MB)):
+            valor = data.get(campo, por_defecto)
+            try:
+                limites[campo] = None if valor is None else float(valor)
+            except (TypeError, ValueError):
+                limites[campo] = -1
+            if limites[campo] is not None and limites[campo] <= 0:
+                return jsonify({
+                    "error": "Límite de recursos no válido",
+                    "message": f"{campo} debe ser un número positivo",
+                    "status": "error"
+                }), 400
         
         # Verificar que los archivos existan
         if not os.path.exists(archivo_cartilla):
@@ -241,116 +750,28 @@ def start_oica():
                 "status": "error"
             }), 400
         
-        # Marcar como procesamiento activo
-        procesamiento_activo = True
+        config_algoritmo = {'perfil': perfil_algoritmo, 'parametros': parametros_personalizados}
+        trabajo = gestor_trabajos.enviar(archivo_cartilla, archivo_barras, config_algoritmo, prioridad, **limites)
         
-        # Registro del inicio del procesamiento
-        registro_procesamiento = {
-            "id": len(historial_procesamiento) + 1,
-            "inicio": datetime.now().isoformat(),
-            "fin": None,
-            "duracion": None,
-            "perfil": perfil_algoritmo,
-            "archivo_cartilla": archivo_cartilla,
-            "archivo_barras": archivo_barras,
-            "estado": "procesando",
-            "resultado": None,
-            "error": None
-        }
-        
-        historial_procesamiento.append(registro_procesamiento)
-        
-        def ejecutar_procesamiento():
-            """
-            Función para ejecutar el procesamiento en un hilo separado
-            """
-            global procesamiento_activo, ultimo_resultado
-            
-            inicio_tiempo = time.time()
-            
-            try:
-                logger.info("Ejecutando función main() de OICA...")
-                
-                # Ejecutar la función main
-                main()
-                
-                fin_tiempo = time.time()
-                duracion = fin_tiempo - inicio_tiempo
-                
-                # Actualizar registro
-                registro_procesamiento["fin"] = datetime.now().isoformat()
-                registro_procesamiento["duracion"] = round(duracion, 2)
-                registro_procesamiento["estado"] = "completado"
-                
-                # Intentar leer los archivos de resultados generados
-                resultado_files = {}
-                
-                if os.path.exists('resultados_optimizacion_cortes.csv'):
-                    resultado_files["resultados_csv"] = "resultados_optimizacion_cortes.csv"
-                    
-                if os.path.exists('PLAN_DE_CORTE_EJECUTABLE_AUTO.md'):
-                    resultado_files["plan_ejecutable"] = "PLAN_DE_CORTE_EJECUTABLE_AUTO.md"
-                
-                resultado = {
-                    "status": "success",
-                    "message": "Procesamiento OICA completado exitosamente",
-                    "duracion_segundos": round(duracion, 2),
-                    "perfil_usado": perfil_algoritmo,
-                    "archivos_generados": resultado_files,
-                    "timestamp": datetime.now().isoformat()
-                }
-                
-                registro_procesamiento["resultado"] = resultado
-                ultimo_resultado = resultado
-                
-                logger.info(f"Procesamiento completado en {duracion:.2f} segundos")
-                
-            except Exception as e:
-                fin_tiempo = time.time()
-                duracion = fin_tiempo - inicio_tiempo
-                
-                error_msg = str(e)
-                error_trace = traceback.format_exc()
-                
-                logger.error(f"Error en el procesamiento: {error_msg}")
-                logger.error(f"Trace completo: {error_trace}")
-                
-                # Actualizar registro con error
-                registro_procesamiento["fin"] = datetime.now().isoformat()
-                registro_procesamiento["duracion"] = round(duracion, 2)
-                registro_procesamiento["estado"] = "error"
-                registro_procesamiento["error"] = error_msg
-                
-                ultimo_resultado = {
-                    "status": "error",
-                    "message": f"Error durante el procesamiento: {error_msg}",
-                    "duracion_segundos": round(duracion, 2),
-                    "timestamp": datetime.now().isoformat()
-                }
-                
-            finally:
-                procesamiento_activo = False
-        
-        # Iniciar el procesamiento en un hilo separado
-        thread = threading.Thread(target=ejecutar_procesamiento)
-        thread.daemon = True
-        thread.start()
+        logger.info(f"Trabajo {trabajo['id']} encolado con perfil: {perfil_algoritmo}")
         
         return jsonify({
-            "status": "started",
-            "message": "Procesamiento OICA iniciado exitosamente",
-            "procesamiento_id": registro_procesamiento["id"],
+            "status": "queued",
+            "message": "Trabajo OICA encolado exitosamente",
+            "procesamiento_id": trabajo["id"],
+            "trabajo_id": trabajo["id"],
+            "estado": gestor_trabajos.obtener(trabajo["id"])["estado"],
             "perfil_algoritmo": perfil_algoritmo,
+            "prioridad": prioridad,
             "timestamp": datetime.now().isoformat(),
-            "info": "Use el endpoint /status para monitorear el progreso"
+            "info": f"Use /jobs/{trabajo['id']} o el stream /events para monitorear el progreso"
         }), 202
         
     except Exception as e:
-        procesamiento_activo = False
         error_msg = str(e)
         error_trace = traceback.format_exc()
         
-        logger.error(f"Error iniciando procesamiento: {error_msg}")
+        logger.error(f"Error encolando procesamiento: {error_msg}")
         logger.error(f"Trace: {error_trace}")
         
         return jsonify({
@@ -360,14 +781,115 @@ def start_oica():
             "timestamp": datetime.now().isoformat()
         }), 500
 
+@app.route('/jobs', methods=['GET'])
+def list_jobs():
+    """
+    Endpoint para listar los trabajos y su estado
+    """
+    trabajos = gestor_trabajos.listar()
+    return jsonify({
+        "trabajos": trabajos,
+        "total": len(trabajos),
+        "timestamp": datetime.now().isoformat()
+    }), 200
+
+def _trabajo_no_encontrado(trabajo_id):
+    return jsonify({
+        "error": "Trabajo no encontrado",
+        "message": f"No existe el trabajo {trabajo_id}",
+        "status": "not_found",
+        "timestamp": datetime.now().isoformat()
+    }), 404
+
+@app.route('/jobs/<trabajo_id>', methods=['GET'])
+def get_job(trabajo_id):
+    """
+    Endpoint para consultar el estado de un trabajo
+    
+    Estados: 'en_cola', 'ejecutando', 'completado', 'error' y 'cancelado'.
+    """
+    trabajo = gestor_trabajos.obtener(trabajo_id)
+    if trabajo is None:
+        return _trabajo_no_encontrado(trabajo_id)
+    return jsonify({**trabajo, "timestamp": datetime.now().isoformat()}), 200
+
+@app.route('/jobs/<trabajo_id>/result', methods=['GET'])
+def get_job_result(trabajo_id):
+    """
+    Endpoint para obtener el resultado de un trabajo terminado
+    
+    Incluye los patrones de corte de resultados_optimizacion_cortes.csv del
+    directorio del trabajo (parciales si el trabajo se canceló en ejecución).
+    """
+    trabajo = gestor_trabajos.obtener(trabajo_id)
+    if trabajo is None:
+        return _trabajo_no_encontrado(trabajo_id)
+    if trabajo["estado"] not in ESTADOS_TRABAJO_FINALES:
+        return jsonify({
+            "error": "Trabajo sin terminar",
+            "message": f"El trabajo está en estado '{trabajo['estado']}'",
+            "estado": trabajo["estado"],
+            "status": "pending"
+        }), 409
+    
+    respuesta = {
+        "trabajo_id": trabajo_id,
+        "estado": trabajo["estado"],
+        "resultado": trabajo["resultado"],
+        "error": trabajo["error"],
+        "timestamp": datetime.now().isoformat()
+    }
+    ruta_resultados = os.path.join(trabajo["directorio"], 'resultados_optimizacion_cortes.csv')
+    # Un trabajo detenido por cancelación o por sus límites deja resultados parciales
+    if trabajo["estado"] in ("completado", "cancelado") and os.path.exists(ruta_resultados):
+        df = pd.read_csv(ruta_resultados)
+        respuesta["resultados"] = df.to_dict('records')
+        respuesta["total_records"] = len(df)
+    return jsonify(respuesta), 200
+
+@app.route('/jobs/<trabajo_id>/cancel', methods=['POST'])
+def cancel_job(trabajo_id):
+    """
+    Endpoint para cancelar un trabajo en cola o en ejecución
+
+    Un trabajo en ejecución se detiene en la siguiente generación o subproblema;
+    su estado pasa a 'cancelado' con un resultado parcial en /jobs/<id>/result.
+    """
+    cancelacion = gestor_trabajos.cancelar(trabajo_id)
+    if cancelacion is None:
+        return _trabajo_no_encontrado(trabajo_id)
+    cancelacion_aceptada, estado = cancelacion
+    if not cancelacion_aceptada:
+        return jsonify({
+            "error": "No se puede cancelar el trabajo",
+            "message": f"El trabajo ya terminó en estado '{estado}'",
+            "estado": estado,
+            "status": "conflict"
+        }), 409
+    if estado == "ejecutando":
+        return jsonify({
+            "status": "cancelling",
+            "trabajo_id": trabajo_id,
+            "estado": "ejecutando",
+            "message": "Cancelación solicitada; el trabajo se detendrá con un resultado parcial",
+            "timestamp": datetime.now().isoformat()
+        }), 202
+    return jsonify({
+        "status": "cancelled",
+        "trabajo_id": trabajo_id,
+        "estado": "cancelado",
+        "timestamp": datetime.now().isoformat()
+    }), 200
+
 @app.route('/historial', methods=['GET'])
 def get_historial():
     """
     Endpoint para obtener el historial de procesamientos
     """
+    historial = gestor_trabajos.listar()
     return jsonify({
-        "historial": historial_procesamiento,
-        "total_procesamientos": len(historial_procesamiento),
+        "historial": historial,
+        "total_procesamientos": len(historial),
         "timestamp": datetime.now().isoformat()
     }), 200
 
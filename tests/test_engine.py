@@ -2,22 +2,59 @@
 Tests unitarios para el motor del algoritmo genético.
 """
 
+import json
+import multiprocessing
+import os
+import random
+import tempfile
+import threading
 import unittest
+from concurrent.futures import Future, ProcessPoolExecutor
+from unittest.mock import patch
+import numpy as np
 import pandas as pd
 import time
 
 from genetic_algorithm.engine import (
     ejecutar_algoritmo_genetico,
+    _evolucionar_asincrono,
     ejecutar_algoritmo_genetico_simple,
     verificar_criterios_parada,
     aplicar_elitismo_y_reemplazo,
+    aplicar_reemplazo_estado_estacionario,
     validar_configuracion_ga
 )
+from genetic_algorithm.chromosome_utils import calcular_firma_canonica
 from genetic_algorithm.chromosome import Patron, Cromosoma
 from genetic_algorithm.metrics import RegistroEvolucion
+from genetic_algorithm.demand import compilar_demanda
+from genetic_algorithm.lower_bound import calcular_cota_inferior, alcanza_cota_inferior
+from genetic_algorithm.portfolio import ejecutar_portafolio, registrar_resultado_portafolio
+from genetic_algorithm.islands import ejecutar_modelo_islas
+from genetic_algorithm.checkpoint import guardar_checkpoint, cargar_checkpoint
+from genetic_algorithm.scheduler import estimar_dificultad, asignar_presupuesto
+from genetic_algorithm.cancellation import TokenCancelacion, CancelacionSolicitada
+from genetic_algorithm.population import inicializar_poblacion
 from genetic_algorithm import CONFIG_GA_DEFAULT
 
 
+def _consumir_cpu(segundos):
+    tiempo_inicio = time.time()
+    while time.time() - tiempo_inicio < segundos:
+        pass
+
+
+def _consultar_token(token):
+    return token.cancelado, token.motivo
+
+
+def _reservar_memoria(megabytes, reservada):
+    bloque = bytearray(b'\x01') * (megabytes * 1024 * 1024)
+    reservada.set()
+    time.sleep(60)
+    return bloque
+
+
 class TestEngine(unittest.TestCase):
     """Tests para el motor del algoritmo genético."""
     
@@ -189,6 +226,31 @@ class TestEngine(unittest.TestCase):
         self.assertIn(6.0, nuevos_fitness)  # El mejor de la élite debe estar presente
         self.assertEqual(min(nuevos_fitness), 6.0)  # El mejor global debe ser de la élite
     
+    def test_reemplazo_estado_estacionario(self):
+        """Test del reemplazo del peor individuo en estado estacionario."""
+        poblacion = self._crear_poblacion_prueba(4)
+        valores_fitness = [10.0, 8.0, 12.0, 6.0]
+        firmas = [calcular_firma_canonica(c) for c in poblacion]
+        hijo = self._crear_poblacion_prueba(5)[4]
+        config_ga = {'estrategia_reemplazo': 'reemplazo_peor'}
+        
+        # Un hijo peor que todos no entra
+        self.assertFalse(aplicar_reemplazo_estado_estacionario(
+            poblacion, valores_fitness, firmas, hijo, 13.0, config_ga
+        ))
+        
+        # Un hijo mejor reemplaza al peor (fitness 12.0, índice 2)
+        self.assertTrue(aplicar_reemplazo_estado_estacionario(
+            poblacion, valores_fitness, firmas, hijo, 9.0, config_ga
+        ))
+        self.assertIs(poblacion[2], hijo)
+        self.assertEqual(valores_fitness, [10.0, 8.0, 9.0, 6.0])
+        
+        # Un duplicado de un individuo presente se rechaza
+        self.assertFalse(aplicar_reemplazo_estado_estacionario(
+            poblacion, valores_fitness, firmas, hijo.clonar(), 7.0, config_ga
+        ))
+    
     def test_validar_configuracion_ga_valida(self):
         """Test de validación con configuración válida."""
         config_valida = {
@@ -309,6 +371,180 @@ class TestEngine(unittest.TestCase):
                 
                 self.assertIsInstance(mejor_cromosoma, Cromosoma)
     
+    def test_cache_fitness(self):
+        """Test de ejecución con la caché de fitness habilitada."""
+        config_cache = {
+            **self.config_test,
+            'cache_fitness': True,
+            'tamaño_cache_fitness': 50
+        }
+        
+        mejor_cromosoma, estadisticas = ejecutar_algoritmo_genetico(
+            self.piezas_requeridas_df,
+            self.barras_disponibles,
+            self.desperdicios_disponibles,
+            config_cache
+        )
+        
+        self.assertIsInstance(mejor_cromosoma, Cromosoma)
+        self.assertGreater(estadisticas['cache_fitness_aciertos'], 0)
+        self.assertGreater(estadisticas['cache_fitness_fallos'], 0)
+    
+    def test_estado_estacionario(self):
+        """Test de ejecución con reemplazo de estado estacionario."""
+        for estrategia in ('reemplazo_peor', 'reemplazo_torneo'):
+            with self.subTest(estrategia=estrategia):
+                config_estacionario = {
+                    **self.config_test,
+                    'estrategia_reemplazo': estrategia,
+                    'hijos_por_paso': 1
+                }
+                
+                mejor_cromosoma, estadisticas = ejecutar_algoritmo_genetico(
+                    self.piezas_requeridas_df,
+                    self.barras_disponibles,
+                    self.desperdicios_disponibles,
+                    config_estacionario
+                )
+                
+                self.assertIsInstance(mejor_cromosoma, Cromosoma)
+                self.assertGreaterEqual(estadisticas['generaciones_ejecutadas'], 1)
+                self.assertGreaterEqual(estadisticas['mejora_total'], 0)
+        
+        # El estado estacionario síncrono no crea un pool de evaluación que no usaría
+        with patch('genetic_algorithm.engine.EvaluadorParalelo') as evaluador_paralelo:
+            ejecutar_algoritmo_genetico(
+                self.piezas_requeridas_df,
+                self.barras_disponibles,
+                self.desperdicios_disponibles,
+                {**config_estacionario, 'paralelizar_evaluacion': True}
+            )
+        evaluador_paralelo.assert_not_called()
+    
+    def test_evaluacion_paralela(self):
+        """Test de ejecución con evaluación y descendencia en procesos trabajadores."""
+        config_paralela = {
+            **self.config_test,
+            'paralelizar_evaluacion': True,
+            'cache_fitness': True,
+            'num_trabajadores': 2,
+            'tamaño_lote_paralelo': 3
+        }
+        
+        mejor_cromosoma, estadisticas = ejecutar_algoritmo_genetico(
+            self.piezas_requeridas_df,
+            self.barras_disponibles,
+            self.desperdicios_disponibles,
+            config_paralela
+        )
+        
+        self.assertIsInstance(mejor_cromosoma, Cromosoma)
+        self.assertGreater(len(mejor_cromosoma.patrones), 0)
+        self.assertGreaterEqual(estadisticas['generaciones_ejecutadas'], 1)
+    
+    def test_evolucion_asincrona(self):
+        """Test de evolución asíncrona maestro–trabajador con generaciones virtuales."""
+        config_asincrona = {
+            **self.config_test,
+            'paralelizar_evaluacion': True,
+            'evolucion_asincrona': True,
+            'num_trabajadores': 2,
+            'max_generaciones': 4,
+            'generaciones_sin_mejora_max': 100
+        }
+        
+        from genetic_algorithm import engine
+        reemplazo_original = engine.aplicar_reemplazo_estado_estacionario
+        mejores_en_poblacion = []
+        
+        def reemplazo_registrado(poblacion, valores_fitness, *args, **kwargs):
+            resultado = reemplazo_original(poblacion, valores_fitness, *args, **kwargs)
+            mejores_en_poblacion.append(min(valores_fitness))
+            return resultado
+        
+        eventos = []
+        with patch('genetic_algorithm.engine.aplicar_reemplazo_estado_estacionario',
+                   side_effect=reemplazo_registrado):
+            mejor_cromosoma, estadisticas = ejecutar_algoritmo_genetico(
+                self.piezas_requeridas_df,
+                self.barras_disponibles,
+                self.desperdicios_disponibles,
+                config_asincrona,
+                callback_progreso=eventos.append
+            )
+        
+        self.assertIsInstance(mejor_cromosoma, Cromosoma)
+        # Generación inicial, tres generaciones virtuales y, si quedaron hijos sin
+        # registrar, una generación parcial final
+        generaciones = [evento['generacion'] for evento in eventos if evento['tipo'] == 'generacion']
+        self.assertEqual(generaciones[:4], [0, 1, 2, 3])
+        self.assertIn(generaciones[4:], ([], [4]))
+        self.assertEqual(estadisticas['generaciones_ejecutadas'], len(generaciones))
+        self.assertGreaterEqual(estadisticas['mejora_total'], 0)
+        
+        # Ningún hijo insertado en la población se pierde del mejor global
+        self.assertLessEqual(estadisticas['mejor_fitness_global'], min(mejores_en_poblacion))
+        
+        errores = validar_configuracion_ga({**CONFIG_GA_DEFAULT, 'evolucion_asincrona': True})
+        self.assertTrue(any('asíncrona' in error for error in errores))
+    
+    def test_evolucion_asincrona_registra_generacion_parcial(self):
+        """Los hijos recibidos después de la última generación virtual llegan al mejor global."""
+        config = {**CONFIG_GA_DEFAULT, **self.config_test, 'hijos_por_paso': 1, 'logging_habilitado': False}
+        poblacion = inicializar_poblacion(
+            tamaño_poblacion=config['tamaño_poblacion'],
+            piezas_requeridas_df=self.piezas_requeridas_df,
+            barras_estandar_disponibles=self.barras_disponibles,
+            desperdicios_reutilizables_previos=self.desperdicios_disponibles,
+            estrategia_inicializacion='heuristica',
+            config_ga=config
+        )
+        valores_fitness = [10.0 + i for i in range(len(poblacion))]
+        registro = RegistroEvolucion()
+        registro.iniciar_registro(config)
+        registro.registrar_generacion(0, poblacion, valores_fitness, 0.0)
+        token = TokenCancelacion()
+        
+        class EvaluadorFicticio:
+            """Devuelve un hijo mejor que toda la población y cancela tras el primer envío."""
+            num_trabajadores = 1
+            
+            def enviar_pareja(self, padre1, padre2):
+                token.cancelar()
+                futuro = Future()
+                futuro.set_result(([Cromosoma([])], [1.0]))
+                return futuro
+        
+        _evolucionar_asincrono(
+            poblacion, valores_fitness, config, compilar_demanda(self.piezas_requeridas_df),
+            registro, EvaluadorFicticio(), token_cancelacion=token
+        )
+        
+        # Un solo hijo nuevo (el segundo es un duplicado): menos que una generación virtual
+        self.assertEqual(min(valores_fitness), 1.0)
+        self.assertEqual(registro.mejor_fitness_global, 1.0)
+        self.assertEqual(registro.generaciones, [0, 1])
+    
+    def test_callback_progreso(self):
+        """Test de los eventos de progreso emitidos por generación."""
+        eventos = []
+        
+        _, estadisticas = ejecutar_algoritmo_genetico(
+            self.piezas_requeridas_df,
+            self.barras_disponibles,
+            self.desperdicios_disponibles,
+            self.config_test,
+            callback_progreso=eventos.append
+        )
+        
+        self.assertEqual(len(eventos), estadisticas['generaciones_ejecutadas'])
+        self.assertEqual([e['generacion'] for e in eventos], list(range(len(eventos))))
+        for evento in eventos:
+            self.assertEqual(evento['tipo'], 'generacion')
+            self.assertLessEqual(evento['mejor_fitness_global'], evento['mejor_fitness'])
+            self.assertGreaterEqual(evento['evaluaciones_por_segundo'], 0)
+        self.assertEqual(eventos[-1]['mejor_fitness_global'], estadisticas['mejor_fitness_global'])
+    
     def test_manejo_errores(self):
         """Test de manejo de errores."""
         # Test con DataFrame vacío
@@ -421,5 +657,585 @@ class TestRegistroEvolucion(unittest.TestCase):
         return poblacion
 
 
+
+class TestCotaInferior(unittest.TestCase):
+    """Tests para la cota inferior de Gilmore–Gomory."""
+    
+    def _crear_df(self, piezas: list) -> pd.DataFrame:
+        return pd.DataFrame([
+            {'id_pedido': f'P{i}', 'longitud_pieza_requerida': longitud, 'cantidad_requerida': cantidad}
+            for i, (longitud, cantidad) in enumerate(piezas)
+        ])
+    
+    def test_cota_relajacion_lineal(self):
+        """La relajación permite media barra; la cota se redondea a barras enteras."""
+        cota = calcular_cota_inferior(self._crear_df([(5.0, 3)]), [{'longitud': 12.0}], [])
+        
+        self.assertAlmostEqual(cota['valor_lp_mm'], 18000.0)
+        self.assertEqual(cota['longitud_minima_mm'], 24000)
+        self.assertEqual(cota['barras_minimas'], 2)
+    
+    def test_cota_con_desperdicios(self):
+        """Los desperdicios reutilizables reducen la longitud de barras estándar necesaria."""
+        piezas_df = self._crear_df([(2.0, 2), (1.5, 2), (1.0, 1)])
+        barras = [{'longitud': 6.0}, {'longitud': 4.0}]
+        
+        sin_desperdicios = calcular_cota_inferior(piezas_df, barras, [])
+        con_desperdicios = calcular_cota_inferior(piezas_df, barras, [{'longitud': 2.5}])
+        
+        self.assertEqual(sin_desperdicios['longitud_minima_mm'], 8000)
+        self.assertEqual(con_desperdicios['longitud_minima_mm'], 6000)
+        self.assertIsNone(calcular_cota_inferior(self._crear_df([(7.0, 1)]), barras, []))
+    
+    def test_parada_al_alcanzar_cota(self):
+        """El AG se detiene sin evolucionar si la población inicial ya alcanza la cota."""
+        piezas_df = self._crear_df([(3.0, 8), (2.0, 6)])
+        barras = [{'longitud': 12.0, 'tipo': 'estandar'}]
+        config_ga = {
+            'tamaño_poblacion': 10,
+            'max_generaciones': 50,
+            'estrategia_inicializacion': 'heuristica',
+            'logging_habilitado': False,
+            'parada_por_cota_inferior': True
+        }
+        
+        mejor_cromosoma, estadisticas = ejecutar_algoritmo_genetico(piezas_df, barras, [], config_ga)
+        
+        self.assertEqual(estadisticas['cota_inferior']['barras_minimas'], 3)
+        self.assertEqual(mejor_cromosoma.obtener_resumen().num_barras_estandar, 3)
+        self.assertEqual(estadisticas['generaciones_ejecutadas'], 1)
+        self.assertTrue(alcanza_cota_inferior(
+            mejor_cromosoma,
+            compilar_demanda(piezas_df),
+            estadisticas['cota_inferior']
+        ))
+        
+        # Un plan con una pieza faltante no alcanza la cota aunque use menos barras
+        incompleto = Cromosoma([Patron(12.0, 'estandar', [
+            {'id_pedido': 'P0', 'longitud_pieza': 3.0, 'cantidad_pieza_en_patron': 4}
+        ])])
+        self.assertFalse(verificar_criterios_parada(
+            1, [], time.time(), {'max_generaciones': 50},
+            mejor_cromosoma=incompleto,
+            demanda=compilar_demanda(piezas_df),
+            cota_inferior=estadisticas['cota_inferior']
+        ))
+
+
+
+class TestPortafolio(unittest.TestCase):
+    """Tests para el portafolio de solvers."""
+    
+    def setUp(self):
+        """Configuración inicial para las pruebas."""
+        self.barras = [{'longitud': 12.0, 'tipo': 'estandar'}]
+        self.config_ga = {
+            'tamaño_poblacion': 6,
+            'max_generaciones': 3,
+            'estrategia_inicializacion': 'heuristica',
+            'logging_habilitado': False
+        }
+    
+    def test_retorna_el_mejor_resultado(self):
+        """El ganador es el solver con menor fitness y todos reportan su resultado."""
+        piezas_df = pd.DataFrame([
+            {'id_pedido': 'P001', 'longitud_pieza_requerida': 5.0, 'cantidad_requerida': 3},
+            {'id_pedido': 'P002', 'longitud_pieza_requerida': 3.5, 'cantidad_requerida': 4}
+        ])
+        
+        cromosoma, resumen = ejecutar_portafolio(
+            piezas_df, self.barras, [], self.config_ga,
+            tiempo_limite_segundos=30, solvers=('ffd', 'bfd', 'algoritmo_genetico')
+        )
+        
+        fitness_reportados = [
+            resultado['fitness'] for resultado in resumen['resultados'].values()
+            if resultado['fitness'] is not None
+        ]
+        self.assertIsInstance(cromosoma, Cromosoma)
+        self.assertIn(resumen['ganador'], ('ffd', 'bfd', 'algoritmo_genetico'))
+        self.assertEqual(resumen['fitness_ganador'], min(fitness_reportados))
+        self.assertIsNone(resumen['motivo_cancelacion'])
+    
+    def test_cancela_al_demostrar_optimo(self):
+        """Cuando FFD alcanza la cota inferior, el AG se cancela sin agotar el plazo."""
+        piezas_df = pd.DataFrame([
+            {'id_pedido': 'P001', 'longitud_pieza_requerida': 3.0, 'cantidad_requerida': 8},
+            {'id_pedido': 'P002', 'longitud_pieza_requerida': 2.0, 'cantidad_requerida': 6}
+        ])
+        config_lenta = {
+            **self.config_ga,
+            'tamaño_poblacion': 50,
+            'max_generaciones': 100000,
+            'generaciones_sin_mejora_max': 100000,
+            'tiempo_limite_segundos': 60
+        }
+        
+        _, resumen = ejecutar_portafolio(
+            piezas_df, self.barras, [], config_lenta,
+            tiempo_limite_segundos=60, solvers=('ffd', 'algoritmo_genetico')
+        )
+        
+        self.assertTrue(resumen['optimo_demostrado'])
+        self.assertEqual(resumen['ganador'], 'ffd')
+        self.assertTrue(resumen['resultados']['algoritmo_genetico']['cancelado'])
+        self.assertLess(resumen['tiempo_total_segundos'], 30)
+    
+    def test_registro_del_ganador(self):
+        """El historial guarda una línea JSON por ejecución con el solver ganador."""
+        piezas_df = pd.DataFrame([
+            {'id_pedido': 'P001', 'longitud_pieza_requerida': 4.0, 'cantidad_requerida': 3}
+        ])
+        _, resumen = ejecutar_portafolio(
+            piezas_df, self.barras, [], self.config_ga,
+            tiempo_limite_segundos=30, solvers=('ffd', 'exacto')
+        )
+        
+        with tempfile.TemporaryDirectory() as directorio:
+            ruta = os.path.join(directorio, 'historial.jsonl')
+            registrar_resultado_portafolio(ruta, piezas_df, resumen)
+            registrar_resultado_portafolio(ruta, piezas_df, resumen)
+            with open(ruta, encoding='utf-8') as archivo:
+                lineas = [json.loads(linea) for linea in archivo]
+        
+        self.assertEqual(len(lineas), 2)
+        self.assertEqual(lineas[0]['ganador'], resumen['ganador'])
+        self.assertEqual(lineas[0]['num_piezas'], 3)
+    
+    def test_cancelacion_termina_los_solvers(self):
+        """El progreso del AG llega al proceso principal y el token detiene el portafolio."""
+        piezas_df = pd.DataFrame([
+            {'id_pedido': 'P001', 'longitud_pieza_requerida': 5.0, 'cantidad_requerida': 3},
+            {'id_pedido': 'P002', 'longitud_pieza_requerida': 3.5, 'cantidad_requerida': 4}
+        ])
+        config_lenta = {
+            **self.config_ga,
+            'max_generaciones': 100000,
+            'generaciones_sin_mejora_max': 100000,
+            'tiempo_limite_segundos': 60
+        }
+        token = TokenCancelacion()
+        eventos = []
+        
+        def cancelar_tras_tres_generaciones(evento):
+            eventos.append(evento)
+            if len(eventos) == 3:
+                token.cancelar()
+        
+        tiempo_inicio = time.time()
+        with self.assertRaises(CancelacionSolicitada) as contexto:
+            ejecutar_portafolio(
+                piezas_df, self.barras, [], config_lenta,
+                tiempo_limite_segundos=60, solvers=('algoritmo_genetico',),
+                token_cancelacion=token, callback_progreso=cancelar_tras_tres_generaciones
+            )
+        
+        self.assertEqual(contexto.exception.motivo, 'cancelado')
+        self.assertLess(time.time() - tiempo_inicio, 30)
+        self.assertGreaterEqual(len(eventos), 3)
+        self.assertTrue(all(e['tipo'] == 'generacion' and e['solver'] == 'algoritmo_genetico' for e in eventos))
+
+
+
+class TestModeloIslas(unittest.TestCase):
+    """Tests para el modelo de islas con migración."""
+    
+    def setUp(self):
+        """Configuración inicial para las pruebas."""
+        self.piezas_df = pd.DataFrame([
+            {'id_pedido': 'P001', 'longitud_pieza_requerida': 5.0, 'cantidad_requerida': 3},
+            {'id_pedido': 'P002', 'longitud_pieza_requerida': 3.5, 'cantidad_requerida': 4},
+            {'id_pedido': 'P003', 'longitud_pieza_requerida': 2.2, 'cantidad_requerida': 5}
+        ])
+        self.barras = [
+            {'longitud': 12.0, 'tipo': 'estandar'},
+            {'longitud': 9.0, 'tipo': 'estandar'}
+        ]
+        self.config_ga = {
+            'tamaño_poblacion': 8,
+            'max_generaciones': 12,
+            'estrategia_inicializacion': 'heuristica',
+            'num_islas': 3,
+            'intervalo_migracion': 3,
+            'num_migrantes': 2,
+            'generaciones_sin_mejora_max': 1000,
+            'logging_habilitado': False
+        }
+    
+    def test_migracion_entre_islas(self):
+        """Las islas migran cada época y el resultado es el mejor de todas ellas."""
+        variantes = [
+            {'estrategia_cruce': 'un_punto'},
+            {'estrategia_cruce': 'basado_en_piezas', 'metodo_seleccion': 'ruleta'}
+        ]
+        
+        cromosoma, resumen = ejecutar_modelo_islas(
+            self.piezas_df, self.barras, [], self.config_ga, variantes_islas=variantes
+        )
+        
+        self.assertIsInstance(cromosoma, Cromosoma)
+        self.assertEqual(resumen['num_islas'], 3)
+        self.assertEqual(resumen['generaciones_ejecutadas'], 12)
+        self.assertEqual(resumen['migraciones'], 3)
+        self.assertEqual(len(resumen['mejor_fitness_por_isla']), 3)
+        self.assertEqual(resumen['mejor_fitness_global'], min(resumen['mejor_fitness_por_isla']))
+        
+        resumen_cromosoma = cromosoma.obtener_resumen()
+        demanda = compilar_demanda(self.piezas_df)
+        self.assertEqual(demanda.calcular_longitud_faltante(demanda.vectorizar_sumario(resumen_cromosoma.conteos_piezas)[0]), 0)
+    
+    def test_parada_por_cota_inferior(self):
+        """El proceso principal detiene todas las islas al alcanzar la cota inferior."""
+        piezas_df = pd.DataFrame([
+            {'id_pedido': 'P001', 'longitud_pieza_requerida': 3.0, 'cantidad_requerida': 8},
+            {'id_pedido': 'P002', 'longitud_pieza_requerida': 2.0, 'cantidad_requerida': 6}
+        ])
+        config = {
+            **self.config_ga,
+            'max_generaciones': 100000,
+            'parada_por_cota_inferior': True
+        }
+        
+        _, resumen = ejecutar_modelo_islas(piezas_df, [{'longitud': 12.0, 'tipo': 'estandar'}], [], config)
+        
+        self.assertEqual(resumen['generaciones_ejecutadas'], 3)
+        self.assertEqual(resumen['migraciones'], 0)
+        self.assertIsNotNone(resumen['cota_inferior'])
+
+
+
+class TestCheckpoint(unittest.TestCase):
+    """Tests para los checkpoints del algoritmo genético."""
+    
+    def setUp(self):
+        """Configuración inicial para las pruebas."""
+        self.piezas_df = pd.DataFrame([
+            {'id_pedido': 'P001', 'longitud_pieza_requerida': 5.0, 'cantidad_requerida': 3},
+            {'id_pedido': 'P002', 'longitud_pieza_requerida': 3.5, 'cantidad_requerida': 4},
+            {'id_pedido': 'P003', 'longitud_pieza_requerida': 2.2, 'cantidad_requerida': 5}
+        ])
+        self.barras = [{'longitud': 12.0, 'tipo': 'estandar'}, {'longitud': 9.0, 'tipo': 'estandar'}]
+        self.config_ga = {
+            'tamaño_poblacion': 8,
+            'max_generaciones': 8,
+            'estrategia_inicializacion': 'hibrida',
+            'generaciones_sin_mejora_max': 100,
+            'intervalo_checkpoint': 3,
+            'logging_habilitado': False
+        }
+    
+    def _ejecutar(self, config, semilla):
+        random.seed(semilla)
+        np.random.seed(semilla)
+        return ejecutar_algoritmo_genetico(self.piezas_df, self.barras, [], config)
+    
+    def test_reanudacion_exacta(self):
+        """Una ejecución interrumpida y reanudada coincide con la ejecución sin interrumpir."""
+        _, estadisticas_completa = self._ejecutar(self.config_ga, 7)
+        
+        with tempfile.TemporaryDirectory() as directorio:
+            config = {**self.config_ga, 'ruta_checkpoint': os.path.join(directorio, 'ag.ckpt')}
+            
+            # Se interrumpe durante la generación 5; el último checkpoint es el de la generación 3
+            from genetic_algorithm import engine
+            evolucionar_original = engine.evolucionar_generacion
+            llamadas = []
+            
+            def evolucionar_con_fallo(*args, **kwargs):
+                llamadas.append(1)
+                if len(llamadas) == 5:
+                    raise RuntimeError("Interrupción simulada")
+                return evolucionar_original(*args, **kwargs)
+            
+            with patch('genetic_algorithm.engine.evolucionar_generacion', side_effect=evolucionar_con_fallo):
+                with self.assertRaises(RuntimeError):
+                    self._ejecutar(config, 7)
+            self.assertTrue(os.path.exists(config['ruta_checkpoint']))
+            
+            # La reanudación parte de otra semilla: el estado aleatorio sale del checkpoint
+            _, estadisticas_reanudada = self._ejecutar(config, 99)
+            self.assertFalse(os.path.exists(config['ruta_checkpoint']))
+        
+        self.assertEqual(estadisticas_reanudada['generaciones_ejecutadas'],
+                         estadisticas_completa['generaciones_ejecutadas'])
+        self.assertEqual(estadisticas_reanudada['mejor_fitness_global'],
+                         estadisticas_completa['mejor_fitness_global'])
+        self.assertEqual(estadisticas_reanudada['fitness_promedio_final'],
+                         estadisticas_completa['fitness_promedio_final'])
+    
+    def test_checkpoint_de_otro_problema(self):
+        """Un checkpoint con otra clave de problema se ignora."""
+        with tempfile.TemporaryDirectory() as directorio:
+            ruta = os.path.join(directorio, 'ag.ckpt')
+            guardar_checkpoint(ruta, 'clave_a', {'generacion': 3})
+            
+            self.assertEqual(cargar_checkpoint(ruta, 'clave_a'), {'generacion': 3})
+            self.assertIsNone(cargar_checkpoint(ruta, 'clave_b'))
+            self.assertIsNone(cargar_checkpoint(os.path.join(directorio, 'no_existe.ckpt'), 'clave_a'))
+            
+            # Un checkpoint ajeno no impide ejecutar el AG desde cero
+            config = {**self.config_ga, 'max_generaciones': 2, 'ruta_checkpoint': ruta}
+            mejor_cromosoma, _ = ejecutar_algoritmo_genetico(self.piezas_df, self.barras, [], config)
+            self.assertIsInstance(mejor_cromosoma, Cromosoma)
+
+
+class TestPresupuesto(unittest.TestCase):
+    """Tests para el reparto del presupuesto de tiempo entre subproblemas."""
+    
+    def _crear_df(self, piezas: list) -> pd.DataFrame:
+        return pd.DataFrame([
+            {'id_pedido': f'P{i}', 'longitud_pieza_requerida': longitud, 'cantidad_requerida': cantidad}
+            for i, (longitud, cantidad) in enumerate(piezas)
+        ])
+    
+    def test_estimar_dificultad(self):
+        """Un subproblema que FFD resuelve en la cota es trivial."""
+        barras = [{'longitud': 12.0, 'tipo': 'estandar'}]
+        
+        trivial = estimar_dificultad(self._crear_df([(3.0, 8), (2.0, 6)]), barras)
+        dificil = estimar_dificultad(self._crear_df([(4.4, 6), (3.7, 9), (2.6, 5), (1.9, 4)]), barras)
+        
+        self.assertEqual(trivial['dificultad'], 0.0)
+        self.assertEqual(dificil['num_piezas'], 24)
+        self.assertEqual(dificil['longitudes_distintas'], 4)
+        self.assertGreater(dificil['brecha_barras'], 0)
+        self.assertGreater(dificil['dificultad'], 0)
+    
+    def test_asignar_presupuesto(self):
+        """El tiempo, las generaciones y la población crecen con la dificultad."""
+        config_ga = {'tamaño_poblacion': 30, 'max_generaciones': 50, 'tamaño_elite': 3, 'tamaño_torneo': 4}
+        
+        asignaciones = asignar_presupuesto([0.0, 10.0, 30.0], 20.0, config_ga)
+        
+        self.assertAlmostEqual(sum(a['tiempo_limite_segundos'] for a in asignaciones), 20.0)
+        trivial, facil, dificil = asignaciones
+        self.assertLess(trivial['tiempo_limite_segundos'], facil['tiempo_limite_segundos'])
+        self.assertLess(facil['tiempo_limite_segundos'], dificil['tiempo_limite_segundos'])
+        self.assertLess(facil['max_generaciones'], dificil['max_generaciones'])
+        self.assertLess(facil['tamaño_poblacion'], dificil['tamaño_poblacion'])
+        self.assertTrue(trivial['parada_por_cota_inferior'])
+        
+        # Solo los subproblemas más difíciles que la media conservan el paralelismo
+        self.assertEqual(trivial['num_islas'], 1)
+        self.assertEqual(facil['num_islas'], 1)
+        self.assertNotIn('num_islas', dificil)
+        
+        # Con un presupuesto menor que los mínimos, el reparto se escala
+        escasas = asignar_presupuesto([0.0, 10.0], 0.3, config_ga)
+        self.assertAlmostEqual(sum(a['tiempo_limite_segundos'] for a in escasas), 0.3)
+
+
+class TestCancelacion(unittest.TestCase):
+    """Tests para la cancelación cooperativa y los límites de recursos."""
+    
+    def setUp(self):
+        """Configuración inicial para las pruebas."""
+        self.piezas_df = pd.DataFrame([
+            {'id_pedido': 'P001', 'longitud_pieza_requerida': 4.4, 'cantidad_requerida': 6},
+            {'id_pedido': 'P002', 'longitud_pieza_requerida': 3.7, 'cantidad_requerida': 9},
+            {'id_pedido': 'P003', 'longitud_pieza_requerida': 2.6, 'cantidad_requerida': 5}
+        ])
+        self.barras = [{'longitud': 12.0, 'tipo': 'estandar'}]
+        self.config_ga = {
+            'tamaño_poblacion': 8,
+            'max_generaciones': 200,
+            'estrategia_inicializacion': 'hibrida',
+            'generaciones_sin_mejora_max': 1000,
+            'logging_habilitado': False
+        }
+    
+    def _cancelar_en_generacion(self, generacion, accion):
+        def callback(evento):
+            if evento['tipo'] == 'generacion' and evento['generacion'] == generacion:
+                accion()
+        return callback
+    
+    def test_cancelacion_entre_generaciones(self):
+        """El AG se detiene en la generación siguiente y retorna su mejor cromosoma."""
+        token = TokenCancelacion()
+        
+        mejor_cromosoma, estadisticas = ejecutar_algoritmo_genetico(
+            self.piezas_df, self.barras, [], self.config_ga,
+            callback_progreso=self._cancelar_en_generacion(3, token.cancelar),
+            token_cancelacion=token
+        )
+        
+        self.assertIsInstance(mejor_cromosoma, Cromosoma)
+        self.assertEqual(estadisticas['motivo_cancelacion'], 'cancelado')
+        self.assertLessEqual(estadisticas['generaciones_ejecutadas'], 4)
+    
+    def test_limite_tiempo_cpu(self):
+        """Superar el tiempo de CPU máximo detiene el AG con ese motivo."""
+        tiempo_cpu = [0.0]
+        with patch('genetic_algorithm.cancellation._medir_arbol_de_procesos', lambda pid_raiz: (tiempo_cpu[0], None)):
+            token = TokenCancelacion(limite_tiempo_cpu_segundos=5.0)
+            
+            def agotar_cpu():
+                tiempo_cpu[0] = 6.0
+            
+            _, estadisticas = ejecutar_algoritmo_genetico(
+                self.piezas_df, self.barras, [], self.config_ga,
+                callback_progreso=self._cancelar_en_generacion(2, agotar_cpu),
+                token_cancelacion=token
+            )
+        
+        self.assertEqual(estadisticas['motivo_cancelacion'], 'limite_tiempo_cpu')
+        self.assertLess(estadisticas['generaciones_ejecutadas'], self.config_ga['max_generaciones'])
+    
+    def test_cancelacion_durante_inicializacion(self):
+        """Sin población no hay resultado parcial: la inicialización lanza CancelacionSolicitada."""
+        with tempfile.TemporaryDirectory() as directorio:
+            ruta_senal = os.path.join(directorio, 'CANCELAR')
+            
+            # Otro token con el mismo archivo de señal (otro proceso) envía la cancelación
+            token = TokenCancelacion(ruta_senal=ruta_senal)
+            self.assertFalse(token.cancelado)
+            TokenCancelacion(ruta_senal=ruta_senal).cancelar('limite_memoria')
+            
+            with self.assertRaises(CancelacionSolicitada) as contexto:
+                inicializar_poblacion(
+                    tamaño_poblacion=8,
+                    piezas_requeridas_df=self.piezas_df,
+                    barras_estandar_disponibles=self.barras,
+                    desperdicios_reutilizables_previos=[],
+                    estrategia_inicializacion='aleatoria',
+                    token_cancelacion=token
+                )
+        
+        self.assertEqual(contexto.exception.motivo, 'limite_memoria')
+    
+    def _esperar_cancelacion(self, token, tiempo_maximo=20):
+        limite = time.time() + tiempo_maximo
+        while time.time() < limite and not token.cancelado:
+            time.sleep(0.05)
+        return token.motivo
+    
+    def test_limite_tiempo_cpu_incluye_procesos_hijos(self):
+        """El tiempo de CPU de un hijo vivo cuenta para el límite del proceso que consulta."""
+        token = TokenCancelacion(limite_tiempo_cpu_segundos=0.5)
+        proceso = multiprocessing.Process(target=_consumir_cpu, args=(30,), daemon=True)
+        proceso.start()
+        try:
+            self.assertEqual(self._esperar_cancelacion(token), 'limite_tiempo_cpu')
+            self.assertTrue(proceso.is_alive())
+        finally:
+            proceso.terminate()
+            proceso.join()
+    
+    def test_limite_memoria_incluye_procesos_hijos(self):
+        """La memoria residente de un hijo vivo cuenta para el límite del proceso que consulta."""
+        from genetic_algorithm.cancellation import _medir_arbol_de_procesos
+        token = TokenCancelacion(limite_memoria_mb=_medir_arbol_de_procesos(os.getpid())[1] + 150)
+        self.assertFalse(token.cancelado)
+        
+        reservada = multiprocessing.Event()
+        proceso = multiprocessing.Process(target=_reservar_memoria, args=(200, reservada), daemon=True)
+        proceso.start()
+        try:
+            self.assertTrue(reservada.wait(20))
+            self.assertEqual(self._esperar_cancelacion(token), 'limite_memoria')
+        finally:
+            proceso.terminate()
+            proceso.join()
+    
+    def test_limite_tiempo_cpu_compartido_entre_procesos(self):
+        """Un proceso que recibe el token mide el presupuesto de toda la ejecución, no uno propio."""
+        token = TokenCancelacion(limite_tiempo_cpu_segundos=0.3)
+        _consumir_cpu(0.5)
+        
+        with ProcessPoolExecutor(max_workers=1) as ejecutor:
+            cancelado, motivo = ejecutor.submit(_consultar_token, token).result()
+        
+        self.assertTrue(cancelado)
+        self.assertEqual(motivo, 'limite_tiempo_cpu')
+    
+    def test_medicion_de_procesos_limitada(self):
+        """Consultas seguidas del token reutilizan el último recorrido de /proc."""
+        token = TokenCancelacion(limite_tiempo_cpu_segundos=60, limite_memoria_mb=1e6)
+        with patch('genetic_algorithm.cancellation.os.listdir', wraps=os.listdir) as listdir:
+            for _ in range(100):
+                self.assertFalse(token.cancelado)
+        
+        self.assertLessEqual(listdir.call_count, 2)
+    
+    def test_limite_tiempo_cpu_en_modelo_islas(self):
+        """Las islas corren en procesos hijos y su tiempo de CPU detiene el modelo."""
+        config_islas = {
+            **self.config_ga,
+            'num_islas': 2,
+            'intervalo_migracion': 5,
+            'max_generaciones': 1000000,
+            'tiempo_limite_segundos': 60
+        }
+        token = TokenCancelacion(limite_tiempo_cpu_segundos=1.0)
+        
+        tiempo_inicio = time.time()
+        mejor_cromosoma, estadisticas = ejecutar_modelo_islas(
+            self.piezas_df, self.barras, [], config_islas, token_cancelacion=token
+        )
+        
+        self.assertIsInstance(mejor_cromosoma, Cromosoma)
+        self.assertEqual(estadisticas['motivo_cancelacion'], 'limite_tiempo_cpu')
+        self.assertLess(time.time() - tiempo_inicio, 30)
+    
+    def test_cancelacion_durante_inicializacion_de_islas(self):
+        """Una cancelación antes de que las islas tengan población lanza CancelacionSolicitada."""
+        with tempfile.TemporaryDirectory() as directorio:
+            ruta_senal = os.path.join(directorio, 'CANCELAR')
+            token = TokenCancelacion(ruta_senal=ruta_senal)
+            TokenCancelacion(ruta_senal=ruta_senal).cancelar('limite_memoria')
+            
+            with self.assertRaises(CancelacionSolicitada) as contexto:
+                ejecutar_modelo_islas(
+                    self.piezas_df, self.barras, [], {**self.config_ga, 'num_islas': 2},
+                    token_cancelacion=token
+                )
+        
+        self.assertEqual(contexto.exception.motivo, 'limite_memoria')
+    
+    def test_cancelacion_dentro_de_una_epoca_de_islas(self):
+        """Las islas consultan la señal entre generaciones sin esperar al fin de la época."""
+        config_islas = {
+            **self.config_ga,
+            'num_islas': 2,
+            'intervalo_migracion': 1000000,
+            'max_generaciones': 1000000,
+            'tiempo_limite_segundos': 60
+        }
+        with tempfile.TemporaryDirectory() as directorio:
+            ruta_senal = os.path.join(directorio, 'CANCELAR')
+            token = TokenCancelacion(ruta_senal=ruta_senal)
+            temporizador = threading.Timer(1.0, TokenCancelacion(ruta_senal=ruta_senal).cancelar)
+            temporizador.start()
+            
+            tiempo_inicio = time.time()
+            try:
+                mejor_cromosoma, estadisticas = ejecutar_modelo_islas(
+                    self.piezas_df, self.barras, [], config_islas, token_cancelacion=token
+                )
+            finally:
+                temporizador.cancel()
+        
+        self.assertIsInstance(mejor_cromosoma, Cromosoma)
+        self.assertEqual(estadisticas['motivo_cancelacion'], 'cancelado')
+        self.assertLess(time.time() - tiempo_inicio, 30)
+    
+    def test_limite_tiempo_dentro_de_una_epoca_de_islas(self):
+        """El plazo de tiempo se respeta aunque la época de migración sea más larga."""
+        config_islas = {
+            **self.config_ga,
+            'num_islas': 2,
+            'intervalo_migracion': 1000000,
+            'max_generaciones': 1000000,
+            'tiempo_limite_segundos': 1
+        }
+        
+        tiempo_inicio = time.time()
+        mejor_cromosoma, _ = ejecutar_modelo_islas(self.piezas_df, self.barras, [], config_islas)
+        
+        self.assertIsInstance(mejor_cromosoma, Cromosoma)
+        self.assertLess(time.time() - tiempo_inicio, 30)
+
+
 if __name__ == '__main__':
     unittest.main() 
\ No newline at end of file
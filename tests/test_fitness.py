@@ -2,12 +2,16 @@
 Tests unitarios para la función de fitness.
 """
 
+import random
 import unittest
+import numpy as np
 import pandas as pd
 
-from genetic_algorithm.chromosome import Patron, Cromosoma
+from genetic_algorithm.chromosome import Patron, Cromosoma, ResumenCromosoma
 from genetic_algorithm.fitness import (
     calcular_fitness,
+    calcular_fitness_poblacion,
+    CacheFitness,
     calcular_penalizacion_faltantes,
     calcular_penalizacion_sobrantes,
     calcular_penalizacion_barras_usadas,
@@ -15,6 +19,20 @@ from genetic_algorithm.fitness import (
     analizar_componentes_fitness,
     obtener_config_fitness_default
 )
+from genetic_algorithm.demand import DemandaCompilada, compilar_demanda
+from genetic_algorithm.chromosome_utils import calcular_firma_canonica
+from genetic_algorithm.population import (
+    inicializar_poblacion,
+    perturbar_individuo,
+    generar_individuo_heuristico_ffd,
+    generar_individuo_heuristico_bfd
+)
+from genetic_algorithm.lower_bound import calcular_cota_inferior
+from genetic_algorithm.exact_solver import resolver_exacto
+from genetic_algorithm.mutation import mutar
+from genetic_algorithm.input_adapter import adaptar_entrada_completa
+from genetic_algorithm.engine import ejecutar_algoritmo_genetico
+from genetic_algorithm.output_formatter import formatear_salida_desde_cromosoma
 
 
 class TestFitness(unittest.TestCase):
@@ -255,5 +273,333 @@ class TestFitness(unittest.TestCase):
         self.assertLess(fitness_faltantes_bajo, fitness_original)
 
 
+class TestDemandaCompilada(unittest.TestCase):
+    """Pruebas de la demanda precompilada usada por la función de fitness."""
+    
+    def setUp(self):
+        """Configuración inicial para las pruebas."""
+        self.piezas_requeridas_df = pd.DataFrame([
+            {'id_pedido': 'P001', 'longitud_pieza_requerida': 2.5, 'cantidad_requerida': 2},
+            {'id_pedido': 'P002', 'longitud_pieza_requerida': 1.0, 'cantidad_requerida': 3},
+            {'id_pedido': 'P002', 'longitud_pieza_requerida': 1.0, 'cantidad_requerida': 1}
+        ])
+    
+    def test_compilacion_acumula_claves_repetidas(self):
+        """Las claves repetidas comparten índice y suman su cantidad."""
+        demanda = DemandaCompilada.desde_dataframe(self.piezas_requeridas_df)
+        
+        self.assertEqual(demanda.num_tipos_demandados, 2)
+        self.assertEqual(demanda.cantidades_requeridas.tolist(), [2, 4])
+        self.assertEqual(demanda.buscar_indice('P002', 1.0), 1)
+    
+    def test_fitness_igual_con_dataframe_y_demanda_compilada(self):
+        """El fitness no depende de si la demanda llega como DataFrame o compilada."""
+        cromosoma = Cromosoma([
+            Patron(6.0, 'estandar', [
+                {'id_pedido': 'P001', 'longitud_pieza': 2.5, 'cantidad_pieza_en_patron': 1},
+                {'id_pedido': 'P002', 'longitud_pieza': 1.0, 'cantidad_pieza_en_patron': 3}
+            ]),
+            Patron(2.0, 'desperdicio', [
+                {'id_pedido': 'P999', 'longitud_pieza': 1.2, 'cantidad_pieza_en_patron': 1}
+            ])
+        ])
+        demanda = DemandaCompilada.desde_dataframe(self.piezas_requeridas_df)
+        
+        componentes_df = analizar_componentes_fitness(cromosoma, self.piezas_requeridas_df)
+        componentes_compilada = analizar_componentes_fitness(cromosoma, demanda)
+        
+        for clave, valor in componentes_df.items():
+            self.assertAlmostEqual(componentes_compilada[clave], valor, places=6)
+        # 1 pieza de 2.5 y 1 de 1.0 faltan; la pieza P999 no está en la demanda
+        self.assertAlmostEqual(componentes_compilada['penalizacion_faltantes'], 3.5 * 10000.0, places=6)
+        self.assertAlmostEqual(componentes_compilada['penalizacion_sobrantes'], 1.2 * 5000.0, places=6)
+        self.assertAlmostEqual(
+            calcular_fitness(cromosoma, demanda),
+            calcular_fitness(cromosoma, self.piezas_requeridas_df),
+            places=6
+        )
+
+
+    def test_fitness_poblacion_coincide_con_fitness_individual(self):
+        """La evaluación vectorizada reproduce calcular_fitness individuo a individuo."""
+        random.seed(7)
+        barras = [{'longitud': 6.0, 'tipo': 'estandar'}, {'longitud': 9.0, 'tipo': 'estandar'}]
+        desperdicios = [{'longitud': 3.2, 'tipo': 'desperdicio'}]
+        poblacion = inicializar_poblacion(
+            12, self.piezas_requeridas_df, barras, desperdicios, 'aleatoria'
+        )
+        # Un individuo con una pieza fuera de la demanda y otro vacío
+        poblacion.append(Cromosoma([
+            Patron(6.0, 'estandar', [
+                {'id_pedido': 'P999', 'longitud_pieza': 1.2, 'cantidad_pieza_en_patron': 2}
+            ])
+        ]))
+        poblacion.append(Cromosoma())
+        demanda = DemandaCompilada.desde_dataframe(self.piezas_requeridas_df)
+        
+        esperados = [calcular_fitness(c, self.piezas_requeridas_df) for c in poblacion]
+        self.assertEqual(calcular_fitness_poblacion(poblacion, demanda), esperados)
+        self.assertEqual(calcular_fitness_poblacion([], demanda), [])
+
+
+class TestResumenIncremental(unittest.TestCase):
+    """Pruebas del resumen de piezas mantenido de forma incremental."""
+    
+    def setUp(self):
+        """Configuración inicial para las pruebas."""
+        self.piezas_requeridas_df = pd.DataFrame([
+            {'id_pedido': 'P001', 'longitud_pieza_requerida': 2.5, 'cantidad_requerida': 3},
+            {'id_pedido': 'P002', 'longitud_pieza_requerida': 1.2, 'cantidad_requerida': 4},
+            {'id_pedido': 'P003', 'longitud_pieza_requerida': 0.7, 'cantidad_requerida': 5}
+        ])
+        self.barras = [{'longitud': 6.0, 'tipo': 'estandar'}, {'longitud': 9.0, 'tipo': 'estandar'}]
+        self.desperdicios = [{'longitud': 3.2, 'tipo': 'desperdicio'}]
+    
+    def assertResumenCoincide(self, cromosoma):
+        """Compara el resumen en caché con un recálculo completo."""
+        resumen = cromosoma.resumen_en_cache
+        self.assertIsNotNone(resumen)
+        completo = ResumenCromosoma.desde_patrones(cromosoma.patrones)
+        self.assertEqual(resumen.conteos_piezas, completo.conteos_piezas)
+        self.assertEqual(resumen.desperdicio_mm, completo.desperdicio_mm)
+        self.assertEqual(resumen.num_barras_estandar, completo.num_barras_estandar)
+        self.assertEqual(resumen.longitud_desperdicios_usados_mm, completo.longitud_desperdicios_usados_mm)
+    
+    def test_mutaciones_mantienen_el_resumen(self):
+        """Los operadores actualizan el resumen sin recalcularlo y el fitness no cambia."""
+        random.seed(11)
+        config = {'operaciones_mutacion': [
+            'cambiar_origen', 'reoptimizar', 'mover_pieza',
+            'ajustar_cantidad', 'dividir_patron', 'combinar_patrones'
+        ]}
+        poblacion = inicializar_poblacion(
+            8, self.piezas_requeridas_df, self.barras, self.desperdicios, 'aleatoria'
+        )
+        
+        for cromosoma in poblacion:
+            calcular_fitness(cromosoma, self.piezas_requeridas_df)
+            for _ in range(20):
+                cromosoma = mutar(
+                    cromosoma, self.piezas_requeridas_df, self.barras, self.desperdicios,
+                    tasa_mutacion_individuo=1.0, tasa_mutacion_gen=0.8, config_ga=config
+                )
+                cromosoma = perturbar_individuo(cromosoma)
+                self.assertResumenCoincide(cromosoma)
+                self.assertEqual(
+                    calcular_fitness(cromosoma, self.piezas_requeridas_df),
+                    calcular_fitness(Cromosoma(list(cromosoma.patrones)), self.piezas_requeridas_df)
+                )
+    
+    def test_edicion_directa_invalida_el_resumen(self):
+        """Modificar un patrón con patron_mutable descarta el resumen en caché."""
+        cromosoma = Cromosoma([
+            Patron(6.0, 'estandar', [
+                {'id_pedido': 'P001', 'longitud_pieza': 2.5, 'cantidad_pieza_en_patron': 2}
+            ])
+        ])
+        self.assertEqual(cromosoma.obtener_resumen().conteos_piezas, {('P001', 2.5): 2})
+        
+        cromosoma.patron_mutable(0).agregar_pieza('P002', 1.0)
+        
+        self.assertIsNone(cromosoma.resumen_en_cache)
+        self.assertEqual(cromosoma.obtener_resumen().conteos_piezas, {('P001', 2.5): 2, ('P002', 1.0): 1})
+
+
+class TestCacheFitness(unittest.TestCase):
+    """Pruebas de la firma canónica y la caché LRU de fitness."""
+    
+    def setUp(self):
+        """Configuración inicial para las pruebas."""
+        self.piezas_requeridas_df = pd.DataFrame([
+            {'id_pedido': 'P001', 'longitud_pieza_requerida': 2.5, 'cantidad_requerida': 2},
+            {'id_pedido': 'P002', 'longitud_pieza_requerida': 1.0, 'cantidad_requerida': 3}
+        ])
+        self.patron_a = Patron(6.0, 'estandar', [
+            {'id_pedido': 'P001', 'longitud_pieza': 2.5, 'cantidad_pieza_en_patron': 2},
+            {'id_pedido': 'P002', 'longitud_pieza': 1.0, 'cantidad_pieza_en_patron': 1}
+        ])
+        self.patron_b = Patron(3.0, 'desperdicio', [
+            {'id_pedido': 'P002', 'longitud_pieza': 1.0, 'cantidad_pieza_en_patron': 2}
+        ])
+    
+    def test_firma_independiente_del_orden(self):
+        """La firma no depende del orden de patrones ni de piezas."""
+        patron_a_reordenado = Patron(6.0, 'estandar', [
+            {'id_pedido': 'P002', 'longitud_pieza': 1.0, 'cantidad_pieza_en_patron': 1},
+            {'id_pedido': 'P001', 'longitud_pieza': 2.5, 'cantidad_pieza_en_patron': 1},
+            {'id_pedido': 'P001', 'longitud_pieza': 2.5, 'cantidad_pieza_en_patron': 1}
+        ])
+        firma = calcular_firma_canonica(Cromosoma([self.patron_a, self.patron_b]))
+        
+        self.assertEqual(firma, calcular_firma_canonica(Cromosoma([self.patron_b, patron_a_reordenado])))
+        self.assertNotEqual(firma, calcular_firma_canonica(Cromosoma([self.patron_a])))
+    
+    def test_cache_lru_y_contadores(self):
+        """La caché reutiliza valores, cuenta aciertos y descarta el menos usado."""
+        cache = CacheFitness(capacidad=1)
+        cromosoma = Cromosoma([self.patron_a, self.patron_b])
+        otro = Cromosoma([self.patron_a])
+        
+        valores = cache.evaluar_poblacion([cromosoma, cromosoma.clonar()], self.piezas_requeridas_df)
+        
+        self.assertEqual(valores, [calcular_fitness(cromosoma, self.piezas_requeridas_df)] * 2)
+        self.assertEqual((cache.aciertos, cache.fallos), (1, 1))
+        
+        cache.evaluar_poblacion([otro], self.piezas_requeridas_df)
+        self.assertEqual(len(cache), 1)
+        self.assertIsNone(cache.obtener(calcular_firma_canonica(cromosoma)))
+        self.assertEqual((cache.aciertos, cache.fallos), (1, 3))
+
+
+class TestAritmeticaEntera(unittest.TestCase):
+    """Pruebas para el modo de aritmética entera en milímetros."""
+    
+    def setUp(self):
+        """Configuración inicial para las pruebas."""
+        self.piezas_df = pd.DataFrame([
+            {'id_pedido': 'P001', 'longitud_pieza_requerida': 2.5, 'cantidad_requerida': 2},
+            {'id_pedido': 'P002', 'longitud_pieza_requerida': 1.0, 'cantidad_requerida': 3}
+        ])
+    
+    def test_patron_en_milimetros(self):
+        """El desperdicio en milímetros es exacto y usa el umbral en milímetros."""
+        patron = Patron(6000, 'estandar', [
+            {'id_pedido': 'P001', 'longitud_pieza': 2500, 'cantidad_pieza_en_patron': 2},
+            {'id_pedido': 'P002', 'longitud_pieza': 1000, 'cantidad_pieza_en_patron': 0}
+        ], en_milimetros=True)
+        self.assertEqual(patron.desperdicio_patron_longitud, 1000)
+        self.assertIsInstance(patron.desperdicio_patron_longitud, int)
+        self.assertTrue(patron.es_desperdicio_utilizable)
+        
+        patron_corto = Patron(2900, 'desperdicio', [
+            {'id_pedido': 'P001', 'longitud_pieza': 2500, 'cantidad_pieza_en_patron': 1}
+        ], en_milimetros=True)
+        self.assertEqual(patron_corto.desperdicio_patron_longitud, 400)
+        self.assertFalse(patron_corto.es_desperdicio_utilizable)
+    
+    def test_fitness_equivalente_en_metros_y_milimetros(self):
+        """El fitness no depende de la unidad en que se expresan las longitudes."""
+        piezas_mm, _, _, _ = adaptar_entrada_completa(self.piezas_df, [6.0], [3.0], aritmetica_entera=True)
+        
+        cromosoma_m = Cromosoma([
+            Patron(6.0, 'estandar', [
+                {'id_pedido': 'P001', 'longitud_pieza': 2.5, 'cantidad_pieza_en_patron': 2},
+                {'id_pedido': 'P002', 'longitud_pieza': 1.0, 'cantidad_pieza_en_patron': 1}
+            ]),
+            Patron(3.0, 'desperdicio', [
+                {'id_pedido': 'P002', 'longitud_pieza': 1.0, 'cantidad_pieza_en_patron': 1}
+            ])
+        ])
+        cromosoma_mm = Cromosoma([
+            Patron(6000, 'estandar', [
+                {'id_pedido': 'P001', 'longitud_pieza': 2500, 'cantidad_pieza_en_patron': 2},
+                {'id_pedido': 'P002', 'longitud_pieza': 1000, 'cantidad_pieza_en_patron': 1}
+            ], en_milimetros=True),
+            Patron(3000, 'desperdicio', [
+                {'id_pedido': 'P002', 'longitud_pieza': 1000, 'cantidad_pieza_en_patron': 1}
+            ], en_milimetros=True)
+        ])
+        
+        self.assertAlmostEqual(
+            calcular_fitness(cromosoma_mm, piezas_mm),
+            calcular_fitness(cromosoma_m, self.piezas_df),
+            places=6
+        )
+    
+    def test_flujo_completo_en_milimetros(self):
+        """Con aritmética entera el AG trabaja en milímetros y la salida vuelve a metros."""
+        piezas_mm, barras_mm, desperdicios_mm, resumen = adaptar_entrada_completa(
+            self.piezas_df, [6.0, 12.0], [3.0], aritmetica_entera=True
+        )
+        
+        self.assertEqual(sorted(barra['longitud'] for barra in barras_mm), [6000, 12000])
+        self.assertEqual(desperdicios_mm[0]['longitud'], 3000)
+        self.assertEqual(sorted(piezas_mm['longitud_pieza_requerida'].tolist()), [1000, 2500])
+        
+        mejor_cromosoma, _ = ejecutar_algoritmo_genetico(piezas_mm, barras_mm, desperdicios_mm, {
+            'tamaño_poblacion': 6,
+            'max_generaciones': 3,
+            'tamaño_elite': 1,
+            'logging_habilitado': False
+        })
+        patrones, desperdicios = formatear_salida_desde_cromosoma(mejor_cromosoma)
+        
+        for patron in patrones:
+            self.assertIn(patron['barra_origen_longitud'], (3.0, 6.0, 12.0))
+            for corte in patron['cortes_realizados']:
+                self.assertIn(corte, (1.0, 2.5))
+        for desperdicio in desperdicios:
+            self.assertLess(desperdicio, 12.0)
+    
+    def test_longitudes_enteras_en_metros(self):
+        """Sin aritmética entera, las longitudes enteras (int64 de un CSV) siguen en metros."""
+        piezas_df = pd.DataFrame({
+            'id_pedido': ['P001', 'P002'],
+            'longitud_pieza_requerida': pd.Series([3, 5], dtype='int64'),
+            'cantidad_requerida': [4, 2]
+        })
+        
+        piezas, barras, desperdicios, _ = adaptar_entrada_completa(piezas_df, [6, 12], [3])
+        
+        self.assertEqual(piezas['longitud_pieza_requerida'].dtype, float)
+        self.assertEqual([type(barra['longitud']) for barra in barras], [float, float])
+        self.assertIsInstance(desperdicios[0]['longitud'], float)
+        
+        mejor_cromosoma, _ = ejecutar_algoritmo_genetico(piezas, barras, desperdicios, {
+            'tamaño_poblacion': 6,
+            'max_generaciones': 3,
+            'tamaño_elite': 1,
+            'logging_habilitado': False
+        })
+        patrones, _ = formatear_salida_desde_cromosoma(mejor_cromosoma)
+        
+        cortes = sorted(corte for patron in patrones for corte in patron['cortes_realizados'])
+        self.assertEqual(cortes, [3.0] * 4 + [5.0] * 2)
+        
+        # Un desperdicio de 3 m es reutilizable
+        patron = Patron(3.0, 'desperdicio', [])
+        self.assertTrue(patron.es_desperdicio_utilizable)
+    
+    def test_api_publica_con_metros_enteros(self):
+        """La API pública acepta longitudes enteras en metros sin tratarlas como milímetros."""
+        patron = Patron(6, 'desperdicio', [
+            {'id_pedido': 'a', 'longitud_pieza': 2, 'cantidad_pieza_en_patron': 1}
+        ])
+        self.assertEqual(patron.desperdicio_patron_longitud, 4)
+        self.assertTrue(patron.es_desperdicio_utilizable)
+        
+        patron_numpy = Patron(np.int64(6), 'estandar', [
+            {'id_pedido': 'a', 'longitud_pieza': np.int64(5), 'cantidad_pieza_en_patron': 1}
+        ])
+        self.assertTrue(patron_numpy.es_desperdicio_utilizable)
+        
+        piezas_df = pd.DataFrame({
+            'id_pedido': ['P001', 'P002'],
+            'longitud_pieza_requerida': [3, 5],
+            'cantidad_requerida': [4, 2]
+        })
+        barras = [{'longitud': 6, 'tipo': 'estandar'}, {'longitud': 12, 'tipo': 'estandar'}]
+        desperdicios = [{'longitud': 3, 'tipo': 'desperdicio'}]
+        
+        for generador in (generar_individuo_heuristico_ffd, generar_individuo_heuristico_bfd):
+            cromosoma = generador(piezas_df, barras, desperdicios)
+            self.assertEqual(
+                cromosoma.calcular_desperdicio_total(),
+                sum(patron.desperdicio_patron_longitud for patron in cromosoma.patrones)
+            )
+            self.assertLess(cromosoma.calcular_desperdicio_total(), 20)
+        
+        cota = calcular_cota_inferior(compilar_demanda(piezas_df), barras, desperdicios)
+        self.assertEqual(cota['longitud_minima_mm'], 24000)
+        
+        exacto = resolver_exacto(piezas_df, barras, desperdicios)
+        self.assertIsNotNone(exacto)
+        self.assertEqual(
+            sum(patron.origen_barra_longitud for patron in exacto.patrones
+                if patron.origen_barra_tipo == 'estandar'),
+            24
+        )
+
+
 if __name__ == '__main__':
     unittest.main() 
\ No newline at end of file
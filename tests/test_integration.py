@@ -9,13 +9,16 @@ import unittest
 import pandas as pd
 import tempfile
 import json
+import io
 import os
+import time
 from unittest.mock import patch
 
 # Importar módulos del sistema
 import sys
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
+import main
 from main import (
     algoritmo_optimizacion_corte,
     consolidar_desperdicios,
@@ -23,10 +26,13 @@ from main import (
     generar_metricas_desperdicios,
     cargar_cartilla_acero,
     cargar_barras_estandar,
+    procesar_cartilla,
+    procesar_cartilla_con_plazo,
     _algoritmo_respaldo_ffd
 )
 from genetic_algorithm.output_formatter import formatear_salida_desde_cromosoma
 from genetic_algorithm.input_adapter import adaptar_entrada_completa
+from genetic_algorithm.cancellation import TokenCancelacion
 
 
 class TestIntegracionCompleta(unittest.TestCase):
@@ -209,6 +215,334 @@ class TestIntegracionCompleta(unittest.TestCase):
         self.assertGreater(metricas['eficiencia_global'], 0)
         self.assertLessEqual(metricas['eficiencia_global'], 100)
 
+    
+    def test_procesar_cartilla_paralela_por_diametro(self):
+        """Test del procesamiento de diámetros en procesos separados."""
+        cartilla_df = pd.DataFrame([
+            {'id_pedido': f'P{i}', 'numero_barra': numero_barra, 'longitud_pieza_requerida': 1.2 + 0.4 * i,
+             'cantidad_requerida': 2, 'grupo_ejecucion': grupo}
+            for numero_barra in ['#4', '#3'] for grupo in [1, 2] for i in range(3)
+        ])
+        barras_estandar_dict = {'#3': [6.0, 9.0], '#4': [6.0, 12.0], '#5': [9.0]}
+        
+        resultados_secuencial, desperdicios_secuencial = procesar_cartilla(
+            cartilla_df, barras_estandar_dict, self.config_test, paralelo=False, verbose=False
+        )
+        resultados_paralelo, desperdicios_paralelo = procesar_cartilla(
+            cartilla_df, barras_estandar_dict, self.config_test, paralelo=True, num_trabajadores=2, verbose=False
+        )
+        
+        # Los resultados se combinan en el orden de los números de barra de la cartilla
+        orden_secuencial = list(dict.fromkeys((r['numero_barra'], r['grupo_ejecucion']) for r in resultados_secuencial))
+        orden_paralelo = list(dict.fromkeys((r['numero_barra'], r['grupo_ejecucion']) for r in resultados_paralelo))
+        self.assertEqual(orden_paralelo, orden_secuencial)
+        self.assertEqual(orden_paralelo[0][0], '#4')
+        self.assertEqual(list(desperdicios_paralelo.keys()), list(desperdicios_secuencial.keys()))
+        self.assertEqual(desperdicios_paralelo['#5'], [])
+    
+    def test_procesar_cartilla_eventos_de_progreso(self):
+        """Los eventos de progreso identifican su subproblema, también en modo paralelo."""
+        cartilla_df = pd.DataFrame([
+            {'id_pedido': f'P{i}', 'numero_barra': numero_barra, 'longitud_pieza_requerida': 1.2 + 0.4 * i,
+             'cantidad_requerida': 12, 'grupo_ejecucion': grupo}
+            for numero_barra in ['#4', '#3'] for grupo in [1, 2] for i in range(3)
+        ])
+        barras_estandar_dict = {'#3': [6.0, 9.0], '#4': [6.0, 12.0]}
+        
+        for paralelo in (False, True):
+            with self.subTest(paralelo=paralelo):
+                eventos = []
+                procesar_cartilla(cartilla_df, barras_estandar_dict, self.config_test,
+                                  paralelo=paralelo, num_trabajadores=2, verbose=False,
+                                  callback_progreso=eventos.append)
+                
+                subproblemas = {(e['numero_barra'], e['grupo_ejecucion']) for e in eventos}
+                self.assertEqual(subproblemas, {('#4', 1), ('#4', 2), ('#3', 1), ('#3', 2)})
+                tipos = [e['tipo'] for e in eventos]
+                self.assertEqual(tipos.count('inicio_subproblema'), 4)
+                self.assertEqual(tipos.count('fin_subproblema'), 4)
+                self.assertIn('generacion', tipos)
+    
+    def test_procesar_cartilla_reanuda_desde_checkpoint(self):
+        """Una cartilla interrumpida se reanuda sin repetir los grupos ya completados."""
+        cartilla_df = pd.DataFrame([
+            {'id_pedido': f'P{grupo}{i}', 'numero_barra': '#4', 'longitud_pieza_requerida': 1.2 + 0.4 * i,
+             'cantidad_requerida': 2, 'grupo_ejecucion': grupo}
+            for grupo in [1, 2, 3] for i in range(3)
+        ])
+        barras_estandar_dict = {'#4': [6.0, 12.0]}
+        
+        import main
+        funcion_original = main.algoritmo_optimizacion_corte
+        grupos_optimizados = []
+        
+        def algoritmo_que_falla_en_grupo_3(piezas_df, *args, **kwargs):
+            grupo = piezas_df['id_pedido'].iloc[0][1]
+            if grupo == '3' and len(grupos_optimizados) < 3:
+                grupos_optimizados.append(grupo)
+                raise RuntimeError("Interrupción simulada")
+            grupos_optimizados.append(grupo)
+            return funcion_original(piezas_df, *args, **kwargs)
+        
+        with tempfile.TemporaryDirectory() as directorio:
+            with patch('main.algoritmo_optimizacion_corte', side_effect=algoritmo_que_falla_en_grupo_3):
+                with self.assertRaises(RuntimeError):
+                    procesar_cartilla(cartilla_df, barras_estandar_dict, self.config_test,
+                                      verbose=False, directorio_checkpoints=directorio)
+                self.assertTrue(os.path.exists(os.path.join(directorio, 'barra_#4.ckpt')))
+                
+                resultados, desperdicios = procesar_cartilla(
+                    cartilla_df, barras_estandar_dict, self.config_test,
+                    verbose=False, directorio_checkpoints=directorio
+                )
+            
+            # Solo el grupo interrumpido se vuelve a optimizar
+            self.assertEqual(grupos_optimizados, ['1', '2', '3', '3'])
+            self.assertEqual(sorted({r['grupo_ejecucion'] for r in resultados}), [1, 2, 3])
+            self.assertFalse(os.path.exists(os.path.join(directorio, 'barra_#4.ckpt')))
+
+    
+    def test_procesar_cartilla_con_presupuesto(self):
+        """El presupuesto se reparte entre los subproblemas según su dificultad."""
+        cartilla_df = pd.DataFrame(
+            [{'id_pedido': f'T{i}', 'numero_barra': '#4', 'longitud_pieza_requerida': longitud,
+              'cantidad_requerida': cantidad, 'grupo_ejecucion': 1}
+             for i, (longitud, cantidad) in enumerate([(3.0, 8), (2.0, 6)])] +
+            [{'id_pedido': f'D{i}', 'numero_barra': '#4', 'longitud_pieza_requerida': longitud,
+              'cantidad_requerida': cantidad, 'grupo_ejecucion': 2}
+             for i, (longitud, cantidad) in enumerate([(4.4, 6), (3.7, 9), (2.6, 5), (1.9, 4)])]
+        )
+        barras_estandar_dict = {'#4': [12.0]}
+        
+        import main
+        funcion_original = main.algoritmo_optimizacion_corte
+        configuraciones = []
+        
+        def algoritmo_registrado(piezas_df, *args, config_algoritmo=None, **kwargs):
+            configuraciones.append(config_algoritmo['parametros'])
+            return funcion_original(piezas_df, *args, config_algoritmo=config_algoritmo, **kwargs)
+        
+        with patch('main.algoritmo_optimizacion_corte', side_effect=algoritmo_registrado):
+            resultados, _ = procesar_cartilla(
+                cartilla_df, barras_estandar_dict, self.config_test,
+                verbose=False, presupuesto_segundos=4.0
+            )
+        
+        trivial, dificil = configuraciones
+        self.assertLess(trivial['tiempo_limite_segundos'], dificil['tiempo_limite_segundos'])
+        self.assertAlmostEqual(trivial['tiempo_limite_segundos'] + dificil['tiempo_limite_segundos'], 4.0)
+        self.assertEqual(trivial['num_islas'], 1)
+        self.assertEqual(sorted({r['grupo_ejecucion'] for r in resultados}), [1, 2])
+
+    
+    def test_procesar_cartilla_con_plazo_global(self):
+        """El modo anytime entrega un plan completo dentro del plazo global."""
+        cartilla_df = pd.DataFrame([
+            {'id_pedido': f'P{grupo}{i}', 'numero_barra': numero_barra, 'longitud_pieza_requerida': 1.3 + 0.7 * i,
+             'cantidad_requerida': 9, 'grupo_ejecucion': grupo}
+            for numero_barra in ['#4', '#3'] for grupo in [1, 2] for i in range(4)
+        ])
+        barras_estandar_dict = {'#3': [6.0, 9.0], '#4': [6.0, 12.0], '#5': [9.0]}
+        
+        eventos = []
+        tiempo_inicio = time.time()
+        resultados, desperdicios = procesar_cartilla_con_plazo(
+            cartilla_df, barras_estandar_dict, 3.0, self.config_test,
+            verbose=False, callback_progreso=eventos.append
+        )
+        tiempo_total = time.time() - tiempo_inicio
+        
+        self.assertLess(tiempo_total, 4.0)
+        self.assertEqual(list(desperdicios.keys()), ['#3', '#4', '#5'])
+        
+        # Cada subproblema recibe exactamente sus piezas
+        for (numero_barra, grupo), filas in cartilla_df.groupby(['numero_barra', 'grupo_ejecucion']):
+            obtenidas = sum(
+                len(r['piezas_obtenidas']) for r in resultados
+                if r['numero_barra'] == numero_barra and r['grupo_ejecucion'] == grupo
+            )
+            self.assertEqual(obtenidas, filas['cantidad_requerida'].sum())
+        
+        # Las mejoras aceptadas nunca empeoran el plan inicial
+        longitudes = [e['longitud_estandar_total'] for e in eventos]
+        self.assertEqual(eventos[0]['tipo'], 'plan_inicial')
+        self.assertEqual(longitudes, sorted(longitudes, reverse=True))
+    
+    def test_limite_de_cpu_en_diametros_paralelos(self):
+        """El presupuesto de CPU es de toda la cartilla y el motivo llega al token del llamador."""
+        cartilla_df = pd.DataFrame([
+            {'id_pedido': f'P{barra}{i}', 'numero_barra': barra, 'longitud_pieza_requerida': 1.2 + 0.4 * i,
+             'cantidad_requerida': 2, 'grupo_ejecucion': 1}
+            for barra in ['#4', '#5'] for i in range(3)
+        ])
+        barras_estandar_dict = {'#4': [6.0, 12.0], '#5': [6.0, 12.0]}
+        token = TokenCancelacion(limite_tiempo_cpu_segundos=0.2)
+        tiempo_inicio = time.process_time()
+        while time.process_time() - tiempo_inicio < 0.3:
+            pass
+        
+        procesar_cartilla(cartilla_df, barras_estandar_dict, self.config_test,
+                          paralelo=True, verbose=False, token_cancelacion=token)
+        
+        self.assertEqual(token.motivo, 'limite_tiempo_cpu')
+    
+    def test_procesar_cartilla_cancelada(self):
+        """Una cartilla cancelada retorna los grupos resueltos y conserva el checkpoint."""
+        cartilla_df = pd.DataFrame([
+            {'id_pedido': f'P{grupo}{i}', 'numero_barra': '#4', 'longitud_pieza_requerida': 1.2 + 0.4 * i,
+             'cantidad_requerida': 2, 'grupo_ejecucion': grupo}
+            for grupo in [1, 2, 3] for i in range(3)
+        ])
+        barras_estandar_dict = {'#4': [6.0, 12.0]}
+        token = TokenCancelacion()
+        
+        import main
+        funcion_original = main.algoritmo_optimizacion_corte
+        grupos_optimizados = []
+        
+        def algoritmo_que_cancela_en_grupo_2(piezas_df, *args, **kwargs):
+            grupo = piezas_df['id_pedido'].iloc[0][1]
+            grupos_optimizados.append(grupo)
+            resultado = funcion_original(piezas_df, *args, **kwargs)
+            if grupo == '2' and len(grupos_optimizados) == 2:
+                token.cancelar()
+            return resultado
+        
+        with tempfile.TemporaryDirectory() as directorio:
+            with patch('main.algoritmo_optimizacion_corte', side_effect=algoritmo_que_cancela_en_grupo_2):
+                resultados, _ = procesar_cartilla(
+                    cartilla_df, barras_estandar_dict, self.config_test,
+                    verbose=False, directorio_checkpoints=directorio, token_cancelacion=token
+                )
+                
+                # El plan parcial del grupo 2 se retorna, pero el checkpoint solo tiene el grupo 1
+                self.assertEqual(sorted({r['grupo_ejecucion'] for r in resultados}), [1, 2])
+                self.assertTrue(os.path.exists(os.path.join(directorio, 'barra_#4.ckpt')))
+                
+                # Sin cancelación, la cartilla se completa desde el checkpoint
+                resultados, _ = procesar_cartilla(
+                    cartilla_df, barras_estandar_dict, self.config_test,
+                    verbose=False, directorio_checkpoints=directorio
+                )
+            self.assertEqual(grupos_optimizados, ['1', '2', '2', '3'])
+            self.assertEqual(sorted({r['grupo_ejecucion'] for r in resultados}), [1, 2, 3])
+        
+        # Cancelada tras el plan inicial, el modo anytime no mejora el plan heurístico
+        token = TokenCancelacion()
+        eventos = []
+        
+        def cancelar_tras_plan_inicial(evento):
+            eventos.append(evento)
+            token.cancelar()
+        
+        resultados, _ = procesar_cartilla_con_plazo(
+            cartilla_df, barras_estandar_dict, 30.0, self.config_test, verbose=False,
+            callback_progreso=cancelar_tras_plan_inicial, token_cancelacion=token
+        )
+        self.assertEqual([e['tipo'] for e in eventos], ['plan_inicial'])
+        self.assertEqual(sorted({r['grupo_ejecucion'] for r in resultados}), [1, 2, 3])
+        
+        # Cancelada desde el inicio, no se resuelve ningún grupo
+        resultados, _ = procesar_cartilla_con_plazo(
+            cartilla_df, barras_estandar_dict, 30.0, self.config_test, verbose=False,
+            token_cancelacion=token
+        )
+        self.assertEqual(resultados, [])
+    
+    def test_plazo_global_con_piezas_que_no_caben(self):
+        """Una pieza más larga que toda barra queda sin cortar, como en el modo sin plazo."""
+        cartilla_df = pd.DataFrame([
+            {'id_pedido': 'P1', 'numero_barra': '#4', 'longitud_pieza_requerida': 13.0,
+             'cantidad_requerida': 1, 'grupo_ejecucion': 1},
+            {'id_pedido': 'P2', 'numero_barra': '#4', 'longitud_pieza_requerida': 4.0,
+             'cantidad_requerida': 3, 'grupo_ejecucion': 1}
+        ])
+        barras_estandar_dict = {'#4': [6.0, 12.0]}
+        
+        for resultados, _ in (
+            procesar_cartilla(cartilla_df, barras_estandar_dict, self.config_test, verbose=False),
+            procesar_cartilla_con_plazo(cartilla_df, barras_estandar_dict, 2.0, self.config_test, verbose=False)
+        ):
+            piezas = [pieza['id_pedido'] for r in resultados for pieza in r['piezas_obtenidas']]
+            self.assertEqual(piezas, ['P2', 'P2', 'P2'])
+    
+    def test_plazo_global_vencido_durante_el_plan_inicial(self):
+        """El plazo se respeta también en el plan inicial, que retorna los grupos resueltos."""
+        cartilla_df = pd.DataFrame([
+            {'id_pedido': f'P{grupo}{i}', 'numero_barra': '#4', 'longitud_pieza_requerida': 1.2 + 0.4 * i,
+             'cantidad_requerida': 2, 'grupo_ejecucion': grupo}
+            for grupo in range(1, 11) for i in range(3)
+        ])
+        
+        import main
+        funcion_original = main._resolver_subproblema_con_plazo
+        
+        def resolver_lento(*args, **kwargs):
+            time.sleep(0.2)
+            return funcion_original(*args, **kwargs)
+        
+        tiempo_inicio = time.time()
+        with patch('main._resolver_subproblema_con_plazo', side_effect=resolver_lento), \
+                patch('main.calcular_cota_inferior') as cota_inferior:
+            resultados, _ = procesar_cartilla_con_plazo(
+                cartilla_df, {'#4': [6.0, 12.0]}, 0.5, self.config_test, verbose=False
+            )
+        
+        self.assertLess(time.time() - tiempo_inicio, 1.5)
+        grupos = sorted({r['grupo_ejecucion'] for r in resultados})
+        self.assertGreater(len(grupos), 0)
+        self.assertEqual(grupos, list(range(1, len(grupos) + 1)))
+        self.assertLess(len(grupos), 10)
+        # Sin tiempo para mejorar, la cota de Gilmore–Gomory no se calcula
+        cota_inferior.assert_not_called()
+
+
+
+class TestCancelacionUpload(unittest.TestCase):
+    """Pruebas del registro de ids con que se cancela un /upload."""
+    
+    def setUp(self):
+        """Registro de uploads en un directorio temporal."""
+        self.directorio = tempfile.TemporaryDirectory()
+        parche = patch('main.DIRECTORIO_UPLOADS', self.directorio.name)
+        parche.start()
+        self.addCleanup(parche.stop)
+        self.addCleanup(self.directorio.cleanup)
+        self.cliente = main.app.test_client()
+    
+    def test_id_desconocido(self):
+        """Un id que el servidor no emitió no se puede cancelar ni deja archivos de señal."""
+        self.assertEqual(self.cliente.post('/upload/desconocido/cancel').status_code, 404)
+        self.assertEqual(self.cliente.post('/upload/..%2Fotro/cancel').status_code, 404)
+        self.assertEqual(os.listdir(self.directorio.name), [])
+        
+        respuesta = self.cliente.post('/upload', data={'file': (io.BytesIO(b'x'), 'cartilla.csv'),
+                                                       'id_trabajo': 'desconocido'})
+        self.assertEqual(respuesta.status_code, 404)
+    
+    def test_ciclo_de_vida_del_id(self):
+        """El id sirve para un solo upload y una señal antigua no cancela el upload que empieza."""
+        respuesta = self.cliente.post('/upload/id-trabajo')
+        self.assertEqual(respuesta.status_code, 201)
+        id_trabajo = respuesta.get_json()['id_trabajo']
+        
+        # Reservado pero sin empezar: todavía no hay nada que cancelar
+        self.assertEqual(self.cliente.post(f'/upload/{id_trabajo}/cancel').status_code, 404)
+        
+        ruta_senal = os.path.join(self.directorio.name, f'{id_trabajo}.cancelar')
+        with open(ruta_senal, 'w', encoding='utf-8') as archivo:
+            archivo.write('cancelado')
+        self.assertTrue(main._iniciar_upload(id_trabajo))
+        self.assertFalse(os.path.exists(ruta_senal))
+        self.assertFalse(main._iniciar_upload(id_trabajo))
+        
+        respuesta = self.cliente.post(f'/upload/{id_trabajo}/cancel')
+        self.assertEqual(respuesta.status_code, 202)
+        self.assertTrue(TokenCancelacion(ruta_senal=ruta_senal).cancelado)
+        
+        main._finalizar_upload(id_trabajo)
+        self.assertEqual(os.listdir(self.directorio.name), [])
+        self.assertEqual(self.cliente.post(f'/upload/{id_trabajo}/cancel').status_code, 404)
 
 class TestCargaDatos(unittest.TestCase):
     """Tests para las funciones de carga de datos."""
@@ -3,15 +3,23 @@ Tests unitarios para los operadores genéticos.
 """
 
 import unittest
+from unittest.mock import patch
 import pandas as pd
 import random
+from itertools import product
 
 from genetic_algorithm.chromosome import Patron, Cromosoma
 from genetic_algorithm.population import (
     inicializar_poblacion,
     generar_individuo_heuristico_ffd,
     generar_individuo_heuristico_bfd,
-    generar_individuo_aleatorio_con_reparacion
+    generar_individuo_aleatorio_con_reparacion,
+    reparar_cromosoma,
+    perturbar_individuo
+)
+from genetic_algorithm.chromosome_utils import (
+    calcular_sumario_piezas_en_cromosoma,
+    validar_cromosoma_completitud
 )
 from genetic_algorithm.selection import (
     seleccionar_padres,
@@ -32,6 +40,9 @@ from genetic_algorithm.mutation import (
     mutacion_ajustar_cantidad_piezas
 )
 from genetic_algorithm.fitness import calcular_fitness
+from genetic_algorithm.optimal_analyzer import calcular_solucion_optima_homogenea
+from genetic_algorithm.exact_solver import resolver_exacto
+from genetic_algorithm.output_formatter import formatear_salida_desde_cromosoma
 
 
 class TestPopulation(unittest.TestCase):
@@ -82,6 +93,60 @@ class TestPopulation(unittest.TestCase):
         self.assertIsInstance(cromosoma, Cromosoma)
         self.assertGreater(len(cromosoma.patrones), 0)
     
+    def test_ffd_bfd_asignacion_esperada(self):
+        """FFD coloca en la primera barra con espacio y BFD en la de menor holgura."""
+        piezas_df = pd.DataFrame([
+            {'id_pedido': 'A', 'longitud_pieza_requerida': 4.0, 'cantidad_requerida': 1},
+            {'id_pedido': 'B', 'longitud_pieza_requerida': 3.0, 'cantidad_requerida': 1},
+            {'id_pedido': 'C', 'longitud_pieza_requerida': 1.0, 'cantidad_requerida': 1}
+        ])
+        # Desperdicios de 4.5 y 3.5: FFD abre primero la barra estándar de 6.0,
+        # BFD la más pequeña que admite cada pieza
+        desperdicios = [{'longitud': 4.5, 'tipo': 'desperdicio'}, {'longitud': 3.5, 'tipo': 'desperdicio'}]
+        barras = [{'longitud': 6.0, 'tipo': 'estandar'}]
+        
+        def resumen(cromosoma):
+            return [
+                (patron.origen_barra_longitud, [p['id_pedido'] for p in patron.piezas_cortadas])
+                for patron in cromosoma.patrones
+            ]
+        
+        ffd = generar_individuo_heuristico_ffd(piezas_df, barras, desperdicios)
+        bfd = generar_individuo_heuristico_bfd(piezas_df, barras, desperdicios)
+        
+        self.assertEqual(resumen(ffd), [(6.0, ['A', 'C']), (6.0, ['B'])])
+        self.assertEqual(resumen(bfd), [(4.5, ['A']), (3.5, ['B']), (6.0, ['C'])])
+    
+    def test_reparar_cromosoma_sin_dataframe(self):
+        """La reparación reagrupa las piezas con BFD sin construir DataFrames."""
+        cromosoma = Cromosoma([
+            Patron(6.0, 'estandar', [{'id_pedido': 'B', 'longitud_pieza': 3.0, 'cantidad_pieza_en_patron': 1}]),
+            Patron(6.0, 'estandar', [
+                {'id_pedido': 'A', 'longitud_pieza': 4.0, 'cantidad_pieza_en_patron': 1},
+                {'id_pedido': 'C', 'longitud_pieza': 1.0, 'cantidad_pieza_en_patron': 2}
+            ])
+        ])
+        barras = [{'longitud': 6.0, 'tipo': 'estandar'}]
+        piezas_agrupadas = pd.DataFrame([
+            {'id_pedido': 'A', 'longitud_pieza_requerida': 4.0, 'cantidad_requerida': 1},
+            {'id_pedido': 'B', 'longitud_pieza_requerida': 3.0, 'cantidad_requerida': 1},
+            {'id_pedido': 'C', 'longitud_pieza_requerida': 1.0, 'cantidad_requerida': 2}
+        ])
+        
+        def resumen(cromosoma):
+            return [
+                (patron.origen_barra_longitud, [(p['id_pedido'], p['longitud_pieza']) for p in patron.piezas_cortadas])
+                for patron in cromosoma.patrones
+            ]
+        
+        with patch('genetic_algorithm.population.pd.DataFrame') as dataframe:
+            reparado = reparar_cromosoma(cromosoma, piezas_agrupadas, barras, [])
+            dataframe.assert_not_called()
+        
+        esperado = generar_individuo_heuristico_bfd(piezas_agrupadas, barras, [])
+        self.assertEqual(resumen(reparado), resumen(esperado))
+        self.assertEqual(resumen(reparado), [(6.0, [('A', 4.0), ('C', 1.0), ('C', 1.0)]), (6.0, [('B', 3.0)])])
+    
     def test_generar_individuo_aleatorio(self):
         """Test para la generación de individuo aleatorio."""
         cromosoma = generar_individuo_aleatorio_con_reparacion(
@@ -107,6 +172,52 @@ class TestPopulation(unittest.TestCase):
         for cromosoma in poblacion:
             self.assertIsInstance(cromosoma, Cromosoma)
     
+    def test_semillas_deterministas_se_calculan_una_vez(self):
+        """FFD y BFD se ejecutan una sola vez; el resto son variantes completas."""
+        with patch('genetic_algorithm.population.generar_individuo_heuristico_ffd',
+                   wraps=generar_individuo_heuristico_ffd) as ffd, \
+             patch('genetic_algorithm.population.generar_individuo_heuristico_bfd',
+                   wraps=generar_individuo_heuristico_bfd) as bfd:
+            poblacion = inicializar_poblacion(
+                tamaño_poblacion=10,
+                piezas_requeridas_df=self.piezas_requeridas_df,
+                barras_estandar_disponibles=self.barras_disponibles,
+                desperdicios_reutilizables_previos=self.desperdicios_disponibles,
+                estrategia_inicializacion='heuristica'
+            )
+        
+        self.assertEqual(ffd.call_count, 1)
+        self.assertEqual(bfd.call_count, 1)
+        self.assertEqual(len({id(cromosoma) for cromosoma in poblacion}), 10)
+        for cromosoma in poblacion:
+            es_completo, _ = validar_cromosoma_completitud(cromosoma, self.piezas_requeridas_df)
+            self.assertTrue(es_completo)
+    
+    def test_perturbar_individuo(self):
+        """La perturbación conserva las piezas y la validez sin modificar el original."""
+        random.seed(3)
+        original = generar_individuo_heuristico_ffd(
+            self.piezas_requeridas_df,
+            [{'longitud': 6.0, 'tipo': 'estandar'}],
+            self.desperdicios_disponibles
+        )
+        self.assertGreater(len(original.patrones), 1)
+        sumario_original = calcular_sumario_piezas_en_cromosoma(original)
+        patrones_original = [str(patron) for patron in original.patrones]
+        
+        variantes_distintas = 0
+        for _ in range(20):
+            variante = perturbar_individuo(original, num_operaciones=3)
+            self.assertEqual(calcular_sumario_piezas_en_cromosoma(variante), sumario_original)
+            for patron in variante.patrones:
+                self.assertTrue(patron.es_valido())
+                self.assertGreater(len(patron.piezas_cortadas), 0)
+            if [str(patron) for patron in variante.patrones] != patrones_original:
+                variantes_distintas += 1
+        
+        self.assertGreater(variantes_distintas, 0)
+        self.assertEqual([str(patron) for patron in original.patrones], patrones_original)
+    
     def test_inicializar_poblacion_aleatoria(self):
         """Test para inicialización de población aleatoria."""
         poblacion = inicializar_poblacion(
@@ -137,6 +248,107 @@ class TestPopulation(unittest.TestCase):
             self.assertIsInstance(cromosoma, Cromosoma)
 
 
+class TestAnalisisOptimo(unittest.TestCase):
+    """Tests para la solución óptima de casos homogéneos."""
+    
+    def test_programacion_dinamica_coincide_con_enumeracion(self):
+        """La programación dinámica encuentra el mínimo de la enumeración exhaustiva."""
+        random.seed(13)
+        for _ in range(30):
+            longitud_pieza = random.choice([350, 1080, 1750, 2500, 4100])
+            barras = random.sample([3000, 4500, 6000, 9000, 12000], 3)
+            cantidad = random.randint(1, 40)
+            
+            solucion = calcular_solucion_optima_homogenea(longitud_pieza, cantidad, barras)
+            
+            piezas = [barra // longitud_pieza for barra in barras]
+            mejor = min(
+                (sum(c * b for c, b in zip(combinacion, barras)), sum(combinacion))
+                for combinacion in product(*[range(cantidad // p + 2 if p else 1) for p in piezas])
+                if sum(c * p for c, p in zip(combinacion, piezas)) >= cantidad
+            )
+            self.assertEqual(solucion['metodo'], 'programacion_dinamica')
+            self.assertEqual(solucion['desperdicio_total'], mejor[0] - cantidad * longitud_pieza)
+            self.assertEqual(solucion['num_barras_total'], mejor[1])
+    
+    def test_limite_de_estados_usa_aproximacion_voraz(self):
+        """Por encima del límite de estados se retorna una solución voraz factible."""
+        exacta = calcular_solucion_optima_homogenea(2.0, 5, [6.0, 4.0])
+        voraz = calcular_solucion_optima_homogenea(2.0, 5, [6.0, 4.0], max_estados=1)
+        
+        self.assertEqual(exacta['combinacion_barras'], {6.0: 1, 4.0: 1})
+        self.assertEqual(voraz['metodo'], 'voraz')
+        self.assertGreaterEqual(voraz['piezas_producidas'], 5)
+        self.assertGreater(voraz['desperdicio_total'], exacta['desperdicio_total'])
+    
+    def test_pedido_grande(self):
+        """Un pedido de miles de piezas se resuelve sin enumerar combinaciones."""
+        solucion = calcular_solucion_optima_homogenea(1.08, 2000, [6.0, 9.0, 12.0])
+        
+        self.assertEqual(solucion['metodo'], 'programacion_dinamica')
+        self.assertGreaterEqual(solucion['piezas_producidas'], 2000)
+        self.assertLess(solucion['piezas_exceso'], 11)
+
+
+class TestSolverExacto(unittest.TestCase):
+    """Tests para el solver exacto de ramificación y acotamiento."""
+    
+    def setUp(self):
+        """Configuración inicial para las pruebas."""
+        self.barras = [
+            {'longitud': 6.0, 'tipo': 'estandar'},
+            {'longitud': 9.0, 'tipo': 'estandar'},
+            {'longitud': 12.0, 'tipo': 'estandar'}
+        ]
+        self.piezas_df = pd.DataFrame([
+            {'id_pedido': 'P001', 'longitud_pieza_requerida': 2.0, 'cantidad_requerida': 2},
+            {'id_pedido': 'P002', 'longitud_pieza_requerida': 3.5, 'cantidad_requerida': 1}
+        ])
+    
+    def test_mejora_a_las_heuristicas(self):
+        """FFD corta de la barra más larga; el óptimo usa una sola barra de 9 m."""
+        ffd = generar_individuo_heuristico_ffd(self.piezas_df, self.barras, [])
+        exacto = resolver_exacto(self.piezas_df, self.barras, [])
+        
+        self.assertEqual([patron.origen_barra_longitud for patron in exacto.patrones], [9.0])
+        self.assertLess(calcular_fitness(exacto, self.piezas_df), calcular_fitness(ffd, self.piezas_df))
+    
+    def test_coincide_con_enumeracion(self):
+        """El fitness del solver coincide con la mejor asignación exhaustiva."""
+        random.seed(17)
+        for _ in range(10):
+            longitudes = [random.choice([1.5, 2.5, 3.0, 4.5, 5.5]) for _ in range(5)]
+            piezas_df = pd.DataFrame([
+                {'id_pedido': f'P{i}', 'longitud_pieza_requerida': longitud, 'cantidad_requerida': 1}
+                for i, longitud in enumerate(longitudes)
+            ])
+            
+            # Cada pieza va a una de cinco barras estándar o al desperdicio de 3 m (índice 5).
+            # Con los pesos por defecto, una barra estándar de L metros cuesta 10·L + 50 y
+            # el desperdicio cuesta (10 - 30)·3; se descuenta 10 por metro de pieza.
+            mejor = float('inf')
+            for asignacion in product(range(6), repeat=len(longitudes)):
+                cargas = [sum(l for l, b in zip(longitudes, asignacion) if b == barra) for barra in range(6)]
+                if cargas[5] > 3.0 or max(cargas[:5]) > 12.0:
+                    continue
+                costo = -10 * sum(longitudes) + (-20 * 3.0 if cargas[5] > 0 else 0)
+                for carga in cargas[:5]:
+                    if carga > 0:
+                        costo += 10 * min(b['longitud'] for b in self.barras if b['longitud'] >= carga) + 50
+                mejor = min(mejor, costo)
+            
+            exacto = resolver_exacto(piezas_df, self.barras, [{'longitud': 3.0, 'tipo': 'desperdicio'}])
+            self.assertAlmostEqual(calcular_fitness(exacto, piezas_df), mejor)
+    
+    def test_salida_y_presupuesto(self):
+        """La salida tiene el formato del AG y sin presupuesto se recurre al AG."""
+        exacto = resolver_exacto(self.piezas_df, self.barras, [])
+        patrones, _ = formatear_salida_desde_cromosoma(exacto)
+        
+        self.assertEqual(sorted(patrones[0]['cortes_realizados']), [2.0, 2.0, 3.5])
+        self.assertIsNone(resolver_exacto(self.piezas_df, self.barras, [], max_nodos=1))
+
+
 class TestSelection(unittest.TestCase):
     """Tests para la selección de padres."""
     
@@ -392,6 +604,33 @@ class TestMutation(unittest.TestCase):
         # Verificar que el cromosoma sigue siendo válido
         self.assertIsInstance(cromosoma_copia, Cromosoma)
     
+    def test_clonar_copia_en_escritura(self):
+        """Clonar comparte los patrones y la mutación solo copia los que modifica."""
+        clon = self.cromosoma.clonar()
+        self.assertIs(clon.patrones[0], self.cromosoma.patrones[0])
+        self.assertIs(clon.patrones[1], self.cromosoma.patrones[1])
+        
+        exito = mutacion_mover_pieza(
+            clon,
+            patron_origen=0,
+            patron_destino=1,
+            pieza_info={'id_pedido': 'P002', 'longitud_pieza': 1.5}
+        )
+        self.assertTrue(exito)
+        
+        # Ambos patrones modificados son copias; el original no cambia
+        self.assertIsNot(clon.patrones[0], self.cromosoma.patrones[0])
+        self.assertIsNot(clon.patrones[1], self.cromosoma.patrones[1])
+        self.assertEqual(len(self.cromosoma.patrones[0].piezas_cortadas), 2)
+        self.assertEqual(self.cromosoma.patrones[1].desperdicio_patron_longitud, 2.0)
+        self.assertEqual(clon.patrones[1].desperdicio_patron_longitud, 0.5)
+        
+        # Una vez copiado, el patrón pertenece al clon y no se vuelve a copiar
+        patron_propio = clon.patrones[1]
+        mutacion_cambiar_origen_patron(clon, 1, [{'longitud': 8.0, 'tipo': 'estandar'}])
+        self.assertIs(clon.patrones[1], patron_propio)
+        self.assertEqual(self.cromosoma.patrones[1].origen_barra_longitud, 4.0)
+    
     def test_mutar_con_tasa_baja(self):
         """Test para mutación con tasa baja."""
         cromosoma_mutado = mutar(
@@ -0,0 +1,232 @@
+"""
+Tests de la cola de trabajos del servidor (GestorTrabajos y endpoints /jobs).
+
+Los trabajos de prueba reemplazan a ejecutar_trabajo por funciones rápidas con
+la misma firma; solo los tests de aislamiento y de fallo de main() ejecutan
+OICA completo.
+"""
+
+import unittest
+import pandas as pd
+import tempfile
+import json
+import os
+import time
+from unittest.mock import patch
+
+# Importar módulos del sistema
+import sys
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+os.environ.setdefault('UPLOAD_PATH', os.path.join(tempfile.mkdtemp(), 'filestore'))
+
+import server
+from server import GestorTrabajos, ESTADOS_TRABAJO_FINALES, ARCHIVO_SENAL_CANCELACION
+from genetic_algorithm.cancellation import TokenCancelacion
+
+
+def _trabajo_rapido(trabajo_id, directorio_trabajo, config_algoritmo,
+                    limite_tiempo_cpu_segundos=None, limite_memoria_mb=None):
+    time.sleep(0.2)
+    with open(os.path.join(directorio_trabajo, 'salida.txt'), 'w') as archivo:
+        archivo.write(trabajo_id)
+    return {'archivos_generados': ['salida.txt'], 'motivo_cancelacion': None}
+
+
+def _trabajo_hasta_cancelar(trabajo_id, directorio_trabajo, config_algoritmo,
+                            limite_tiempo_cpu_segundos=None, limite_memoria_mb=None):
+    token = TokenCancelacion(ruta_senal=os.path.join(directorio_trabajo, ARCHIVO_SENAL_CANCELACION))
+    while not token.cancelado:
+        time.sleep(0.05)
+    return {'archivos_generados': [], 'motivo_cancelacion': token.motivo}
+
+
+def _trabajo_que_muere(trabajo_id, directorio_trabajo, config_algoritmo,
+                       limite_tiempo_cpu_segundos=None, limite_memoria_mb=None):
+    os._exit(9)
+
+
+class TestGestorTrabajos(unittest.TestCase):
+    """Tests para la cola de trabajos con pool acotado de procesos."""
+
+    def setUp(self):
+        """Configuración inicial para las pruebas."""
+        self.directorio = tempfile.TemporaryDirectory()
+        self.archivo_cartilla = os.path.join(self.directorio.name, 'cartilla.csv')
+        pd.DataFrame([
+            {'id_pedido': f'P{grupo}{i}', 'numero_barra': '#4', 'longitud_pieza_requerida': 1.1 + 0.6 * i,
+             'cantidad_requerida': 3, 'grupo_ejecucion': grupo}
+            for grupo in [1, 2] for i in range(4)
+        ]).to_csv(self.archivo_cartilla, index=False)
+        self.archivo_barras = os.path.join(self.directorio.name, 'barras.json')
+        with open(self.archivo_barras, 'w') as archivo:
+            json.dump({'#4': [6.0, 12.0]}, archivo)
+        self.gestores = []
+
+    def tearDown(self):
+        for gestor in self.gestores:
+            gestor.cerrar()
+        self.directorio.cleanup()
+
+    def _crear_gestor(self, funcion_trabajo=_trabajo_rapido, **kwargs):
+        gestor = GestorTrabajos(
+            directorio_base=os.path.join(self.directorio.name, 'jobs'),
+            max_trabajos=1,
+            funcion_trabajo=funcion_trabajo,
+            **kwargs
+        )
+        self.gestores.append(gestor)
+        return gestor
+
+    def _enviar(self, gestor, prioridad=0, config_algoritmo=None):
+        return gestor.enviar(self.archivo_cartilla, self.archivo_barras, config_algoritmo, prioridad)['id']
+
+    def _esperar(self, gestor, trabajo_id, estados=ESTADOS_TRABAJO_FINALES, tiempo_maximo=120):
+        limite = time.time() + tiempo_maximo
+        while time.time() < limite:
+            trabajo = gestor.obtener(trabajo_id)
+            if trabajo['estado'] in estados:
+                return trabajo
+            time.sleep(0.05)
+        self.fail(f"El trabajo {trabajo_id} no llegó a {estados}")
+
+    def test_orden_por_prioridad(self):
+        """Mayor prioridad primero y, a igual prioridad, por orden de llegada."""
+        gestor = self._crear_gestor()
+        primero = self._enviar(gestor)
+        normal_1 = self._enviar(gestor)
+        normal_2 = self._enviar(gestor)
+        urgente = self._enviar(gestor, prioridad=5)
+
+        self.assertEqual(gestor.obtener(primero)['estado'], 'ejecutando')
+        self.assertEqual(
+            [gestor.obtener(t)['posicion_en_cola'] for t in (urgente, normal_1, normal_2)],
+            [1, 2, 3]
+        )
+        self.assertNotIn('posicion_en_cola', gestor.obtener(primero))
+
+        trabajos = [self._esperar(gestor, t) for t in (primero, normal_1, normal_2, urgente)]
+        self.assertTrue(all(trabajo['estado'] == 'completado' for trabajo in trabajos))
+        orden_inicio = [trabajo['id'] for trabajo in sorted(trabajos, key=lambda t: t['inicio'])]
+        self.assertEqual(orden_inicio, [primero, urgente, normal_1, normal_2])
+
+    def test_cancelar_en_cola_y_en_ejecucion(self):
+        """Un trabajo en cola se cancela de inmediato; uno en ejecución, con resultado parcial."""
+        gestor = self._crear_gestor(_trabajo_hasta_cancelar)
+        en_ejecucion = self._enviar(gestor)
+        en_cola = self._enviar(gestor)
+
+        self.assertEqual(gestor.cancelar(en_cola), (True, 'cancelado'))
+        self.assertEqual(gestor.obtener(en_cola)['estado'], 'cancelado')
+        self.assertIsNone(gestor.obtener(en_cola)['resultado'])
+
+        self.assertEqual(gestor.cancelar(en_ejecucion), (True, 'ejecutando'))
+        self.assertTrue(gestor.obtener(en_ejecucion)['cancelacion_solicitada'])
+        trabajo = self._esperar(gestor, en_ejecucion)
+        self.assertEqual(trabajo['estado'], 'cancelado')
+        self.assertEqual(trabajo['resultado']['status'], 'cancelled')
+        self.assertEqual(trabajo['resultado']['motivo_cancelacion'], 'cancelado')
+
+        # Un trabajo terminado ya no se puede cancelar, y el cancelado en cola nunca se ejecutó
+        self.assertEqual(gestor.cancelar(en_ejecucion), (False, 'cancelado'))
+        self.assertIsNone(gestor.obtener(en_cola)['inicio'])
+        self.assertIsNone(gestor.cancelar('no_existe'))
+
+    def test_endpoints_de_trabajos(self):
+        """Códigos de estado de /jobs/<id>/result y /jobs/<id>/cancel."""
+        gestor = self._crear_gestor(_trabajo_hasta_cancelar)
+        cliente = server.app.test_client()
+        with patch('server.gestor_trabajos', gestor):
+            en_ejecucion = self._enviar(gestor)
+            en_cola = self._enviar(gestor)
+
+            self.assertEqual(cliente.get('/jobs/no_existe').status_code, 404)
+            self.assertEqual(cliente.post('/jobs/no_existe/cancel').status_code, 404)
+            self.assertEqual(cliente.get(f'/jobs/{en_ejecucion}/result').status_code, 409)
+            self.assertEqual(cliente.get(f'/jobs/{en_cola}').get_json()['posicion_en_cola'], 1)
+
+            respuesta = cliente.post(f'/jobs/{en_cola}/cancel')
+            self.assertEqual(respuesta.status_code, 200)
+            self.assertEqual(respuesta.get_json()['estado'], 'cancelado')
+
+            respuesta = cliente.post(f'/jobs/{en_ejecucion}/cancel')
+            self.assertEqual(respuesta.status_code, 202)
+            self._esperar(gestor, en_ejecucion)
+
+            respuesta = cliente.get(f'/jobs/{en_ejecucion}/result')
+            self.assertEqual(respuesta.status_code, 200)
+            self.assertEqual(respuesta.get_json()['estado'], 'cancelado')
+            self.assertEqual(cliente.post(f'/jobs/{en_ejecucion}/cancel').status_code, 409)
+
+    def test_directorios_aislados(self):
+        """Cada trabajo ejecuta OICA en su propio directorio, con copias de sus entradas."""
+        gestor = self._crear_gestor(server.ejecutar_trabajo, max_terminados=10)
+        config_algoritmo = {'perfil': 'rapido', 'parametros': {'logging_habilitado': False}}
+        trabajos = [self._enviar(gestor, config_algoritmo=config_algoritmo) for _ in range(2)]
+        trabajos = [self._esperar(gestor, t) for t in trabajos]
+
+        directorios = [trabajo['directorio'] for trabajo in trabajos]
+        self.assertEqual(len(set(directorios)), 2)
+        for trabajo in trabajos:
+            self.assertEqual(trabajo['estado'], 'completado')
+            self.assertEqual(trabajo['resultado']['archivos_generados'], ['resultados_optimizacion_cortes.csv'])
+            self.assertEqual(
+                sorted(os.listdir(trabajo['directorio'])),
+                sorted([server.RUTA_CARTILLA_ACERO, server.RUTA_BARRAS_ESTANDAR, 'resultados_optimizacion_cortes.csv'])
+            )
+        self.assertFalse(os.path.exists('resultados_optimizacion_cortes.csv'))
+
+    def test_trabajo_sin_paralelismo_interno(self):
+        """Un trabajo del pool no lanza islas, evaluación paralela ni diámetros en paralelo."""
+        with tempfile.TemporaryDirectory() as directorio, \
+                patch('server.main', return_value=['resultados.csv']) as main_simulado:
+            server.ejecutar_trabajo('id', directorio, {'perfil': 'intensivo', 'parametros': {'semilla': 1}})
+
+        argumentos = main_simulado.call_args.kwargs
+        self.assertFalse(argumentos['paralelizar_diametros'])
+        self.assertEqual(argumentos['config_algoritmo'], {
+            'perfil': 'intensivo',
+            'parametros': {'semilla': 1, 'paralelizar_evaluacion': False, 'num_islas': 1}
+        })
+
+    def test_trabajo_sin_resultados_es_error(self):
+        """Si main() no puede cargar la cartilla, el trabajo termina en error."""
+        pd.read_csv(self.archivo_cartilla).drop(columns=['grupo_ejecucion']).to_csv(
+            self.archivo_cartilla, index=False
+        )
+        gestor = self._crear_gestor(server.ejecutar_trabajo)
+
+        trabajo = self._esperar(gestor, self._enviar(gestor))
+
+        self.assertEqual(trabajo['estado'], 'error')
+        self.assertEqual(trabajo['resultado']['status'], 'error')
+
+    def test_pool_roto_se_reinicia(self):
+        """Un proceso que muere no bloquea los trabajos siguientes."""
+        gestor = self._crear_gestor()
+        with patch.object(gestor, 'funcion_trabajo', _trabajo_que_muere):
+            fallido = self._enviar(gestor)
+        siguiente = self._enviar(gestor)
+        otro = self._enviar(gestor)
+
+        self.assertEqual(self._esperar(gestor, fallido)['estado'], 'error')
+        self.assertEqual(self._esperar(gestor, siguiente)['estado'], 'completado')
+        self.assertEqual(self._esperar(gestor, otro)['estado'], 'completado')
+        self.assertEqual(gestor.contar('ejecutando'), 0)
+
+    def test_retencion_de_trabajos_terminados(self):
+        """Solo se conservan los trabajos terminados más recientes y sus directorios."""
+        gestor = self._crear_gestor(max_terminados=2)
+        trabajos = [gestor.enviar(self.archivo_cartilla, self.archivo_barras) for _ in range(4)]
+        self._esperar(gestor, trabajos[-1]['id'])
+
+        self.assertEqual([t['id'] for t in gestor.listar()], [t['id'] for t in trabajos[2:]])
+        for trabajo in trabajos[:2]:
+            self.assertIsNone(gestor.obtener(trabajo['id']))
+            self.assertFalse(os.path.exists(trabajo['directorio']))
+        for trabajo in trabajos[2:]:
+            self.assertTrue(os.path.exists(trabajo['directorio']))
+
+
+if __name__ == '__main__':
+    unittest.main()